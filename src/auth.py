@@ -436,13 +436,17 @@ class RadikoAuthenticator(LoggerMixin):
             self.logger.error(f"認証情報復号化エラー: {e}")
             return None
     
-    def get_valid_auth_info(self) -> AuthInfo:
-        """有効な認証情報を取得（期限切れの場合は再認証）"""
+    def get_valid_auth_info(self, force_refresh: bool = False) -> AuthInfo:
+        """有効な認証情報を取得（期限切れの場合は再認証）
+        
+        Args:
+            force_refresh: 有効期限内でもサーバー側で失効した場合等に再認証する
+        """
         # 既存の認証情報が有効かチェック
-        if self.auth_info and not self.auth_info.is_expired():
+        if not force_refresh and self.auth_info and not self.auth_info.is_expired():
             return self.auth_info
         
-        self.logger.info("認証情報が期限切れまたは未取得、再認証を実行")
+        self.logger.info("認証情報が期限切れ・未取得または失効、再認証を実行")
         
         # 保存済みプレミアム認証情報があるかチェック
         config = self._load_config()
@@ -485,9 +489,9 @@ class RadikoAuthenticator(LoggerMixin):
             return self.auth_info.timefree_session
         
         try:
-            # 基本認証が有効であることを確認
-            if not self.is_authenticated():
-                self.auth_info = self.get_valid_auth_info()
+            # 基本認証が有効であることを確認（強制再取得時は基本認証からやり直す）
+            if force_refresh or not self.is_authenticated():
+                self.auth_info = self.get_valid_auth_info(force_refresh=force_refresh)
             
             self.logger.info("タイムフリー認証開始（基本認証トークンを使用）")
             
@@ -0,0 +1,221 @@
+"""
+帯域制限モジュール
+
+録音・番組表取得の通信量を設定した帯域以下に抑えるトークンバケットを提供します。
+- config.json の network セクションで上限 (Mbit/s) を指定
+- 時間帯毎の上限（業務時間のみ制限する等）のスケジュール
+- 同じ設定の全コンポーネント（TimeFreeRecorder・StreamingManager・番組表取得）で1つのバケットを共有
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, time as dtime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .logging_config import get_logger
+from .utils.base import LoggerMixin
+from .utils.config_utils import ConfigManager
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class BandwidthWindow:
+    """時間帯毎の帯域上限（end が start より前の場合は日付を跨ぐ時間帯）"""
+    start: dtime
+    end: dtime
+    limit_mbps: float
+
+    def contains(self, moment: dtime) -> bool:
+        """時刻が時間帯に含まれるか"""
+        if self.start <= self.end:
+            return self.start <= moment < self.end
+        return moment >= self.start or moment < self.end
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> 'BandwidthWindow':
+        """設定 {"start": "09:00", "end": "18:00", "limit_mbps": 5} から生成
+
+        Raises:
+            ValueError: 時刻・上限の形式が不正な場合
+        """
+        try:
+            return cls(
+                start=dtime.fromisoformat(entry['start']),
+                end=dtime.fromisoformat(entry['end']),
+                limit_mbps=float(entry['limit_mbps'])
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"帯域スケジュールの形式が不正です: {entry}") from e
+
+
+class BandwidthLimiter(LoggerMixin):
+    """トークンバケットによる帯域制限
+
+    受信したバイト数分のトークンを消費し、不足分は上限帯域で補充されるまで待機させる。
+    トークンの前借りを許すため、1回の受信量がバケット容量を超えても停止しない。
+    スレッド（requests）とコルーチン（aiohttp）のどちらからも利用できる。
+
+    Usage:
+        limiter = BandwidthLimiter(limit_mbps=10)
+        limiter.throttle(len(chunk))              # 同期
+        await limiter.throttle_async(len(data))   # 非同期
+    """
+
+    def __init__(self, limit_mbps: float = 0, schedule: Optional[List[BandwidthWindow]] = None,
+                 burst_seconds: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 wall_clock: Callable[[], datetime] = datetime.now):
+        """初期化
+
+        Args:
+            limit_mbps: スケジュール外の帯域上限 (Mbit/s, 0 の場合は無制限)
+            schedule: 時間帯毎の帯域上限（先に一致した時間帯を適用）
+            burst_seconds: バケット容量（上限帯域で何秒分の受信を待機なしで許すか）
+            clock: トークン補充用の単調時計
+            wall_clock: スケジュール判定用の現在時刻
+        """
+        super().__init__()
+        self.limit_mbps = limit_mbps
+        self.schedule = list(schedule or [])
+        self.burst_seconds = burst_seconds
+        self.bytes_total = 0
+        self.throttled_seconds = 0.0
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._rate: Optional[float] = None
+        self._tokens = 0.0
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, network_config: Dict[str, Any]) -> Optional['BandwidthLimiter']:
+        """network セクションから生成
+
+        Args:
+            network_config: config.json の network セクション
+
+        Returns:
+            Optional[BandwidthLimiter]: 帯域制限（上限・スケジュールとも未設定の場合はNone）
+        """
+        limit_mbps, schedule, burst_seconds = cls._parse_config(network_config)
+        if not limit_mbps and not schedule:
+            return None
+        return cls(limit_mbps, schedule, burst_seconds)
+
+    @classmethod
+    def _parse_config(cls, network_config: Dict[str, Any]) -> Tuple[float, Tuple[BandwidthWindow, ...], float]:
+        """network セクションから上限・スケジュール・バケット容量を取得（不正なスケジュールは無視）"""
+        schedule = []
+        for entry in network_config.get('bandwidth_schedule', []):
+            try:
+                schedule.append(BandwidthWindow.from_dict(entry))
+            except ValueError as e:
+                logger.warning(f"{e}（無視します）")
+        return (
+            float(network_config.get('bandwidth_limit_mbps', 0) or 0),
+            tuple(schedule),
+            float(network_config.get('bandwidth_burst_seconds', 1.0))
+        )
+
+    def current_limit_mbps(self) -> float:
+        """現在時刻に適用される帯域上限 (Mbit/s, 0 の場合は無制限)"""
+        moment = self._wall_clock().time()
+        for window in self.schedule:
+            if window.contains(moment):
+                return window.limit_mbps
+        return self.limit_mbps
+
+    def throttle(self, nbytes: int):
+        """受信したバイト数分のトークンを消費し、必要な時間待機（同期）
+
+        Args:
+            nbytes: 受信したバイト数
+        """
+        delay = self._reserve(nbytes)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def throttle_async(self, nbytes: int):
+        """受信したバイト数分のトークンを消費し、必要な時間待機（非同期）
+
+        Args:
+            nbytes: 受信したバイト数
+        """
+        delay = self._reserve(nbytes)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _reserve(self, nbytes: int) -> float:
+        """トークンを消費し、不足分が補充されるまでの待機秒数を返す"""
+        with self._lock:
+            self.bytes_total += nbytes
+            now = self._clock()
+            elapsed = now - self._updated_at
+            self._updated_at = now
+
+            limit_mbps = self.current_limit_mbps()
+            if limit_mbps <= 0:
+                # 無制限の時間帯は前借り分も精算済みとする
+                self._rate = None
+                self._tokens = 0.0
+                return 0.0
+
+            rate = limit_mbps * 1_000_000 / 8
+            capacity = rate * self.burst_seconds
+            if self._rate != rate:
+                # 制限開始・上限変更時はバケットを満杯から始める（前借り分は引き継ぐ）
+                self._tokens = capacity if self._rate is None else min(self._tokens, capacity)
+                self._rate = rate
+            else:
+                self._tokens = min(capacity, self._tokens + elapsed * rate)
+
+            self._tokens -= nbytes
+            if self._tokens >= 0:
+                return 0.0
+            delay = -self._tokens / rate
+            self.throttled_seconds += delay
+            return delay
+
+
+# 同じ設定の帯域制限を共有するためのレジストリ
+_shared_limiters: Dict[Tuple, BandwidthLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_bandwidth_limiter(network_config: Dict[str, Any]) -> Optional[BandwidthLimiter]:
+    """設定に対応するプロセス内共有の帯域制限を取得
+
+    同じ設定を読み込んだコンポーネントは同一のバケットを共有するため、
+    録音と番組表取得を合わせた通信量が上限以下に抑えられる。
+
+    Args:
+        network_config: config.json の network セクション
+
+    Returns:
+        Optional[BandwidthLimiter]: 帯域制限（未設定の場合はNone）
+    """
+    key = BandwidthLimiter._parse_config(network_config)
+    limit_mbps, schedule, burst_seconds = key
+    if not limit_mbps and not schedule:
+        return None
+    with _shared_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = BandwidthLimiter(limit_mbps, list(schedule), burst_seconds)
+            _shared_limiters[key] = limiter
+        return limiter
+
+
+def load_bandwidth_limiter(config_path: str = "config.json") -> Optional[BandwidthLimiter]:
+    """設定ファイルの network セクションから共有の帯域制限を取得
+
+    Args:
+        config_path: 設定ファイルパス
+
+    Returns:
+        Optional[BandwidthLimiter]: 帯域制限（未設定の場合はNone）
+    """
+    return shared_bandwidth_limiter(ConfigManager(config_path).load_config({}).get('network', {}))
@@ -0,0 +1,113 @@
+"""
+分割変換計画モジュール
+
+長時間番組の変換を複数の FFmpeg プロセスへ分割するための計画を立てます。
+- 入力（ID3 タグ付き ADTS）はセグメント境界で分割し、前後1セグメントを重ねて渡す
+- 出力はコーデックのフレーム単位で連結し、再エンコードせずに継ぎ目のないストリームにする
+
+継ぎ目の考え方:
+    出力フレーム j が覆う区間は「入力先頭 + j×F − D」から F サンプル
+    （F: 1フレームのサンプル数、D: エンコーダー遅延）。各チャンクの入力先頭を
+    atrim で F の倍数の位置に揃えると、全チャンクの出力フレームが番組全体で
+    同じフレーム格子に乗り、D はチャンク間で相殺される。チャンク i は格子上の
+    境界 m_i から m_(i+1) までのフレームだけを採用する。重ねた前後のセグメントは
+    デコーダーの立ち上がりとエンコーダーの先読みに使われ、採用されない。
+"""
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+
+# チャンクの前後に重ねるセグメント数
+OVERLAP_SEGMENTS = 1
+
+
+@dataclass(frozen=True)
+class TranscodeChunk:
+    """1プロセス分の変換範囲"""
+    index: int
+    # 入力ファイル中のバイト範囲（前後に重ねたセグメントを含む）
+    input_start: int
+    input_end: int
+    # 入力のデコード結果の先頭から削除するサンプル数（出力サンプリング周波数）
+    trim_samples: int
+    # 出力の先頭から読み捨てるフレーム数と、採用するフレーム数（最終チャンクは残り全て）
+    skip_frames: int
+    keep_frames: Optional[int]
+
+
+def output_frame_size(codec: str, sample_rate: int) -> int:
+    """出力コーデックの1フレームあたりのサンプル数
+
+    Args:
+        codec: FFmpeg エンコーダー名 (libmp3lame / aac)
+        sample_rate: 出力サンプリング周波数
+
+    Returns:
+        int: サンプル数
+    """
+    if codec == 'libmp3lame':
+        # MPEG-1 (32kHz以上) は1152、MPEG-2/2.5 は576
+        return 1152 if sample_rate >= 32000 else 576
+    return 1024
+
+
+def plan_transcode_chunks(segment_starts: Sequence[Tuple[int, float]], total_seconds: float,
+                          file_size: int, chunk_count: int, sample_rate: int,
+                          frame_size: int) -> List[TranscodeChunk]:
+    """セグメント境界で分割した変換計画
+
+    Args:
+        segment_starts: (バイト位置, 開始時点の再生時間) のセグメント一覧（先頭から順）
+        total_seconds: 全体の再生時間
+        file_size: 入力ファイルのバイト数
+        chunk_count: 分割数
+        sample_rate: 出力サンプリング周波数
+        frame_size: 出力の1フレームあたりのサンプル数
+
+    Returns:
+        List[TranscodeChunk]: 変換範囲一覧（分割できない場合は空）
+    """
+    if not segment_starts or segment_starts[0][0] != 0:
+        return []
+    # 各チャンクに重ね分を除いて最低2セグメント割り当てる
+    chunk_count = min(chunk_count, len(segment_starts) // (2 + 2 * OVERLAP_SEGMENTS))
+    if chunk_count < 2:
+        return []
+
+    # 再生時間を等分する位置に最も近いセグメント境界を選択
+    boundaries = [0]
+    for i in range(1, chunk_count):
+        target = total_seconds * i / chunk_count
+        # 後続の境界のためにセグメントを残す
+        candidates = range(boundaries[-1] + 1, len(segment_starts) - (chunk_count - i) + 1)
+        candidate = min(candidates, key=lambda s: abs(segment_starts[s][1] - target))
+        boundaries.append(candidate)
+    boundaries.append(len(segment_starts))
+
+    def samples_at(segment: int) -> int:
+        return round(segment_starts[segment][1] * sample_rate)
+
+    def offset_at(segment: int) -> int:
+        return segment_starts[segment][0] if segment < len(segment_starts) else file_size
+
+    # 境界をフレーム格子上に切り上げ（m_i: 格子上の境界のフレーム番号）
+    grid = [0] + [math.ceil(samples_at(s) / frame_size) for s in boundaries[1:-1]]
+
+    chunks = []
+    for i in range(chunk_count):
+        first_segment = max(boundaries[i] - OVERLAP_SEGMENTS, 0)
+        last_segment = min(boundaries[i + 1] + OVERLAP_SEGMENTS, len(segment_starts))
+        input_samples = samples_at(first_segment)
+        trim_samples = -input_samples % frame_size
+        aligned_frame = (input_samples + trim_samples) // frame_size
+        chunks.append(TranscodeChunk(
+            index=i,
+            input_start=offset_at(first_segment),
+            input_end=offset_at(last_segment),
+            trim_samples=trim_samples,
+            skip_frames=grid[i] - aligned_frame,
+            keep_frames=grid[i + 1] - grid[i] if i + 1 < chunk_count else None
+        ))
+    return chunks
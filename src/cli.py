@@ -299,6 +299,13 @@ class RecRadikoCLI(LoggerMixin):
     def _cleanup(self):
         """リソースのクリーンアップ"""
         try:
+            if self.timefree_recorder:
+                try:
+                    # 録音で共有しているHTTPセッションをクローズ
+                    self.timefree_recorder.close_sync()
+                except Exception as e:
+                    self.logger.debug(f"タイムフリー録音のクリーンアップエラー: {e}")
+            
             if self.error_handler:
                 try:
                     self.error_handler.shutdown()
@@ -0,0 +1,180 @@
+"""
+セグメント並行数の適応制御モジュール
+
+セグメントダウンロードの同時リクエスト数を AIMD（加算増加・乗算減少）で調整します。
+- 応答が健全な間は並行数を1ずつ増加
+- 429/5xx/タイムアウト検出時は並行数を乗算的に減少
+- 並行数の変更履歴と理由の記録
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+from .utils.base import LoggerMixin
+
+
+@dataclass
+class ConcurrencyAdjustment:
+    """並行数変更記録"""
+    timestamp: float
+    old_limit: int
+    new_limit: int
+    reason: str
+
+    def __str__(self) -> str:
+        return f"{self.old_limit}→{self.new_limit}: {self.reason}"
+
+
+@dataclass
+class ConcurrencySlot:
+    """取得したダウンロード枠
+
+    ``epoch`` は枠取得時点の減少世代。同じ輻輳で同時に失敗した複数の
+    リクエストにより並行数が連続して減少しないよう、減少済みの世代に
+    属するリクエストの失敗は無視する。
+    """
+    epoch: int
+    started_at: float
+
+    @property
+    def elapsed(self) -> float:
+        """枠取得からの経過秒数"""
+        return time.monotonic() - self.started_at
+
+
+class AdaptiveConcurrencyController(LoggerMixin):
+    """AIMD による並行数コントローラー
+
+    現在の並行数分のリクエストが健全に完了する毎に並行数を1増やし、
+    サーバー側の輻輳を示す応答（429/5xx/タイムアウト）を受けると
+    ``decrease_factor`` 倍に減らす。レイテンシが観測最小値の
+    ``latency_tolerance`` 倍を超える応答やその他のエラーは増加を保留する。
+
+    Usage:
+        controller = AdaptiveConcurrencyController(initial_limit=8, max_limit=32)
+        async with controller.slot() as slot:
+            ...
+            controller.record_success(slot)    # 正常応答
+            controller.record_congestion(slot, "HTTP 429")  # 輻輳応答
+    """
+
+    def __init__(self, initial_limit: int = 8, min_limit: int = 1, max_limit: int = 32,
+                 decrease_factor: float = 0.5, latency_tolerance: float = 2.0):
+        """初期化
+
+        Args:
+            initial_limit: 初期並行数
+            min_limit: 並行数の下限
+            max_limit: 並行数の上限
+            decrease_factor: 輻輳検出時の並行数倍率
+            latency_tolerance: 健全とみなすレイテンシ（観測最小値に対する倍率）
+        """
+        super().__init__()
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.peak_limit = self.limit
+        self.in_flight = 0
+        self.adjustments: List[ConcurrencyAdjustment] = []
+
+        self._epoch = 0
+        self._healthy_streak = 0
+        self._best_latency: Optional[float] = None
+        self._condition = asyncio.Condition()
+        # 実行中の待機者通知タスク（イベントループは弱参照しか保持しないため完了まで参照を保持）
+        self._notify_tasks: Set[asyncio.Task] = set()
+
+    @asynccontextmanager
+    async def slot(self):
+        """並行数の範囲内でダウンロード枠を取得
+
+        Yields:
+            ConcurrencySlot: 取得した枠
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        try:
+            yield ConcurrencySlot(epoch=self._epoch, started_at=time.monotonic())
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record_success(self, slot: ConcurrencySlot):
+        """正常応答を記録し、健全な状態が続けば並行数を増やす
+
+        Args:
+            slot: 応答を受けた枠
+        """
+        latency = slot.elapsed
+        if self._best_latency is None or latency < self._best_latency:
+            self._best_latency = latency
+
+        if latency > self._best_latency * self.latency_tolerance:
+            # レイテンシ悪化中は増加を保留
+            self._healthy_streak = 0
+            return
+
+        self._healthy_streak += 1
+        if self._healthy_streak >= self.limit and self.limit < self.max_limit:
+            self._healthy_streak = 0
+            self._set_limit(self.limit + 1, f"正常応答継続 (レイテンシ {latency:.2f}秒)")
+
+    def record_error(self, slot: ConcurrencySlot):
+        """輻輳以外のエラーを記録（並行数は維持し、増加を保留）
+
+        Args:
+            slot: エラーとなった枠
+        """
+        self._healthy_streak = 0
+
+    def record_congestion(self, slot: ConcurrencySlot, reason: str):
+        """輻輳応答を記録し、並行数を乗算的に減らす
+
+        Args:
+            slot: 輻輳応答を受けた枠
+            reason: 輻輳の理由（例: "HTTP 429", "タイムアウト"）
+        """
+        self._healthy_streak = 0
+        if slot.epoch < self._epoch:
+            # 同じ輻輳に対しては既に減少済み
+            return
+
+        self._epoch += 1
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        if new_limit != self.limit:
+            self._set_limit(new_limit, reason)
+
+    def _set_limit(self, new_limit: int, reason: str):
+        """並行数を変更して履歴に記録"""
+        adjustment = ConcurrencyAdjustment(time.time(), self.limit, new_limit, reason)
+        self.adjustments.append(adjustment)
+        old_limit, self.limit = self.limit, new_limit
+        self.peak_limit = max(self.peak_limit, new_limit)
+        self.logger.info(f"セグメント並行数変更: {adjustment}")
+
+        if new_limit > old_limit:
+            # 増加時は待機中のダウンロードを起こす
+            try:
+                task = asyncio.get_running_loop().create_task(self._notify())
+            except RuntimeError:
+                return  # イベントループ外では待機中の枠取得も存在しない
+            self._notify_tasks.add(task)
+            task.add_done_callback(self._notify_done)
+
+    async def _notify(self):
+        """待機中の枠取得を再評価させる"""
+        async with self._condition:
+            self._condition.notify_all()
+
+    def _notify_done(self, task: asyncio.Task):
+        """完了した通知タスクの参照を解放し、失敗を記録"""
+        self._notify_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.warning(f"並行数増加時の待機者通知に失敗しました: {task.exception()}")
@@ -32,6 +32,7 @@ from .auth import RadikoAuthenticator
 from .program_info import ProgramInfo
 from .utils.base import LoggerMixin
 from .utils.network_utils import create_radiko_session
+from .bandwidth_limiter import load_bandwidth_limiter
 from .utils.path_utils import ensure_directory_path_exists
 
 
@@ -183,7 +184,8 @@ class ProgramHistoryManager(LoggerMixin):
         super().__init__()  # LoggerMixin初期化
         self.authenticator = authenticator or RadikoAuthenticator()
         self.cache = ProgramCache()
-        self.session = create_radiko_session()
+        # 番組表取得も録音と共有の帯域制限に従う
+        self.session = create_radiko_session(bandwidth_limiter=load_bandwidth_limiter())
     
     def get_programs_by_date(self, date: str, station_id: str = None) -> List[ProgramInfo]:
         """指定日の番組表取得
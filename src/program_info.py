@@ -22,6 +22,7 @@ from pathlib import Path
 from .auth import RadikoAuthenticator, AuthenticationError
 from .utils.base import LoggerMixin
 from .utils.network_utils import create_radiko_session
+from .bandwidth_limiter import load_bandwidth_limiter
 
 
 @dataclass
@@ -305,8 +306,8 @@ class ProgramInfoManager(LoggerMixin):
         self.area_id = area_id
         self.authenticator = authenticator or RadikoAuthenticator()
         
-        # セッション設定
-        self.session = create_radiko_session()
+        # セッション設定（番組表取得も録音と共有の帯域制限に従う）
+        self.session = create_radiko_session(bandwidth_limiter=load_bandwidth_limiter())
         
         # 日本時間のタイムゾーン設定
         self.jst = pytz.timezone('Asia/Tokyo')
@@ -0,0 +1,288 @@
+"""
+録音メトリクスモジュール
+
+録音1件毎のスループット計測値を収集し、ファイルへ出力します。
+- プレイリスト解決時間・最初のセグメント取得までの時間
+- セグメント取得レイテンシのパーセンタイル・時間毎の受信速度
+- 原因別のリトライ回数・トークン再取得回数
+- 変換速度（再生時間 / 変換時間）
+- JSON Lines・Prometheus textfile 形式の出力先
+"""
+
+import json
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .utils.base import LoggerMixin
+
+
+# レイテンシのパーセンタイルとして出力する分位
+LATENCY_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+@dataclass
+class RecordingMetrics:
+    """録音1件分の計測値"""
+    program_id: str = ""
+    station_id: str = ""
+    success: Optional[bool] = None
+    # プレイリスト（セグメントURL一覧）の取得に要した秒数
+    playlist_seconds: float = 0.0
+    # 録音開始から最初のセグメントを受信するまでの秒数
+    time_to_first_segment_seconds: Optional[float] = None
+    # セグメントダウンロードに要した秒数
+    download_seconds: float = 0.0
+    # 通信で取得したセグメント数・バイト数（再開用スプール・セグメントストアからの再利用は除く）
+    segments_downloaded: int = 0
+    segments_reused: int = 0
+    bytes_downloaded: int = 0
+    segment_latencies: List[float] = field(default_factory=list)
+    retries_by_cause: Dict[str, int] = field(default_factory=dict)
+    token_refreshes: int = 0
+    # 変換に要した秒数と変換した音声の再生時間
+    transcode_seconds: float = 0.0
+    media_duration_seconds: float = 0.0
+    # 受信速度を集計する時間間隔（秒）
+    throughput_interval: float = 1.0
+
+    def __post_init__(self):
+        self._started_at = time.monotonic()
+        self._bytes_by_interval: Dict[int, int] = {}
+
+    def start(self):
+        """計測開始時刻を記録（録音開始時に呼び出す）"""
+        self._started_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """計測開始からの経過秒数"""
+        return time.monotonic() - self._started_at
+
+    def record_segment(self, nbytes: int, latency: float):
+        """通信で取得したセグメントを記録
+
+        Args:
+            nbytes: セグメントのバイト数
+            latency: リクエスト開始から受信完了までの秒数
+        """
+        elapsed = self.elapsed
+        if self.time_to_first_segment_seconds is None:
+            self.time_to_first_segment_seconds = elapsed
+        self.segments_downloaded += 1
+        self.bytes_downloaded += nbytes
+        self.segment_latencies.append(latency)
+        bucket = int(elapsed // self.throughput_interval)
+        self._bytes_by_interval[bucket] = self._bytes_by_interval.get(bucket, 0) + nbytes
+
+    def record_reused_segment(self):
+        """再開用スプール・セグメントストアから再利用したセグメントを記録"""
+        self.segments_reused += 1
+
+    def record_retries(self, retries_by_cause: Dict[str, int]):
+        """原因別のリトライ回数を加算"""
+        for cause, count in retries_by_cause.items():
+            self.retries_by_cause[cause] = self.retries_by_cause.get(cause, 0) + count
+
+    @property
+    def retries_total(self) -> int:
+        """リトライ回数の合計"""
+        return sum(self.retries_by_cause.values())
+
+    @property
+    def bytes_per_second(self) -> float:
+        """ダウンロード全体の平均受信速度（バイト/秒）"""
+        return self.bytes_downloaded / self.download_seconds if self.download_seconds > 0 else 0.0
+
+    @property
+    def transcode_speed_ratio(self) -> float:
+        """変換速度（再生時間 / 変換時間。10.0 の場合は実時間の10倍速）"""
+        return self.media_duration_seconds / self.transcode_seconds if self.transcode_seconds > 0 else 0.0
+
+    def latency_percentiles(self) -> Dict[str, float]:
+        """セグメント取得レイテンシのパーセンタイル（最近接順位法）
+
+        Returns:
+            Dict[str, float]: {"p50": 秒, "p90": 秒, "p95": 秒, "p99": 秒, "max": 秒}（未取得時は空）
+        """
+        if not self.segment_latencies:
+            return {}
+        latencies = sorted(self.segment_latencies)
+        percentiles = {
+            f"p{quantile * 100:g}": latencies[max(0, math.ceil(quantile * len(latencies)) - 1)]
+            for quantile in LATENCY_QUANTILES
+        }
+        percentiles['max'] = latencies[-1]
+        return percentiles
+
+    def throughput_series(self) -> List[Tuple[float, float]]:
+        """時間毎の受信速度
+
+        Returns:
+            List[Tuple[float, float]]: (計測開始からの秒数, バイト/秒) の一覧（受信のない区間は0）
+        """
+        if not self._bytes_by_interval:
+            return []
+        first, last = min(self._bytes_by_interval), max(self._bytes_by_interval)
+        return [
+            (bucket * self.throughput_interval,
+             self._bytes_by_interval.get(bucket, 0) / self.throughput_interval)
+            for bucket in range(first, last + 1)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """出力用の辞書（個々のレイテンシは集計値のみ）"""
+        return {
+            'program_id': self.program_id,
+            'station_id': self.station_id,
+            'success': self.success,
+            'playlist_seconds': round(self.playlist_seconds, 3),
+            'time_to_first_segment_seconds': (
+                round(self.time_to_first_segment_seconds, 3)
+                if self.time_to_first_segment_seconds is not None else None
+            ),
+            'download_seconds': round(self.download_seconds, 3),
+            'segments_downloaded': self.segments_downloaded,
+            'segments_reused': self.segments_reused,
+            'bytes_downloaded': self.bytes_downloaded,
+            'bytes_per_second': round(self.bytes_per_second, 1),
+            'segment_latency_seconds': {
+                key: round(value, 4) for key, value in self.latency_percentiles().items()
+            },
+            'throughput_bytes_per_second': [
+                [offset, round(rate, 1)] for offset, rate in self.throughput_series()
+            ],
+            'retries_by_cause': dict(self.retries_by_cause),
+            'token_refreshes': self.token_refreshes,
+            'transcode_seconds': round(self.transcode_seconds, 3),
+            'media_duration_seconds': round(self.media_duration_seconds, 3),
+            'transcode_speed_ratio': round(self.transcode_speed_ratio, 2),
+        }
+
+
+class JsonLinesMetricsSink(LoggerMixin):
+    """録音毎に1行のJSONを追記する出力先
+
+    Usage:
+        sink = JsonLinesMetricsSink("~/.recradiko/metrics.jsonl")
+        sink.write(result.metrics)
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        super().__init__()
+        self.path = Path(path).expanduser()
+
+    def write(self, metrics: RecordingMetrics):
+        """計測値を1行追記
+
+        Args:
+            metrics: 録音の計測値
+        """
+        record = {'timestamp': datetime.now().isoformat(timespec='seconds'), **metrics.to_dict()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+class PrometheusTextfileSink(LoggerMixin):
+    """node_exporter の textfile collector 向けの出力先
+
+    放送局毎に直近の録音の計測値を保持し、書き込みの度にファイル全体を
+    一時ファイル経由で置き換える（収集中に不完全なファイルを読ませない）。
+
+    Usage:
+        sink = PrometheusTextfileSink("/var/lib/node_exporter/textfile/recradiko.prom")
+        sink.write(result.metrics)
+    """
+
+    PREFIX = "recradiko_recording"
+
+    # (メトリクス名, 説明, 値の取得関数)
+    GAUGES = (
+        ('success', "直近の録音が成功したか", lambda m: 1 if m.success else 0),
+        ('playlist_seconds', "プレイリスト取得秒数", lambda m: m.playlist_seconds),
+        ('time_to_first_segment_seconds', "最初のセグメント受信までの秒数",
+         lambda m: m.time_to_first_segment_seconds),
+        ('download_seconds', "セグメントダウンロード秒数", lambda m: m.download_seconds),
+        ('segments_downloaded', "通信で取得したセグメント数", lambda m: m.segments_downloaded),
+        ('segments_reused', "スプール・ストアから再利用したセグメント数", lambda m: m.segments_reused),
+        ('bytes_downloaded', "受信バイト数", lambda m: m.bytes_downloaded),
+        ('bytes_per_second', "平均受信速度（バイト/秒）", lambda m: m.bytes_per_second),
+        ('token_refreshes', "ダウンロード中のトークン再取得回数", lambda m: m.token_refreshes),
+        ('transcode_seconds', "変換秒数", lambda m: m.transcode_seconds),
+        ('transcode_speed_ratio', "変換速度（再生時間/変換時間）", lambda m: m.transcode_speed_ratio),
+    )
+
+    def __init__(self, path: Union[str, Path]):
+        super().__init__()
+        self.path = Path(path).expanduser()
+        self._latest: Dict[str, Tuple[RecordingMetrics, float]] = {}
+
+    def write(self, metrics: RecordingMetrics):
+        """放送局の直近の計測値を更新してファイルを書き直す
+
+        Args:
+            metrics: 録音の計測値
+        """
+        self._latest[metrics.station_id] = (metrics, time.time())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, self.path)
+
+    def render(self) -> str:
+        """保持中の計測値を Prometheus テキスト形式に変換"""
+        lines = []
+        entries = sorted(self._latest.items())
+
+        for name, description, getter in self.GAUGES:
+            self._header(lines, name, description)
+            for _, (metrics, _) in entries:
+                value = getter(metrics)
+                if value is not None:
+                    lines.append(f"{self.PREFIX}_{name}{self._labels(metrics)} {self._number(value)}")
+
+        self._header(lines, 'segment_latency_seconds', "セグメント取得レイテンシのパーセンタイル")
+        for _, (metrics, _) in entries:
+            percentiles = metrics.latency_percentiles()
+            for quantile in LATENCY_QUANTILES:
+                key = f"p{quantile * 100:g}"
+                if key in percentiles:
+                    labels = self._labels(metrics, quantile=f"{quantile:g}")
+                    lines.append(f"{self.PREFIX}_segment_latency_seconds{labels} {self._number(percentiles[key])}")
+
+        self._header(lines, 'retries', "原因別のリトライ回数")
+        for _, (metrics, _) in entries:
+            for cause, count in sorted(metrics.retries_by_cause.items()):
+                lines.append(f"{self.PREFIX}_retries{self._labels(metrics, cause=cause)} {count}")
+
+        self._header(lines, 'timestamp_seconds', "録音完了時刻（UNIX時間）")
+        for _, (metrics, written_at) in entries:
+            lines.append(f"{self.PREFIX}_timestamp_seconds{self._labels(metrics)} {written_at:.0f}")
+
+        return '\n'.join(lines) + '\n'
+
+    def _header(self, lines: List[str], name: str, description: str):
+        lines.append(f"# HELP {self.PREFIX}_{name} {description}")
+        lines.append(f"# TYPE {self.PREFIX}_{name} gauge")
+
+    @staticmethod
+    def _labels(metrics: RecordingMetrics, **extra: str) -> str:
+        """ラベル文字列（値はエスケープ）"""
+        labels = {'station': metrics.station_id, 'program': metrics.program_id, **extra}
+        return '{' + ','.join(
+            f'{key}="{PrometheusTextfileSink._escape(str(value))}"' for key, value in labels.items()
+        ) + '}'
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    @staticmethod
+    def _number(value: float) -> str:
+        return f"{value:.6g}" if isinstance(value, float) else str(value)
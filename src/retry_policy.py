@@ -0,0 +1,206 @@
+"""
+セグメント取得リトライポリシーモジュール
+
+TimeFreeRecorder と StreamingManager で共有するリトライ方針を提供します。
+- HTTPステータス・例外のリトライ可否分類
+- フルジッター付き指数バックオフ
+- Retry-After ヘッダーの尊重
+- 録音単位のリトライ予算
+"""
+
+import asyncio
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import aiohttp
+import requests
+
+
+class RetryBudget:
+    """録音単位のリトライ予算
+
+    1つの録音で消費できるリトライ回数の上限。障害時に全ワーカーが
+    リトライを繰り返して録音時間が際限なく延びるのを防ぐ。
+    スレッド・コルーチンのどちらからも利用できる。
+    """
+
+    def __init__(self, limit: int):
+        """初期化
+
+        Args:
+            limit: 録音全体で許可するリトライ回数
+        """
+        self.limit = limit
+        self.used = 0
+        self.retries_by_cause: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        """残りリトライ回数"""
+        return max(0, self.limit - self.used)
+
+    def try_acquire(self, cause: str) -> bool:
+        """リトライ1回分の予算を消費
+
+        Args:
+            cause: リトライ理由（例: "HTTP 503", "タイムアウト"）
+
+        Returns:
+            bool: 予算内でリトライ可能な場合True
+        """
+        with self._lock:
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            self.retries_by_cause[cause] += 1
+            return True
+
+
+class RetryPolicy:
+    """セグメント取得リトライポリシー
+
+    Usage:
+        policy = RetryPolicy(max_attempts=3)
+        budget = policy.new_budget(len(segment_urls))
+        for attempt in range(policy.max_attempts):
+            ...
+            if policy.classify_status(status) == RetryPolicy.RETRY and \\
+                    policy.should_retry(attempt, budget, f"HTTP {status}"):
+                await asyncio.sleep(policy.backoff_delay(attempt, retry_after))
+    """
+
+    SUCCESS = "success"
+    RETRY = "retry"
+    FATAL = "fatal"
+
+    # 一時的な障害とみなすHTTPステータス
+    RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5,
+                 max_delay: float = 30.0, max_retry_after: float = 120.0,
+                 budget_ratio: float = 0.1, min_budget: int = 10):
+        """初期化
+
+        Args:
+            max_attempts: 1リクエストあたりの最大試行回数
+            base_delay: バックオフの基準秒数
+            max_delay: バックオフの上限秒数
+            max_retry_after: 尊重する Retry-After の上限秒数
+            budget_ratio: 録音のリクエスト数に対するリトライ予算の割合
+            min_budget: リトライ予算の最小回数
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.budget_ratio = budget_ratio
+        self.min_budget = min_budget
+
+    def new_budget(self, total_requests: int) -> RetryBudget:
+        """録音1件分のリトライ予算を生成
+
+        Args:
+            total_requests: 録音で発行するリクエスト数（セグメント数）
+
+        Returns:
+            RetryBudget: リトライ予算
+        """
+        return RetryBudget(max(self.min_budget, int(total_requests * self.budget_ratio)))
+
+    def classify_status(self, status: int) -> str:
+        """HTTPステータスを分類
+
+        Args:
+            status: HTTPステータスコード
+
+        Returns:
+            str: SUCCESS / RETRY / FATAL
+        """
+        if 200 <= status < 300:
+            return self.SUCCESS
+        if status in self.RETRYABLE_STATUSES or status >= 500:
+            return self.RETRY
+        return self.FATAL
+
+    def is_retryable_exception(self, error: BaseException) -> bool:
+        """例外がリトライ対象か判定（タイムアウト・接続エラー等の一時障害）
+
+        Args:
+            error: 発生した例外
+
+        Returns:
+            bool: リトライ対象の場合True
+        """
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return self.classify_status(error.response.status_code) == self.RETRY
+        return isinstance(error, (
+            asyncio.TimeoutError,
+            aiohttp.ClientError,
+            requests.ConnectionError,
+            requests.Timeout,
+            ConnectionError,
+        ))
+
+    def should_retry(self, attempt: int, budget: Optional[RetryBudget], cause: str) -> bool:
+        """試行回数と予算からリトライ可否を判定（可の場合は予算を消費）
+
+        Args:
+            attempt: 失敗した試行の番号（0始まり）
+            budget: 録音のリトライ予算（Noneの場合は無制限）
+            cause: リトライ理由
+
+        Returns:
+            bool: リトライする場合True
+        """
+        if attempt >= self.max_attempts - 1:
+            return False
+        return budget is None or budget.try_acquire(cause)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """次の試行までの待機秒数
+
+        フルジッター（0〜指数上限の一様乱数）で複数ワーカーのリトライ時刻を分散させる。
+        Retry-After 指定時はその秒数以上待機する。
+
+        Args:
+            attempt: 失敗した試行の番号（0始まり）
+            retry_after: サーバー指定の待機秒数
+
+        Returns:
+            float: 待機秒数
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    @staticmethod
+    def parse_retry_after(headers: Optional[Dict[str, str]]) -> Optional[float]:
+        """Retry-After ヘッダーを秒数に変換（秒数・HTTP日付の両形式に対応）
+
+        Args:
+            headers: レスポンスヘッダー
+
+        Returns:
+            Optional[float]: 待機秒数（未指定・解析不能時はNone）
+        """
+        if not headers:
+            return None
+        value = headers.get('Retry-After')
+        if not value:
+            return None
+
+        value = str(value).strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
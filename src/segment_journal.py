@@ -0,0 +1,244 @@
+"""
+セグメントジャーナルモジュール
+
+録音中断からの再開を可能にするため、取得済みセグメントをスプールディレクトリに保存します。
+- 録音単位（放送局ID・開始時刻・終了時刻）のスプールディレクトリ管理
+- 取得完了セグメント番号・URLパスの追記型ジャーナル
+- プレイリスト変更時のセグメント単位の無効化（全URLが揃う前の時間窓毎の取得にも対応）
+- 再試行されずに残った古いスプールの削除
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+from .utils.base import LoggerMixin
+
+
+class SegmentJournal(LoggerMixin):
+    """録音再開用セグメントジャーナル
+
+    スプールディレクトリの構成:
+        manifest.json   スプールの形式
+        journal.log     取得完了したセグメント番号とURLパス（1行1件の追記型）
+        000123.seg      セグメントデータ
+
+    取得済みセグメントはURLパス（セッション毎に変わり得るクエリ部分を除く）が
+    一致する場合のみ再利用する。プレイリスト全体を開く時点で渡せない場合
+    （時間窓毎に取得しながらダウンロードする場合）も、セグメント毎に照合できる。
+
+    Usage:
+        journal = SegmentJournal.for_program("~/.recradiko/spool", "TBS", start, end)
+        if journal.has_segment(index, url):
+            data = journal.load_segment(index)
+        else:
+            journal.save_segment(index, data, url)
+        journal.discard()  # 録音成功時
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    JOURNAL_FILE = "journal.log"
+    # スプールの形式（異なる形式のスプールは破棄）
+    FORMAT_VERSION = 2
+
+    def __init__(self, spool_dir: Union[str, Path], segment_urls: Optional[List[str]] = None):
+        """初期化
+
+        Args:
+            spool_dir: この録音専用のスプールディレクトリ
+            segment_urls: セグメントURL一覧（指定時はURLパスが一致しない取得済みセグメントを破棄）
+        """
+        super().__init__()
+        self.spool_dir = Path(spool_dir).expanduser()
+        self._expected_paths = [self._url_path(url) for url in segment_urls] if segment_urls is not None else None
+        # 取得済みセグメント番号 → URLパス（パス不明の記録はNone）
+        self._completed: Dict[int, Optional[str]] = {}
+
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @classmethod
+    def for_program(cls, spool_root: Union[str, Path], station_id: str,
+                    start_time: datetime, end_time: datetime,
+                    segment_urls: Optional[List[str]] = None,
+                    max_age: Optional[timedelta] = None) -> 'SegmentJournal':
+        """番組（放送局ID・ft・to）に対応するジャーナルを開く
+
+        Args:
+            spool_root: スプールのルートディレクトリ
+            station_id: 放送局ID
+            start_time: 開始時刻（ft）
+            end_time: 終了時刻（to）
+            segment_urls: セグメントURL一覧（取得前の場合は省略し、セグメント毎に照合）
+            max_age: 指定時は最終更新からこの期間を過ぎた他の録音のスプールを削除
+
+        Returns:
+            SegmentJournal: 既存の取得状況を読み込んだジャーナル
+        """
+        ft = start_time.strftime('%Y%m%d%H%M%S')
+        to = end_time.strftime('%Y%m%d%H%M%S')
+        journal = cls(Path(spool_root).expanduser() / f"{station_id}_{ft}_{to}", segment_urls)
+        if max_age is not None:
+            journal.purge_stale(max_age)
+        return journal
+
+    def purge_stale(self, max_age: timedelta) -> int:
+        """同じスプールのルート内で最終更新から max_age を過ぎた他の録音のスプールを削除
+
+        マニフェストを持つディレクトリのみを対象とし、ルート直下の
+        それ以外のファイル・ディレクトリには触れない。
+
+        Args:
+            max_age: 保持期間
+
+        Returns:
+            int: 削除したスプール数
+        """
+        cutoff = time.time() - max_age.total_seconds()
+        removed = 0
+        try:
+            candidates = [path for path in self.spool_dir.parent.iterdir()
+                          if path.is_dir() and path != self.spool_dir]
+        except OSError as e:
+            self.logger.warning(f"スプール一覧取得エラー: {e}")
+            return 0
+
+        for spool_dir in candidates:
+            try:
+                if not (spool_dir / self.MANIFEST_FILE).exists():
+                    continue
+                # セグメント保存毎にジャーナル・ディレクトリの更新時刻が進む
+                mtime = spool_dir.stat().st_mtime
+                journal_path = spool_dir / self.JOURNAL_FILE
+                if journal_path.exists():
+                    mtime = max(mtime, journal_path.stat().st_mtime)
+            except OSError:
+                continue
+            if mtime < cutoff:
+                shutil.rmtree(spool_dir, ignore_errors=True)
+                removed += 1
+
+        if removed:
+            self.logger.info(f"古いセグメントスプールを削除: {removed}件")
+        return removed
+
+    @property
+    def completed_count(self) -> int:
+        """取得済みセグメント数"""
+        return len(self._completed)
+
+    def has_segment(self, index: int, url: Optional[str] = None) -> bool:
+        """セグメントが取得済みかどうか
+
+        Args:
+            index: セグメント番号
+            url: セグメントURL（指定時は記録したURLパスと一致する場合のみ取得済みとする）
+        """
+        if index not in self._completed:
+            return False
+        return url is None or self._completed[index] == self._url_path(url)
+
+    def load_segment(self, index: int) -> bytes:
+        """取得済みセグメントを読み込み
+
+        Args:
+            index: セグメント番号
+
+        Returns:
+            bytes: セグメントデータ
+        """
+        return self._segment_path(index).read_bytes()
+
+    def save_segment(self, index: int, data: bytes, url: Optional[str] = None):
+        """セグメントを保存してジャーナルに記録
+
+        セグメントファイルを一時名で書き込んでから置き換え、その後に
+        ジャーナルへ追記するため、中断時にも不完全なセグメントは記録されない。
+        fsync は行わない（中断からの再開に必要なのはプロセス終了への耐性のみ）。
+        異なるセグメント番号であれば複数スレッドから同時に呼び出してよい。
+
+        Args:
+            index: セグメント番号
+            data: セグメントデータ
+            url: セグメントURL（省略時は開く際に渡されたセグメントURL一覧から取得）
+        """
+        if url is not None:
+            url_path = self._url_path(url)
+        elif self._expected_paths is not None and index < len(self._expected_paths):
+            url_path = self._expected_paths[index]
+        else:
+            url_path = None
+
+        segment_path = self._segment_path(index)
+        temp_path = segment_path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, segment_path)
+
+        with open(self.spool_dir / self.JOURNAL_FILE, 'a', encoding='utf-8') as f:
+            f.write(f"{index} {url_path}\n" if url_path else f"{index}\n")
+        self._completed[index] = url_path
+
+    def discard(self):
+        """録音完了後にスプールディレクトリを削除"""
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+        self._completed.clear()
+        self.logger.debug(f"セグメントスプール削除: {self.spool_dir}")
+
+    def _load(self):
+        """マニフェストを照合し、ジャーナルから取得済みセグメントを復元"""
+        manifest_path = self.spool_dir / self.MANIFEST_FILE
+        manifest = {'format': self.FORMAT_VERSION}
+
+        try:
+            if manifest_path.exists():
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    saved_manifest = json.load(f)
+                if saved_manifest != manifest:
+                    self.logger.info("スプールの形式が異なるため、セグメントジャーナルを破棄します")
+                    self._reset()
+            journal_path = self.spool_dir / self.JOURNAL_FILE
+            if journal_path.exists():
+                with open(journal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        index, _, url_path = line.strip().partition(' ')
+                        if index.isdigit() and self._segment_path(int(index)).exists():
+                            self._completed[int(index)] = url_path or None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"セグメントジャーナル読み込みエラー: {e}")
+            self._reset()
+
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+        if self._expected_paths is not None:
+            # プレイリストが変更された場合、URLパスが一致しないセグメントは再取得する
+            mismatched = [index for index, url_path in self._completed.items()
+                          if index >= len(self._expected_paths) or url_path != self._expected_paths[index]]
+            if mismatched:
+                self.logger.info(f"プレイリストが変更されたため、取得済みセグメントを破棄します: {len(mismatched)}件")
+                for index in mismatched:
+                    del self._completed[index]
+
+        if self._completed:
+            self.logger.info(f"セグメントジャーナルから再開: {len(self._completed)}セグメント取得済み")
+
+    def _reset(self):
+        """スプールディレクトリを空にする"""
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._completed.clear()
+
+    def _segment_path(self, index: int) -> Path:
+        """セグメントファイルパス"""
+        return self.spool_dir / f"{index:06d}.seg"
+
+    @staticmethod
+    def _url_path(url: str) -> str:
+        """セグメントの照合に使用するURLパス（セッション毎に変わり得るクエリ部分は除外）"""
+        return urlsplit(url).path
@@ -0,0 +1,133 @@
+"""
+メモリセグメントキャッシュモジュール
+
+ストリーミング中に取得したセグメントをメモリ上に保持します。
+- セグメントURLをキーとする LRU（最終利用順）キャッシュ
+- 合計バイト数の上限（任意でエントリ数の上限）による追い出し
+- ヒット・ミス・追い出し回数の集計
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .utils.base import LoggerMixin
+
+
+class SegmentMemoryCache(LoggerMixin):
+    """バイト数上限付きの LRU セグメントキャッシュ
+
+    取得・保存・追い出しはいずれも O(1)（追い出しは1件あたり）。
+    複数スレッドから利用できる。
+
+    Usage:
+        cache = SegmentMemoryCache(max_bytes=64 * 1024 * 1024)
+        data = cache.get(url)
+        if data is None:
+            data = download(url)
+            cache.put(url, data)
+        print(cache.stats())
+    """
+
+    def __init__(self, max_bytes: int, max_entries: Optional[int] = None):
+        """初期化
+
+        Args:
+            max_bytes: 保持するセグメントの合計バイト数の上限
+            max_entries: 保持するセグメント数の上限（None の場合は無制限）
+        """
+        super().__init__()
+        self.max_bytes = max(0, max_bytes)
+        self.max_entries = max_entries
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
+
+    def __setitem__(self, url: str, data: bytes):
+        self.put(url, data)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """セグメントを取得（最終利用として記録）
+
+        Args:
+            url: セグメントURL
+
+        Returns:
+            Optional[bytes]: セグメントデータ（未保持の場合はNone）
+        """
+        with self._lock:
+            data = self._entries.get(url)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return data
+
+    def put(self, url: str, data: bytes):
+        """セグメントを保存し、上限を超えた分を最終利用が古い順に追い出す
+
+        上限より大きいセグメントは保存しない。
+
+        Args:
+            url: セグメントURL
+            data: セグメントデータ
+        """
+        size = len(data)
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self.total_bytes -= len(previous)
+            if size > self.max_bytes:
+                return
+            self._entries[url] = data
+            self.total_bytes += size
+            self._evict()
+
+    def keys(self) -> List[str]:
+        """保持中のセグメントURL（最終利用が古い順）"""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        """保持中のセグメントを全て削除（集計値は保持）"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュの状態と集計値
+
+        Returns:
+            Dict[str, Any]: エントリ数・合計バイト数・上限・ヒット/ミス/追い出し回数・ヒット率
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _evict(self):
+        """上限以下になるまで最終利用が古いセグメントを削除（呼び出し側でロックを保持）"""
+        while self._entries and (
+                self.total_bytes > self.max_bytes or
+                (self.max_entries is not None and len(self._entries) > self.max_entries)):
+            _, data = self._entries.popitem(last=False)
+            self.total_bytes -= len(data)
+            self.evictions += 1
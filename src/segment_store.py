@@ -0,0 +1,215 @@
+"""
+セグメントストアモジュール
+
+録音間で共有する永続セグメントキャッシュを提供します。
+- セグメントURL（パス部分）のハッシュをキーとするコンテンツアドレス方式の保存
+- 合計バイト数の上限と LRU（最終利用時刻順）による追い出し
+- 別フォーマットでの再録音や隣接番組の境界セグメントの再ダウンロード回避
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Set, Union
+from urllib.parse import urlsplit
+
+from .utils.base import LoggerMixin
+
+
+class SegmentStore(LoggerMixin):
+    """永続セグメントキャッシュ
+
+    ストアディレクトリの構成:
+        ab/abcdef....seg    セグメントデータ（キー先頭2文字で分散）
+
+    最終利用時刻はファイルの更新時刻で管理し、起動時の走査で LRU 順を復元する。
+    スレッド・コルーチンのどちらからも利用できる。ロックは索引の更新中のみ保持し、
+    ファイルの読み書き・削除はロック外で行う（並行ダウンロードをディスクI/Oで直列化しない）。
+
+    Usage:
+        store = SegmentStore("~/.recradiko/segment_cache", max_bytes=512 * 1024 * 1024)
+        data = store.get(url)
+        if data is None:
+            data = download(url)
+            store.put(url, data)
+    """
+
+    SEGMENT_SUFFIX = ".seg"
+
+    def __init__(self, store_dir: Union[str, Path], max_bytes: int):
+        """初期化
+
+        Args:
+            store_dir: ストアディレクトリ
+            max_bytes: 保存するセグメントの合計バイト数の上限
+        """
+        super().__init__()
+        self.store_dir = Path(store_dir).expanduser()
+        self.max_bytes = max(0, max_bytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        # 書き込み中のキー（同じセグメントの重複書き込みを防ぐ）
+        self._writing: Set[str] = set()
+        self._lock = threading.Lock()
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """セグメントURLに対応するキー（セッション毎に変わり得るクエリ部分は除外）
+
+        Args:
+            url: セグメントURL
+
+        Returns:
+            str: キー（SHA-256 16進文字列）
+        """
+        parts = urlsplit(url)
+        return hashlib.sha256(f"{parts.netloc}{parts.path}".encode('utf-8')).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return self.key_for(url) in self._entries
+
+    def get(self, url: str) -> Optional[bytes]:
+        """セグメントを取得
+
+        Args:
+            url: セグメントURL
+
+        Returns:
+            Optional[bytes]: セグメントデータ（未保存の場合はNone）
+        """
+        key = self.key_for(url)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+
+        path = self._path_for(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError as e:
+            # 外部から削除された・読み込み中に追い出された場合は未保存として扱う
+            self.logger.debug(f"セグメントストア読み込み失敗: {e}")
+            with self._lock:
+                size = self._entries.pop(key, None)
+                if size is not None:
+                    self.total_bytes -= size
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, url: str, data: bytes):
+        """セグメントを保存し、上限を超えた分を古い順に追い出す
+
+        一時ファイルに書き込んでから os.replace で置き換えるため、中断時にも
+        不完全なセグメントは残らない。
+
+        Args:
+            url: セグメントURL
+            data: セグメントデータ
+        """
+        size = len(data)
+        if size == 0 or size > self.max_bytes:
+            return
+
+        key = self.key_for(url)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            if key in self._writing:
+                return
+            self._writing.add(key)
+
+        path = self._path_for(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            # 複数プロセスで共有しても衝突しない一時ファイル名
+            temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.logger.warning(f"セグメントストア書き込みエラー: {e}")
+            with self._lock:
+                self._writing.discard(key)
+            return
+
+        with self._lock:
+            self._writing.discard(key)
+            self._entries[key] = size
+            self.total_bytes += size
+            evicted = self._evict()
+        self._remove_files(evicted)
+
+    def clear(self):
+        """保存済みセグメントを全て削除"""
+        with self._lock:
+            shutil.rmtree(self.store_dir, ignore_errors=True)
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            self._entries.clear()
+            self.total_bytes = 0
+        self.logger.info(f"セグメントストアをクリアしました: {self.store_dir}")
+
+    def _evict(self) -> List[str]:
+        """合計バイト数が上限以下になるまで最終利用が古いセグメントを索引から外す（ロック保持中に呼び出す）
+
+        Returns:
+            List[str]: 索引から外したキー（ファイルは呼び出し側がロック外で削除）
+        """
+        evicted = []
+        while self.total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+    def _remove_files(self, keys: List[str]):
+        """追い出したセグメントのファイルを削除"""
+        for key in keys:
+            try:
+                self._path_for(key).unlink()
+            except OSError:
+                pass
+
+    def _load(self):
+        """ストアディレクトリを走査して最終利用時刻順の索引を復元"""
+        entries = []
+        for path in self.store_dir.glob(f"*/*{self.SEGMENT_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self.total_bytes += size
+        self._remove_files(self._evict())
+
+        if self._entries:
+            self.logger.debug(
+                f"セグメントストア読み込み: {len(self._entries)}セグメント "
+                f"({self.total_bytes / 1024 / 1024:.1f}MB)"
+            )
+
+    def _path_for(self, key: str) -> Path:
+        """セグメントファイルパス"""
+        return self.store_dir / key[:2] / f"{key}{self.SEGMENT_SUFFIX}"
@@ -0,0 +1,162 @@
+"""
+セグメント逐次書き込みモジュール
+
+並行ダウンロードで順不同に到着するセグメントを、番号順に出力先へ書き出します。
+- 到着済みセグメントの並べ替えバッファ
+- 先読みウィンドウ・保持バイト数上限によるダウンロード開始の制御（メモリ上限の保証）
+- 書き込み済みバイト数・セグメント数・再生時間の集計
+- 中断時に待機中の全ダウンロードを解放する異常終了処理
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from .utils.base import LoggerMixin
+from .utils.audio_utils import adts_duration
+
+
+class SegmentWriterError(Exception):
+    """セグメントライター中断エラー"""
+    pass
+
+
+class OrderedSegmentWriter(LoggerMixin):
+    """順序保証付きセグメントライター
+
+    ダウンロード完了したセグメントを受け取り、欠番が埋まった時点で
+    出力先へ順番に書き出す。ダウンロード側は ``wait_for_slot`` で
+    先読みウィンドウ内に入るまで待機するため、並べ替えバッファに
+    保持されるセグメント数は常に ``window`` 未満に収まる。
+    ``max_pending_bytes`` 指定時は保持中のバイト数が上限以上の間、
+    次に書き出すセグメント以外のダウンロード開始も待機させる。
+    ``abort`` 後は待機中・以降の ``wait_for_slot`` / ``write`` が
+    ``SegmentWriterError`` を送出する。
+
+    Usage:
+        with open(path, 'wb') as f:
+            writer = OrderedSegmentWriter(f, window=16)
+            await writer.wait_for_slot(index)
+            await writer.write(index, data)
+    """
+
+    def __init__(self, output: Any, window: int, max_pending_bytes: Optional[int] = None):
+        """初期化
+
+        Args:
+            output: 書き込み先（``write`` を持つファイルオブジェクト、
+                または ``drain`` を併せ持つ asyncio.StreamWriter）
+            window: 未書き込みで保持できる最大セグメント数
+            max_pending_bytes: 未書き込みで保持できる合計バイト数の目安（None の場合は無制限）
+        """
+        super().__init__()
+        self.output = output
+        self.window = max(1, window)
+        self.max_pending_bytes = max_pending_bytes
+        self.pending_bytes = 0
+        self.peak_pending_bytes = 0
+        self.next_index = 0
+        self.bytes_written = 0
+        self.segments_written = 0
+        self.duration_seconds = 0.0
+        self.error: Optional[BaseException] = None
+        self._pending: Dict[int, Optional[bytes]] = {}
+        self._condition = asyncio.Condition()
+
+    @property
+    def pending_count(self) -> int:
+        """並べ替えバッファに保持中のセグメント数"""
+        return len(self._pending)
+
+    async def wait_for_slot(self, index: int):
+        """セグメントが先読みウィンドウに入り、保持バイト数が上限未満になるまで待機
+
+        次に書き出すセグメントは欠番を埋めるため常に待機しない。
+
+        Args:
+            index: これからダウンロードするセグメント番号
+            
+        Raises:
+            SegmentWriterError: ライターが中断された場合
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.error is not None or self._has_slot(index))
+            self._raise_if_failed()
+
+    def _has_slot(self, index: int) -> bool:
+        """セグメントのダウンロードを開始できるか"""
+        if index <= self.next_index:
+            return True
+        if index >= self.next_index + self.window:
+            return False
+        return self.max_pending_bytes is None or self.pending_bytes < self.max_pending_bytes
+
+    async def write(self, index: int, data: bytes):
+        """セグメントを登録し、連続する分を出力先へ書き出す
+
+        Args:
+            index: セグメント番号
+            data: セグメントデータ
+            
+        Raises:
+            SegmentWriterError: ライターが中断された場合
+        """
+        async with self._condition:
+            self._raise_if_failed()
+            self._pending[index] = data
+            if data:
+                self.pending_bytes += len(data)
+            await self._flush()
+            self.peak_pending_bytes = max(self.peak_pending_bytes, self.pending_bytes)
+            self._condition.notify_all()
+
+    async def skip(self, index: int):
+        """取得失敗したセグメントを欠番として扱い、後続の書き込みを進める
+
+        Args:
+            index: セグメント番号
+        """
+        await self.write(index, None)
+
+    async def abort(self, error: BaseException):
+        """ライターを中断し、待機中のダウンロードを全て解放する
+
+        既に中断済みの場合は最初のエラーを保持する。
+
+        Args:
+            error: 中断の原因
+        """
+        async with self._condition:
+            if self.error is None:
+                self.error = error
+                self.logger.error(f"セグメント書き込み中断: {error}")
+            self._condition.notify_all()
+
+    def _raise_if_failed(self):
+        """中断済みの場合は SegmentWriterError を送出"""
+        if self.error is not None:
+            raise SegmentWriterError(f"セグメント書き込みは中断されています: {self.error}") from self.error
+
+    async def _flush(self):
+        """連続するセグメントを出力先へ書き出す（ロック取得済みで呼び出す）
+
+        Raises:
+            SegmentWriterError: 出力先への書き込みに失敗した場合（以降ライターは中断状態）
+        """
+        while self.next_index in self._pending:
+            data = self._pending.pop(self.next_index)
+            if data:
+                self.pending_bytes -= len(data)
+                try:
+                    self.output.write(data)
+                    if hasattr(self.output, 'drain'):
+                        await self.output.drain()
+                except OSError as e:
+                    # 出力先の終了（FFmpegの異常終了によるBrokenPipe等）・容量不足
+                    self.error = e
+                    self.logger.error(f"セグメント {self.next_index} 書き込みエラー: {e}")
+                    self._condition.notify_all()
+                    raise SegmentWriterError(f"セグメント {self.next_index} を書き込めません: {e}") from e
+                self.bytes_written += len(data)
+                self.segments_written += 1
+                self.duration_seconds += adts_duration(data)
+            self.next_index += 1
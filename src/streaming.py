@@ -6,26 +6,41 @@
 - M3U8プレイリストの解析
 - TSセグメントのダウンロード
 - 暗号化セグメントの復号
+
+プレイリスト取得・セグメントダウンロードは asyncio（aiohttp）で実行し、TimeFreeRecorder と同じ
+AsyncSessionPool を共有できる。同期APIは非同期版の薄いラッパーで、セッションプールの
+イベントループ（別スレッドで実行中の場合）または同期API用のイベントループで実行する。
 """
 
+import asyncio
+import aiohttp
+import contextlib
+import math
 import m3u8
 import requests
 import threading
-import queue
 import time
 import logging
-import hashlib
-from typing import List, Optional, Dict, Any, Generator, Callable
+from typing import (
+    List, Optional, Dict, Any, Generator, AsyncGenerator, Awaitable, Callable, Sequence, Tuple, TypeVar
+)
+from collections import deque
 from dataclasses import dataclass
 from urllib.parse import urljoin, urlparse
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future
 from pathlib import Path
 import tempfile
 
 from .auth import RadikoAuthenticator, AuthenticationError
 from .utils.base import LoggerMixin
-from .utils.network_utils import create_streaming_session
+from .utils.network_utils import create_streaming_session, AsyncSessionPool
+from .retry_policy import RetryPolicy, RetryBudget
+from .segment_store import SegmentStore
+from .segment_memory_cache import SegmentMemoryCache
+from .bandwidth_limiter import BandwidthLimiter, load_bandwidth_limiter
+
+T = TypeVar('T')
 
 
 @dataclass
@@ -67,25 +82,87 @@ class StreamingManager(LoggerMixin):
     STREAM_URL_API = "https://radiko.jp/v2/api/ts/playlist.m3u8"
     TIMEFREE_URL_API = "https://radiko.jp/v2/api/ts/playlist.m3u8"
     
-    def __init__(self, authenticator: RadikoAuthenticator, max_workers: int = 4):
+    # 並列ダウンロードで未出力のまま保持するセグメントの合計バイト数の既定上限
+    DEFAULT_MAX_INFLIGHT_BYTES = 32 * 1024 * 1024
+    # ヘッジ判定に使用する直近のセグメント取得レイテンシの件数
+    HEDGE_LATENCY_WINDOW = 200
+    # 暗号化キーのキャッシュ有効期間（秒）
+    DEFAULT_KEY_CACHE_TTL = 300.0
+    # メモリセグメントキャッシュの既定の上限（合計バイト数・エントリ数）
+    DEFAULT_MAX_CACHE_BYTES = 64 * 1024 * 1024
+    DEFAULT_MAX_CACHE_ENTRIES = 100
+    
+    def __init__(self, authenticator: RadikoAuthenticator, max_workers: int = 4,
+                 segment_store: Optional[SegmentStore] = None,
+                 max_inflight_bytes: Optional[int] = DEFAULT_MAX_INFLIGHT_BYTES,
+                 bandwidth_limiter: Optional[BandwidthLimiter] = None,
+                 max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+                 session_pool: Optional[AsyncSessionPool] = None,
+                 reorder_window: Optional[int] = None,
+                 config_path: str = "config.json"):
         super().__init__()  # LoggerMixin初期化
         
         self.authenticator = authenticator
         self.max_workers = max_workers
+        # 並列ダウンロード時の未出力セグメントの合計バイト数上限（None の場合は無制限）
+        self.max_inflight_bytes = max_inflight_bytes
+        self.peak_buffered_bytes = 0
+        # 並列ダウンロードで未出力の先頭セグメントから先読みするセグメント数（既定は並列数の4倍）
+        self.reorder_window = reorder_window if reorder_window is not None else max_workers * 4
+        # 録音間で共有する永続セグメントキャッシュ（TimeFreeRecorder.create_streaming_manager で共有）
+        self.segment_store = segment_store
+        # 帯域制限（未指定時は config_path の network セクションから共有の制限を取得）
+        self.bandwidth_limiter = (bandwidth_limiter if bandwidth_limiter is not None
+                                  else load_bandwidth_limiter(config_path))
         
         # セッション設定
         self.session = create_streaming_session()
+        # 非同期ダウンロード用の aiohttp セッションプール（TimeFreeRecorder.session_pool を渡して共有）
+        self._owns_session_pool = session_pool is None
+        self.session_pool = session_pool if session_pool is not None else AsyncSessionPool(connection_limit=max_workers)
+        # 同期API用のイベントループ（初回利用時に起動し、close/close_sync で停止）
+        self._background_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._background_thread: Optional[threading.Thread] = None
+        self._background_lock = threading.Lock()
         
         # セグメントダウンロード用の設定
         self.segment_timeout = 30
         self.retry_count = 3
-        self.buffer_size = 8192
-        self.max_segment_cache = 100
+        # 取得が遅れているセグメントの重複リクエスト（ヘッジ）: レイテンシの p95 を超えた時点で
+        # 同じセグメントをもう1回要求し、先に完了した方を採用する。p95 の算出に必要な件数が
+        # 揃うまでは straggler_timeout 秒を超えた時点で再取得する
+        self.hedge_min_delay = 0.5
+        self.straggler_timeout = 10.0
+        self.hedge_min_samples = 20
+        self.hedged_requests = 0
+        # 受信チャンクサイズ（チャンク毎のPython側の処理回数を抑える）
+        self.buffer_size = 64 * 1024
+        
+        # リトライ方針（録音単位のリトライ予算はダウンロード呼び出し毎に生成）
+        self.retry_policy = RetryPolicy(max_attempts=self.retry_count)
         
+        # メモリセグメントキャッシュ（セグメントURL → 復号済みデータ）
+        self.segment_cache = SegmentMemoryCache(max_cache_bytes, max_entries=self.DEFAULT_MAX_CACHE_ENTRIES)
         
-        # セグメントキャッシュ
-        self.segment_cache: Dict[str, bytes] = {}
-        self.cache_lock = threading.RLock()
+        # 暗号化キーキャッシュ（キーURI → (AESアルゴリズム, 有効期限)）と取得中のキーURI
+        self.key_cache_ttl = self.DEFAULT_KEY_CACHE_TTL
+        self.key_fetch_count = 0
+        self._key_cache: Dict[str, Tuple[Any, float]] = {}
+        self._key_fetches: Dict[str, Future] = {}
+        self.key_cache_lock = threading.Lock()
+    
+    @property
+    def max_segment_cache(self) -> Optional[int]:
+        """メモリセグメントキャッシュのエントリ数上限（None の場合は合計バイト数のみで制限）"""
+        return self.segment_cache.max_entries
+    
+    @max_segment_cache.setter
+    def max_segment_cache(self, max_entries: Optional[int]):
+        self.segment_cache.max_entries = max_entries
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """メモリセグメントキャッシュの状態と集計値（SegmentMemoryCache.stats を参照）"""
+        return self.segment_cache.stats()
     
     def get_stream_url(self, station_id: str, start_time: Optional[datetime] = None,
                       end_time: Optional[datetime] = None) -> str:
@@ -163,81 +240,102 @@ class StreamingManager(LoggerMixin):
             self.logger.error(f"予期しないエラー: {e}")
             raise StreamingError(f"ストリーミングURL取得で予期しないエラー: {e}")
     
+    def _request_headers(self) -> Dict[str, str]:
+        """プレイリスト・セグメント取得用の認証ヘッダー"""
+        auth_info = self.authenticator.get_valid_auth_info()
+        return {
+            'X-Radiko-AuthToken': auth_info.auth_token,
+            'X-Radiko-AreaId': auth_info.area_id,
+            'User-Agent': self.session.headers.get('User-Agent', ''),
+            'Accept': '*/*'
+        }
+    
+    async def _request_headers_async(self) -> Dict[str, str]:
+        """認証ヘッダーを取得（非同期版、トークン再取得の同期通信はイベントループ外で実行）"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._request_headers)
+    
     def parse_playlist(self, playlist_url: str) -> StreamInfo:
-        """M3U8プレイリストを解析"""
+        """M3U8プレイリストを解析（parse_playlist_async の同期ラッパー）"""
+        return self._run_sync(self.parse_playlist_async(playlist_url))
+    
+    async def parse_playlist_async(self, playlist_url: str) -> StreamInfo:
+        """M3U8プレイリストを解析（非同期版、session_pool のセッションで取得）"""
         try:
             self.logger.info(f"プレイリスト解析開始: {playlist_url}")
             
-            # M3U8プレイリストを取得（認証ヘッダー付き）
-            auth_info = self.authenticator.get_valid_auth_info()
-            headers = {
-                'X-Radiko-AuthToken': auth_info.auth_token,
-                'X-Radiko-AreaId': auth_info.area_id,
-                'User-Agent': self.session.headers.get('User-Agent', ''),
-                'Accept': '*/*'
-            }
-            response = self.session.get(playlist_url, headers=headers)
-            response.raise_for_status()
+            session = await self.session_pool.get_session()
+            headers = await self._request_headers_async()
+            async with session.get(playlist_url, headers=headers) as response:
+                response.raise_for_status()
+                text = await response.text()
             
-            # m3u8ライブラリでプレイリストを解析
-            playlist = m3u8.loads(response.text, uri=playlist_url)
+            playlist = m3u8.loads(text, uri=playlist_url)
             
             if not playlist.segments:
-                # マスタープレイリストの場合、適切な品質を選択
-                if playlist.playlists:
-                    # 最高品質のプレイリストを選択
-                    best_playlist = max(playlist.playlists, 
-                                      key=lambda p: p.stream_info.bandwidth if p.stream_info else 0)
-                    playlist_url = urljoin(playlist_url, best_playlist.uri)
-                    
-                    # 再帰的に解析
-                    return self.parse_playlist(playlist_url)
-                else:
-                    raise StreamingError("有効なセグメントが見つかりません")
-            
-            # セグメント情報を抽出
-            segments = []
-            for i, segment in enumerate(playlist.segments):
-                segment_url = urljoin(playlist_url, segment.uri)
-                
-                # 暗号化情報を取得
-                encryption_key = None
-                encryption_iv = None
-                if segment.key and segment.key.uri:
-                    encryption_key = urljoin(playlist_url, segment.key.uri)
-                    encryption_iv = segment.key.iv
-                
-                stream_segment = StreamSegment(
-                    url=segment_url,
-                    duration=segment.duration,
-                    sequence=i,
-                    timestamp=datetime.now(),
-                    encryption_key=encryption_key,
-                    encryption_iv=encryption_iv
-                )
-                segments.append(stream_segment)
-            
-            # ストリーム情報を作成
-            stream_info = StreamInfo(
-                stream_url=playlist_url,
-                station_id=self._extract_station_id(playlist_url),
-                quality="standard",
-                bitrate=playlist.target_duration * 1000 if playlist.target_duration else 48000,
-                codec="aac",
-                segments=segments,
-                is_live=not playlist.is_endlist
-            )
+                return await self.parse_playlist_async(self._select_variant_url(playlist, playlist_url))
             
-            self.logger.info(f"プレイリスト解析完了: {len(segments)}セグメント")
-            return stream_info
+            return self._build_stream_info(playlist, playlist_url)
             
-        except requests.RequestException as e:
+        except StreamingError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             self.logger.error(f"プレイリスト取得エラー: {e}")
             raise StreamingError(f"プレイリストの取得に失敗しました: {e}")
         except Exception as e:
             self.logger.error(f"プレイリスト解析エラー: {e}")
             raise StreamingError(f"プレイリストの解析に失敗しました: {e}")
     
+    def _select_variant_url(self, playlist: m3u8.M3U8, playlist_url: str) -> str:
+        """マスタープレイリストから最高品質のプレイリストURLを選択"""
+        if not playlist.playlists:
+            raise StreamingError("有効なセグメントが見つかりません")
+        best_playlist = max(playlist.playlists,
+                            key=lambda p: p.stream_info.bandwidth if p.stream_info else 0)
+        return urljoin(playlist_url, best_playlist.uri)
+    
+    def _build_stream_info(self, playlist: m3u8.M3U8, playlist_url: str) -> StreamInfo:
+        """メディアプレイリストからストリーム情報を作成"""
+        # セグメント情報を抽出
+        segments = []
+        for i, segment in enumerate(playlist.segments):
+            segment_url = urljoin(playlist_url, segment.uri)
+
+            # 暗号化情報を取得
+            encryption_key = None
+            encryption_iv = None
+            if segment.key and segment.key.uri:
+                encryption_key = urljoin(playlist_url, segment.key.uri)
+                encryption_iv = segment.key.iv
+                if not encryption_iv:
+                    # IV省略時はメディアシーケンス番号を128ビットのビッグエンディアンとして使用
+                    media_sequence = (playlist.media_sequence or 0) + i
+                    encryption_iv = f"0x{media_sequence:032x}"
+
+            stream_segment = StreamSegment(
+                url=segment_url,
+                duration=segment.duration,
+                sequence=i,
+                timestamp=datetime.now(),
+                encryption_key=encryption_key,
+                encryption_iv=encryption_iv
+            )
+            segments.append(stream_segment)
+
+        # ストリーム情報を作成
+        stream_info = StreamInfo(
+            stream_url=playlist_url,
+            station_id=self._extract_station_id(playlist_url),
+            quality="standard",
+            bitrate=playlist.target_duration * 1000 if playlist.target_duration else 48000,
+            codec="aac",
+            segments=segments,
+            is_live=not playlist.is_endlist
+        )
+
+        self.logger.info(f"プレイリスト解析完了: {len(segments)}セグメント")
+        return stream_info
+    
     def _extract_station_id(self, url: str) -> str:
         """URLから放送局IDを抽出"""
         try:
@@ -260,6 +358,7 @@ class StreamingManager(LoggerMixin):
         try:
             total_segments = len(stream_info.segments)
             downloaded_segments = 0
+            retry_budget = self.retry_policy.new_budget(total_segments)
             
             self.logger.info(f"セグメントダウンロード開始: {total_segments}セグメント")
             
@@ -271,7 +370,7 @@ class StreamingManager(LoggerMixin):
                 
                 try:
                     # セグメントデータを取得
-                    segment_data = self._download_single_segment(segment)
+                    segment_data = self._download_single_segment(segment, retry_budget)
                     yield segment_data
                     
                     downloaded_segments += 1
@@ -296,149 +395,402 @@ class StreamingManager(LoggerMixin):
     def download_segments_parallel(self, stream_info: StreamInfo, output_path: str,
                                   progress_callback: Optional[Callable[[int, int], None]] = None,
                                   stop_flag: Optional[threading.Event] = None) -> Generator[bytes, None, None]:
-        """セグメントを並列ダウンロード（順序保証あり）"""
+        """セグメントを並列ダウンロード（順序保証あり、download_segments_async の同期ラッパー）"""
+        yield from self._iterate_async(self.download_segments_async(stream_info, progress_callback, stop_flag))
+    
+    async def download_segments_async(self, stream_info: StreamInfo,
+                                      progress_callback: Optional[Callable[[int, int], None]] = None,
+                                      stop_flag: Optional[Any] = None) -> AsyncGenerator[bytes, None]:
+        """セグメントを並行ダウンロードし、プレイリスト順に返す非同期ジェネレーター
+        
+        未出力の先頭セグメントから reorder_window 件先までを、同時に max_workers 件まで
+        ダウンロードする（スレッドは使用しない）。並べ替えバッファに保持中のバイト数が
+        max_inflight_bytes 以上の間は新たなダウンロードを開始しない。
+        取得が遅れているセグメントは1回だけ重複して要求し、先に完了した方を採用する。
+        取得に失敗したセグメントは欠番として読み飛ばす。
+        
+        Args:
+            stream_info: ストリーム情報
+            progress_callback: 進捗コールバック (出力済みセグメント数, 全セグメント数)
+            stop_flag: 停止要求（threading.Event / asyncio.Event）
+        """
         try:
             total_segments = len(stream_info.segments)
             downloaded_segments = 0
+            # リトライ予算は呼び出し毎に生成（並行するダウンロード間で共有しない）
+            retry_budget = self.retry_policy.new_budget(total_segments)
+            self.hedged_requests = 0
+            session = await self.session_pool.get_session()
+            # 認証ヘッダーは一括で1回だけ取得（各セグメントでトークン確認の同期処理を行わない）
+            headers = await self._request_headers_async()
             
             self.logger.info(f"並列セグメントダウンロード開始: {total_segments}セグメント")
             
-            # 並列ダウンロードとバッファリング
-            segment_buffer = {}
-            next_sequence = 0
+            # 並べ替えバッファ（プレイリスト内の位置をキーとし、取得失敗はNone）
+            segment_buffer: Dict[int, Optional[bytes]] = {}
+            buffered_bytes = 0
+            self.peak_buffered_bytes = 0
+            next_position = 0
+            submitted_count = 0
+            # 実行中のダウンロード（タスク → (位置, 開始時刻)）と位置毎のタスク
+            running: Dict[asyncio.Task, Tuple[int, float]] = {}
+            tasks_by_position: Dict[int, List[asyncio.Task]] = {}
+            # 採用されずキャンセルした重複リクエスト（終了時に完了を待つ）
+            abandoned: List[asyncio.Task] = []
+            hedged_positions = set()
+            latencies: deque = deque(maxlen=self.HEDGE_LATENCY_WINDOW)
+            
+            def start(position: int):
+                task = asyncio.ensure_future(
+                    self._download_single_segment_async(
+                        stream_info.segments[position], session, headers, retry_budget
+                    )
+                )
+                running[task] = (position, time.monotonic())
+                tasks_by_position.setdefault(position, []).append(task)
             
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # 最初のバッチをサブミット
-                future_to_segment = {
-                    executor.submit(self._download_single_segment, segment): segment
-                    for segment in stream_info.segments[:self.max_workers]
-                }
-                
-                submitted_count = min(self.max_workers, total_segments)
-                
-                while future_to_segment:
+            try:
+                while True:
                     if stop_flag and stop_flag.is_set():
                         self.logger.info("並列ダウンロード停止要求を受信")
-                        # 実行中のタスクをキャンセル
-                        for future in future_to_segment.keys():
-                            future.cancel()
                         break
                     
-                    # 完了したタスクを処理
-                    for future in as_completed(future_to_segment, timeout=1.0):
-                        segment = future_to_segment.pop(future)
-                        
+                    # 遅れているセグメントを重複して要求（セグメント毎に1回）
+                    # 重複リクエストも max_workers の枠内で実行し、空いた枠は新規セグメントより優先する
+                    hedge_delay = self._hedge_delay(latencies)
+                    now = time.monotonic()
+                    for task, (position, started_at) in list(running.items()):
+                        if len(running) >= self.max_workers:
+                            break
+                        if position not in hedged_positions and now - started_at >= hedge_delay:
+                            hedged_positions.add(position)
+                            self.hedged_requests += 1
+                            self.logger.info(
+                                f"セグメント {stream_info.segments[position].sequence} 取得遅延 "
+                                f"({now - started_at:.1f}秒): 重複リクエスト"
+                            )
+                            start(position)
+                    
+                    # 先読み範囲内かつ保持バイト数が上限未満の間だけ次のセグメントを開始
+                    # （先頭セグメントは常に開始済みのため停止しない）
+                    while (submitted_count < total_segments and
+                           len(running) < self.max_workers and
+                           submitted_count < next_position + max(1, self.reorder_window) and
+                           (self.max_inflight_bytes is None or buffered_bytes < self.max_inflight_bytes)):
+                        start(submitted_count)
+                        submitted_count += 1
+                    
+                    if not running:
+                        break
+                    
+                    # 完了したダウンロードを処理（次のヘッジ判定・停止要求確認まで待機）
+                    # 枠が埋まっている間は重複リクエストを送れないため、完了まで待つ
+                    wait_timeout = 1.0
+                    if len(running) < self.max_workers:
+                        for task, (position, started_at) in running.items():
+                            if position not in hedged_positions:
+                                wait_timeout = min(wait_timeout, started_at + hedge_delay - now)
+                    done, _ = await asyncio.wait(list(running), timeout=max(wait_timeout, 0.01),
+                                                 return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task not in running:
+                            # 同じ待機で先に処理した重複リクエストが採用済み（キャンセル済み）
+                            continue
+                        position, started_at = running.pop(task)
+                        siblings = tasks_by_position[position]
+                        siblings.remove(task)
                         try:
-                            segment_data = future.result()
-                            segment_buffer[segment.sequence] = segment_data
-                            
-                            # 順序通りにバッファから出力
-                            while next_sequence in segment_buffer:
-                                yield segment_buffer.pop(next_sequence)
-                                downloaded_segments += 1
-                                next_sequence += 1
-                                
-                                # 進捗コールバック
-                                if progress_callback:
-                                    progress_callback(downloaded_segments, total_segments)
-                            
-                            # 次のセグメントをサブミット
-                            if submitted_count < total_segments:
-                                next_segment = stream_info.segments[submitted_count]
-                                new_future = executor.submit(self._download_single_segment, next_segment)
-                                future_to_segment[new_future] = next_segment
-                                submitted_count += 1
-                                
-                        except Exception as e:
-                            self.logger.error(f"セグメント {segment.sequence} 処理エラー: {e}")
+                            segment_data = task.result()
+                        except (asyncio.CancelledError, Exception) as e:
+                            if siblings:
+                                # 重複リクエストの完了を待つ
+                                continue
+                            sequence = stream_info.segments[position].sequence
+                            self.logger.error(f"セグメント {sequence} 処理エラー: {e}")
+                            segment_data = None
+                        else:
+                            latencies.append(time.monotonic() - started_at)
+                            # 先に完了した方を採用し、残りはキャンセル
+                            for sibling in siblings:
+                                sibling.cancel()
+                                running.pop(sibling, None)
+                                abandoned.append(sibling)
+                        del tasks_by_position[position]
+                        segment_buffer[position] = segment_data
+                        if segment_data:
+                            buffered_bytes += len(segment_data)
+                    
+                    # 順序通りにバッファから出力
+                    while next_position in segment_buffer:
+                        segment_data = segment_buffer.pop(next_position)
+                        next_position += 1
+                        if segment_data is None:
                             continue
-            
-            # 残りのバッファを出力
-            while next_sequence in segment_buffer:
-                yield segment_buffer.pop(next_sequence)
-                downloaded_segments += 1
-                next_sequence += 1
-                
-                if progress_callback:
-                    progress_callback(downloaded_segments, total_segments)
-            
-            self.logger.info(f"並列セグメントダウンロード完了: {downloaded_segments}/{total_segments}")
+                        buffered_bytes -= len(segment_data)
+                        yield segment_data
+                        downloaded_segments += 1
+                        
+                        # 進捗コールバック
+                        if progress_callback:
+                            progress_callback(downloaded_segments, total_segments)
+                    
+                    # 欠番待ちで保持しているバイト数の最大値
+                    self.peak_buffered_bytes = max(self.peak_buffered_bytes, buffered_bytes)
+            finally:
+                # 停止・中断時は実行中のダウンロードをキャンセル
+                pending = list(running) + abandoned
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+            
+            self.logger.info(
+                f"並列セグメントダウンロード完了: {downloaded_segments}/{total_segments} "
+                f"(未出力最大 {self.peak_buffered_bytes / 1024 / 1024:.1f}MB, "
+                f"重複リクエスト {self.hedged_requests}件)"
+            )
             
         except Exception as e:
             self.logger.error(f"並列セグメントダウンロードエラー: {e}")
             raise StreamingError(f"並列セグメントダウンロードに失敗しました: {e}")
     
-    def _download_single_segment(self, segment: StreamSegment) -> bytes:
-        """単一セグメントをダウンロード"""
-        # キャッシュをチェック
-        cache_key = hashlib.md5(segment.url.encode()).hexdigest()
+    def _hedge_delay(self, latencies: Sequence[float]) -> float:
+        """重複リクエストを送るまでの経過秒数
         
-        with self.cache_lock:
-            if cache_key in self.segment_cache:
-                self.logger.debug(f"セグメントキャッシュヒット: {segment.sequence}")
-                return self.segment_cache[cache_key]
+        Args:
+            latencies: 直近のセグメント取得レイテンシ（秒）
+            
+        Returns:
+            float: レイテンシの p95（下限 hedge_min_delay）。件数が足りない場合は straggler_timeout
+        """
+        if len(latencies) < self.hedge_min_samples:
+            return self.straggler_timeout
+        ordered = sorted(latencies)
+        p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+        return max(p95, self.hedge_min_delay)
+    
+    def _iterate_async(self, generator: AsyncGenerator[T, None]) -> Generator[T, None, None]:
+        """非同期ジェネレーターを同期的に返す（要素毎に _run_sync と同じイベントループで取得）
+        
+        利用側が次の要素を要求するまで非同期ジェネレーターは yield で停止したままのため、
+        未出力データは非同期ジェネレーター側の並べ替えバッファで制限される。
+        利用側がジェネレーターを閉じた場合は実行中のダウンロードをキャンセルする。
+        
+        Args:
+            generator: 非同期ジェネレーター
+        """
+        loop = self._sync_loop()
+        finished = object()
+        
+        async def next_item():
+            try:
+                return await generator.__anext__()
+            except StopAsyncIteration:
+                return finished
+        
+        try:
+            while True:
+                item = self._run_sync(next_item(), loop)
+                if item is finished:
+                    return
+                yield item
+        finally:
+            self._run_sync(generator.aclose(), loop)
+    
+    def _run_sync(self, coro: Awaitable[T], loop: Optional[asyncio.AbstractEventLoop] = None) -> T:
+        """コルーチンを実行して結果を返す（同期APIの共通実行部）
+        
+        Args:
+            coro: 実行するコルーチン
+            loop: 実行するイベントループ（未指定時は _sync_loop）
+        """
+        try:
+            future = asyncio.run_coroutine_threadsafe(coro, loop or self._sync_loop())
+        except BaseException:
+            coro.close()
+            raise
+        try:
+            return future.result()
+        except BaseException:
+            # 利用側の中断（KeyboardInterrupt等）では実行中の処理をキャンセル
+            future.cancel()
+            raise
+    
+    def _sync_loop(self) -> asyncio.AbstractEventLoop:
+        """同期APIを実行するイベントループ
+        
+        セッションプールのセッションを生成したループが別スレッドで実行中であれば、
+        そのループで実行して接続を共有する（TimeFreeRecorder 等とプールを共有する場合）。
+        それ以外は同期API用のループを1つだけ起動して使い回す（呼び出し毎に
+        スレッド・ループ・セッションを作り直さない）。
+        
+        Raises:
+            StreamingError: セッションプールのループ内から同期APIが呼ばれた場合
+        """
+        pool_loop = self.session_pool.loop
+        if pool_loop is not None and pool_loop.is_running():
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+            if pool_loop is running_loop:
+                raise StreamingError("イベントループ内では非同期版（*_async）のAPIを使用してください")
+            return pool_loop
+        
+        with self._background_lock:
+            if self._background_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="streaming-sync-loop", daemon=True)
+                thread.start()
+                self._background_loop, self._background_thread = loop, thread
+            return self._background_loop
+    
+    def _stop_background_loop(self):
+        """同期API用のイベントループを停止（そのループで生成されたセッションはクローズ）"""
+        with self._background_lock:
+            loop, thread = self._background_loop, self._background_thread
+            self._background_loop = self._background_thread = None
+        if loop is None:
+            return
+        
+        if self.session_pool.loop is loop:
+            # 共有プールでも停止するループに紐付くセッションは使用できなくなるためクローズ
+            asyncio.run_coroutine_threadsafe(self.session_pool.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+    
+    def _download_single_segment(self, segment: StreamSegment,
+                                 retry_budget: Optional[RetryBudget] = None) -> bytes:
+        """単一セグメントをダウンロード（_download_single_segment_async の同期ラッパー）"""
+        async def download() -> bytes:
+            session = await self.session_pool.get_session()
+            headers = await self._request_headers_async()
+            return await self._download_single_segment_async(segment, session, headers, retry_budget)
+        
+        return self._run_sync(download())
+    
+    async def _download_single_segment_async(self, segment: StreamSegment,
+                                             session: aiohttp.ClientSession,
+                                             headers: Dict[str, str],
+                                             retry_budget: Optional[RetryBudget] = None) -> bytes:
+        """単一セグメントをダウンロード（非同期版、キャッシュ確認・リトライを含む）
         
-        # ダウンロードを試行
+        Args:
+            segment: セグメント
+            session: 使用するHTTPセッション
+            headers: 一括ダウンロードの開始時に取得した認証ヘッダー
+            retry_budget: 呼び出し元のダウンロードで共有するリトライ予算（None の場合は無制限）
+        """
+        data = self.segment_cache.get(segment.url)
+        if data is not None:
+            self.logger.debug(f"セグメントキャッシュヒット: {segment.sequence}")
+            return data
+        
+        loop = asyncio.get_running_loop()
+        if self.segment_store is not None:
+            # ハッシュ計算・ファイル読み込みはイベントループ外で実行
+            data = await loop.run_in_executor(None, self.segment_store.get, segment.url)
+            if data is not None:
+                self.logger.debug(f"セグメントストアヒット: {segment.sequence}")
+                self.segment_cache.put(segment.url, data)
+                return data
+        
+        timeout = aiohttp.ClientTimeout(total=self.segment_timeout)
         for attempt in range(self.retry_count):
+            retry_after = None
             try:
-                # 認証ヘッダーを追加
-                auth_info = self.authenticator.get_valid_auth_info()
-                headers = {
-                    'X-Radiko-AuthToken': auth_info.auth_token,
-                    'X-Radiko-AreaId': auth_info.area_id,
-                    'User-Agent': self.session.headers.get('User-Agent', ''),
-                    'Accept': '*/*'
-                }
+                async with session.get(segment.url, headers=headers, timeout=timeout) as response:
+                    status = response.status
+                    if status == 200:
+                        data = await self._read_segment_body(response)
+                    else:
+                        retry_after = self.retry_policy.parse_retry_after(response.headers)
                 
-                response = self.session.get(
-                    segment.url,
-                    headers=headers,
-                    timeout=self.segment_timeout,
-                    stream=True
-                )
-                response.raise_for_status()
-                
-                # データを読み取り
-                data = b''
-                for chunk in response.iter_content(chunk_size=self.buffer_size):
-                    data += chunk
-                
-                # 暗号化されている場合は復号化
-                if segment.encryption_key:
-                    data = self._decrypt_segment(data, segment.encryption_key, segment.encryption_iv)
-                
-                # キャッシュに保存（サイズ制限あり）
-                with self.cache_lock:
-                    if len(self.segment_cache) < self.max_segment_cache:
-                        self.segment_cache[cache_key] = data
-                    elif cache_key not in self.segment_cache:
-                        # 古いエントリを削除して新しいものを追加
-                        oldest_key = next(iter(self.segment_cache))
-                        del self.segment_cache[oldest_key]
-                        self.segment_cache[cache_key] = data
-                
-                return data
+                if status == 200:
+                    # 暗号化されている場合は復号化（キー取得・復号はイベントループ外で実行）
+                    if segment.encryption_key:
+                        data = await loop.run_in_executor(
+                            None, self._decrypt_segment, data, segment.encryption_key, segment.encryption_iv
+                        )
+                    
+                    self.segment_cache.put(segment.url, data)
+                    if self.segment_store is not None:
+                        await loop.run_in_executor(None, self.segment_store.put, segment.url, data)
+                    return data
                 
+                error = cause = f"HTTP {status}"
+                retryable = self.retry_policy.classify_status(status) == RetryPolicy.RETRY
             except Exception as e:
-                if attempt == self.retry_count - 1:
-                    raise StreamingError(f"セグメント {segment.sequence} のダウンロードに失敗: {e}")
-                
-                self.logger.warning(
-                    f"セグメント {segment.sequence} ダウンロード再試行 "
-                    f"({attempt + 1}/{self.retry_count}): {e}"
-                )
-                time.sleep(1)  # リトライ前に待機
+                error = e
+                cause = "タイムアウト" if isinstance(e, asyncio.TimeoutError) else type(e).__name__
+                retryable = self.retry_policy.is_retryable_exception(e)
+            
+            if (attempt == self.retry_count - 1 or not retryable or
+                    (retry_budget and not retry_budget.try_acquire(cause))):
+                raise StreamingError(f"セグメント {segment.sequence} のダウンロードに失敗: {error}")
+            
+            delay = self.retry_policy.backoff_delay(attempt, retry_after)
+            self.logger.warning(
+                f"セグメント {segment.sequence} ダウンロード再試行 "
+                f"({attempt + 1}/{self.retry_count}): {cause}, {delay:.1f}秒後"
+            )
+            await asyncio.sleep(delay)
+    
+    async def _read_segment_body(self, response: aiohttp.ClientResponse) -> bytes:
+        """レスポンス本文を読み取り
+        
+        Content-Length が分かる場合は本文サイズの bytearray を確保して受信チャンクを
+        順に書き込み、そのバッファを返す（連結・bytes 化による再コピーをしない）。
+        Content-Length が無い・圧縮転送の場合はチャンクを一覧に集めて最後に1回だけ連結する。
+        受信したチャンク毎に帯域制限を適用する。
+        返した本文はセグメントキャッシュと共有するため、呼び出し側で変更しないこと。
+        
+        Args:
+            response: 応答ヘッダー受信済みのレスポンス
+            
+        Returns:
+            bytes: 本文（Content-Length から確保した場合は bytearray）
+            
+        Raises:
+            aiohttp.ClientPayloadError: 本文の長さが Content-Length と一致しない場合（再試行対象）
+        """
+        content_length = response.headers.get('Content-Length')
+        expected = int(content_length) if isinstance(content_length, str) and content_length.isdigit() else None
+        if expected is not None and response.headers.get('Content-Encoding', 'identity') != 'identity':
+            # 圧縮転送の Content-Length は展開後のサイズではない
+            expected = None
+        
+        buffer = bytearray(expected) if expected else None
+        chunks: List[bytes] = []
+        position = 0
+        with memoryview(buffer) if buffer is not None else contextlib.nullcontext() as view:
+            async for chunk in response.content.iter_chunked(self.buffer_size):
+                size = len(chunk)
+                if view is not None:
+                    if position + size > expected:
+                        raise aiohttp.ClientPayloadError(
+                            f"本文が Content-Length より長い: {position + size}/{expected}バイト"
+                        )
+                    view[position:position + size] = chunk
+                else:
+                    chunks.append(chunk)
+                position += size
+                if self.bandwidth_limiter is not None:
+                    await self.bandwidth_limiter.throttle_async(size)
+        
+        if expected is not None and position != expected:
+            raise aiohttp.ClientPayloadError(f"本文が Content-Length より短い: {position}/{expected}バイト")
+        return buffer if buffer is not None else b''.join(chunks)
     
     def _decrypt_segment(self, data: bytes, key_uri: str, iv: Optional[str]) -> bytes:
         """セグメントを復号化"""
         try:
-            # 暗号化キーを取得
-            key_response = self.session.get(key_uri, timeout=10)
-            key_response.raise_for_status()
-            key = key_response.content
+            # 暗号化キーを取得（同じキーURIのセグメント間で共有）
+            algorithm = self._get_decryption_algorithm(key_uri)
             
             # AES復号化
-            from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+            from cryptography.hazmat.primitives.ciphers import Cipher, modes
             from cryptography.hazmat.backends import default_backend
             
             # IVを処理
@@ -448,12 +800,12 @@ class StreamingManager(LoggerMixin):
                 else:
                     iv_bytes = bytes.fromhex(iv)
             else:
-                # デフォルトIV（シーケンス番号ベース）
+                # IV不明（parse_playlist はメディアシーケンス番号からIVを設定済み）
                 iv_bytes = b'\x00' * 16
             
             # 復号化
             cipher = Cipher(
-                algorithms.AES(key),
+                algorithm,
                 modes.CBC(iv_bytes),
                 backend=default_backend()
             )
@@ -474,14 +826,73 @@ class StreamingManager(LoggerMixin):
             # 復号化に失敗した場合は元のデータを返す
             return data
     
+    def _get_decryption_algorithm(self, key_uri: str) -> Any:
+        """キーURIに対応するAESアルゴリズム（キー）を取得
+        
+        有効期限内のキーはキャッシュから返す。同じキーURIを複数スレッドが同時に
+        要求した場合は1回だけ取得し、他のスレッドはその結果を待つ。
+        取得に失敗したキーはキャッシュしない。
+        
+        Args:
+            key_uri: 暗号化キーのURI
+            
+        Returns:
+            algorithms.AES: 復号に使用するAESアルゴリズム
+        """
+        with self.key_cache_lock:
+            cached = self._key_cache.get(key_uri)
+            if cached is not None and cached[1] > time.monotonic():
+                return cached[0]
+            pending = self._key_fetches.get(key_uri)
+            fetching = pending is None
+            if fetching:
+                pending = Future()
+                self._key_fetches[key_uri] = pending
+        
+        if not fetching:
+            return pending.result()
+        
+        try:
+            from cryptography.hazmat.primitives.ciphers import algorithms
+            
+            key_response = self.session.get(key_uri, timeout=10)
+            key_response.raise_for_status()
+            algorithm = algorithms.AES(key_response.content)
+            
+            now = time.monotonic()
+            with self.key_cache_lock:
+                self.key_fetch_count += 1
+                # 期限切れのキー（キーローテーション後の旧キー）を削除
+                for expired_uri in [uri for uri, (_, expires) in self._key_cache.items() if expires <= now]:
+                    del self._key_cache[expired_uri]
+                self._key_cache[key_uri] = (algorithm, now + self.key_cache_ttl)
+            pending.set_result(algorithm)
+            return algorithm
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self.key_cache_lock:
+                self._key_fetches.pop(key_uri, None)
     
+    async def close(self):
+        """同期API用のイベントループを停止し、セッションをクローズ（共有されたセッションプールは所有者がクローズ）"""
+        if self._background_loop is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._stop_background_loop)
+        if self._owns_session_pool:
+            await self.session_pool.close()
     
-    
+    def close_sync(self):
+        """同期コンテキストから同期API用のイベントループを停止し、セッションをクローズ"""
+        self._stop_background_loop()
+        if self._owns_session_pool:
+            self.session_pool.close_sync()
     
     def clear_cache(self):
         """セグメントキャッシュをクリア"""
-        with self.cache_lock:
-            self.segment_cache.clear()
+        self.segment_cache.clear()
+        with self.key_cache_lock:
+            self._key_cache.clear()
         self.logger.info("セグメントキャッシュをクリアしました")
 
 
@@ -504,10 +915,11 @@ if __name__ == "__main__":
     
     try:
         from .auth import RadikoAuthenticator
+        from .timefree_recorder import TimeFreeRecorder
         
-        # ストリーミングテスト
+        # ストリーミングテスト（録音と同じセグメントストアを共有）
         authenticator = RadikoAuthenticator()
-        streaming_manager = StreamingManager(authenticator)
+        streaming_manager = TimeFreeRecorder(authenticator).create_streaming_manager()
         
         station_id = "TBS"  # テスト用放送局
         
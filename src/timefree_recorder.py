@@ -10,19 +10,44 @@
 import asyncio
 import time
 import os
+import shutil
 import tempfile
 import subprocess
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple, Any
-import aiohttp
+from typing import List, Optional, Dict, Tuple, Any, AsyncGenerator, Awaitable, Callable, Set
+from urllib.parse import urlsplit
 import sys
 # import aiofiles  # 必要に応じて後で追加
-from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 
 from .auth import RadikoAuthenticator, AuthenticationError
 from .utils.base import LoggerMixin
 from .utils.config_utils import ConfigManager
+from .utils.network_utils import AsyncSessionPool
+from .utils.audio_utils import adts_duration, adts_file_duration, adts_file_segments, iter_audio_frames
+from .segment_writer import OrderedSegmentWriter, SegmentWriterError
+from .segment_journal import SegmentJournal
+from .segment_store import SegmentStore
+from .streaming import StreamingManager
+from .concurrency_controller import AdaptiveConcurrencyController, ConcurrencyAdjustment
+from .retry_policy import RetryPolicy
+from .bandwidth_limiter import BandwidthLimiter, shared_bandwidth_limiter
+from .recording_metrics import RecordingMetrics, JsonLinesMetricsSink, PrometheusTextfileSink
+from .chunked_transcode import TranscodeChunk, output_frame_size, plan_transcode_chunks
+
+
+# 永続セグメントキャッシュの既定保存先
+DEFAULT_SEGMENT_CACHE_DIR = '~/.recradiko/segment_cache'
+# 録音再開用スプールの既定保存先
+DEFAULT_SPOOL_DIR = '~/.recradiko/spool'
+
+# 再エンコードせずAACをそのまま格納する出力形式（audio.format → 拡張子）
+STREAM_COPY_FORMATS = {
+    'aac_copy': '.aac',  # ADTS
+    'm4a': '.m4a',       # MP4（faststart）
+}
 
 
 @dataclass
@@ -35,6 +60,37 @@ class RecordingResult:
     total_segments: int
     failed_segments: int
     error_messages: List[str]
+    # セグメント並行数（録音終了時点）と録音中の変更履歴
+    segment_concurrency: int = 0
+    concurrency_adjustments: List[ConcurrencyAdjustment] = field(default_factory=list)
+    # プレイリスト取得・セグメント取得・変換の計測値
+    metrics: Optional[RecordingMetrics] = None
+
+
+@dataclass
+class _RecordingJob:
+    """録音1件分の処理状態（ダウンロード段から変換段へ受け渡す）"""
+    program_info: 'ProgramInfo'
+    output_path: str
+    recording_start: float = 0.0
+    segment_urls: List[str] = field(default_factory=list)
+    # 未取得の時間窓のセグメントURL（ダウンロード中に segment_urls へ追加される）
+    segment_windows: Optional[AsyncGenerator[List[str], None]] = None
+    journal: Optional[SegmentJournal] = None
+    temp_ts_path: Optional[str] = None
+    segment_concurrency: int = 0
+    concurrency_adjustments: List[ConcurrencyAdjustment] = field(default_factory=list)
+    metrics: RecordingMetrics = field(default_factory=RecordingMetrics)
+    
+    def record_concurrency(self, controller: AdaptiveConcurrencyController, adjustments_start: int):
+        """この録音の実行中に適用されたセグメント並行数を記録"""
+        self.segment_concurrency = controller.limit
+        self.concurrency_adjustments = controller.adjustments[adjustments_start:]
+    
+    async def close_segment_windows(self):
+        """未取得の時間窓のプレイリスト取得を打ち切る（取得済み・未開始の場合は何もしない）"""
+        if self.segment_windows is not None:
+            await self.segment_windows.aclose()
 
 
 class TimeFreeError(Exception):
@@ -66,11 +122,86 @@ class FileConversionError(TimeFreeError):
     pass
 
 
+class _TimeFreeToken:
+    """ダウンロード中の全ワーカーで共有するタイムフリー認証トークン
+    
+    長時間の録音中にトークンが失効した場合、401/403 を受けた各ワーカーが
+    個別に再認証しないよう、トークンの再取得を1回にまとめる（single-flight）。
+    """
+    
+    # トークン失効を示すステータスコード
+    AUTH_ERROR_STATUSES = frozenset({401, 403})
+    
+    def __init__(self, authenticator: RadikoAuthenticator, token: str, build_headers):
+        """初期化
+        
+        Args:
+            authenticator: 認証器
+            token: 現在のタイムフリー認証トークン
+            build_headers: トークンからリクエストヘッダーを生成する関数
+        """
+        self.authenticator = authenticator
+        self.token = token
+        self.headers = build_headers(token)
+        # 再取得の度に増える世代番号（リクエスト時の世代と比較して再取得済みか判定）
+        self.generation = 0
+        # 受け付けられたことのある最新の世代番号（失効と無効なトークンの区別に使用）
+        self.accepted_generation = -1
+        self.refresh_count = 0
+        self._build_headers = build_headers
+        self._lock = asyncio.Lock()
+    
+    def mark_accepted(self, generation: int):
+        """リクエストが受け付けられた世代番号を記録"""
+        self.accepted_generation = max(self.accepted_generation, generation)
+    
+    def was_accepted(self, generation: int) -> bool:
+        """世代番号のトークンが受け付けられた後に失効したか（再取得直後に拒否されたトークンはFalse）"""
+        return generation <= self.accepted_generation
+    
+    async def refresh(self, stale_generation: int) -> Dict[str, str]:
+        """失効したトークンを再取得（既に他のワーカーが再取得済みの場合はそれを使用）
+        
+        Args:
+            stale_generation: 認証エラーとなったリクエスト時の世代番号
+            
+        Returns:
+            Dict[str, str]: 新しいトークンのリクエストヘッダー
+            
+        Raises:
+            TimeFreeAuthError: 再認証に失敗した場合
+        """
+        async with self._lock:
+            if self.generation != stale_generation:
+                return self.headers
+            
+            loop = asyncio.get_running_loop()
+            try:
+                # 同時実行中の別の録音が再取得済みであればそのトークンを使用
+                token = await loop.run_in_executor(None, self.authenticator.authenticate_timefree)
+                if token == self.token:
+                    token = await loop.run_in_executor(
+                        None, lambda: self.authenticator.authenticate_timefree(force_refresh=True)
+                    )
+            except Exception as e:
+                raise TimeFreeAuthError(f"タイムフリー再認証に失敗しました: {e}")
+            if not token:
+                raise TimeFreeAuthError("タイムフリー再認証に失敗しました")
+            
+            self.token = token
+            self.headers = self._build_headers(token)
+            self.generation += 1
+            self.refresh_count += 1
+            return self.headers
+
+
 class TimeFreeRecorder(LoggerMixin):
     """タイムフリー専用録音クラス"""
     
     # Radiko タイムフリーAPI
     TIMEFREE_URL_API = "https://radiko.jp/v2/api/ts/playlist.m3u8"
+    # プレイリスト中の chunklist・セグメントURLとして扱うスキーム（HTTPSのみ）
+    PLAYLIST_URL_SCHEMES = ('https://',)
     
     def __init__(self, authenticator: RadikoAuthenticator, config_path: str = "config.json"):
         super().__init__()  # LoggerMixin初期化
@@ -81,6 +212,74 @@ class TimeFreeRecorder(LoggerMixin):
         self.chunk_size = 8192
         # Phase 8拡張: 設定管理追加
         self.config_manager = ConfigManager(config_path)
+        
+        config = self.config_manager.load_config({})
+        recording_config = config.get('recording', {})
+        # 録音・番組表取得で共有する帯域制限（network セクション未設定時は無制限）
+        self.bandwidth_limiter: Optional[BandwidthLimiter] = shared_bandwidth_limiter(config.get('network', {}))
+        # セグメント並行数の適応制御（max_workers を初期値として AIMD で増減）
+        self.adaptive_concurrency = recording_config.get('adaptive_concurrency', True)
+        self.min_concurrency = recording_config.get('min_concurrency', 2)
+        self.max_concurrency = recording_config.get('max_concurrency', 32)
+        self.latency_tolerance = recording_config.get('latency_tolerance', 2.0)
+        
+        # セグメント取得のリトライ方針（指数バックオフ・録音単位のリトライ予算）
+        self.retry_policy = RetryPolicy(
+            max_attempts=self.retry_attempts,
+            base_delay=recording_config.get('retry_base_delay', 0.5),
+            max_delay=recording_config.get('retry_max_delay', 30.0),
+            budget_ratio=recording_config.get('retry_budget_ratio', 0.1)
+        )
+        
+        # セグメント逐次書き込み設定（メモリ使用量を並行数で制限）
+        self.streaming_write = recording_config.get('streaming_write', True)
+        self.write_window = recording_config.get('write_window', self._concurrency_ceiling() * 2)
+        # 未書き込みで保持するセグメントの合計バイト数の上限（先頭セグメントの停滞時の保護）
+        self.max_inflight_bytes = int(recording_config.get('max_inflight_mb', 32) * 1024 * 1024)
+        # ダウンロードと同時にFFmpegへパイプ入力するモード
+        self.pipeline_conversion = recording_config.get('pipeline_conversion', False)
+        # 番組メタデータを変換時にFFmpegで書き込む（無効時は変換後にmutagenで書き込み）
+        self.tag_during_transcode = recording_config.get('tag_during_transcode', True)
+        # 中断した録音を取得済みセグメントから再開するためのスプール
+        self.resume_enabled = recording_config.get('resume_enabled', True)
+        self.spool_dir = recording_config.get('spool_dir', DEFAULT_SPOOL_DIR)
+        # 再試行されないまま残ったスプールの保持日数（ジャーナルを開く際に削除）
+        self.spool_max_age_days = recording_config.get('spool_max_age_days', 7)
+        # 録音間で共有する永続セグメントキャッシュ（既定は無効、有効時は別フォーマットでの再録音を通信なしで実行）
+        self.segment_store = self._open_segment_store(recording_config)
+        # 長時間番組のプレイリストを時間窓に分割して並行取得する設定
+        self.playlist_slice_threshold_minutes = recording_config.get('playlist_slice_threshold_minutes', 120)
+        self.playlist_slice_minutes = recording_config.get('playlist_slice_minutes', 60)
+        # 一括録音時の同時録音数
+        self.max_concurrent_recordings = recording_config.get('max_concurrent_recordings', 4)
+        # 一括録音時に番組Nの変換と番組N+1のダウンロードを重ねる設定
+        self.overlap_transcode = recording_config.get('overlap_transcode', True)
+        self.transcode_workers = recording_config.get('transcode_workers', os.cpu_count() or 1)
+        self.transcode_queue_size = recording_config.get('transcode_queue_size', self.transcode_workers)
+        # 長時間番組の変換をセグメント境界で分割し、複数のFFmpegで並列実行する設定
+        self.chunked_transcode = recording_config.get('chunked_transcode', False)
+        self.chunked_transcode_min_minutes = recording_config.get('chunked_transcode_min_minutes', 30)
+        self.chunked_transcode_workers = recording_config.get('chunked_transcode_workers', os.cpu_count() or 1)
+        # 変換段・分割変換の全FFmpegで共有する同時実行数の上限（transcode_workers、イベントループ毎に生成）
+        self._transcode_semaphore: Optional[asyncio.Semaphore] = None
+        self._transcode_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        # 録音毎の計測値の出力先（JSON Lines・Prometheus textfile、未設定時は結果にのみ格納）
+        self.metrics_sinks = self._open_metrics_sinks(recording_config)
+        
+        # ダウンロード時に算出した一時TSファイルの再生時間（変換プログレス表示用）
+        self._media_durations: Dict[str, float] = {}
+        
+        # 同時実行中の全録音で共有するセグメント並行数コントローラー
+        self._segment_controller: Optional[AdaptiveConcurrencyController] = None
+        self._segment_controller_users = 0
+        
+        # プレイリスト取得・セグメントダウンロード・全録音で共有するHTTPセッション
+        self.session_pool = AsyncSessionPool(
+            connection_limit=recording_config.get('connection_limit', self._concurrency_ceiling()),
+            dns_cache_ttl=recording_config.get('dns_cache_ttl', 300),
+            keepalive_timeout=recording_config.get('keepalive_timeout', 30),
+            timeout=self.segment_timeout
+        )
     
     async def record_program(self, program_info: 'ProgramInfo', 
                            output_path: str) -> RecordingResult:
@@ -98,79 +297,139 @@ class TimeFreeRecorder(LoggerMixin):
             SegmentDownloadError: セグメントダウンロードエラー
             FileConversionError: ファイル変換エラー
         """
+        job = _RecordingJob(program_info, output_path)
         try:
-            self.logger.info(f"タイムフリー録音開始: {program_info.title} ({program_info.station_id})")
-            recording_start = time.time()
-            
-            # タイムフリー利用可能性確認
-            if not program_info.is_timefree_available:
-                raise TimeFreeError("この番組はタイムフリーで利用できません")
-            
-            # プレイリストURL生成
-            playlist_url = self._generate_timefree_url(
-                program_info.station_id,
-                program_info.start_time,
-                program_info.end_time
-            )
-            
-            # セグメントURL一覧取得
-            segment_urls = await self._fetch_playlist(playlist_url)
-            
-            if not segment_urls:
-                raise PlaylistFetchError("セグメントURLが取得できませんでした")
+            await self._prepare_recording(job)
+            
+            async with self._shared_segment_budget() as controller:
+                adjustments_start = len(controller.adjustments)
+                if self.pipeline_conversion:
+                    # ダウンロードと並行してFFmpegへ直接パイプ入力
+                    await self._download_and_convert_pipelined(
+                        job.segment_urls, output_path, program_info, job.journal, metrics=job.metrics,
+                        segment_windows=job.segment_windows
+                    )
+                else:
+                    # 一時TSファイル経由でダウンロード後に変換
+                    await self._download_and_convert_via_file(
+                        job.segment_urls, output_path, program_info, job.journal, metrics=job.metrics,
+                        segment_windows=job.segment_windows
+                    )
+                job.record_concurrency(controller, adjustments_start)
             
-            self.logger.info(f"セグメント数: {len(segment_urls)}")
+            return self._complete_recording(job)
             
-            # セグメントを並行ダウンロード
-            segments_data = await self._download_segments_concurrent(segment_urls)
+        except Exception as e:
+            await job.close_segment_windows()
+            return self._failed_recording(job, e)
+    
+    async def _prepare_recording(self, job: '_RecordingJob'):
+        """録音開始処理（利用可能性確認・セグメントURL取得・再開用ジャーナル準備）
+        
+        Args:
+            job: 録音ジョブ
+        """
+        program_info = job.program_info
+        self.logger.info(f"タイムフリー録音開始: {program_info.title} ({program_info.station_id})")
+        job.recording_start = time.time()
+        job.metrics.program_id = program_info.program_id
+        job.metrics.station_id = program_info.station_id
+        job.metrics.start()
+        
+        # タイムフリー利用可能性確認
+        if not program_info.is_timefree_available:
+            raise TimeFreeError("この番組はタイムフリーで利用できません")
+        
+        # セグメントURL取得（長時間番組は時間窓に分割して並行取得し、残りの窓はダウンロード中に追加）
+        playlist_start = time.monotonic()
+        job.segment_windows = self._iter_segment_windows(
+            program_info.station_id,
+            program_info.start_time,
+            program_info.end_time
+        )
+        async for window_urls in job.segment_windows:
+            job.segment_urls.extend(window_urls)
+            if job.segment_urls:
+                break
+        # ダウンロードを開始できるまでの時間（先頭の時間窓の取得時間）
+        job.metrics.playlist_seconds = time.monotonic() - playlist_start
+        
+        if not job.segment_urls:
+            raise PlaylistFetchError("セグメントURLが取得できませんでした")
+        
+        self.logger.info(f"セグメント数: {len(job.segment_urls)}")
+        
+        # 前回中断分の取得済みセグメントを再利用（URLパスはセグメント毎に照合）
+        job.journal = self._open_journal(program_info)
+    
+    def _complete_recording(self, job: '_RecordingJob') -> RecordingResult:
+        """録音完了処理（メタデータ埋め込み・スプール削除・結果生成）
+        
+        Args:
+            job: 変換まで完了した録音ジョブ
             
-            # 一時TSファイルに結合
-            temp_ts_path = None
-            try:
-                with tempfile.NamedTemporaryFile(suffix='.ts', delete=False) as temp_file:
-                    temp_ts_path = temp_file.name
-                    self._combine_ts_segments(segments_data, temp_ts_path)
-                
-                # 音声フォーマット変換とメタデータ埋め込み
-                await self._convert_to_target_format(temp_ts_path, output_path, program_info)
-                
-                # メタデータ埋め込み
-                self._embed_metadata(output_path, program_info)
-                
-            finally:
-                # 一時ファイルクリーンアップ
-                if temp_ts_path and os.path.exists(temp_ts_path):
-                    os.unlink(temp_ts_path)
-            
-            # 録音結果生成
-            recording_duration = time.time() - recording_start
-            file_size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
-            
-            self.logger.info(f"タイムフリー録音完了: {output_path} ({file_size / 1024 / 1024:.1f}MB)")
-            
-            return RecordingResult(
-                success=True,
-                output_path=output_path,
-                file_size_bytes=file_size,
-                recording_duration_seconds=recording_duration,
-                total_segments=len(segment_urls),
-                failed_segments=0,
-                error_messages=[]
-            )
+        Returns:
+            RecordingResult: 録音結果
+        """
+        output_path = job.output_path
+        
+        # メタデータ埋め込み（変換時に書き込み済みの場合は不要）
+        if not self.tag_during_transcode:
+            self._embed_metadata(output_path, job.program_info)
+        
+        # 録音完了したためスプールを削除
+        if job.journal:
+            job.journal.discard()
+        
+        # 録音結果生成
+        recording_duration = time.time() - job.recording_start
+        file_size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+        
+        self.logger.info(
+            f"タイムフリー録音完了: {output_path} ({file_size / 1024 / 1024:.1f}MB, "
+            f"セグメント並行数: {job.segment_concurrency}, 並行数変更: {len(job.concurrency_adjustments)}回)"
+        )
+        job.metrics.success = True
+        self._emit_metrics(job.metrics)
+        
+        return RecordingResult(
+            success=True,
+            output_path=output_path,
+            file_size_bytes=file_size,
+            recording_duration_seconds=recording_duration,
+            total_segments=len(job.segment_urls),
+            failed_segments=0,
+            error_messages=[],
+            segment_concurrency=job.segment_concurrency,
+            concurrency_adjustments=job.concurrency_adjustments,
+            metrics=job.metrics
+        )
+    
+    def _failed_recording(self, job: '_RecordingJob', error: Exception) -> RecordingResult:
+        """録音失敗時の結果生成
+        
+        Args:
+            job: 録音ジョブ
+            error: 発生したエラー
             
-        except Exception as e:
-            error_msg = f"タイムフリー録音エラー: {e}"
-            self.logger.error(error_msg)
-            
-            return RecordingResult(
-                success=False,
-                output_path=output_path,
-                file_size_bytes=0,
-                recording_duration_seconds=time.time() - recording_start if 'recording_start' in locals() else 0,
-                total_segments=len(segment_urls) if 'segment_urls' in locals() else 0,
-                failed_segments=len(segment_urls) if 'segment_urls' in locals() else 0,
-                error_messages=[error_msg]
-            )
+        Returns:
+            RecordingResult: 失敗結果
+        """
+        error_msg = f"タイムフリー録音エラー: {error}"
+        self.logger.error(error_msg)
+        job.metrics.success = False
+        self._emit_metrics(job.metrics)
+        
+        return RecordingResult(
+            success=False,
+            output_path=job.output_path,
+            file_size_bytes=0,
+            recording_duration_seconds=time.time() - job.recording_start if job.recording_start else 0,
+            total_segments=len(job.segment_urls),
+            failed_segments=len(job.segment_urls),
+            error_messages=[error_msg],
+            metrics=job.metrics
+        )
     
     async def record_by_datetime(self, station_id: str, start_time: datetime, 
                                end_time: datetime, output_path: str) -> RecordingResult:
@@ -200,6 +459,252 @@ class TimeFreeRecorder(LoggerMixin):
         
         return await self.record_program(program_info, output_path)
     
+    async def record_programs(self, programs: List['ProgramInfo'], output_dir: str,
+                              max_concurrent_recordings: Optional[int] = None) -> List[RecordingResult]:
+        """複数番組を1つのイベントループで一括タイムフリー録音
+        
+        Args:
+            programs: 録音対象番組情報一覧
+            output_dir: 出力ディレクトリ
+            max_concurrent_recordings: 同時に実行する録音数（省略時は設定値）
+            
+        Returns:
+            List[RecordingResult]: 番組順の録音結果一覧
+            
+        Note:
+            全録音で1つのHTTPセッション（コネクタ）とセグメント並行数コントローラーを
+            共有するため、録音数に関わらず同時リクエスト数は適応制御された並行数以下に保たれる。
+        """
+        output_paths = self._generate_batch_output_paths(programs, output_dir)
+        limit = max_concurrent_recordings or self.max_concurrent_recordings
+        recording_semaphore = asyncio.Semaphore(max(1, limit))
+        
+        self.logger.info(f"一括録音開始: {len(programs)}番組 (同時録音数: {limit}, セグメント初期並行数: {self.max_workers})")
+        
+        async def record_one(program_info: 'ProgramInfo', output_path: str) -> RecordingResult:
+            async with recording_semaphore:
+                return await self.record_program(program_info, output_path)
+        
+        async with self._shared_segment_budget():
+            if self.overlap_transcode and not self.pipeline_conversion:
+                results = await self._record_programs_overlapped(programs, output_paths, recording_semaphore)
+            else:
+                results = await asyncio.gather(
+                    *(record_one(program, path) for program, path in zip(programs, output_paths))
+                )
+        
+        succeeded = sum(1 for result in results if result.success)
+        self.logger.info(f"一括録音完了: 成功 {succeeded}/{len(programs)}")
+        return list(results)
+    
+    async def _record_programs_overlapped(self, programs: List['ProgramInfo'], output_paths: List[str],
+                                          download_semaphore: asyncio.Semaphore) -> List[RecordingResult]:
+        """ダウンロード段と変換段を分離した2段パイプラインで一括録音
+        
+        ダウンロード段（ネットワーク律速）が一時TSファイルを作成して有界キューへ渡し、
+        CPU数分の変換ワーカー（FFmpeg・CPU律速）がキューから取り出して変換する。
+        番組Nの変換中に番組N+1のダウンロードが進むため、一括録音の所要時間は
+        ダウンロード時間と変換時間の和ではなく最大値に近づく。
+        
+        Args:
+            programs: 録音対象番組情報一覧
+            output_paths: 出力ファイルパス一覧
+            download_semaphore: 同時ダウンロード数の制限
+            
+        Returns:
+            List[RecordingResult]: 番組順の録音結果一覧
+        """
+        worker_count = max(1, self.transcode_workers)
+        transcode_queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.transcode_queue_size))
+        results: List[Optional[RecordingResult]] = [None] * len(programs)
+        
+        self.logger.info(f"変換オーバーラップ有効: 変換ワーカー {worker_count}, 変換待ちキュー {transcode_queue.maxsize}")
+        
+        async def download_stage(index: int, job: _RecordingJob):
+            async with download_semaphore:
+                try:
+                    await self._prepare_recording(job)
+                    async with self._shared_segment_budget() as controller:
+                        adjustments_start = len(controller.adjustments)
+                        job.temp_ts_path = await self._download_to_temp_file(
+                            job.segment_urls, job.journal, metrics=job.metrics,
+                            segment_windows=job.segment_windows
+                        )
+                        job.record_concurrency(controller, adjustments_start)
+                except Exception as e:
+                    await job.close_segment_windows()
+                    results[index] = self._failed_recording(job, e)
+                    return
+                
+                # 変換待ちキューが満杯の間はダウンロード枠を保持したまま待機（バックプレッシャー）
+                await transcode_queue.put((index, job))
+        
+        async def transcode_worker():
+            while True:
+                index, job = await transcode_queue.get()
+                try:
+                    transcode_start = time.monotonic()
+                    await self._convert_to_target_format(job.temp_ts_path, job.output_path, job.program_info)
+                    job.metrics.transcode_seconds = time.monotonic() - transcode_start
+                    results[index] = self._complete_recording(job)
+                except Exception as e:
+                    results[index] = self._failed_recording(job, e)
+                finally:
+                    self._remove_temp_file(job.temp_ts_path)
+                    transcode_queue.task_done()
+        
+        workers = [asyncio.create_task(transcode_worker()) for _ in range(worker_count)]
+        try:
+            await asyncio.gather(*(
+                download_stage(index, _RecordingJob(program, path))
+                for index, (program, path) in enumerate(zip(programs, output_paths))
+            ))
+            await transcode_queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        return results
+    
+    def _generate_batch_output_paths(self, programs: List['ProgramInfo'], output_dir: str) -> List[str]:
+        """一括録音用の出力パスを生成（同名ファイルは開始時刻で区別）
+        
+        Args:
+            programs: 録音対象番組情報一覧
+            output_dir: 出力ディレクトリ
+            
+        Returns:
+            List[str]: 出力ファイルパス一覧
+        """
+        extension = self.get_output_extension()
+        directory = Path(output_dir).expanduser()
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        output_paths = []
+        used_names = set()
+        for program in programs:
+            filename = program.to_filename(extension.lstrip('.'))
+            if filename in used_names:
+                stem, suffix = os.path.splitext(filename)
+                filename = f"{stem}_{program.start_time.strftime('%H%M')}{suffix}"
+            used_names.add(filename)
+            output_paths.append(str(directory / filename))
+        return output_paths
+    
+    def get_output_extension(self) -> str:
+        """audio.format 設定に対応する出力ファイル拡張子
+        
+        Returns:
+            str: 拡張子（例: ".mp3", ストリームコピー形式 "aac_copy" は ".aac"）
+        """
+        config = self.config_manager.load_config({})
+        audio_format = config.get('audio', {}).get('format', 'mp3')
+        return STREAM_COPY_FORMATS.get(audio_format, f".{audio_format}")
+    
+    @asynccontextmanager
+    async def _shared_segment_budget(self):
+        """同時実行中の全録音で共有するセグメント並行数コントローラーを用意
+        
+        既に実行中の録音があればそのコントローラーを共有し、
+        最後の利用者の終了時に解放する。
+        """
+        if self._segment_controller is None:
+            self._segment_controller = self._create_concurrency_controller()
+        self._segment_controller_users += 1
+        try:
+            yield self._segment_controller
+        finally:
+            self._segment_controller_users -= 1
+            if self._segment_controller_users == 0:
+                self._segment_controller = None
+    
+    def _transcode_slots(self) -> asyncio.Semaphore:
+        """全FFmpeg変換プロセスで共有する同時実行数の制限を取得
+        
+        変換ワーカーと分割変換のチャンクがそれぞれ並列にFFmpegを起動しても、
+        同時に実行するプロセス数は transcode_workers を超えない。
+        """
+        loop = asyncio.get_running_loop()
+        if self._transcode_semaphore is None or self._transcode_semaphore_loop is not loop:
+            self._transcode_semaphore = asyncio.Semaphore(max(1, self.transcode_workers))
+            self._transcode_semaphore_loop = loop
+        return self._transcode_semaphore
+    
+    def _create_concurrency_controller(self) -> AdaptiveConcurrencyController:
+        """設定に基づくセグメント並行数コントローラーを生成"""
+        if not self.adaptive_concurrency:
+            # 適応制御無効時は max_workers で固定
+            return AdaptiveConcurrencyController(self.max_workers, self.max_workers, self.max_workers)
+        return AdaptiveConcurrencyController(
+            initial_limit=self.max_workers,
+            min_limit=self.min_concurrency,
+            max_limit=self.max_concurrency,
+            latency_tolerance=self.latency_tolerance
+        )
+    
+    def _concurrency_ceiling(self) -> int:
+        """セグメント並行数の上限"""
+        if not self.adaptive_concurrency:
+            return self.max_workers
+        return max(self.max_workers, self.max_concurrency)
+    
+    async def close(self):
+        """共有HTTPセッションをクローズ（asyncio.run 等でループを終了する前に呼び出す）"""
+        await self.session_pool.close()
+    
+    def close_sync(self):
+        """同期コンテキストから共有HTTPセッションをクローズ（ループを使い続ける場合）"""
+        self.session_pool.close_sync()
+    
+    def create_streaming_manager(self, **kwargs) -> StreamingManager:
+        """録音と同じ永続セグメントストア・帯域制限・セッションプールを使用する StreamingManager を生成
+        
+        Args:
+            **kwargs: StreamingManager のその他の引数
+            
+        Returns:
+            StreamingManager: 録音と資源を共有するストリーミングマネージャー
+        """
+        return StreamingManager(
+            self.authenticator,
+            segment_store=self.segment_store,
+            bandwidth_limiter=self.bandwidth_limiter,
+            session_pool=self.session_pool,
+            config_path=str(self.config_manager.config_path),
+            **kwargs
+        )
+    
+    async def __aenter__(self) -> 'TimeFreeRecorder':
+        """非同期コンテキストマネージャー開始"""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """非同期コンテキストマネージャー終了（ループ内で共有HTTPセッションをクローズ）"""
+        await self.close()
+    
+    def _build_request_headers(self, timefree_token: str) -> Dict[str, str]:
+        """タイムフリーAPI用リクエストヘッダーを生成（2025年Radiko仕様）
+        
+        Args:
+            timefree_token: タイムフリー認証トークン
+            
+        Returns:
+            Dict[str, str]: リクエストヘッダー
+        """
+        return {
+            'User-Agent': 'curl/7.56.1',
+            'Accept': '*/*',
+            'Accept-Language': 'ja,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+            'X-Radiko-App': 'pc_html5',
+            'X-Radiko-App-Version': '0.0.1',
+            'X-Radiko-User': 'dummy_user',
+            'X-Radiko-Device': 'pc',
+            'X-Radiko-AuthToken': timefree_token
+        }
+    
     def _generate_timefree_url(self, station_id: str, start_time: datetime, 
                              end_time: datetime) -> str:
         """タイムフリーM3U8 URL生成
@@ -223,7 +728,7 @@ class TimeFreeRecorder(LoggerMixin):
             ft = start_time.strftime('%Y%m%d%H%M%S')
             to = corrected_end_time.strftime('%Y%m%d%H%M%S')
             
-            playlist_url = f"https://radiko.jp/v2/api/ts/playlist.m3u8?station_id={station_id}&ft={ft}&to={to}"
+            playlist_url = f"{self.TIMEFREE_URL_API}?station_id={station_id}&ft={ft}&to={to}"
             
             self.logger.debug(f"タイムフリーURL生成: {playlist_url}")
             return playlist_url
@@ -233,6 +738,104 @@ class TimeFreeRecorder(LoggerMixin):
         except Exception as e:
             raise TimeFreeError(f"URL生成エラー: {e}")
     
+    async def _fetch_segment_urls(self, station_id: str, start_time: datetime,
+                                  end_time: datetime) -> List[str]:
+        """番組のセグメントURL一覧取得（全時間窓の取得完了まで待機）
+        
+        Args:
+            station_id: 放送局ID
+            start_time: 開始時刻
+            end_time: 終了時刻
+            
+        Returns:
+            List[str]: 番組全体のセグメントURL一覧（時系列順）
+        """
+        segment_urls = []
+        async for window_urls in self._iter_segment_windows(station_id, start_time, end_time):
+            segment_urls.extend(window_urls)
+        return segment_urls
+    
+    async def _iter_segment_windows(self, station_id: str, start_time: datetime,
+                                    end_time: datetime) -> AsyncGenerator[List[str], None]:
+        """番組のセグメントURLを時間窓毎に時系列順で返す非同期ジェネレーター
+        
+        閾値を超える長時間番組は ft/to を時間窓に分割したプレイリストを全て並行して
+        取得開始し、先頭の窓から順に取得でき次第返す（窓の境界で重複するセグメントは除外）。
+        後続の窓の取得完了を待たずに、先頭の窓のセグメントのダウンロードを開始できる。
+        ジェネレーターを途中で閉じた場合は取得中のプレイリストをキャンセルする。
+        
+        Args:
+            station_id: 放送局ID
+            start_time: 開始時刻
+            end_time: 終了時刻
+            
+        Yields:
+            List[str]: 時間窓のセグメントURL一覧（前の窓までと重複するセグメントを除く）
+        """
+        windows = self._split_time_windows(start_time, end_time)
+        if len(windows) == 1:
+            yield await self._fetch_playlist(self._generate_timefree_url(station_id, start_time, end_time))
+            return
+        
+        self.logger.info(f"プレイリスト分割取得: {len(windows)}区間 ({self.playlist_slice_minutes}分毎)")
+        fetches = [
+            asyncio.ensure_future(
+                self._fetch_playlist(self._generate_timefree_url(station_id, window_start, window_end))
+            )
+            for window_start, window_end in windows
+        ]
+        seen_paths = set()
+        total = 0
+        duplicates = 0
+        try:
+            for fetch in fetches:
+                window_urls = []
+                for url in await fetch:
+                    # セッション毎に変わり得るクエリ部分は比較対象外
+                    path = urlsplit(url).path
+                    if path in seen_paths:
+                        duplicates += 1
+                        continue
+                    seen_paths.add(path)
+                    window_urls.append(url)
+                total += len(window_urls)
+                yield window_urls
+        finally:
+            for fetch in fetches:
+                fetch.cancel()
+            await asyncio.gather(*fetches, return_exceptions=True)
+        
+        if duplicates:
+            self.logger.debug(f"時間窓境界の重複セグメント除外: {duplicates}件")
+        self.logger.info(f"プレイリスト連結完了: {total}セグメント ({len(windows)}区間)")
+    
+    def _split_time_windows(self, start_time: datetime,
+                            end_time: datetime) -> List[Tuple[datetime, datetime]]:
+        """録音区間をプレイリスト取得用の時間窓に分割
+        
+        Args:
+            start_time: 開始時刻
+            end_time: 終了時刻（開始時刻以前の場合は翌日として扱う）
+            
+        Returns:
+            List[Tuple[datetime, datetime]]: (窓開始, 窓終了) 一覧
+        """
+        if end_time <= start_time:
+            end_time = end_time + timedelta(days=1)
+        
+        threshold = timedelta(minutes=self.playlist_slice_threshold_minutes)
+        slice_length = timedelta(minutes=self.playlist_slice_minutes)
+        if slice_length <= timedelta(0) or end_time - start_time <= threshold:
+            return [(start_time, end_time)]
+        
+        windows = []
+        window_start = start_time
+        while window_start < end_time:
+            window_end = min(window_start + slice_length, end_time)
+            windows.append((window_start, window_end))
+            window_start = window_end
+        return windows
+    
     async def _fetch_playlist(self, playlist_url: str) -> List[str]:
         """M3U8プレイリストからセグメントURL一覧取得
         
@@ -252,84 +855,107 @@ class TimeFreeRecorder(LoggerMixin):
                 raise PlaylistFetchError("タイムフリー認証に失敗しました")
             
             # 2025年Radiko仕様に合わせたヘッダー設定
-            headers = {
-                'User-Agent': 'curl/7.56.1',
-                'Accept': '*/*',
-                'Accept-Language': 'ja,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'X-Radiko-App': 'pc_html5',
-                'X-Radiko-App-Version': '0.0.1',
-                'X-Radiko-User': 'dummy_user',
-                'X-Radiko-Device': 'pc',
-                'X-Radiko-AuthToken': timefree_token
-            }
-            
-            async with aiohttp.ClientSession(headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as session:
-                async with session.get(playlist_url) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        self.logger.error(f"プレイリスト取得エラー詳細: URL={playlist_url}")
-                        self.logger.error(f"ステータス: {response.status}, レスポンス: {error_text}")
-                        self.logger.error(f"リクエストヘッダー: {headers}")
-                        raise PlaylistFetchError(f"プレイリスト取得失敗: HTTP {response.status}")
-                    
-                    playlist_content = await response.text()
-                    self.logger.debug(f"プレイリスト内容: {playlist_content[:500]}...")
-                    
-                    # Radikoの2段階プレイリスト対応
-                    # 1段目: playlist.m3u8 (ストリーム情報)
-                    # 2段目: chunklist.m3u8 (実際のセグメント)
-                    
-                    # chunklistのURLを抽出
-                    chunklist_url = None
-                    for line in playlist_content.strip().split('\n'):
-                        if line.startswith('https://') and 'chunklist' in line:
-                            chunklist_url = line.strip()
-                            break
-                    
-                    if not chunklist_url:
-                        raise PlaylistFetchError("chunklistURLが見つかりません")
+            headers = self._build_request_headers(timefree_token)
+            
+            session = await self.session_pool.get_session()
+            async with session.get(playlist_url, headers=headers) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    self.logger.error(f"プレイリスト取得エラー詳細: URL={playlist_url}")
+                    self.logger.error(f"ステータス: {response.status}, レスポンス: {error_text}")
+                    self.logger.error(f"リクエストヘッダー: {headers}")
+                    raise PlaylistFetchError(f"プレイリスト取得失敗: HTTP {response.status}")
+                
+                playlist_content = await response.text()
+                self.logger.debug(f"プレイリスト内容: {playlist_content[:500]}...")
+                
+                # Radikoの2段階プレイリスト対応
+                # 1段目: playlist.m3u8 (ストリーム情報)
+                # 2段目: chunklist.m3u8 (実際のセグメント)
+                
+                # chunklistのURLを抽出
+                chunklist_url = None
+                for line in playlist_content.strip().split('\n'):
+                    if line.startswith(self.PLAYLIST_URL_SCHEMES) and 'chunklist' in line:
+                        chunklist_url = line.strip()
+                        break
+                
+                if not chunklist_url:
+                    raise PlaylistFetchError("chunklistURLが見つかりません")
+                
+                self.logger.debug(f"chunklist URL: {chunklist_url}")
+                
+                # chunklistを取得
+                async with session.get(chunklist_url, headers=headers) as chunklist_response:
+                    if chunklist_response.status != 200:
+                        error_text = await chunklist_response.text()
+                        raise PlaylistFetchError(f"chunklist取得失敗: HTTP {chunklist_response.status}")
                     
-                    self.logger.debug(f"chunklist URL: {chunklist_url}")
+                    chunklist_content = await chunklist_response.text()
+                    self.logger.debug(f"chunklist内容: {chunklist_content[:500]}...")
                     
-                    # chunklistを取得
-                    async with session.get(chunklist_url) as chunklist_response:
-                        if chunklist_response.status != 200:
-                            error_text = await chunklist_response.text()
-                            raise PlaylistFetchError(f"chunklist取得失敗: HTTP {chunklist_response.status}")
-                        
-                        chunklist_content = await chunklist_response.text()
-                        self.logger.debug(f"chunklist内容: {chunklist_content[:500]}...")
-                        
-                        # セグメントURL抽出
-                        segment_urls = []
-                        for line in chunklist_content.strip().split('\n'):
-                            if line.startswith('https://') and '.aac' in line:
-                                segment_urls.append(line.strip())
-                        
-                        self.logger.info(f"プレイリスト解析完了: {len(segment_urls)}セグメント")
-                        return segment_urls
+                    # セグメントURL抽出
+                    segment_urls = []
+                    for line in chunklist_content.strip().split('\n'):
+                        if line.startswith(self.PLAYLIST_URL_SCHEMES) and '.aac' in line:
+                            segment_urls.append(line.strip())
                     
+                    self.logger.info(f"プレイリスト解析完了: {len(segment_urls)}セグメント")
+                    return segment_urls
+                
         except Exception as e:
             raise PlaylistFetchError(f"プレイリスト取得エラー: {e}")
     
-    async def _download_segments_concurrent(self, segment_urls: List[str]) -> List[bytes]:
+    async def _read_segment_body(self, response) -> bytes:
+        """セグメントの応答本文を受信
+        
+        帯域制限の設定時は受信チャンク毎に帯域を消費し、制限を超える間はソケットからの
+        読み込み自体を待機させる（本文の受信後にまとめて待機すると短時間の帯域が上限を超える）。
+        
+        Args:
+            response: aiohttp の応答
+            
+        Returns:
+            bytes: 応答本文
+        """
+        if self.bandwidth_limiter is None:
+            return await response.read()
+        
+        chunks = []
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            await self.bandwidth_limiter.throttle_async(len(chunk))
+            chunks.append(chunk)
+        return b''.join(chunks)
+    
+    async def _download_segments_concurrent(self, segment_urls: List[str],
+                                          writer: Optional[OrderedSegmentWriter] = None,
+                                          journal: Optional[SegmentJournal] = None,
+                                          metrics: Optional[RecordingMetrics] = None,
+                                          segment_windows: Optional[AsyncGenerator[List[str], None]] = None
+                                          ) -> List[bytes]:
         """セグメントの並行ダウンロード
         
         Args:
             segment_urls: セグメントURL一覧
+            writer: 順序保証付きライター（指定時は到着順に書き出し、メモリに保持しない）
+            journal: 録音再開用ジャーナル（取得済みセグメントはスプールから読み込み）
+            metrics: 録音の計測値（セグメント毎のレイテンシ・受信量・リトライ回数を記録）
+            segment_windows: 未取得の時間窓のセグメントURL（指定時は segment_urls のダウンロードを
+                開始した後、取得でき次第 segment_urls に追加してダウンロードする。終了時に閉じる）
             
         Returns:
-            List[bytes]: ダウンロードされたセグメントデータ
+            List[bytes]: ダウンロードされたセグメントデータ（writer指定時は空リスト）
             
         Performance:
-            - 8並行ダウンロード
-            - セグメント毎のリトライ処理
+            - AIMDによる並行数の適応制御（初期値 max_workers、429/5xx/タイムアウトで減少）
+            - フルジッター付き指数バックオフ・Retry-After対応のリトライ（録音単位の予算付き）
             - プログレスバー表示
+            - writer指定時の保持データは先読みウィンドウ・max_inflight_bytes で制限
+            - journal指定時は未取得セグメントのみダウンロード
+            - segment_windows指定時は後続の時間窓のプレイリスト取得を待たずにダウンロード開始
         """
         try:
-            segment_data = [None] * len(segment_urls)
+            segment_data: Dict[int, Optional[bytes]] = {}
             failed_segments = []
             
             # タイムフリー認証ヘッダー準備
@@ -337,18 +963,8 @@ class TimeFreeRecorder(LoggerMixin):
             if not timefree_token:
                 raise SegmentDownloadError("タイムフリー認証に失敗しました")
             
-            headers = {
-                'User-Agent': 'curl/7.56.1',
-                'Accept': '*/*',
-                'Accept-Language': 'ja,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'X-Radiko-App': 'pc_html5',
-                'X-Radiko-App-Version': '0.0.1',
-                'X-Radiko-User': 'dummy_user',
-                'X-Radiko-Device': 'pc',
-                'X-Radiko-AuthToken': timefree_token
-            }
+            # 録音中のトークン失効時は全ワーカーで1回だけ再取得
+            auth_token = _TimeFreeToken(self.authenticator, timefree_token, self._build_request_headers)
             
             # プログレスバー表示用
             try:
@@ -357,53 +973,175 @@ class TimeFreeRecorder(LoggerMixin):
             except ImportError:
                 progress_bar = None
             
-            async with aiohttp.ClientSession(
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=self.segment_timeout),
-                connector=aiohttp.TCPConnector(limit=self.max_workers)
-            ) as session:
+            session = await self.session_pool.get_session()
+            loop = asyncio.get_running_loop()
+            
+            # 録音全体で消費できるリトライ回数
+            retry_budget = self.retry_policy.new_budget(len(segment_urls))
+            
+            async def download_single_segment(index: int, url: str) -> Tuple[int, Optional[bytes]]:
+                """単一セグメントのダウンロード"""
+                if journal and journal.has_segment(index, url):
+                    # 前回取得済みのセグメントはスプールから読み込み（ファイル読み込みはイベントループ外で実行）
+                    data = await loop.run_in_executor(None, journal.load_segment, index)
+                    if progress_bar:
+                        progress_bar.update(1)
+                    if metrics:
+                        metrics.record_reused_segment()
+                    return index, data
                 
-                # セマフォで並行数制御
-                semaphore = asyncio.Semaphore(self.max_workers)
+                if self.segment_store is not None:
+                    # ハッシュ計算・ファイル読み込みはイベントループ外で実行
+                    cached = await loop.run_in_executor(None, self.segment_store.get, url)
+                    if cached is not None:
+                        # 過去の録音で取得済みのセグメントはストアから読み込み
+                        if progress_bar:
+                            progress_bar.update(1)
+                        if metrics:
+                            metrics.record_reused_segment()
+                        return index, cached
                 
-                async def download_single_segment(index: int, url: str) -> Tuple[int, Optional[bytes]]:
-                    """単一セグメントのダウンロード"""
-                    async with semaphore:
-                        for attempt in range(self.retry_attempts):
+                last_error = None
+                auth_refreshed = False
+                attempt = 0
+                while True:
+                    retry_after = None
+                    status = None
+                    try:
+                        async with controller.slot() as slot:
+                            # 枠の待機中の再取得に備え、送信するトークンの世代をここで記録
+                            request_generation = auth_token.generation
                             try:
-                                async with session.get(url) as response:
+                                async with session.get(url, headers=auth_token.headers) as response:
                                     if response.status == 200:
-                                        data = await response.read()
+                                        data = await self._read_segment_body(response)
+                                        controller.record_success(slot)
+                                        auth_token.mark_accepted(request_generation)
+                                        if metrics:
+                                            metrics.record_segment(len(data), slot.elapsed)
+                                        if journal:
+                                            await loop.run_in_executor(None, journal.save_segment, index, data, url)
+                                        if self.segment_store is not None:
+                                            await loop.run_in_executor(None, self.segment_store.put, url, data)
                                         if progress_bar:
                                             progress_bar.update(1)
                                         return index, data
+                                    
+                                    status = response.status
+                                    retry_after = self.retry_policy.parse_retry_after(response.headers)
+                                    if status == 429 or status >= 500:
+                                        controller.record_congestion(slot, f"HTTP {status}")
                                     else:
-                                        self.logger.warning(f"セグメント {index} HTTP {response.status}")
-                                        
-                            except Exception as e:
-                                if attempt == self.retry_attempts - 1:
-                                    self.logger.error(f"セグメント {index} ダウンロード失敗: {e}")
-                                    failed_segments.append(index)
-                                    if progress_bar:
-                                        progress_bar.update(1)
-                                    return index, None
-                                else:
-                                    await asyncio.sleep(1)  # リトライ前の待機
+                                        controller.record_error(slot)
+                            except asyncio.TimeoutError:
+                                controller.record_congestion(slot, "タイムアウト")
+                                raise
+                            except Exception:
+                                controller.record_error(slot)
+                                raise
+                        
+                        last_error = cause = f"HTTP {status}"
+                        retryable = self.retry_policy.classify_status(status) == RetryPolicy.RETRY
+                    except Exception as e:
+                        last_error = e
+                        cause = "タイムアウト" if isinstance(e, asyncio.TimeoutError) else type(e).__name__
+                        retryable = self.retry_policy.is_retryable_exception(e)
                     
-                    return index, None
-                
-                # 並行ダウンロード実行
-                tasks = [download_single_segment(i, url) for i, url in enumerate(segment_urls)]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+                    if status in _TimeFreeToken.AUTH_ERROR_STATUSES and (
+                            not auth_refreshed or auth_token.was_accepted(request_generation)):
+                        # トークン失効: 再取得後に再試行（試行回数・リトライ予算は消費しない）
+                        # 再取得済みでも、再試行中にそのトークンが受け付けられた後で失効した場合は再度再取得
+                        auth_refreshed = True
+                        try:
+                            await auth_token.refresh(request_generation)
+                        except TimeFreeAuthError as e:
+                            last_error = e
+                            break
+                        self.logger.warning(f"セグメント {index} 認証エラー ({cause}): トークン再取得後に再試行")
+                        continue
+                    
+                    if not retryable or not self.retry_policy.should_retry(attempt, retry_budget, cause):
+                        break
+                    delay = self.retry_policy.backoff_delay(attempt, retry_after)
+                    self.logger.warning(
+                        f"セグメント {index} 再試行 ({attempt + 1}/{self.retry_policy.max_attempts}): "
+                        f"{cause}, {delay:.1f}秒後"
+                    )
+                    await asyncio.sleep(delay)
+                    attempt += 1
                 
-                # 結果を整理
-                for result in results:
-                    if isinstance(result, tuple):
-                        index, data = result
-                        segment_data[index] = data
+                self.logger.error(f"セグメント {index} ダウンロード失敗: {last_error}")
+                failed_segments.append(index)
+                if progress_bar:
+                    progress_bar.update(1)
+                return index, None
+            
+            async def download_and_write_segment(index: int, url: str) -> Tuple[int, Optional[bytes]]:
+                """ダウンロードし、ライターへ書き出す（先読みウィンドウの待機は開始前に完了済み）
                 
+                取得・書き込みのどこで失敗しても、欠番として扱うかライターを中断し、
+                後続セグメントの開始が先読みウィンドウの待機で停止しないようにする。
+                """
+                try:
+                    try:
+                        _, data = await download_single_segment(index, url)
+                    except Exception as e:
+                        # スプール読み込み失敗など、ダウンロード処理外のエラーも欠番として扱う
+                        self.logger.error(f"セグメント {index} 処理エラー: {e}")
+                        failed_segments.append(index)
+                        data = None
+                    if data is None:
+                        await writer.skip(index)
+                    else:
+                        await writer.write(index, data)
+                    return index, None
+                except BaseException as e:
+                    # 書き込み失敗・キャンセル時はライターを中断して待機中のセグメントを解放
+                    await writer.abort(e)
+                    raise
+            
+            # 並行ダウンロード実行
+            def add_segment_urls(window_urls: List[str]):
+                """取得できた時間窓のセグメントを追加し、進捗表示・リトライ予算に反映"""
+                segment_urls.extend(window_urls)
+                retry_budget.limit = max(retry_budget.limit, self.retry_policy.new_budget(len(segment_urls)).limit)
                 if progress_bar:
-                    progress_bar.close()
+                    progress_bar.total = len(segment_urls)
+                    progress_bar.refresh()
+            
+            download_start = time.monotonic()
+            download = download_and_write_segment if writer else download_single_segment
+            # 並行数は適応制御（同時実行中の録音とはコントローラーを共有）
+            async with self._shared_segment_budget() as controller:
+                results = await self._run_segment_downloads(
+                    segment_urls, download, writer, segment_windows, add_segment_urls
+                )
+            
+            # 結果を整理
+            for result in results:
+                if isinstance(result, tuple):
+                    index, data = result
+                    segment_data[index] = data
+            
+            if progress_bar:
+                progress_bar.close()
+            
+            if metrics:
+                metrics.download_seconds += time.monotonic() - download_start
+                metrics.record_retries(retry_budget.retries_by_cause)
+                metrics.token_refreshes += auth_token.refresh_count
+            
+            if retry_budget.used:
+                self.logger.info(
+                    f"セグメント再試行: {retry_budget.used}/{retry_budget.limit}回 "
+                    f"({dict(retry_budget.retries_by_cause)})"
+                )
+            if auth_token.refresh_count:
+                self.logger.info(f"ダウンロード中にタイムフリー認証トークンを再取得: {auth_token.refresh_count}回")
+            
+            # 書き込み中断時（出力先エラー等）はエラー
+            if writer and writer.error is not None:
+                raise SegmentDownloadError(f"セグメント書き込みエラー: {writer.error}", sorted(failed_segments))
             
             # 失敗セグメントがある場合はエラー
             if failed_segments:
@@ -412,14 +1150,335 @@ class TimeFreeRecorder(LoggerMixin):
                     failed_segments
                 )
             
+            if writer:
+                self.logger.info(
+                    f"セグメントダウンロード完了: {writer.segments_written}/{len(segment_urls)} "
+                    f"({writer.bytes_written / 1024 / 1024:.1f}MB書き込み, "
+                    f"未書き込み最大 {writer.peak_pending_bytes / 1024 / 1024:.1f}MB)"
+                )
+                return []
+            
             # Noneを除去して有効なデータのみ返す
-            valid_segments = [data for data in segment_data if data is not None]
+            valid_segments = [segment_data[index] for index in sorted(segment_data)
+                              if segment_data[index] is not None]
             
             self.logger.info(f"セグメントダウンロード完了: {len(valid_segments)}/{len(segment_urls)}")
             return valid_segments
             
         except Exception as e:
-            raise SegmentDownloadError(f"並行ダウンロードエラー: {e}")
+            raise SegmentDownloadError(f"並行ダウンロードエラー: {e}", getattr(e, 'failed_segments', None))
+    
+    async def _run_segment_downloads(self, segment_urls: List[str],
+                                     download: Callable[[int, str], Awaitable[Tuple[int, Optional[bytes]]]],
+                                     writer: Optional[OrderedSegmentWriter] = None,
+                                     segment_windows: Optional[AsyncGenerator[List[str], None]] = None,
+                                     add_segment_urls: Optional[Callable[[List[str]], None]] = None) -> List[Any]:
+        """先読み範囲内のセグメントだけダウンロードタスクを開始して全件を処理
+        
+        全セグメントのタスクを最初に生成すると、先読みウィンドウ・並行数の待機に
+        セグメント数分のタスクが並び、書き込み毎の起床がセグメント数の2乗で増える。
+        このループのみが先読みウィンドウを待ち、実行中のタスク数を write_window 以下に保つ。
+        
+        Args:
+            segment_urls: セグメントURL一覧
+            download: セグメント番号・URLを受け取り (番号, データ) を返すダウンロード処理
+            writer: 順序保証付きライター（指定時はウィンドウに入るまで開始を待機）
+            segment_windows: 未取得の時間窓のセグメントURL（segment_urls を開始し終えた後に順に待機）
+            add_segment_urls: 取得できた時間窓のセグメントURLを segment_urls に追加する処理
+            
+        Returns:
+            List[Any]: 完了順の結果一覧（例外は結果として格納）
+        """
+        lookahead = max(1, self.write_window)
+        running: Set[asyncio.Future] = set()
+        results: List[Any] = []
+        
+        def collect(done: Set[asyncio.Future]):
+            for task in done:
+                results.append(task.exception() or task.result())
+        
+        async def next_segment_url(index: int) -> Optional[str]:
+            """次のセグメントURL（未取得の場合は次の時間窓の取得を待機、全て取得済みの場合はNone）"""
+            while index >= len(segment_urls):
+                if segment_windows is None:
+                    return None
+                try:
+                    window_urls = await segment_windows.__anext__()
+                except StopAsyncIteration:
+                    return None
+                add_segment_urls(window_urls)
+            return segment_urls[index]
+        
+        try:
+            index = 0
+            while (url := await next_segment_url(index)) is not None:
+                if writer:
+                    try:
+                        await writer.wait_for_slot(index)
+                    except SegmentWriterError:
+                        # ライター中断後は新たに開始せず、実行中の分の終了を待つ
+                        break
+                while len(running) >= lookahead:
+                    done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    collect(done)
+                running.add(asyncio.ensure_future(download(index, url)))
+                index += 1
+            
+            if running:
+                done, running = await asyncio.wait(running)
+                collect(done)
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+        finally:
+            if segment_windows is not None:
+                # 中断時は未取得の時間窓のプレイリスト取得を打ち切る
+                await segment_windows.aclose()
+        return results
+    
+    def _open_segment_store(self, recording_config: Dict[str, Any]) -> Optional[SegmentStore]:
+        """設定に基づく永続セグメントキャッシュを開く
+        
+        Args:
+            recording_config: recording 設定
+            
+        Returns:
+            Optional[SegmentStore]: セグメントストア（無効時・作成失敗時はNone）
+        """
+        if not recording_config.get('segment_cache_enabled', False):
+            return None
+        
+        try:
+            return SegmentStore(
+                recording_config.get('segment_cache_dir', DEFAULT_SEGMENT_CACHE_DIR),
+                max_bytes=int(recording_config.get('segment_cache_max_mb', 1024) * 1024 * 1024)
+            )
+        except OSError as e:
+            self.logger.warning(f"セグメントストアを作成できません（キャッシュなしで続行）: {e}")
+            return None
+    
+    def _open_metrics_sinks(self, recording_config: Dict[str, Any]) -> List[Any]:
+        """設定に基づく録音メトリクスの出力先を作成
+        
+        Args:
+            recording_config: recording 設定
+            
+        Returns:
+            List[Any]: 出力先一覧（``write(metrics)`` を持つ）
+        """
+        sinks = []
+        if recording_config.get('metrics_jsonl_path'):
+            sinks.append(JsonLinesMetricsSink(recording_config['metrics_jsonl_path']))
+        if recording_config.get('metrics_prometheus_path'):
+            sinks.append(PrometheusTextfileSink(recording_config['metrics_prometheus_path']))
+        return sinks
+    
+    def _emit_metrics(self, metrics: RecordingMetrics):
+        """録音メトリクスを出力先へ書き込み（書き込み失敗は録音結果に影響させない）"""
+        for sink in self.metrics_sinks:
+            try:
+                sink.write(metrics)
+            except OSError as e:
+                self.logger.warning(f"録音メトリクス出力エラー ({sink.path}): {e}")
+    
+    def _open_journal(self, program_info: 'ProgramInfo',
+                      segment_urls: Optional[List[str]] = None) -> Optional[SegmentJournal]:
+        """番組に対応する録音再開用ジャーナルを開く
+        
+        Args:
+            program_info: 番組情報
+            segment_urls: セグメントURL一覧（省略時は取得済みセグメントをダウンロード時にURL毎に照合）
+            
+        Returns:
+            Optional[SegmentJournal]: ジャーナル（再開無効時・作成失敗時はNone）
+        """
+        if not self.resume_enabled:
+            return None
+        
+        try:
+            return SegmentJournal.for_program(
+                self.spool_dir,
+                program_info.station_id,
+                program_info.start_time,
+                program_info.end_time,
+                segment_urls,
+                max_age=timedelta(days=self.spool_max_age_days) if self.spool_max_age_days else None
+            )
+        except OSError as e:
+            self.logger.warning(f"セグメントジャーナルを作成できません（再開機能なしで続行）: {e}")
+            return None
+    
+    async def _download_and_convert_via_file(self, segment_urls: List[str], output_path: str,
+                                             program_info: 'ProgramInfo',
+                                             journal: Optional[SegmentJournal] = None,
+                                             metrics: Optional[RecordingMetrics] = None,
+                                             segment_windows: Optional[AsyncGenerator[List[str], None]] = None):
+        """一時TSファイルにダウンロードしてから音声変換
+        
+        Args:
+            segment_urls: セグメントURL一覧
+            output_path: 最終出力パス
+            program_info: 番組情報
+            journal: 録音再開用セグメントジャーナル
+            metrics: 録音の計測値（指定時はダウンロード・変換の所要時間を記録）
+            segment_windows: 未取得の時間窓のセグメントURL（_download_segments_concurrent を参照）
+        """
+        temp_ts_path = await self._download_to_temp_file(
+            segment_urls, journal, metrics=metrics, segment_windows=segment_windows
+        )
+        try:
+            # 音声フォーマット変換
+            transcode_start = time.monotonic()
+            await self._convert_to_target_format(temp_ts_path, output_path, program_info)
+            if metrics:
+                metrics.transcode_seconds = time.monotonic() - transcode_start
+        finally:
+            # 一時ファイルクリーンアップ
+            self._remove_temp_file(temp_ts_path)
+    
+    async def _download_to_temp_file(self, segment_urls: List[str],
+                                     journal: Optional[SegmentJournal] = None,
+                                     metrics: Optional[RecordingMetrics] = None,
+                                     segment_windows: Optional[AsyncGenerator[List[str], None]] = None) -> str:
+        """全セグメントを一時TSファイルへダウンロード
+        
+        Args:
+            segment_urls: セグメントURL一覧
+            journal: 録音再開用セグメントジャーナル
+            metrics: 録音の計測値
+            segment_windows: 未取得の時間窓のセグメントURL（_download_segments_concurrent を参照）
+            
+        Returns:
+            str: 一時TSファイルパス（削除は呼び出し側の責任）
+        """
+        temp_ts_path = None
+        try:
+            with tempfile.NamedTemporaryFile(suffix='.ts', delete=False) as temp_file:
+                temp_ts_path = temp_file.name
+                
+                if self.streaming_write:
+                    # 到着したセグメントを順次一時TSファイルへ書き込み
+                    writer = OrderedSegmentWriter(temp_file, self.write_window, self.max_inflight_bytes)
+                    await self._download_segments_concurrent(
+                        segment_urls, writer=writer, journal=journal, metrics=metrics,
+                        segment_windows=segment_windows
+                    )
+                    duration = writer.duration_seconds
+            
+            if not self.streaming_write:
+                # 全セグメントをメモリに保持してから一時TSファイルに結合
+                segments_data = await self._download_segments_concurrent(
+                    segment_urls, journal=journal, metrics=metrics, segment_windows=segment_windows
+                )
+                self._combine_ts_segments(segments_data, temp_ts_path)
+                duration = sum(adts_duration(data) for data in segments_data)
+            
+            # ADTSフレームから算出した再生時間を変換時のプログレス表示に使用
+            if duration > 0:
+                self._media_durations[temp_ts_path] = duration
+            if metrics:
+                metrics.media_duration_seconds = duration
+            return temp_ts_path
+            
+        except BaseException:
+            self._remove_temp_file(temp_ts_path)
+            raise
+    
+    def _remove_temp_file(self, temp_ts_path: Optional[str]):
+        """一時TSファイルを削除"""
+        self._media_durations.pop(temp_ts_path, None)
+        if temp_ts_path and os.path.exists(temp_ts_path):
+            os.unlink(temp_ts_path)
+    
+    async def _download_and_convert_pipelined(self, segment_urls: List[str], output_path: str,
+                                              program_info: 'ProgramInfo',
+                                              journal: Optional[SegmentJournal] = None,
+                                              metrics: Optional[RecordingMetrics] = None,
+                                              segment_windows: Optional[AsyncGenerator[List[str], None]] = None):
+        """ダウンロード中のセグメントをFFmpeg標準入力へ直接流し込んで変換
+        
+        Args:
+            segment_urls: セグメントURL一覧
+            output_path: 最終出力パス
+            program_info: 番組情報
+            journal: 録音再開用セグメントジャーナル
+            metrics: 録音の計測値（変換時間はダウンロードと重なるためパイプライン全体の時間）
+            segment_windows: 未取得の時間窓のセグメントURL（_download_segments_concurrent を参照）
+            
+        Raises:
+            FileConversionError: FFmpeg起動・変換エラー
+            
+        Note:
+            一時ファイルを使用せず、ダウンロードとエンコードを並行実行する。
+            処理時間はダウンロード時間とエンコード時間の和ではなく最大値に近づく。
+        """
+        codec, extra_args, description = self._get_encoding_settings(output_path)
+        ffmpeg_cmd = [
+            'ffmpeg',
+            '-i', 'pipe:0',
+            '-c:a', codec,
+            *extra_args,
+            *self._get_metadata_args(output_path, program_info),
+            '-nostats',
+            '-loglevel', 'error',
+            '-y',  # 上書き許可
+            output_path
+        ]
+        
+        self.logger.info(f"パイプライン変換開始: {description} -> {output_path}")
+        pipeline_start = time.monotonic()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *ffmpeg_cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except FileNotFoundError:
+            raise FileConversionError("FFmpegが見つかりません。FFmpegをインストールしてください。")
+        
+        # 標準エラーを並行して読み出し、パイプ詰まりによる停止を防ぐ
+        stderr_task = asyncio.create_task(process.stderr.read())
+        # 標準入力を閉じる前のFFmpeg終了を検知し、残りのダウンロードを打ち切る
+        exit_task = asyncio.create_task(process.wait())
+        writer = OrderedSegmentWriter(process.stdin, self.write_window, self.max_inflight_bytes)
+        download_task = asyncio.create_task(self._download_segments_concurrent(
+            segment_urls, writer=writer, journal=journal, metrics=metrics, segment_windows=segment_windows
+        ))
+        try:
+            await asyncio.wait({download_task, exit_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not download_task.done():
+                download_task.cancel()
+                await asyncio.gather(download_task, return_exceptions=True)
+            elif not isinstance(writer.error, ConnectionError):
+                # 標準入力への書き込み失敗（BrokenPipe等）はFFmpegの終了コードで判定
+                download_task.result()
+                process.stdin.close()
+                await process.stdin.wait_closed()
+        except BaseException:
+            download_task.cancel()
+            await asyncio.gather(download_task, return_exceptions=True)
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+            stderr_task.cancel()
+            raise
+        
+        stderr = await stderr_task
+        await exit_task
+        
+        if process.returncode != 0:
+            error_msg = stderr.decode('utf-8', errors='replace') if stderr else 'Unknown FFmpeg error'
+            raise FileConversionError(f"FFmpeg変換エラー: {error_msg}")
+        if download_task.cancelled() or writer.error is not None:
+            raise FileConversionError("FFmpegが入力の途中で終了しました")
+        
+        if metrics:
+            metrics.transcode_seconds = time.monotonic() - pipeline_start
+            metrics.media_duration_seconds = writer.duration_seconds
+        self.logger.info(f"パイプライン変換完了: {output_path}")
     
     def _combine_ts_segments(self, segments: List[bytes], temp_file_path: str):
         """TSセグメントの結合
@@ -443,6 +1502,75 @@ class TimeFreeRecorder(LoggerMixin):
         except Exception as e:
             raise FileConversionError(f"TSセグメント結合エラー: {e}")
     
+    def _get_encoding_settings(self, output_path: str) -> Tuple[str, List[str], str]:
+        """出力パスと音質設定からFFmpegエンコード設定を決定
+        
+        Args:
+            output_path: 最終出力パス
+            
+        Returns:
+            Tuple[str, List[str], str]: (コーデック, 追加引数, 表示用説明)
+        """
+        # 出力形式を拡張子から判定
+        output_ext = Path(output_path).suffix.lower()
+        
+        # 音質設定を読み込み（Phase 8拡張: VBR・320kbps対応）
+        config = self.config_manager.load_config({}) if hasattr(self, 'config_manager') else {}
+        audio_config = config.get('audio', {})
+        audio_format = audio_config.get('format', 'mp3')
+        audio_bitrate = audio_config.get('bitrate', 256)
+        audio_sample_rate = audio_config.get('sample_rate', 48000)
+        
+        # ストリームコピー（Radiko配信のAACを再エンコードせずコンテナのみ変換）
+        if output_ext == '.m4a' or (output_ext == '.aac' and audio_format == 'aac_copy'):
+            if output_ext == '.m4a':
+                extra_args = ['-bsf:a', 'aac_adtstoasc', '-movflags', '+faststart', '-f', 'mp4']
+                description = "AAC ストリームコピー (MP4, faststart)"
+            else:
+                extra_args = ['-f', 'adts']
+                description = "AAC ストリームコピー (ADTS)"
+            return 'copy', extra_args, description
+        
+        # FFmpegコマンド構築
+        if output_ext == '.mp3' or audio_format == 'mp3':
+            codec = 'libmp3lame'
+            # VBRまたは固定ビットレート設定
+            if audio_bitrate == "VBR_V0":
+                extra_args = ['-q:a', '0']  # VBR V0最高品質
+            elif isinstance(audio_bitrate, int):
+                extra_args = ['-b:a', f'{audio_bitrate}k']  # 固定ビットレート
+            else:
+                extra_args = ['-b:a', '256k']  # デフォルト
+        elif output_ext == '.aac' or audio_format == 'aac':
+            codec = 'aac'
+            # VBRまたは固定ビットレート設定
+            if audio_bitrate == "VBR_HQ":
+                extra_args = ['-q:a', '0.4']  # VBR高品質（~256kbps）
+            elif isinstance(audio_bitrate, int):
+                extra_args = ['-b:a', f'{audio_bitrate}k']  # 固定ビットレート
+            else:
+                extra_args = ['-b:a', '256k']  # デフォルト
+        elif output_ext == '.wav':
+            codec = 'pcm_s16le'
+            extra_args = []
+        else:
+            # デフォルトはMP3 256kbps
+            codec = 'libmp3lame'
+            extra_args = ['-b:a', '256k']
+        
+        # サンプルレート設定
+        if audio_sample_rate and audio_sample_rate != 48000:
+            extra_args.extend(['-ar', str(audio_sample_rate)])
+        
+        # 音質設定の表示用説明
+        if isinstance(audio_bitrate, str):
+            bitrate_desc = audio_bitrate
+        else:
+            bitrate_desc = f"{audio_bitrate}kbps"
+        description = f"{codec.upper()} {bitrate_desc}, {audio_sample_rate//1000}kHz"
+        
+        return codec, extra_args, description
+    
     async def _convert_to_target_format(self, temp_ts_path: str, 
                                       output_path: str, 
                                       program_info: 'ProgramInfo'):
@@ -457,89 +1585,62 @@ class TimeFreeRecorder(LoggerMixin):
             - MP3: libmp3lame コーデック
             - AAC: aac コーデック  
             - WAV: pcm_s16le コーデック
+            - AAC(ADTS)/M4A: ストリームコピー（再エンコードなし）
+            
+        Note:
+            chunked_transcode 有効時、長時間番組の MP3(CBR)・AAC への変換は
+            分割して並列実行する（_convert_chunked）
         """
         try:
-            # 出力形式を拡張子から判定
-            output_ext = Path(output_path).suffix.lower()
-            
-            # 音質設定を読み込み（Phase 8拡張: VBR・320kbps対応）
-            config = self.config_manager.load_config({}) if hasattr(self, 'config_manager') else {}
-            audio_config = config.get('audio', {})
-            audio_format = audio_config.get('format', 'mp3')
-            audio_bitrate = audio_config.get('bitrate', 256)
-            audio_sample_rate = audio_config.get('sample_rate', 48000)
-            
-            # FFmpegコマンド構築
-            if output_ext == '.mp3' or audio_format == 'mp3':
-                codec = 'libmp3lame'
-                # VBRまたは固定ビットレート設定
-                if audio_bitrate == "VBR_V0":
-                    extra_args = ['-q:a', '0']  # VBR V0最高品質
-                elif isinstance(audio_bitrate, int):
-                    extra_args = ['-b:a', f'{audio_bitrate}k']  # 固定ビットレート
-                else:
-                    extra_args = ['-b:a', '256k']  # デフォルト
-            elif output_ext == '.aac' or audio_format == 'aac':
-                codec = 'aac'
-                # VBRまたは固定ビットレート設定
-                if audio_bitrate == "VBR_HQ":
-                    extra_args = ['-q:a', '0.4']  # VBR高品質（~256kbps）
-                elif isinstance(audio_bitrate, int):
-                    extra_args = ['-b:a', f'{audio_bitrate}k']  # 固定ビットレート
-                else:
-                    extra_args = ['-b:a', '256k']  # デフォルト
-            elif output_ext == '.wav':
-                codec = 'pcm_s16le'
-                extra_args = []
-            else:
-                # デフォルトはMP3 256kbps
-                codec = 'libmp3lame'
-                extra_args = ['-b:a', '256k']
+            codec, extra_args, description = self._get_encoding_settings(output_path)
             
-            # サンプルレート設定
-            if audio_sample_rate and audio_sample_rate != 48000:
-                extra_args.extend(['-ar', str(audio_sample_rate)])
-            
-            # プログレス情報を取得するためのパイプを作成
-            import tempfile
-            progress_fd, progress_path = tempfile.mkstemp(suffix='.txt')
-            os.close(progress_fd)
+            if self.chunked_transcode:
+                chunks = await self._plan_chunked_transcode(temp_ts_path, output_path, codec, extra_args)
+                if chunks:
+                    await self._convert_chunked(temp_ts_path, output_path, program_info,
+                                                codec, extra_args, description, chunks)
+                    return
             
             ffmpeg_cmd = [
                 'ffmpeg',
                 '-i', temp_ts_path,
                 '-c:a', codec,
                 *extra_args,
-                '-progress', progress_path,  # プログレス情報出力
+                *self._get_metadata_args(output_path, program_info),
+                '-progress', 'pipe:1',  # プログレス情報を標準出力へ
+                '-nostats',
+                '-loglevel', 'error',
                 '-y',  # 上書き許可
                 output_path
             ]
             
-            # 音質設定ログ出力
-            if isinstance(audio_bitrate, str):
-                bitrate_desc = audio_bitrate
-            else:
-                bitrate_desc = f"{audio_bitrate}kbps"
-            self.logger.info(f"音声変換開始: {codec} {bitrate_desc} {audio_sample_rate}Hz -> {output_path}")
-            print(f"\n音声変換中 ({codec.upper()} {bitrate_desc}, {audio_sample_rate//1000}kHz)...")
-            
-            # FFmpeg実行
-            process = await asyncio.create_subprocess_exec(
-                *ffmpeg_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            # プログレスバーを表示しながら処理を待機
-            await self._show_ffmpeg_progress(process, progress_path, temp_ts_path)
-            
-            stdout, stderr = await process.communicate()
+            self.logger.info(f"音声変換開始: {description} -> {output_path}")
+            print(f"\n音声変換中 ({description})...")
             
-            # プログレスファイルを削除
-            try:
-                os.unlink(progress_path)
-            except:
-                pass
+            # FFmpeg実行（分割変換のチャンクと同時実行数の上限を共有）
+            async with self._transcode_slots():
+                process = await asyncio.create_subprocess_exec(
+                    *ffmpeg_cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                # 標準エラーは並行して読み切り、パイプ満杯によるFFmpegの停止を防ぐ
+                stderr_task = asyncio.ensure_future(process.stderr.read())
+                try:
+                    # 標準出力のプログレス情報でプログレスバーを更新しながら処理を待機
+                    await self._show_ffmpeg_progress(process, temp_ts_path)
+                    stderr = await stderr_task
+                    await process.wait()
+                except BaseException:
+                    # 進捗表示の失敗・キャンセル時もFFmpegを残さない
+                    if process.returncode is None:
+                        process.kill()
+                    await process.wait()
+                    raise
+                finally:
+                    if not stderr_task.done():
+                        stderr_task.cancel()
             
             if process.returncode != 0:
                 error_msg = stderr.decode('utf-8') if stderr else 'Unknown FFmpeg error'
@@ -553,115 +1654,315 @@ class TimeFreeRecorder(LoggerMixin):
         except Exception as e:
             raise FileConversionError(f"音声変換エラー: {e}")
     
-    async def _show_ffmpeg_progress(self, process: asyncio.subprocess.Process, progress_path: str, input_file: str):
+    async def _plan_chunked_transcode(self, temp_ts_path: str, output_path: str,
+                                      codec: str, extra_args: List[str]) -> List[TranscodeChunk]:
+        """分割変換の計画（対象外の場合は空）
+        
+        Args:
+            temp_ts_path: 一時TSファイルパス（ID3タグ付きADTS）
+            output_path: 最終出力パス
+            codec: エンコーダー
+            extra_args: エンコード引数
+            
+        Returns:
+            List[TranscodeChunk]: 変換範囲一覧
+            
+        Note:
+            フレーム単位で連結できる MP3(CBR)・AAC(ADTS) のみ対象。
+            MP3 の VBR はフレーム長が揃わず Xing ヘッダーも連結できないため対象外。
+        """
+        output_ext = Path(output_path).suffix.lower()
+        if not ((codec == 'libmp3lame' and output_ext == '.mp3' and '-b:a' in extra_args)
+                or (codec == 'aac' and output_ext == '.aac')):
+            return []
+        
+        loop = asyncio.get_running_loop()
+        segment_starts, total_seconds = await loop.run_in_executor(None, adts_file_segments, temp_ts_path)
+        if total_seconds < self.chunked_transcode_min_minutes * 60:
+            return []
+        
+        sample_rate = self._output_sample_rate(extra_args)
+        return plan_transcode_chunks(
+            segment_starts, total_seconds, os.path.getsize(temp_ts_path),
+            chunk_count=self.chunked_transcode_workers,
+            sample_rate=sample_rate,
+            frame_size=output_frame_size(codec, sample_rate)
+        )
+    
+    @staticmethod
+    def _output_sample_rate(extra_args: List[str]) -> int:
+        """エンコード引数の出力サンプリング周波数（未指定時はRadiko配信の48kHz）"""
+        if '-ar' in extra_args:
+            return int(extra_args[extra_args.index('-ar') + 1])
+        return 48000
+    
+    async def _convert_chunked(self, temp_ts_path: str, output_path: str, program_info: 'ProgramInfo',
+                               codec: str, extra_args: List[str], description: str,
+                               chunks: List[TranscodeChunk]):
+        """分割した範囲を並列に変換し、フレーム単位で連結
+        
+        各チャンクの出力から採用範囲のフレームだけを取り出して連結し、
+        最後にストリームコピーでメタデータとヘッダーを付与する（再エンコードなし）。
+        
+        Args:
+            temp_ts_path: 一時TSファイルパス
+            output_path: 最終出力パス
+            program_info: 番組情報（メタデータ用）
+            codec: エンコーダー
+            extra_args: エンコード引数
+            description: 表示用説明
+            chunks: 変換範囲一覧
+        """
+        container = 'mp3' if codec == 'libmp3lame' else 'adts'
+        self.logger.info(f"分割変換開始: {description}, {len(chunks)}分割 -> {output_path}")
+        print(f"\n音声変換中 ({description}, {len(chunks)}分割)...")
+        
+        work_dir = tempfile.mkdtemp(prefix="recradiko_chunks_")
+        try:
+            semaphore = asyncio.Semaphore(self.chunked_transcode_workers)
+            
+            async def encode(chunk: TranscodeChunk) -> str:
+                async with semaphore:
+                    chunk_path = os.path.join(work_dir, f"chunk{chunk.index:03d}.{container}")
+                    await self._encode_chunk(temp_ts_path, chunk, chunk_path, codec, extra_args, container)
+                    self.logger.debug(f"分割変換 チャンク{chunk.index} 完了")
+                    return chunk_path
+            
+            tasks = [asyncio.ensure_future(encode(chunk)) for chunk in chunks]
+            try:
+                chunk_paths = await asyncio.gather(*tasks)
+            except BaseException:
+                # 1チャンクの失敗で残りのFFmpegも停止
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            
+            joined_path = os.path.join(work_dir, f"joined.{container}")
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._join_chunk_frames, chunks, chunk_paths, joined_path, container)
+            
+            # 連結したフレーム列にメタデータ・ヘッダーを付与（ストリームコピー）
+            process = await asyncio.create_subprocess_exec(
+                'ffmpeg',
+                '-f', 'mp3' if container == 'mp3' else 'aac',
+                '-i', joined_path,
+                '-c:a', 'copy',
+                *self._get_metadata_args(output_path, program_info),
+                '-f', container,
+                '-nostats',
+                '-loglevel', 'error',
+                '-y',
+                output_path,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                error_msg = stderr.decode('utf-8', errors='replace') if stderr else 'Unknown FFmpeg error'
+                raise FileConversionError(f"FFmpeg連結エラー: {error_msg}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        print("\n音声変換完了!")
+        self.logger.info(f"分割変換完了: {output_path}")
+    
+    def _chunk_encode_command(self, chunk: TranscodeChunk, chunk_path: str, codec: str,
+                              extra_args: List[str], container: str) -> List[str]:
+        """チャンク変換のFFmpegコマンド
+        
+        入力はチャンクのバイト範囲を標準入力から渡す。出力サンプリング周波数を明示し、
+        先頭を atrim でフレーム格子に揃える。MP3 はビットリザーバーを無効化し、
+        採用する先頭フレームが読み捨てるフレームのデータを参照しないようにする。
+        """
+        encode_args = list(extra_args)
+        if '-ar' in encode_args:
+            del encode_args[encode_args.index('-ar'):encode_args.index('-ar') + 2]
+        
+        filters = f"aresample={self._output_sample_rate(extra_args)}"
+        if chunk.trim_samples:
+            filters += f",atrim=start_sample={chunk.trim_samples},asetpts=PTS-STARTPTS"
+        
+        if container == 'mp3':
+            # ヘッダーフレーム・タグは連結後に付与
+            format_args = ['-reservoir', '0', '-write_xing', '0', '-id3v2_version', '0', '-f', 'mp3']
+        else:
+            format_args = ['-f', 'adts']
+        
+        return [
+            'ffmpeg',
+            '-f', 'aac',
+            '-i', 'pipe:0',
+            '-map_metadata', '-1',
+            '-af', filters,
+            '-c:a', codec,
+            *encode_args,
+            *format_args,
+            '-nostats',
+            '-loglevel', 'error',
+            '-y',
+            chunk_path
+        ]
+    
+    async def _encode_chunk(self, temp_ts_path: str, chunk: TranscodeChunk, chunk_path: str,
+                            codec: str, extra_args: List[str], container: str):
+        """1チャンクを変換（入力のバイト範囲をFFmpegの標準入力へ流し込む）
+        
+        FFmpegの同時実行数は変換段と共有の上限（_transcode_slots）に従い、
+        入力の読み込みは他のダウンロード・チャンク変換を止めないようイベントループ外で実行する。
+        """
+        async with self._transcode_slots():
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *self._chunk_encode_command(chunk, chunk_path, codec, extra_args, container),
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            except FileNotFoundError:
+                raise FileConversionError("FFmpegが見つかりません。FFmpegをインストールしてください。")
+            
+            loop = asyncio.get_running_loop()
+            stderr_task = asyncio.ensure_future(process.stderr.read())
+            try:
+                f = await loop.run_in_executor(None, open, temp_ts_path, 'rb')
+                try:
+                    await loop.run_in_executor(None, f.seek, chunk.input_start)
+                    remaining = chunk.input_end - chunk.input_start
+                    while remaining > 0:
+                        data = await loop.run_in_executor(None, f.read, min(remaining, 1024 * 1024))
+                        if not data:
+                            break
+                        process.stdin.write(data)
+                        await process.stdin.drain()
+                        remaining -= len(data)
+                finally:
+                    f.close()
+                process.stdin.close()
+                await process.stdin.wait_closed()
+                stderr = await stderr_task
+                await process.wait()
+            except BaseException:
+                if process.returncode is None:
+                    process.kill()
+                await process.wait()
+                stderr_task.cancel()
+                raise
+        
+        if process.returncode != 0:
+            error_msg = stderr.decode('utf-8', errors='replace') if stderr else 'Unknown FFmpeg error'
+            raise FileConversionError(f"FFmpeg変換エラー (チャンク{chunk.index}): {error_msg}")
+    
+    @staticmethod
+    def _join_chunk_frames(chunks: List[TranscodeChunk], chunk_paths: List[str],
+                           joined_path: str, container: str):
+        """各チャンクの出力から採用範囲のフレームを取り出して連結"""
+        with open(joined_path, 'wb') as joined:
+            for chunk, chunk_path in zip(chunks, chunk_paths):
+                data = Path(chunk_path).read_bytes()
+                try:
+                    frames = list(iter_audio_frames(data, container))
+                except ValueError as e:
+                    raise FileConversionError(f"分割変換の出力を解析できません (チャンク{chunk.index}): {e}")
+                
+                end = len(frames) if chunk.keep_frames is None else chunk.skip_frames + chunk.keep_frames
+                if chunk.skip_frames >= end or end > len(frames):
+                    raise FileConversionError(
+                        f"分割変換の出力フレーム不足 (チャンク{chunk.index}: "
+                        f"{len(frames)}フレーム, 必要 {end}フレーム)"
+                    )
+                start_offset = frames[chunk.skip_frames][0]
+                end_offset = frames[end - 1][0] + frames[end - 1][1]
+                joined.write(memoryview(data)[start_offset:end_offset])
+    
+    async def _show_ffmpeg_progress(self, process: asyncio.subprocess.Process, input_file: str):
         """FFmpegの進捗を表示する
         
+        ``-progress pipe:1`` で標準出力に出力される key=value 形式の進捗情報を
+        到着順に読み取り、``progress=`` 行で完結する1回分毎にプログレスバーを更新する。
+        標準出力の終端（FFmpeg終了）で即座に戻る。表示・解析に失敗した場合も
+        標準出力は終端まで読み捨て、パイプ詰まりでFFmpegが停止しないようにする。
+        
         Args:
             process: FFmpegプロセス
-            progress_path: プログレス情報ファイルパス
             input_file: 入力ファイルパス（時間取得用）
         """
+        progress_bar = None
         try:
             # 入力ファイルの総時間を取得
             duration = await self._get_media_duration(input_file)
             
             # tqdmプログレスバーを初期化
-            progress_bar = None
             try:
                 from tqdm import tqdm
                 if duration > 0:
                     progress_bar = tqdm(total=int(duration), desc="音声変換", unit="秒")
             except ImportError:
                 pass
-                
-            # プログレスバーを表示
-            last_time = 0
-            last_update_time = 0
-            no_progress_count = 0
             
-            while process.returncode is None:
-                try:
-                    # プログレスファイルを読み込む
-                    if os.path.exists(progress_path):
-                        with open(progress_path, 'r') as f:
-                            content = f.read()
-                            current_time = self._parse_ffmpeg_progress(content)
-                            
-                            # プログレスが更新された場合
-                            if current_time > last_time:
-                                if progress_bar:
-                                    # 進捗の差分を更新
-                                    diff = int(current_time - last_time)
-                                    progress_bar.update(diff)
-                                    
-                                    # 大きなジャンプの場合は補正
-                                    if diff > duration * 0.1:  # 全体の10%以上のジャンプ
-                                        self.logger.warning(f"プログレスバーの大きなジャンプを検出: {diff}秒")
-                                        
-                                last_time = current_time
-                                last_update_time = current_time
-                                no_progress_count = 0
-                            else:
-                                no_progress_count += 1
-                                
-                                # プログレスが長時間更新されない場合の警告
-                                if no_progress_count > 10:
-                                    self.logger.warning(f"プログレスが{no_progress_count}秒間更新されていません")
-                    
-                    # デバッグ情報を定期的に出力
-                    if duration > 0:
-                        progress_percent = (current_time / duration) * 100
-                        self.logger.debug(f"FFmpeg進捗: {current_time:.1f}/{duration:.1f}秒 ({progress_percent:.1f}%)")
-                        
-                except Exception as e:
-                    self.logger.debug(f"プログレス読み取りエラー: {e}")
+            last_time = 0.0
+            block = []
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
                 
-                await asyncio.sleep(1.0)  # 1秒間隔で更新
+                line = line.decode('utf-8', errors='replace').strip()
+                block.append(line)
+                if not line.startswith('progress='):
+                    continue
                 
+                # progress=continue / progress=end で1回分の進捗情報が完結
+                current_time = self._parse_ffmpeg_progress('\n'.join(block))
+                block.clear()
+                if current_time > last_time:
+                    if progress_bar:
+                        progress_bar.update(int(current_time) - int(last_time))
+                    last_time = current_time
+                    if duration > 0:
+                        self.logger.debug(
+                            f"FFmpeg進捗: {current_time:.1f}/{duration:.1f}秒 ({current_time / duration * 100:.1f}%)"
+                        )
+            
             # プログレスバーを完了
             if progress_bar:
-                # 残りの進捗を更新
-                remaining = int(duration - last_time)
+                remaining = int(duration) - int(last_time)
                 if remaining > 0:
                     progress_bar.update(remaining)
-                progress_bar.close()
                 
-        except Exception as e:
+        except (ValueError, OSError) as e:
+            # 上限を超える長さの行（ValueError）・端末への出力エラー等
             self.logger.debug(f"Progress display error: {e}")
-            if 'progress_bar' in locals() and progress_bar:
+            await self._drain_stream(process.stdout)
+        finally:
+            if progress_bar:
                 progress_bar.close()
     
+    @staticmethod
+    async def _drain_stream(stream: asyncio.StreamReader):
+        """ストリームを終端まで読み捨てる"""
+        while await stream.read(64 * 1024):
+            pass
+    
     async def _get_media_duration(self, file_path: str) -> float:
         """メディアファイルの時間を取得
         
+        ダウンロード時にADTSフレームから算出済みの場合はその値を使用し、
+        それ以外はファイルのADTSフレームヘッダーを走査して算出する（ffprobeは起動しない）。
+        
         Args:
             file_path: ファイルパス
             
         Returns:
-            時間（秒）
+            時間（秒）。算出できない場合は0.0
         """
+        duration = self._media_durations.get(file_path)
+        if duration is not None:
+            return duration
+        
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-show_entries', 'format=duration',
-                '-of', 'csv=p=0',
-                file_path
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, _ = await process.communicate()
-            
-            if process.returncode == 0:
-                return float(stdout.decode().strip())
-            else:
-                return 0.0
-                
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, adts_file_duration, file_path)
         except Exception:
             return 0.0
     
@@ -691,8 +1992,43 @@ class TimeFreeRecorder(LoggerMixin):
             return 0.0
     
     
+    def _get_metadata_args(self, output_path: str, program_info: 'ProgramInfo') -> List[str]:
+        """変換時に番組メタデータを書き込むFFmpeg引数
+        
+        変換後にmutagenでタグを追加するとタグ領域の分だけファイル全体が
+        書き直されるため、FFmpegの出力時に1パスで書き込む。
+        
+        Args:
+            output_path: 出力ファイルパス（拡張子でタグ形式を判定）
+            program_info: 番組情報
+            
+        Returns:
+            List[str]: FFmpeg引数（変換時書き込み無効時は空）
+            
+        Tag Formats:
+            - MP3: ID3v2.4
+            - AAC(ADTS): ID3v2 ヘッダー
+            - M4A: MP4 メタデータ (ilst)
+            - WAV: RIFF INFO チャンク
+        """
+        if not self.tag_during_transcode:
+            return []
+        
+        # 入力側のメタデータ（セグメントのID3タイムスタンプ等）は引き継がない
+        args = ['-map_metadata', '-1']
+        for key, value in program_info.to_metadata().items():
+            if value:
+                args.extend(['-metadata', f"{key}={value}"])
+        
+        output_ext = Path(output_path).suffix.lower()
+        if output_ext == '.mp3':
+            args.extend(['-id3v2_version', '4'])
+        elif output_ext == '.aac':
+            args.extend(['-write_id3v2', '1'])
+        return args
+    
     def _embed_metadata(self, file_path: str, program_info: 'ProgramInfo'):
-        """ID3メタデータの埋め込み
+        """ID3メタデータの埋め込み（tag_during_transcode 無効時に変換後のMP3へ書き込み）
         
         Args:
             file_path: 音声ファイルパス
@@ -756,7 +2092,6 @@ if __name__ == "__main__":
             
             # 認証器を初期化
             authenticator = RadikoAuthenticator()
-            recorder = TimeFreeRecorder(authenticator)
             
             # テスト用の録音（1時間前の15分間）
             now = datetime.now()
@@ -767,12 +2102,14 @@ if __name__ == "__main__":
             
             print(f"タイムフリー録音テスト開始: {start_time} - {end_time}")
             
-            result = await recorder.record_by_datetime(
-                "TBS",  # TBSラジオ
-                start_time,
-                end_time,
-                output_path
-            )
+            # ループ終了前に共有HTTPセッションをクローズ
+            async with TimeFreeRecorder(authenticator) as recorder:
+                result = await recorder.record_by_datetime(
+                    "TBS",  # TBSラジオ
+                    start_time,
+                    end_time,
+                    output_path
+                )
             
             if result.success:
                 print(f"録音成功: {result.output_path} ({result.file_size_bytes / 1024 / 1024:.1f}MB)")
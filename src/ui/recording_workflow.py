@@ -591,7 +591,9 @@ class RecordingWorkflow:
         safe_title = "".join(c for c in program_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
         safe_title = safe_title.replace(" ", "_")
         
-        filename = f"{station_id}_{date_str}_{start_time}_{safe_title}.mp3"
+        # 拡張子は音質設定（audio.format）に従う
+        extension = self.timefree_recorder.get_output_extension()
+        filename = f"{station_id}_{date_str}_{start_time}_{safe_title}{extension}"
         full_path = desktop_path / filename
         
         return str(full_path)
@@ -686,6 +688,8 @@ class RecordingWorkflow:
         try:
             self.menu_manager.shutdown()
             self.reset_selection()
+            # Close the recorder's pooled HTTP session deterministically
+            self.timefree_recorder.close_sync()
             self.logger.debug("Recording workflow cleanup completed")
         except Exception as e:
             self.logger.error(f"Cleanup error: {e}")
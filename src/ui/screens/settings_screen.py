@@ -265,7 +265,7 @@ class SettingsScreen(ScreenBase):
         # Validate audio settings
         if "audio" in config_data:
             audio = config_data["audio"]
-            if "format" in audio and audio["format"] not in ["mp3", "aac"]:
+            if "format" in audio and audio["format"] not in ["mp3", "aac", "aac_copy", "m4a"]:
                 errors.append("Invalid audio format")
             if "bitrate" in audio and not isinstance(audio["bitrate"], int):
                 errors.append("Invalid audio bitrate")
@@ -0,0 +1,244 @@
+"""
+音声データ処理ユーティリティ
+
+ffprobe を起動せずに AAC(ADTS) ストリームの再生時間を求める機能
+Radiko のセグメントは ID3 タグ付きの ADTS ストリームのため、
+フレームヘッダーのサンプリング周波数とブロック数から時間を算出できる
+
+分割変換の出力を連結するための MP3・ADTS フレームの列挙も提供する
+"""
+
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+
+# ADTS sampling_frequency_index に対応するサンプリング周波数
+ADTS_SAMPLE_RATES = (
+    96000, 88200, 64000, 48000, 44100, 32000,
+    24000, 22050, 16000, 12000, 11025, 8000, 7350,
+)
+
+# AAC 1ブロックあたりのサンプル数
+AAC_SAMPLES_PER_BLOCK = 1024
+
+# MPEG Audio Layer III のビットレート (kbps, インデックス順)
+MP3_BITRATES_MPEG1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+MP3_BITRATES_MPEG2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+# MPEG バージョン毎のサンプリング周波数 (ヘッダーのバージョンビット: 3=MPEG-1, 2=MPEG-2, 0=MPEG-2.5)
+MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+class AdtsDurationCounter:
+    """ADTS ストリームの再生時間を逐次集計
+
+    任意の位置で分割されたデータを順に ``feed`` でき、ID3 タグは読み飛ばす。
+    ADTS 以外のデータは次の同期ワードまで読み飛ばす。
+
+    Usage:
+        counter = AdtsDurationCounter()
+        for chunk in chunks:
+            counter.feed(chunk)
+        print(counter.seconds)
+    """
+
+    # ID3v2 ヘッダー長・ADTS 固定ヘッダー長（判定に必要な先読みバイト数）
+    HEADER_SIZE = 10
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.frames = 0
+        # ID3 タグ（セグメント先頭）毎の (ストリーム先頭からのバイト位置, その時点の再生時間)
+        self.segment_starts: List[Tuple[int, float]] = []
+        self._buffer = b''
+        self._skip = 0
+        # ストリーム先頭から _buffer 先頭までのバイト数
+        self._position = 0
+
+    def feed(self, data: bytes):
+        """データを追加して含まれるフレームの時間を集計
+
+        Args:
+            data: ストリームの続きのデータ
+        """
+        if self._skip:
+            skipped = min(self._skip, len(data))
+            data = data[skipped:]
+            self._skip -= skipped
+            self._position += skipped
+
+        buffer = self._buffer + data if self._buffer else bytes(data)
+        end = len(buffer)
+        pos = 0
+        while end - pos >= self.HEADER_SIZE:
+            if buffer[pos:pos + 3] == b'ID3':
+                self.segment_starts.append((self._position + pos, self.seconds))
+                size = self._id3_size(buffer, pos)
+            else:
+                size = self._adts_frame(buffer, pos)
+
+            if size:
+                if end - pos < size:
+                    # 残りは次のデータで読み飛ばす
+                    self._skip = size - (end - pos)
+                    pos = end
+                    break
+                pos += size
+                continue
+
+            # 同期外れ: 次の同期ワード候補まで読み飛ばす
+            pos = self._find_sync(buffer, pos + 1)
+
+        self._position += pos
+        self._buffer = buffer[pos:]
+
+    def _adts_frame(self, buffer: bytes, pos: int) -> int:
+        """ADTS フレームヘッダーを解析して時間を加算
+
+        Returns:
+            int: フレーム長（ADTS フレームでない場合は0）
+        """
+        if buffer[pos] != 0xFF or (buffer[pos + 1] & 0xF6) != 0xF0:
+            return 0
+        rate_index = (buffer[pos + 2] >> 2) & 0x0F
+        frame_length = ((buffer[pos + 3] & 0x03) << 11) | (buffer[pos + 4] << 3) | (buffer[pos + 5] >> 5)
+        if rate_index >= len(ADTS_SAMPLE_RATES) or frame_length < 7:
+            return 0
+
+        blocks = (buffer[pos + 6] & 0x03) + 1
+        self.seconds += blocks * AAC_SAMPLES_PER_BLOCK / ADTS_SAMPLE_RATES[rate_index]
+        self.frames += 1
+        return frame_length
+
+    @staticmethod
+    def _id3_size(buffer: bytes, pos: int) -> int:
+        """ID3v2 タグ全体の長さ（ヘッダー・フッター含む）"""
+        size = 0
+        for byte in buffer[pos + 6:pos + 10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if buffer[pos + 5] & 0x10 else 0
+        return size + 10 + footer
+
+    @staticmethod
+    def _find_sync(buffer: bytes, start: int) -> int:
+        """次の ADTS 同期ワード・ID3 タグ候補の位置（なければ末尾）"""
+        candidates = [index for index in (buffer.find(b'\xff', start), buffer.find(b'ID3', start))
+                      if index >= 0]
+        return min(candidates) if candidates else len(buffer)
+
+
+def adts_duration(data: bytes) -> float:
+    """ADTS データの再生時間を算出
+
+    Args:
+        data: ADTS ストリーム（ID3 タグ付き可）
+
+    Returns:
+        float: 再生時間（秒）。ADTS でない場合は0.0
+    """
+    counter = AdtsDurationCounter()
+    counter.feed(data)
+    return counter.seconds
+
+
+def adts_file_duration(file_path: Union[str, Path], chunk_size: int = 1024 * 1024) -> float:
+    """ADTS ファイルの再生時間を算出
+
+    先頭が ID3 タグ・ADTS フレームでないファイル（MPEG-TS 等）は解析しない。
+
+    Args:
+        file_path: ファイルパス
+        chunk_size: 読み込み単位（バイト）
+
+    Returns:
+        float: 再生時間（秒）。ADTS でない場合は0.0
+    """
+    counter = _scan_adts_file(file_path, chunk_size)
+    return counter.seconds if counter else 0.0
+
+
+def adts_file_segments(file_path: Union[str, Path],
+                       chunk_size: int = 1024 * 1024) -> Tuple[List[Tuple[int, float]], float]:
+    """ADTS ファイル中のセグメント（ID3 タグ）の位置と再生時間を取得
+
+    Args:
+        file_path: ファイルパス
+        chunk_size: 読み込み単位（バイト）
+
+    Returns:
+        Tuple[List[Tuple[int, float]], float]:
+            ((バイト位置, セグメント開始時点の再生時間) 一覧, 全体の再生時間)。ADTS でない場合は ([], 0.0)
+    """
+    counter = _scan_adts_file(file_path, chunk_size)
+    if not counter:
+        return [], 0.0
+    return counter.segment_starts, counter.seconds
+
+
+def _scan_adts_file(file_path: Union[str, Path], chunk_size: int) -> Optional[AdtsDurationCounter]:
+    """ADTS ファイル全体を集計（先頭が ID3 タグ・ADTS フレームでない場合はNone）"""
+    counter = AdtsDurationCounter()
+    with open(file_path, 'rb') as f:
+        head = f.read(2)
+        if not (head == b'ID' or (len(head) == 2 and head[0] == 0xFF and (head[1] & 0xF6) == 0xF0)):
+            return None
+        counter.feed(head)
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            counter.feed(chunk)
+    return counter
+
+
+def mp3_frame_header(header: bytes) -> Tuple[int, int]:
+    """MPEG Audio Layer III のフレームヘッダーを解析
+
+    Args:
+        header: フレーム先頭4バイト
+
+    Returns:
+        Tuple[int, int]: (フレーム長, フレームあたりのサンプル数)。Layer III のフレームでない場合は (0, 0)
+    """
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return 0, 0
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return 0, 0
+
+    padding = (header[2] >> 1) & 0x01
+    sample_rate = MP3_SAMPLE_RATES[version][rate_index]
+    if version == 3:
+        return 144000 * MP3_BITRATES_MPEG1[bitrate_index] // sample_rate + padding, 1152
+    return 72000 * MP3_BITRATES_MPEG2[bitrate_index] // sample_rate + padding, 576
+
+
+def iter_audio_frames(data: bytes, container: str) -> Iterator[Tuple[int, int]]:
+    """タグ・ヘッダーフレームを含まない MP3・ADTS ストリームのフレームを列挙
+
+    Args:
+        data: ストリーム
+        container: 'mp3' または 'adts'
+
+    Yields:
+        Tuple[int, int]: (フレーム先頭のバイト位置, フレーム長)
+
+    Raises:
+        ValueError: フレームとして解析できないデータがある場合
+    """
+    pos = 0
+    end = len(data)
+    while pos < end:
+        if container == 'mp3':
+            length, _ = mp3_frame_header(data[pos:pos + 4])
+        else:
+            header = data[pos:pos + 7]
+            length = 0
+            if len(header) == 7 and header[0] == 0xFF and (header[1] & 0xF6) == 0xF0:
+                length = ((header[3] & 0x03) << 11) | (header[4] << 3) | (header[5] >> 5)
+        if length < 4 or pos + length > end:
+            raise ValueError(f"{container} フレームを解析できません (位置 {pos})")
+        yield pos, length
+        pos += length
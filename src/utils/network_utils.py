@@ -5,13 +5,21 @@ HTTP セッション作成などのネットワーク関連処理の統一機能
 4クラスで重複していたセッション初期化・設定コードを統一
 """
 
+import asyncio
+import aiohttp
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, TYPE_CHECKING
+
+from .base import LoggerMixin
+
+if TYPE_CHECKING:
+    from src.bandwidth_limiter import BandwidthLimiter
 
 
 def create_radiko_session(
     timeout: int = 30,
-    additional_headers: Optional[Dict[str, str]] = None
+    additional_headers: Optional[Dict[str, str]] = None,
+    bandwidth_limiter: Optional['BandwidthLimiter'] = None
 ) -> requests.Session:
     """Radiko API用の標準セッションを作成
     
@@ -21,6 +29,7 @@ def create_radiko_session(
     Args:
         timeout: リクエストタイムアウト秒数（デフォルト: 30秒）
         additional_headers: 追加ヘッダー辞書
+        bandwidth_limiter: 受信量を制限する帯域制限（未指定時は無制限）
         
     Returns:
         requests.Session: 設定済みセッション
@@ -59,6 +68,8 @@ def create_radiko_session(
         standard_headers.update(additional_headers)
     
     session.headers.update(standard_headers)
+    if bandwidth_limiter is not None:
+        attach_bandwidth_limiter(session, bandwidth_limiter)
     return session
 
 
@@ -92,4 +103,167 @@ def create_streaming_session(
     # ストリーミング用の追加設定
     session.stream = True
     
-    return session
\ No newline at end of file
+    return session
+
+
+def attach_bandwidth_limiter(session: requests.Session, bandwidth_limiter: 'BandwidthLimiter'):
+    """セッションの受信量を帯域制限に従わせる
+    
+    stream=False のリクエストは応答本文の受信後にその分の帯域を消費する。
+    stream=True のリクエストは呼び出し側が読み込み毎に ``throttle`` を呼ぶ。
+    
+    Args:
+        session: 対象セッション
+        bandwidth_limiter: 帯域制限
+    """
+    def throttle_response(response, *args, **kwargs):
+        if not kwargs.get('stream'):
+            bandwidth_limiter.throttle(len(response.content))
+        return response
+    
+    session.hooks['response'].append(throttle_response)
+
+
+class AsyncSessionPool(LoggerMixin):
+    """aiohttp セッションの遅延生成・再利用プール
+
+    Radiko エッジへの TCP/TLS ハンドシェイクを録音毎に繰り返さないよう、
+    キープアライブ・DNSキャッシュを有効にした aiohttp.ClientSession を
+    初回利用時に生成して使い回す。セッションは生成したイベントループに
+    紐付くため、別のループから利用された場合は前のセッションをクローズして作り直す。
+
+    接続はセッションを生成したループでしか解放できないため、asyncio.run 等で
+    ループを終了する場合は終了前に close() を await すること（終了済みのループの
+    セッションは解放できず、警告を出力して破棄する）。
+
+    Usage:
+        async def main():
+            pool = AsyncSessionPool(connection_limit=16)
+            try:
+                session = await pool.get_session()
+                async with session.get(url) as response:
+                    ...
+            finally:
+                await pool.close()  # ループを使い続ける場合は同期コンテキストから pool.close_sync() も可
+        asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        connection_limit: int = 16,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        timeout: float = 30.0
+    ):
+        """初期化
+
+        Args:
+            connection_limit: 同時接続数の上限
+            dns_cache_ttl: DNSキャッシュの有効秒数
+            keepalive_timeout: アイドル接続を保持する秒数
+            timeout: リクエスト全体のタイムアウト秒数
+        """
+        super().__init__()
+        self.connection_limit = connection_limit
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_open(self) -> bool:
+        """有効なセッションを保持しているか"""
+        return self._session is not None and not self._session.closed
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """セッションを生成したイベントループ（未生成の場合はNone）"""
+        return self._loop if self.is_open else None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """共有セッションを取得（未生成・クローズ済み・別ループの場合は生成）
+
+        Returns:
+            aiohttp.ClientSession: 共有セッション
+        """
+        loop = asyncio.get_running_loop()
+        if self.is_open and self._loop is loop:
+            return self._session
+
+        # 別ループで生成されたセッションは解放してから作り直す
+        if self.is_open:
+            await self._release_session(self._session, self._loop)
+
+        # 未生成・クローズ済み、または別ループで生成されたセッションは作り直す
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._loop = loop
+        return self._session
+
+    async def _release_session(self, session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]):
+        """別ループに紐付くセッションをクローズ
+
+        生成したループが別スレッドで実行中であればそのループでクローズをスケジュールし、
+        停止中であれば現在のループを止めないよう別スレッドからそのループで実行する。
+        終了済みのループの接続は解放できないため、警告を出力して破棄する。
+
+        Args:
+            session: クローズするセッション
+            loop: セッションを生成したループ
+        """
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(asyncio.ensure_future, session.close())
+            return
+        if loop is None or loop.is_closed():
+            self._warn_closed_loop()
+            return
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, loop.run_until_complete, session.close())
+        except Exception as e:
+            # 使われなくなったセッションの解放失敗で新しいセッションの生成を止めない
+            self.logger.warning(f"以前のセッションのクローズに失敗しました: {e}")
+
+    def _warn_closed_loop(self):
+        """終了済みのループに紐付くセッションを解放できない旨を警告"""
+        self.logger.warning(
+            "セッションを生成したイベントループが終了済みのため接続を解放できません"
+            "（ループの終了前に close() を呼び出してください）"
+        )
+
+    async def close(self):
+        """セッションをクローズ"""
+        session, self._session = self._session, None
+        self._loop = None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def close_sync(self):
+        """同期コンテキストからセッションをクローズ
+
+        セッションを生成したループが停止中であればそのループで完了まで実行し、
+        実行中であればクローズ処理をスケジュールする。終了済みのループの接続は
+        解放できないため、警告を出力して破棄する。
+        """
+        if not self.is_open:
+            self._session = None
+            self._loop = None
+            return
+
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._warn_closed_loop()
+            self._session = None
+            self._loop = None
+        elif loop.is_running():
+            loop.call_soon_threadsafe(asyncio.ensure_future, self.close())
+        else:
+            loop.run_until_complete(self.close())
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+RecRadiko 録音ベンチマーク
+
+ローカルRadikoモックサーバー（tests/utils/mock_radiko_server.py）に対して
+TimeFreeRecorder.record_program を実行し、オフラインで再現可能な性能値を計測します。
+
+計測項目:
+- 壁時計時間・実時間比（番組長 / 録音時間）・受信スループット
+- 録音プロセスのピークRSS
+- CPU時間（録音側・FFmpeg子プロセス・モックサーバースレッドを分けて集計）
+- RecordingResult.metrics（セグメントレイテンシのパーセンタイル・原因別リトライ等）
+
+使用例:
+    # 10分番組をMP3で録音
+    python tests/benchmark_recording.py --minutes 10
+
+    # 遅延50ms・帯域100Mbit/s・5%の503を注入して3回計測、JSONで出力
+    python tests/benchmark_recording.py --minutes 60 --latency-ms 50 --bandwidth-mbps 100 \\
+        --error-rate 0.05 --repeat 3 --json
+
+    # FFmpegを使わずダウンロード（一時TSファイルまで）のみ計測
+    python tests/benchmark_recording.py --minutes 180 --download-only
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.program_info import ProgramInfo
+from src.timefree_recorder import TimeFreeRecorder
+from tests.utils.mock_radiko_server import MockRadikoServer, MockServerConfig
+
+
+def _peak_rss_mb() -> float:
+    """プロセスのピークRSS (MB, Linux は KB・macOS はバイト単位で返る)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _cpu_seconds(who: int) -> float:
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+class RecordingBenchmark:
+    """モックサーバーに対する録音ベンチマーク"""
+
+    def __init__(self, server_config: MockServerConfig, minutes: int, output_format: str = "mp3",
+                 recording_config: Optional[Dict[str, Any]] = None, download_only: bool = False):
+        self.server_config = server_config
+        self.minutes = minutes
+        self.output_format = output_format
+        self.recording_config = recording_config or {}
+        self.download_only = download_only
+
+    def run(self) -> Dict[str, Any]:
+        """1回計測（作業ディレクトリは一時ディレクトリに切り替え、終了時に削除）"""
+        work_dir = Path(tempfile.mkdtemp(prefix="recradiko_benchmark_"))
+        original_cwd = os.getcwd()
+        try:
+            # 認証器が作成する暗号化キー等をリポジトリに残さない
+            os.chdir(work_dir)
+            return self._run_in(work_dir)
+        finally:
+            os.chdir(original_cwd)
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _run_in(self, work_dir: Path) -> Dict[str, Any]:
+        config_path = work_dir / "config.json"
+        config_path.write_text(json.dumps({
+            "recording": {
+                # 計測毎に全セグメントを通信で取得する
+                "segment_cache_enabled": False,
+                "resume_enabled": False,
+                **self.recording_config,
+            }
+        }), encoding='utf-8')
+
+        start_time = datetime(2025, 7, 22, 6, 0, 0)
+        program_info = ProgramInfo(
+            program_id=f"BENCH_{start_time.strftime('%Y%m%d%H%M%S')}",
+            station_id="BENCH",
+            station_name="ベンチマーク放送局",
+            title=f"ベンチマーク番組 ({self.minutes}分)",
+            start_time=start_time,
+            end_time=start_time + timedelta(minutes=self.minutes),
+            is_timefree_available=True
+        )
+        output_path = work_dir / f"benchmark.{self.output_format}"
+
+        with MockRadikoServer(self.server_config) as server:
+            authenticator = server.create_authenticator(str(work_dir / "auth_config.json"))
+            recorder = TimeFreeRecorder(authenticator, config_path=str(config_path))
+            server.configure_recorder(recorder)
+
+            async def run() -> Dict[str, Any]:
+                # 共有HTTPセッションはループ終了前にクローズ
+                async with recorder:
+                    if self.download_only:
+                        return await self._download_only(recorder, program_info)
+                    return await self._record(recorder, program_info, str(output_path))
+
+            cpu_self_start = _cpu_seconds(resource.RUSAGE_SELF)
+            cpu_children_start = _cpu_seconds(resource.RUSAGE_CHILDREN)
+            wall_start = time.perf_counter()
+            outcome = asyncio.run(run())
+            wall_seconds = time.perf_counter() - wall_start
+            cpu_self = _cpu_seconds(resource.RUSAGE_SELF) - cpu_self_start
+            cpu_children = _cpu_seconds(resource.RUSAGE_CHILDREN) - cpu_children_start
+
+        # サーバースレッドの CPU 時間は停止時に確定する
+        server_cpu = server.stats.cpu_seconds
+        media_seconds = self.minutes * 60
+        return {
+            **outcome,
+            'minutes': self.minutes,
+            'segments': server.stats.segments_served,
+            'wall_seconds': round(wall_seconds, 3),
+            'realtime_ratio': round(media_seconds / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+            'throughput_mbps': round(server.stats.bytes_sent * 8 / wall_seconds / 1_000_000, 2)
+            if wall_seconds > 0 else 0.0,
+            'peak_rss_mb': round(_peak_rss_mb(), 1),
+            'cpu_recorder_seconds': round(max(0.0, cpu_self - server_cpu), 3),
+            'cpu_ffmpeg_seconds': round(cpu_children, 3),
+            'cpu_server_seconds': round(server_cpu, 3),
+            'server_requests': dict(server.stats.requests),
+            'server_errors_injected': server.stats.errors_injected,
+            'server_tokens_expired': server.stats.tokens_expired,
+        }
+
+    async def _record(self, recorder: TimeFreeRecorder, program_info: ProgramInfo,
+                      output_path: str) -> Dict[str, Any]:
+        result = await recorder.record_program(program_info, output_path)
+        return {
+            'success': result.success,
+            'file_size_bytes': result.file_size_bytes,
+            'errors': result.error_messages,
+            'metrics': result.metrics.to_dict() if result.metrics else None,
+        }
+
+    async def _download_only(self, recorder: TimeFreeRecorder, program_info: ProgramInfo) -> Dict[str, Any]:
+        """変換を行わず、プレイリスト取得から一時TSファイルへの書き込みまでを計測"""
+        from src.recording_metrics import RecordingMetrics
+
+        metrics = RecordingMetrics(program_id=program_info.program_id, station_id=program_info.station_id)
+        # 録音時と同様に先頭の時間窓を取得した時点でダウンロードを開始
+        segment_windows = recorder._iter_segment_windows(
+            program_info.station_id, program_info.start_time, program_info.end_time
+        )
+        try:
+            playlist_start = time.monotonic()
+            segment_urls = []
+            async for window_urls in segment_windows:
+                segment_urls.extend(window_urls)
+                if segment_urls:
+                    break
+            metrics.playlist_seconds = time.monotonic() - playlist_start
+            temp_ts_path = await recorder._download_to_temp_file(
+                segment_urls, metrics=metrics, segment_windows=segment_windows
+            )
+            file_size = os.path.getsize(temp_ts_path)
+            os.unlink(temp_ts_path)
+            metrics.success = True
+            return {'success': True, 'file_size_bytes': file_size, 'errors': [],
+                    'metrics': metrics.to_dict()}
+        except Exception as e:
+            await segment_windows.aclose()
+            metrics.success = False
+            return {'success': False, 'file_size_bytes': 0, 'errors': [str(e)],
+                    'metrics': metrics.to_dict()}
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """複数回の計測結果の中央値"""
+    keys = ('wall_seconds', 'realtime_ratio', 'throughput_mbps', 'peak_rss_mb',
+            'cpu_recorder_seconds', 'cpu_ffmpeg_seconds', 'cpu_server_seconds')
+    return {key: round(statistics.median(run[key] for run in runs), 3) for key in keys}
+
+
+def format_report(runs: List[Dict[str, Any]]) -> str:
+    """人が読む形式の計測結果"""
+    lines = []
+    for i, run in enumerate(runs, 1):
+        status = "成功" if run['success'] else f"失敗 ({'; '.join(run['errors'])})"
+        latency = (run['metrics'] or {}).get('segment_latency_seconds', {})
+        retries = (run['metrics'] or {}).get('retries_by_cause', {})
+        lines.append(
+            f"[{i}] {run['minutes']}分番組 {run['segments']}セグメント: {status}\n"
+            f"    時間 {run['wall_seconds']:.2f}秒 (実時間の{run['realtime_ratio']}倍), "
+            f"受信 {run['throughput_mbps']}Mbit/s, ピークRSS {run['peak_rss_mb']}MB\n"
+            f"    CPU 録音 {run['cpu_recorder_seconds']:.2f}秒 / FFmpeg {run['cpu_ffmpeg_seconds']:.2f}秒 / "
+            f"サーバー {run['cpu_server_seconds']:.2f}秒\n"
+            f"    レイテンシ {latency}, リトライ {retries}"
+        )
+    if len(runs) > 1:
+        lines.append(f"中央値: {summarize(runs)}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ローカルモックサーバーに対する録音ベンチマーク")
+    parser.add_argument('--minutes', type=int, default=10, help="番組の長さ（分）")
+    parser.add_argument('--format', default="mp3", help="出力形式 (mp3/aac/m4a)")
+    parser.add_argument('--repeat', type=int, default=1, help="計測回数")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="サーバー応答遅延（ミリ秒）")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="応答遅延の揺らぎ（ミリ秒）")
+    parser.add_argument('--bandwidth-mbps', type=float, default=0.0, help="サーバー送信帯域 (Mbit/s, 0 は無制限)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="セグメント要求のエラー応答の割合")
+    parser.add_argument('--error-status', type=int, default=503, help="注入するエラーのHTTPステータス")
+    parser.add_argument('--token-lifetime', type=int, default=None, help="トークンを失効させるまでのセグメント要求数")
+    parser.add_argument('--seed', type=int, default=0, help="乱数シード")
+    parser.add_argument('--set', action='append', default=[], metavar="KEY=VALUE",
+                        help="recording 設定の上書き（値はJSONとして解釈, 例: --set pipeline_conversion=true）")
+    parser.add_argument('--download-only', action='store_true', help="変換せずダウンロードのみ計測")
+    parser.add_argument('--json', action='store_true', help="計測結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    recording_config = {}
+    for item in args.set:
+        key, _, value = item.partition('=')
+        try:
+            recording_config[key] = json.loads(value)
+        except json.JSONDecodeError:
+            recording_config[key] = value
+
+    server_config = MockServerConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        bandwidth_mbps=args.bandwidth_mbps,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        token_lifetime_requests=args.token_lifetime,
+        seed=args.seed,
+    )
+    benchmark = RecordingBenchmark(server_config, args.minutes, args.format,
+                                   recording_config, args.download_only)
+    runs = [benchmark.run() for _ in range(args.repeat)]
+
+    if args.json:
+        print(json.dumps({'runs': runs, 'median': summarize(runs)}, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(runs))
+    return 0 if all(run['success'] for run in runs) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -26,6 +26,22 @@ def temp_env():
         yield env
 
 
+@pytest.fixture(autouse=True)
+def isolated_segment_store(tmp_path, monkeypatch):
+    """永続セグメントキャッシュをテスト毎に分離（テスト間でのキャッシュヒットを防止）"""
+    monkeypatch.setattr(
+        "src.timefree_recorder.DEFAULT_SEGMENT_CACHE_DIR", str(tmp_path / "segment_cache")
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolated_spool(tmp_path, monkeypatch):
+    """録音再開用スプールをテスト毎に分離（ホームディレクトリへの書き込みを防止）"""
+    monkeypatch.setattr(
+        "src.timefree_recorder.DEFAULT_SPOOL_DIR", str(tmp_path / "spool")
+    )
+
+
 @pytest.fixture
 def real_test_base():
     """実環境テストベースfixture"""
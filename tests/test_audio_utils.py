@@ -0,0 +1,146 @@
+"""
+audio_utils単体テスト（TDD手法）
+
+ADTSフレームヘッダーからの再生時間算出（分割入力・ID3タグ・非ADTSデータ）をテスト。
+"""
+
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+
+# テスト対象
+from src.utils.audio_utils import (
+    AdtsDurationCounter, adts_duration, adts_file_duration, adts_file_segments,
+    mp3_frame_header, iter_audio_frames
+)
+from tests.utils.test_environment import TemporaryTestEnvironment
+
+
+FRAME_SECONDS_48K = 1024 / 48000
+
+
+class TestAdtsDuration(unittest.TestCase):
+    """ADTS再生時間算出テスト"""
+
+    def test_01_フレームヘッダーから再生時間算出(self):
+        """
+        TDD Test: フレームヘッダーから再生時間算出
+
+        ID3タグを読み飛ばし、フレーム数×1024サンプル÷サンプリング周波数となることを確認
+        """
+        # Given: 48kHz・235フレーム（約5秒）のセグメント
+        segment = TemporaryTestEnvironment.build_adts_segment(235)
+
+        # Then: 再生時間が算出される
+        self.assertAlmostEqual(adts_duration(segment), 235 * FRAME_SECONDS_48K, places=6)
+
+        # And: 44.1kHz の場合
+        segment = TemporaryTestEnvironment.build_adts_segment(100, sample_rate_index=4)
+        self.assertAlmostEqual(adts_duration(segment), 100 * 1024 / 44100, places=6)
+
+    def test_02_任意位置で分割した入力の逐次集計(self):
+        """
+        TDD Test: 任意位置で分割した入力の逐次集計
+
+        複数セグメントを連結したストリームを任意の位置で分割して与えても結果が変わらないことを確認
+        """
+        # Given: 3セグメント連結したストリーム
+        stream = b"".join(TemporaryTestEnvironment.build_adts_segment(n) for n in (10, 20, 30))
+
+        for chunk_size in (1, 5, 7, 13, 4096):
+            # When: chunk_size毎に分割して入力
+            counter = AdtsDurationCounter()
+            for offset in range(0, len(stream), chunk_size):
+                counter.feed(stream[offset:offset + chunk_size])
+
+            # Then: 全フレームが集計される
+            self.assertEqual(counter.frames, 60, chunk_size)
+            self.assertAlmostEqual(counter.seconds, 60 * FRAME_SECONDS_48K, places=6)
+
+    def test_03_ADTS以外のデータ(self):
+        """
+        TDD Test: ADTS以外のデータ
+
+        ADTSでないデータは0秒、ファイル先頭がADTSでない場合は解析しないことを確認
+        """
+        self.assertEqual(adts_duration(b"\x47" + b"\x00" * 187), 0.0)
+        self.assertEqual(adts_duration(b""), 0.0)
+
+        temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+
+        # MPEG-TS（同期バイト0x47）
+        ts_file = temp_dir / "sample.ts"
+        ts_file.write_bytes((b"\x47" + b"\xff" * 187) * 10)
+        self.assertEqual(adts_file_duration(ts_file), 0.0)
+
+        # ADTS（読み込み単位を跨ぐフレームを含む）
+        aac_file = temp_dir / "sample.aac"
+        aac_file.write_bytes(TemporaryTestEnvironment.build_adts_segment(50) * 2)
+        self.assertAlmostEqual(adts_file_duration(aac_file, chunk_size=100),
+                               100 * FRAME_SECONDS_48K, places=6)
+
+    def test_04_セグメント位置の取得(self):
+        """
+        TDD Test: セグメント位置の取得
+
+        ID3タグ毎にバイト位置とその時点の再生時間が記録され、分割入力でも位置が変わらないことを確認
+        """
+        # Given: 10・20・30フレームの3セグメント
+        segments = [TemporaryTestEnvironment.build_adts_segment(n) for n in (10, 20, 30)]
+        stream = b"".join(segments)
+        expected = [
+            (0, 0.0),
+            (len(segments[0]), 10 * FRAME_SECONDS_48K),
+            (len(segments[0]) + len(segments[1]), 30 * FRAME_SECONDS_48K),
+        ]
+
+        for chunk_size in (1, 7, 4096):
+            # When: chunk_size毎に分割して入力
+            counter = AdtsDurationCounter()
+            for offset in range(0, len(stream), chunk_size):
+                counter.feed(stream[offset:offset + chunk_size])
+
+            # Then: セグメント先頭の位置と再生時間
+            self.assertEqual([offset for offset, _ in counter.segment_starts],
+                             [offset for offset, _ in expected], chunk_size)
+            for (_, seconds), (_, expected_seconds) in zip(counter.segment_starts, expected):
+                self.assertAlmostEqual(seconds, expected_seconds, places=6)
+
+        # And: ファイルから取得
+        temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        aac_file = temp_dir / "sample.aac"
+        aac_file.write_bytes(stream)
+        starts, total = adts_file_segments(aac_file, chunk_size=100)
+        self.assertEqual(len(starts), 3)
+        self.assertAlmostEqual(total, 60 * FRAME_SECONDS_48K, places=6)
+
+    def test_05_MP3_ADTSフレームの列挙(self):
+        """
+        TDD Test: MP3・ADTSフレームの列挙
+
+        フレームヘッダーからフレーム長を求めて列挙し、途中で途切れたデータはエラーとなることを確認
+        """
+        # Given: MPEG-1 Layer III 128kbps 48kHz（384バイト）と 44.1kHz パディングあり（418バイト）
+        frame_48k = bytes([0xFF, 0xFB, 0x94, 0xC4]) + b"\x00" * 380
+        frame_44k = bytes([0xFF, 0xFB, 0x92, 0xC4]) + b"\x00" * 414
+        self.assertEqual(mp3_frame_header(frame_48k[:4]), (384, 1152))
+        self.assertEqual(mp3_frame_header(frame_44k[:4]), (418, 1152))
+        self.assertEqual(mp3_frame_header(b"ID3\x04"), (0, 0))
+
+        # Then: フレーム列挙
+        mp3 = frame_48k + frame_44k + frame_48k
+        self.assertEqual(list(iter_audio_frames(mp3, 'mp3')), [(0, 384), (384, 418), (802, 384)])
+
+        adts = TemporaryTestEnvironment.build_adts_segment(3)[30:]
+        self.assertEqual(list(iter_audio_frames(adts, 'adts')), [(0, 39), (39, 39), (78, 39)])
+
+        # And: 途切れたデータはエラー
+        with self.assertRaises(ValueError):
+            list(iter_audio_frames(mp3[:-1], 'mp3'))
+
+
+if __name__ == '__main__':
+    unittest.main()
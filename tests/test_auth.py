@@ -399,6 +399,41 @@ class TestRadikoAuthenticatorLocationServices(unittest.TestCase, RealEnvironment
         self.assertIsNone(authenticator.auth_info)
         self.assertIsNone(authenticator.location_info)
         self.assertFalse(authenticator.is_authenticated())
+    
+    def test_09_タイムフリー認証の強制再取得(self):
+        """
+        TDD Test: タイムフリー認証の強制再取得
+        
+        有効期限内でもforce_refresh指定時は基本認証からやり直して新しいトークンを取得することを確認
+        """
+        # Given: 有効期限内の認証情報（サーバー側では失効済み）
+        config_path = self.temp_env.config_dir / "auth_config.json"
+        authenticator = RadikoAuthenticator(config_path=str(config_path))
+        authenticator.auth_info = AuthInfo(
+            auth_token="revoked_token",
+            area_id="JP13",
+            expires_at=time.time() + 1800,
+            timefree_session="revoked_token",
+            timefree_expires_at=time.time() + 1800
+        )
+        renewed_auth_info = AuthInfo(
+            auth_token="renewed_token",
+            area_id="JP13",
+            expires_at=time.time() + 3600
+        )
+        
+        with patch.object(authenticator, 'authenticate', return_value=renewed_auth_info) as mock_authenticate:
+            # When: 通常取得ではキャッシュを使用
+            self.assertEqual(authenticator.authenticate_timefree(), "revoked_token")
+            mock_authenticate.assert_not_called()
+            
+            # When: 強制再取得
+            token = authenticator.authenticate_timefree(force_refresh=True)
+        
+        # Then: 基本認証からやり直した新しいトークン
+        self.assertEqual(token, "renewed_token")
+        mock_authenticate.assert_called_once()
+        self.assertEqual(authenticator.session.headers['X-Radiko-AuthToken'], "renewed_token")
 
 
 if __name__ == "__main__":
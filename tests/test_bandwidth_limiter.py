@@ -0,0 +1,145 @@
+"""
+BandwidthLimiter単体テスト（TDD手法）
+
+トークンバケットによる帯域制限・時間帯スケジュール・設定からの共有インスタンス取得をテスト。
+"""
+
+import unittest
+import requests
+from datetime import datetime, time as dtime
+from unittest.mock import patch, MagicMock
+
+# テスト対象
+from src.bandwidth_limiter import BandwidthLimiter, BandwidthWindow, shared_bandwidth_limiter
+from src.utils.network_utils import create_radiko_session
+
+
+class FakeClock:
+    """テスト用の単調時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBandwidthLimiter(unittest.TestCase):
+    """BandwidthLimiter基本機能テスト"""
+
+    def test_01_上限帯域を超える受信量は待機(self):
+        """
+        TDD Test: 上限帯域を超える受信量は待機
+
+        バケット容量を超えた受信量に応じて上限帯域で補充されるまで待機することを確認
+        """
+        # Given: 8Mbit/s（1,000,000バイト/秒）・バケット容量1秒分
+        clock = FakeClock()
+        limiter = BandwidthLimiter(limit_mbps=8, clock=clock)
+
+        with patch('time.sleep') as mock_sleep:
+            # When: バケット容量分の受信
+            limiter.throttle(1_000_000)
+
+            # Then: 待機しない
+            mock_sleep.assert_not_called()
+
+            # When: 続けて500,000バイト受信
+            limiter.throttle(500_000)
+
+            # Then: 0.5秒待機
+            self.assertAlmostEqual(mock_sleep.call_args.args[0], 0.5)
+
+            # When: 前借り分の補充後（0.5秒経過）にさらに250,000バイト受信
+            clock.now += 0.5
+            limiter.throttle(250_000)
+
+            # Then: 0.25秒待機
+            self.assertAlmostEqual(mock_sleep.call_args.args[0], 0.25)
+
+        self.assertEqual(limiter.bytes_total, 1_750_000)
+        self.assertAlmostEqual(limiter.throttled_seconds, 0.75)
+
+    def test_02_時間帯スケジュール(self):
+        """
+        TDD Test: 時間帯スケジュール
+
+        時間帯毎の上限が適用され、日付を跨ぐ時間帯・スケジュール外の既定値が扱われることを確認
+        """
+        # Given: 業務時間は5Mbit/s、深夜帯は20Mbit/s、それ以外は無制限
+        now = {'value': datetime(2025, 7, 22, 10, 0)}
+        limiter = BandwidthLimiter(
+            limit_mbps=0,
+            schedule=[
+                BandwidthWindow.from_dict({"start": "09:00", "end": "18:00", "limit_mbps": 5}),
+                BandwidthWindow.from_dict({"start": "23:00", "end": "05:00", "limit_mbps": 20}),
+            ],
+            clock=FakeClock(),
+            wall_clock=lambda: now['value']
+        )
+
+        # Then: 現在時刻に応じた上限
+        self.assertEqual(limiter.current_limit_mbps(), 5)
+        now['value'] = datetime(2025, 7, 22, 2, 0)
+        self.assertEqual(limiter.current_limit_mbps(), 20)
+        now['value'] = datetime(2025, 7, 22, 20, 0)
+        self.assertEqual(limiter.current_limit_mbps(), 0)
+
+        # And: 無制限の時間帯は待機しない
+        with patch('time.sleep') as mock_sleep:
+            limiter.throttle(100 * 1024 * 1024)
+        mock_sleep.assert_not_called()
+
+        # And: 境界時刻は開始側に含まれる
+        window = BandwidthWindow(dtime(9, 0), dtime(18, 0), 5)
+        self.assertTrue(window.contains(dtime(9, 0)))
+        self.assertFalse(window.contains(dtime(18, 0)))
+
+    def test_03_設定からの共有インスタンス取得(self):
+        """
+        TDD Test: 設定からの共有インスタンス取得
+
+        同じ設定は同一インスタンスを共有し、未設定時はNone、不正なスケジュールは無視されることを確認
+        """
+        config = {"bandwidth_limit_mbps": 10,
+                  "bandwidth_schedule": [{"start": "09:00", "end": "18:00"}]}
+
+        # When: 同じ設定で2回取得
+        limiter = shared_bandwidth_limiter(config)
+        other = shared_bandwidth_limiter(dict(config))
+
+        # Then: 同一インスタンス（不正なスケジュールは除外）
+        self.assertIs(limiter, other)
+        self.assertEqual(limiter.limit_mbps, 10)
+        self.assertEqual(limiter.schedule, [])
+
+        # And: 異なる設定は別インスタンス、未設定はNone
+        self.assertIsNot(shared_bandwidth_limiter({"bandwidth_limit_mbps": 20}), limiter)
+        self.assertIsNone(shared_bandwidth_limiter({}))
+        self.assertIsNone(BandwidthLimiter.from_config({"bandwidth_limit_mbps": 0}))
+
+    def test_04_セッションの受信量を帯域制限に計上(self):
+        """
+        TDD Test: セッションの受信量を帯域制限に計上
+
+        stream=False の応答本文は受信後に帯域を消費し、stream=True の応答は計上しないことを確認
+        """
+        # Given: 帯域制限付きセッション
+        limiter = MagicMock()
+        session = create_radiko_session(bandwidth_limiter=limiter)
+
+        response = requests.Response()
+        response._content = b"x" * 1234
+        response.status_code = 200
+
+        # When: 応答フックを実行
+        for hook in session.hooks['response']:
+            hook(response, stream=False)
+            hook(response, stream=True)
+
+        # Then: stream=False の応答のみ計上
+        limiter.throttle.assert_called_once_with(1234)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+分割変換計画単体テスト（TDD手法）
+
+セグメント境界での分割・フレーム格子への整列・採用フレーム範囲の連続性をテスト。
+"""
+
+import unittest
+
+# テスト対象
+from src.chunked_transcode import OVERLAP_SEGMENTS, output_frame_size, plan_transcode_chunks
+
+
+SEGMENT_SECONDS = 235 * 1024 / 48000
+SEGMENT_BYTES = 30_000
+
+
+def build_segments(count: int):
+    """5秒弱（235フレーム）のセグメント一覧"""
+    return [(i * SEGMENT_BYTES, i * SEGMENT_SECONDS) for i in range(count)]
+
+
+class TestChunkedTranscodePlan(unittest.TestCase):
+    """分割変換計画テスト"""
+
+    def test_01_フレーム格子に揃った連続する採用範囲(self):
+        """
+        TDD Test: フレーム格子に揃った連続する採用範囲
+
+        各チャンクの入力先頭が削除後にフレーム境界へ揃い、採用フレームが隙間・重複なく
+        番組全体を覆うことを確認
+        """
+        segments = build_segments(360)
+        total = 360 * SEGMENT_SECONDS
+
+        for codec, sample_rate in (('libmp3lame', 48000), ('libmp3lame', 44100),
+                                   ('libmp3lame', 24000), ('aac', 48000)):
+            frame_size = output_frame_size(codec, sample_rate)
+            chunks = plan_transcode_chunks(segments, total, 360 * SEGMENT_BYTES, 8, sample_rate, frame_size)
+            self.assertEqual(len(chunks), 8)
+
+            next_frame = 0
+            for chunk in chunks:
+                # Then: 入力はセグメント境界、前後のチャンクと重なる
+                self.assertEqual(chunk.input_start % SEGMENT_BYTES, 0)
+                self.assertEqual(chunk.input_end % SEGMENT_BYTES, 0)
+                input_samples = round(chunk.input_start // SEGMENT_BYTES * SEGMENT_SECONDS * sample_rate)
+
+                # And: 削除後の入力先頭はフレーム境界
+                self.assertLess(chunk.trim_samples, frame_size)
+                self.assertEqual((input_samples + chunk.trim_samples) % frame_size, 0)
+
+                # And: 採用範囲は直前のチャンクの続き
+                first_frame = (input_samples + chunk.trim_samples) // frame_size + chunk.skip_frames
+                self.assertEqual(first_frame, next_frame, (codec, sample_rate, chunk))
+                if chunk.keep_frames is not None:
+                    next_frame = first_frame + chunk.keep_frames
+
+            # And: 最終チャンクはファイル末尾まで
+            self.assertIsNone(chunks[-1].keep_frames)
+            self.assertEqual(chunks[-1].input_end, 360 * SEGMENT_BYTES)
+            self.assertEqual(chunks[0].skip_frames, 0)
+
+    def test_02_重ねたセグメントは読み捨て(self):
+        """
+        TDD Test: 重ねたセグメントは読み捨て
+
+        2番目以降のチャンクは直前のセグメントから入力し、その分を先頭フレームとして読み捨てることを確認
+        """
+        segments = build_segments(40)
+        chunks = plan_transcode_chunks(segments, 40 * SEGMENT_SECONDS, 40 * SEGMENT_BYTES, 4, 48000, 1152)
+
+        # Then: 等分位置（10・20・30セグメント目）で分割
+        self.assertEqual([c.input_start // SEGMENT_BYTES for c in chunks], [0, 9, 19, 29])
+        self.assertEqual([c.input_end // SEGMENT_BYTES for c in chunks], [11, 21, 31, 40])
+
+        # And: 読み捨ては重ねた1セグメント分（フレーム単位の端数を含む）
+        preroll_frames = OVERLAP_SEGMENTS * SEGMENT_SECONDS * 48000 / 1152
+        for chunk in chunks[1:]:
+            self.assertAlmostEqual(chunk.skip_frames, preroll_frames, delta=1)
+
+    def test_03_分割できない入力(self):
+        """
+        TDD Test: 分割できない入力
+
+        セグメント数が足りない場合やID3タグから始まらない入力は分割しないことを確認
+        """
+        self.assertEqual(plan_transcode_chunks(build_segments(7), 35.0, 210_000, 4, 48000, 1152), [])
+        self.assertEqual(plan_transcode_chunks([], 0.0, 0, 4, 48000, 1152), [])
+        self.assertEqual(plan_transcode_chunks([(100, 0.0), (200, 5.0)] * 4, 40.0, 1000, 2, 48000, 1152), [])
+
+        # And: 少ない場合は分割数を減らす
+        self.assertEqual(len(plan_transcode_chunks(build_segments(9), 45.0, 270_000, 8, 48000, 1152)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
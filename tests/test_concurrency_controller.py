@@ -0,0 +1,185 @@
+"""
+AdaptiveConcurrencyController単体テスト（TDD手法）
+
+AIMDによるセグメント並行数の増加・減少・上下限・枠取得制御をテスト。
+"""
+
+import unittest
+import asyncio
+import gc
+from unittest.mock import patch
+
+# テスト対象
+from src.concurrency_controller import AdaptiveConcurrencyController, ConcurrencySlot
+
+
+class TestAdaptiveConcurrencyController(unittest.TestCase):
+    """AdaptiveConcurrencyController基本機能テスト"""
+
+    def _slot(self, controller, latency=0.1):
+        """指定レイテンシで完了した枠を生成"""
+        return _FixedLatencySlot(controller._epoch, latency)
+
+    def test_01_健全な応答継続で加算増加(self):
+        """
+        TDD Test: 健全な応答継続で加算増加
+
+        現在の並行数分の正常応答ごとに並行数が1ずつ増えることを確認
+        """
+        # Given: 初期並行数2のコントローラー
+        controller = AdaptiveConcurrencyController(initial_limit=2, min_limit=1, max_limit=4)
+
+        # When: 正常応答が2件・3件と続く
+        for _ in range(2):
+            controller.record_success(self._slot(controller))
+        self.assertEqual(controller.limit, 3)
+        for _ in range(3):
+            controller.record_success(self._slot(controller))
+
+        # Then: 並行数が増加し、理由が記録される
+        self.assertEqual(controller.limit, 4)
+        self.assertEqual(len(controller.adjustments), 2)
+        self.assertIn("正常応答継続", controller.adjustments[0].reason)
+
+        # And: 上限を超えない
+        for _ in range(10):
+            controller.record_success(self._slot(controller))
+        self.assertEqual(controller.limit, 4)
+        self.assertEqual(controller.peak_limit, 4)
+
+    def test_02_輻輳応答で乗算減少(self):
+        """
+        TDD Test: 輻輳応答で乗算減少
+
+        429/5xx/タイムアウトで並行数が半減し、同じ世代の失敗では重ねて減少しないことを確認
+        """
+        # Given: 並行数16のコントローラー
+        controller = AdaptiveConcurrencyController(initial_limit=16, min_limit=2, max_limit=32)
+        same_epoch_slots = [self._slot(controller) for _ in range(3)]
+
+        # When: 同時に送信したリクエストが輻輳応答を受ける
+        for slot in same_epoch_slots:
+            controller.record_congestion(slot, "HTTP 429")
+
+        # Then: 減少は1回のみ
+        self.assertEqual(controller.limit, 8)
+        self.assertEqual(len(controller.adjustments), 1)
+        self.assertEqual(controller.adjustments[0].reason, "HTTP 429")
+        self.assertEqual(str(controller.adjustments[0]), "16→8: HTTP 429")
+
+        # And: 減少後のリクエストの輻輳では再度減少し、下限で止まる
+        for _ in range(5):
+            controller.record_congestion(self._slot(controller), "タイムアウト")
+        self.assertEqual(controller.limit, 2)
+
+    def test_03_レイテンシ悪化とエラーで増加保留(self):
+        """
+        TDD Test: レイテンシ悪化とエラーで増加保留
+
+        観測最小値の許容倍率を超えるレイテンシや一般エラーでは並行数を増やさないことを確認
+        """
+        # Given: 初期並行数2のコントローラー
+        controller = AdaptiveConcurrencyController(initial_limit=2, max_limit=8, latency_tolerance=2.0)
+        controller.record_success(self._slot(controller, latency=0.1))
+
+        # When: 遅い応答・エラーが交互に発生
+        controller.record_success(self._slot(controller, latency=0.5))
+        controller.record_success(self._slot(controller, latency=0.1))
+        controller.record_error(self._slot(controller))
+        controller.record_success(self._slot(controller, latency=0.1))
+
+        # Then: 並行数は変わらない
+        self.assertEqual(controller.limit, 2)
+        self.assertEqual(controller.adjustments, [])
+
+    def test_04_並行数の範囲内で枠を取得(self):
+        """
+        TDD Test: 並行数の範囲内で枠を取得
+
+        同時に取得される枠が並行数を超えず、増加時に待機中の枠取得が再開されることを確認
+        """
+        async def run_test():
+            # Given: 並行数1のコントローラー
+            controller = AdaptiveConcurrencyController(initial_limit=1, min_limit=1, max_limit=2)
+            observed = {'max_in_flight': 0}
+            release = asyncio.Event()
+
+            async def worker():
+                async with controller.slot():
+                    observed['max_in_flight'] = max(observed['max_in_flight'], controller.in_flight)
+                    await release.wait()
+
+            # When: 2件同時に枠を要求
+            tasks = [asyncio.create_task(worker()) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            self.assertEqual(controller.in_flight, 1)
+
+            # Then: 並行数の増加で待機中の枠取得が再開される
+            controller.record_success(self._slot(controller))
+            await asyncio.sleep(0.01)
+            self.assertEqual(controller.in_flight, 2)
+
+            release.set()
+            await asyncio.gather(*tasks)
+            self.assertEqual(controller.in_flight, 0)
+            self.assertEqual(observed['max_in_flight'], 2)
+
+        asyncio.run(run_test())
+
+    def test_05_増加時の通知タスクを完了まで保持(self):
+        """
+        TDD Test: 増加時の通知タスクを完了まで保持
+
+        並行数増加時の待機者通知タスクが完了まで参照され（GCで消えず）、
+        完了後に解放され、失敗した場合は警告が記録されることを確認
+        """
+        async def run_test():
+            # Given: 並行数1で1件が枠を待機中
+            controller = AdaptiveConcurrencyController(initial_limit=1, min_limit=1, max_limit=3)
+            release = asyncio.Event()
+
+            async def worker():
+                async with controller.slot():
+                    await release.wait()
+
+            tasks = [asyncio.create_task(worker()) for _ in range(2)]
+            await asyncio.sleep(0.01)
+
+            # When: 並行数を増加させ、通知タスクの実行前にGCを実行
+            controller.record_success(self._slot(controller))
+            self.assertEqual(len(controller._notify_tasks), 1)
+            gc.collect()
+            await asyncio.sleep(0.01)
+
+            # Then: 待機中の枠取得が再開され、完了した通知タスクは解放される
+            self.assertEqual(controller.in_flight, 2)
+            self.assertEqual(controller._notify_tasks, set())
+
+            # And: 通知に失敗した場合は警告を記録
+            with patch.object(controller, '_notify', side_effect=RuntimeError("通知失敗")):
+                with self.assertLogs(controller.logger, level='WARNING') as logs:
+                    controller._set_limit(3, "テスト")
+                    await asyncio.sleep(0.01)
+            self.assertIn("通知失敗", "\n".join(logs.output))
+            self.assertEqual(controller._notify_tasks, set())
+
+            release.set()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run_test())
+
+
+class _FixedLatencySlot(ConcurrencySlot):
+    """レイテンシを固定したテスト用の枠"""
+
+    def __init__(self, epoch: int, latency: float):
+        super().__init__(epoch=epoch, started_at=0.0)
+        self._latency = latency
+
+    @property
+    def elapsed(self) -> float:
+        return self._latency
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+ローカルRadikoモックサーバー結合テスト（TDD手法）
+
+モックサーバーに対して実際の認証・プレイリスト取得・セグメントダウンロードを実行し、
+時間窓分割・エラー注入・トークン失効からの回復と、ベンチマークの計測結果をテスト。
+"""
+
+import unittest
+import asyncio
+import gc
+import warnings
+from datetime import datetime, timedelta
+
+# テスト対象
+from src.timefree_recorder import TimeFreeRecorder
+from src.program_info import ProgramInfo
+from src.recording_metrics import RecordingMetrics
+from src.utils.audio_utils import adts_duration
+from tests.benchmark_recording import RecordingBenchmark
+from tests.utils.mock_radiko_server import MockRadikoServer, MockServerConfig
+from tests.utils.test_environment import TemporaryTestEnvironment, RealEnvironmentTestBase
+
+
+class TestMockRadikoServer(unittest.TestCase, RealEnvironmentTestBase):
+    """モックサーバーに対する録音処理テスト"""
+
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        self.temp_env.update_config_data({"recording": {
+            "segment_cache_enabled": False,
+            "resume_enabled": False,
+            "retry_base_delay": 0.01,
+            "playlist_slice_threshold_minutes": 20,
+            "playlist_slice_minutes": 10,
+        }})
+
+        self.start_time = datetime(2025, 7, 22, 6, 0, 0)
+        self.program = ProgramInfo(
+            program_id="TBS_20250722_060000",
+            station_id="TBS",
+            station_name="TBSラジオ",
+            title="テスト番組",
+            start_time=self.start_time,
+            end_time=self.start_time + timedelta(minutes=30),
+            is_timefree_available=True
+        )
+
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+
+    def _download(self, server: MockRadikoServer):
+        """モックサーバーから番組全体をダウンロード"""
+        authenticator = server.create_authenticator(str(self.temp_env.config_dir / "auth_config.json"))
+        recorder = TimeFreeRecorder(authenticator, config_path=str(self.temp_env.config_file))
+        server.configure_recorder(recorder)
+        metrics = RecordingMetrics()
+
+        async def run():
+            async with recorder:
+                segment_urls = await recorder._fetch_segment_urls(
+                    self.program.station_id, self.program.start_time, self.program.end_time
+                )
+                segments = await recorder._download_segments_concurrent(segment_urls, metrics=metrics)
+                return segment_urls, segments
+
+        segment_urls, segments = asyncio.run(run())
+        return segment_urls, segments, metrics
+
+    def test_01_時間窓分割したプレイリストから番組全体を取得(self):
+        """
+        TDD Test: 時間窓分割したプレイリストから番組全体を取得
+
+        auth1/auth2 を経て、分割取得したプレイリストの境界が重複なく連結され、
+        番組の長さ分のADTSセグメントが取得できることを確認
+        """
+        with MockRadikoServer() as server:
+            # When: 30分番組（10分毎の3区間）をダウンロード
+            segment_urls, segments, metrics = self._download(server)
+
+            # Then: 5秒セグメント360個が重複なく時系列順
+            self.assertEqual(len(segment_urls), 360)
+            self.assertEqual(len(set(segment_urls)), 360)
+            self.assertEqual(segment_urls, sorted(segment_urls))
+            self.assertEqual(server.stats.requests['playlist'], 3)
+            self.assertEqual(server.stats.requests['auth2'], 1)
+
+            # And: 番組の長さ分の音声
+            duration = sum(adts_duration(segment) for segment in segments)
+            self.assertAlmostEqual(duration, 30 * 60, delta=5)
+            self.assertEqual(metrics.bytes_downloaded, 360 * server.segment_size)
+
+    def test_02_エラー注入とトークン失効からの回復(self):
+        """
+        TDD Test: エラー注入とトークン失効からの回復
+
+        注入した503は再試行され、失効したトークンは再認証されて全セグメントが取得できることを確認
+        """
+        # Given: 3%の503と、100要求毎のトークン失効
+        config = MockServerConfig(latency_ms=1, latency_jitter_ms=2, error_rate=0.03,
+                                  token_lifetime_requests=100, seed=7)
+        with MockRadikoServer(config) as server:
+            # When: ダウンロード
+            _, segments, metrics = self._download(server)
+
+            # Then: 全セグメント取得
+            self.assertEqual(len(segments), 360)
+
+            # And: 注入したエラー分の再試行とトークン再取得
+            self.assertGreater(server.stats.errors_injected, 0)
+            self.assertEqual(metrics.retries_by_cause.get("HTTP 503"), server.stats.errors_injected)
+            self.assertGreater(server.stats.tokens_expired, 0)
+            self.assertGreater(metrics.token_refreshes, 0)
+
+    def test_03_ベンチマークの計測結果(self):
+        """
+        TDD Test: ベンチマークの計測結果
+
+        ダウンロードのみのベンチマークが受信量・時間・CPU・ピークRSSを報告することを確認
+        """
+        # When: 5分番組をダウンロードのみで計測
+        run = RecordingBenchmark(MockServerConfig(), minutes=5, download_only=True).run()
+
+        # Then: 計測結果
+        self.assertTrue(run['success'], run['errors'])
+        self.assertEqual(run['segments'], 60)
+        self.assertGreater(run['wall_seconds'], 0)
+        self.assertGreater(run['throughput_mbps'], 0)
+        self.assertGreater(run['peak_rss_mb'], 0)
+        self.assertEqual(run['metrics']['segments_downloaded'], 60)
+        self.assertIn('p95', run['metrics']['segment_latency_seconds'])
+
+    def test_04_ループ終了前のクローズでキープアライブ接続を解放(self):
+        """
+        TDD Test: ループ終了前のクローズでキープアライブ接続を解放
+
+        asyncio.run を繰り返しても、async with で終了前にクローズしたセッションは
+        キープアライブ接続を含めて解放され、ResourceWarning が発生しないことを確認
+        """
+        with MockRadikoServer() as server:
+            authenticator = server.create_authenticator(str(self.temp_env.config_dir / "auth_config.json"))
+            recorder = TimeFreeRecorder(authenticator, config_path=str(self.temp_env.config_file))
+            server.configure_recorder(recorder)
+
+            async def run():
+                async with recorder:
+                    segment_urls = await recorder._fetch_segment_urls(
+                        self.program.station_id, self.program.start_time, self.program.end_time
+                    )
+                    return await recorder._download_segments_concurrent(segment_urls[:5])
+
+            # When: 別々のループで2回ダウンロード
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", ResourceWarning)
+                results = [asyncio.run(run()) for _ in range(2)]
+                gc.collect()
+
+            # Then: 未クローズのセッション・コネクター・ソケットの警告が無い
+            self.assertEqual([len(segments) for segments in results], [5, 5])
+            self.assertFalse(recorder.session_pool.is_open)
+            self.assertEqual([str(w.message) for w in caught if issubclass(w.category, ResourceWarning)], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+RecordingMetrics単体テスト（TDD手法）
+
+録音毎の計測値の集計（レイテンシのパーセンタイル・時間毎の受信速度）と
+JSON Lines・Prometheus textfile 形式の出力をテスト。
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# テスト対象
+from src.recording_metrics import RecordingMetrics, JsonLinesMetricsSink, PrometheusTextfileSink
+
+
+def build_metrics(**overrides) -> RecordingMetrics:
+    """テスト用の計測値（レイテンシ 0.01〜1.00秒の100セグメント）"""
+    values = dict(program_id="TBS_20250722_060000", station_id="TBS", success=True,
+                  download_seconds=10.0, transcode_seconds=2.0, media_duration_seconds=60.0)
+    values.update(overrides)
+    metrics = RecordingMetrics(**values)
+    for i in range(1, 101):
+        metrics.record_segment(1000, i / 100)
+    metrics.record_retries({"HTTP 503": 2})
+    metrics.record_retries({"HTTP 503": 1, "タイムアウト": 1})
+    return metrics
+
+
+class TestRecordingMetrics(unittest.TestCase):
+    """RecordingMetrics集計テスト"""
+
+    def test_01_レイテンシのパーセンタイルと平均速度(self):
+        """
+        TDD Test: レイテンシのパーセンタイルと平均速度
+
+        最近接順位法のパーセンタイル・原因別リトライの加算・受信速度・変換速度を確認
+        """
+        # Given: 100セグメント分の計測値
+        metrics = build_metrics()
+
+        # Then: パーセンタイル
+        self.assertEqual(metrics.latency_percentiles(),
+                         {"p50": 0.5, "p90": 0.9, "p95": 0.95, "p99": 0.99, "max": 1.0})
+
+        # And: 集計値
+        self.assertEqual(metrics.segments_downloaded, 100)
+        self.assertEqual(metrics.retries_by_cause, {"HTTP 503": 3, "タイムアウト": 1})
+        self.assertEqual(metrics.retries_total, 4)
+        self.assertEqual(metrics.bytes_per_second, 10_000)
+        self.assertEqual(metrics.transcode_speed_ratio, 30)
+
+        # And: 未計測時は空・0
+        empty = RecordingMetrics()
+        self.assertEqual(empty.latency_percentiles(), {})
+        self.assertEqual(empty.throughput_series(), [])
+        self.assertEqual(empty.bytes_per_second, 0.0)
+
+    def test_02_時間毎の受信速度(self):
+        """
+        TDD Test: 時間毎の受信速度
+
+        受信時刻の区間毎に集計され、受信のない区間は0となることを確認
+        """
+        # Given: 0.5秒間隔で集計する計測値
+        with patch('src.recording_metrics.time.monotonic', return_value=100.0) as mock_clock:
+            metrics = RecordingMetrics(throughput_interval=0.5)
+
+            # When: 0.1秒・0.3秒・1.2秒後に受信
+            for offset, nbytes in ((0.1, 100), (0.3, 200), (1.2, 400)):
+                mock_clock.return_value = 100.0 + offset
+                metrics.record_segment(nbytes, 0.05)
+
+        # Then: 区間毎の受信速度
+        self.assertEqual(metrics.throughput_series(), [(0.0, 600.0), (0.5, 0.0), (1.0, 800.0)])
+        self.assertAlmostEqual(metrics.time_to_first_segment_seconds, 0.1)
+
+
+class TestMetricsSinks(unittest.TestCase):
+    """録音メトリクス出力先テスト"""
+
+    def setUp(self):
+        """テストセットアップ"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+
+    def test_03_JSON_Linesへの追記(self):
+        """
+        TDD Test: JSON Linesへの追記
+
+        録音毎に1行追記され、レイテンシは集計値のみ出力されることを確認
+        """
+        # Given: 存在しないディレクトリ配下の出力先
+        sink = JsonLinesMetricsSink(self.temp_dir / "metrics" / "recordings.jsonl")
+
+        # When: 2件書き込み
+        sink.write(build_metrics())
+        sink.write(build_metrics(station_id="QRR", success=False))
+
+        # Then: 2行のJSON
+        lines = sink.path.read_text(encoding='utf-8').splitlines()
+        self.assertEqual(len(lines), 2)
+        first, second = (json.loads(line) for line in lines)
+        self.assertIn("timestamp", first)
+        self.assertEqual(first["segment_latency_seconds"]["p95"], 0.95)
+        self.assertEqual(first["retries_by_cause"], {"HTTP 503": 3, "タイムアウト": 1})
+        self.assertNotIn("segment_latencies", first)
+        self.assertEqual(second["station_id"], "QRR")
+        self.assertFalse(second["success"])
+
+    def test_04_Prometheus_textfileの書き直し(self):
+        """
+        TDD Test: Prometheus textfileの書き直し
+
+        放送局毎に直近の計測値のみ保持し、ラベル値がエスケープされ、一時ファイルが残らないことを確認
+        """
+        # Given: textfile collector 向けの出力先
+        sink = PrometheusTextfileSink(self.temp_dir / "recradiko.prom")
+
+        # When: 同じ放送局に2回・別の放送局に1回書き込み
+        sink.write(build_metrics(success=False))
+        sink.write(build_metrics(program_id='TBS_"special"'))
+        sink.write(build_metrics(station_id="QRR", program_id="QRR_1"))
+
+        # Then: 放送局毎に1系列（直近の値）
+        text = sink.path.read_text(encoding='utf-8')
+        self.assertIn('recradiko_recording_success{station="TBS",program="TBS_\\"special\\""} 1', text)
+        self.assertIn('recradiko_recording_success{station="QRR",program="QRR_1"} 1', text)
+        self.assertEqual(text.count("recradiko_recording_success{"), 2)
+
+        # And: パーセンタイル・原因別リトライ
+        self.assertIn('recradiko_recording_segment_latency_seconds'
+                      '{station="QRR",program="QRR_1",quantile="0.99"} 0.99', text)
+        self.assertIn('recradiko_recording_retries{station="QRR",program="QRR_1",cause="タイムアウト"} 1', text)
+        self.assertIn("# TYPE recradiko_recording_bytes_downloaded gauge", text)
+
+        # And: 一時ファイルは置き換え済み
+        self.assertEqual([p.name for p in self.temp_dir.iterdir()], ["recradiko.prom"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+RetryPolicy単体テスト（TDD手法）
+
+HTTPステータス分類・フルジッター付き指数バックオフ・Retry-After解析・リトライ予算をテスト。
+"""
+
+import unittest
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+import aiohttp
+import requests
+
+# テスト対象
+from src.retry_policy import RetryPolicy, RetryBudget
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """RetryPolicy基本機能テスト"""
+
+    def setUp(self):
+        """テストセットアップ"""
+        self.policy = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=4.0)
+
+    def test_01_HTTPステータスの分類(self):
+        """
+        TDD Test: HTTPステータスの分類
+
+        一時障害のステータスのみリトライ対象となることを確認
+        """
+        # Then: 2xxは成功、429/5xxはリトライ、その他4xxは致命的
+        self.assertEqual(self.policy.classify_status(200), RetryPolicy.SUCCESS)
+        for status in (408, 429, 500, 502, 503, 504, 599):
+            self.assertEqual(self.policy.classify_status(status), RetryPolicy.RETRY, status)
+        for status in (400, 401, 403, 404, 410):
+            self.assertEqual(self.policy.classify_status(status), RetryPolicy.FATAL, status)
+
+    def test_02_例外のリトライ可否判定(self):
+        """
+        TDD Test: 例外のリトライ可否判定
+
+        タイムアウト・接続エラーのみリトライ対象となることを確認
+        """
+        self.assertTrue(self.policy.is_retryable_exception(asyncio.TimeoutError()))
+        self.assertTrue(self.policy.is_retryable_exception(aiohttp.ClientConnectionError()))
+        self.assertTrue(self.policy.is_retryable_exception(requests.ConnectionError()))
+        self.assertFalse(self.policy.is_retryable_exception(ValueError("不正なデータ")))
+
+        # HTTPErrorはレスポンスのステータスで判定
+        response = requests.Response()
+        response.status_code = 404
+        self.assertFalse(self.policy.is_retryable_exception(requests.HTTPError(response=response)))
+        response.status_code = 503
+        self.assertTrue(self.policy.is_retryable_exception(requests.HTTPError(response=response)))
+
+    def test_03_フルジッター付き指数バックオフ(self):
+        """
+        TDD Test: フルジッター付き指数バックオフ
+
+        待機秒数が 0〜min(上限, 基準×2^試行) の範囲に分散することを確認
+        """
+        for attempt, ceiling in ((0, 0.5), (1, 1.0), (2, 2.0), (5, 4.0)):
+            delays = [self.policy.backoff_delay(attempt) for _ in range(200)]
+            self.assertTrue(all(0 <= delay <= ceiling for delay in delays), attempt)
+            # 固定値ではなく分散している
+            self.assertGreater(len(set(delays)), 100)
+
+        # When: 乱数が上限を返す場合
+        with patch('src.retry_policy.random.uniform', side_effect=lambda low, high: high):
+            self.assertEqual(self.policy.backoff_delay(10), 4.0)
+
+    def test_04_RetryAfterの尊重(self):
+        """
+        TDD Test: Retry-Afterの尊重
+
+        秒数・HTTP日付形式の Retry-After を解析し、その秒数以上待機することを確認
+        """
+        # 秒数形式
+        self.assertEqual(RetryPolicy.parse_retry_after({'Retry-After': '7'}), 7.0)
+
+        # HTTP日付形式
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        seconds = RetryPolicy.parse_retry_after({'Retry-After': format_datetime(retry_at, usegmt=True)})
+        self.assertAlmostEqual(seconds, 30, delta=2)
+
+        # 未指定・解析不能
+        self.assertIsNone(RetryPolicy.parse_retry_after({}))
+        self.assertIsNone(RetryPolicy.parse_retry_after(None))
+        self.assertIsNone(RetryPolicy.parse_retry_after({'Retry-After': 'soon'}))
+
+        # Then: Retry-After指定時はバックオフ上限に関わらずその秒数以上待機
+        delay = self.policy.backoff_delay(0, retry_after=10.0)
+        self.assertGreaterEqual(delay, 10.0)
+        self.assertLessEqual(delay, 10.5)
+
+    def test_05_録音単位のリトライ予算(self):
+        """
+        TDD Test: 録音単位のリトライ予算
+
+        予算を使い切るとリトライが打ち切られ、理由別の回数が集計されることを確認
+        """
+        # Given: セグメント数に応じた予算（最小値10）
+        self.assertEqual(self.policy.new_budget(50).limit, 10)
+        self.assertEqual(self.policy.new_budget(1000).limit, 100)
+
+        budget = RetryBudget(limit=2)
+
+        # When: 予算を超えてリトライを要求
+        self.assertTrue(self.policy.should_retry(0, budget, "HTTP 503"))
+        self.assertTrue(self.policy.should_retry(0, budget, "タイムアウト"))
+        self.assertFalse(self.policy.should_retry(0, budget, "HTTP 503"))
+
+        # Then: 消費状況と理由別回数が記録される
+        self.assertEqual(budget.remaining, 0)
+        self.assertEqual(budget.retries_by_cause, {"HTTP 503": 1, "タイムアウト": 1})
+
+        # And: 最終試行ではリトライしない
+        self.assertFalse(self.policy.should_retry(2, None, "HTTP 503"))
+
+
+if __name__ == '__main__':
+    unittest.main()
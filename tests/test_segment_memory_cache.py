@@ -0,0 +1,99 @@
+"""
+SegmentMemoryCache単体テスト（TDD手法）
+
+メモリセグメントキャッシュの保存・取得・バイト数上限によるLRU追い出し・集計値をテスト。
+"""
+
+import unittest
+import threading
+
+# テスト対象
+from src.segment_memory_cache import SegmentMemoryCache
+
+
+class TestSegmentMemoryCache(unittest.TestCase):
+    """SegmentMemoryCache基本機能テスト"""
+
+    def test_01_URLをキーに保存と取得(self):
+        """
+        TDD Test: URLをキーに保存と取得
+
+        保存したセグメントが取得でき、ヒット・ミス数と合計バイト数が記録されることを確認
+        """
+        # Given: 空のキャッシュ
+        cache = SegmentMemoryCache(max_bytes=1024)
+        url = "https://radiko.jp/segments/TBS/20250722/0001.aac"
+
+        # When: 未保存のセグメントを取得し、その後保存して取得
+        self.assertIsNone(cache.get(url))
+        cache.put(url, b"segment-data")
+        data = cache.get(url)
+
+        # Then: 保存したデータが返され、集計値が記録される
+        self.assertEqual(data, b"segment-data")
+        self.assertIn(url, cache)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (1, 1, 0))
+        self.assertEqual(stats['total_bytes'], len(b"segment-data"))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_02_バイト数上限で最終利用が古い順に追い出し(self):
+        """
+        TDD Test: バイト数上限で最終利用が古い順に追い出し
+
+        合計バイト数が上限を超えると最近参照されていないセグメントから削除され、
+        上限より大きいセグメントは保存されないことを確認
+        """
+        # Given: 上限30バイトのキャッシュに10バイトのセグメント3件
+        cache = SegmentMemoryCache(max_bytes=30)
+        urls = [f"https://radiko.jp/segments/{i}.aac" for i in range(4)]
+        for url in urls[:3]:
+            cache.put(url, b"x" * 10)
+
+        # When: 先頭のセグメントを参照してから4件目を保存
+        cache.get(urls[0])
+        cache.put(urls[3], b"y" * 10)
+
+        # Then: 最終利用が最も古い2件目が追い出される
+        self.assertEqual(cache.keys(), [urls[2], urls[0], urls[3]])
+        self.assertEqual(cache.total_bytes, 30)
+        self.assertEqual(cache.evictions, 1)
+
+        # And: 同じURLの上書きは合計バイト数を置き換え、上限超過のセグメントは保存しない
+        cache.put(urls[3], b"z" * 5)
+        self.assertEqual(cache.total_bytes, 25)
+        cache.put(urls[3], b"w" * 31)
+        self.assertNotIn(urls[3], cache)
+        self.assertEqual(cache.total_bytes, 20)
+
+    def test_03_エントリ数上限と並行アクセス(self):
+        """
+        TDD Test: エントリ数上限と並行アクセス
+
+        エントリ数の上限でも追い出され、複数スレッドからの保存でも合計バイト数が一致することを確認
+        """
+        # Given: 上限1MB・100エントリのキャッシュ
+        cache = SegmentMemoryCache(max_bytes=1024 * 1024, max_entries=100)
+
+        # When: 4スレッドから100件ずつ保存
+        def worker(thread_index):
+            for i in range(100):
+                url = f"https://radiko.jp/segments/{thread_index}/{i}.aac"
+                cache.put(url, b"x" * (i + 1))
+                cache.get(url)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Then: エントリ数が上限内で、合計バイト数が保持中のデータと一致する
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 100)
+        self.assertEqual(stats['evictions'], 300)
+        self.assertEqual(stats['total_bytes'], sum(len(cache.get(url)) for url in cache.keys()))
+
+
+if __name__ == '__main__':
+    unittest.main()
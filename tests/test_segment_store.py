@@ -0,0 +1,145 @@
+"""
+SegmentStore単体テスト（TDD手法）
+
+永続セグメントキャッシュの保存・取得・LRU追い出し・再起動後の復元をテスト。
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# テスト対象
+from src.segment_store import SegmentStore
+
+
+class TestSegmentStore(unittest.TestCase):
+    """SegmentStore基本機能テスト"""
+
+    def setUp(self):
+        """テストセットアップ"""
+        self.store_dir = Path(tempfile.mkdtemp()) / "segment_cache"
+
+    def tearDown(self):
+        """テストクリーンアップ"""
+        shutil.rmtree(self.store_dir.parent, ignore_errors=True)
+
+    def test_01_URLをキーに保存と取得(self):
+        """
+        TDD Test: URLをキーに保存と取得
+
+        クエリ部分が異なる同一セグメントURLでキャッシュヒットすることを確認
+        """
+        # Given: 空のストア
+        store = SegmentStore(self.store_dir, max_bytes=1024)
+        url = "https://radiko.jp/segments/TBS/20250722/0001.aac"
+
+        # When: 未保存のセグメントを取得し、その後保存
+        self.assertIsNone(store.get(url))
+        store.put(url, b"segment-data")
+
+        # Then: クエリ違いのURLでも取得でき、ヒット・ミス数が記録される
+        self.assertEqual(store.get(url + "?token=other"), b"segment-data")
+        self.assertIn(url, store)
+        self.assertEqual((store.hits, store.misses), (1, 1))
+        self.assertEqual(store.total_bytes, len(b"segment-data"))
+
+    def test_02_上限超過で最終利用が古い順に追い出し(self):
+        """
+        TDD Test: 上限超過で最終利用が古い順に追い出し
+
+        合計バイト数が上限を超えると、最近参照されていないセグメントから削除されることを確認
+        """
+        # Given: 上限30バイトのストアに10バイトのセグメント3件
+        store = SegmentStore(self.store_dir, max_bytes=30)
+        urls = [f"https://radiko.jp/segments/{i}.aac" for i in range(4)]
+        for url in urls[:3]:
+            store.put(url, b"x" * 10)
+
+        # When: 最古のセグメントを参照してから4件目を保存
+        store.get(urls[0])
+        store.put(urls[3], b"y" * 10)
+
+        # Then: 参照されていない2件目が追い出される
+        self.assertNotIn(urls[1], store)
+        self.assertIn(urls[0], store)
+        self.assertEqual(store.total_bytes, 30)
+        self.assertEqual(store.evictions, 1)
+        self.assertEqual(len(list(self.store_dir.glob("*/*.seg"))), 3)
+
+        # And: 上限を超える単一セグメントは保存しない
+        store.put("https://radiko.jp/segments/large.aac", b"z" * 31)
+        self.assertEqual(len(store), 3)
+
+    def test_03_再起動後に保存済みセグメントを復元(self):
+        """
+        TDD Test: 再起動後に保存済みセグメントを復元
+
+        別インスタンスから保存済みセグメントが利用でき、最終利用時刻順が引き継がれることを確認
+        """
+        # Given: 2件保存済みのストア（1件目の最終利用を古くする）
+        store = SegmentStore(self.store_dir, max_bytes=20)
+        store.put("https://radiko.jp/segments/old.aac", b"o" * 10)
+        store.put("https://radiko.jp/segments/new.aac", b"n" * 10)
+        old_path = store._path_for(SegmentStore.key_for("https://radiko.jp/segments/old.aac"))
+        past = time.time() - 3600
+        os.utime(old_path, (past, past))
+
+        # When: 新しいインスタンスで開き、1件追加
+        reopened = SegmentStore(self.store_dir, max_bytes=20)
+        self.assertEqual(reopened.total_bytes, 20)
+        reopened.put("https://radiko.jp/segments/next.aac", b"x" * 10)
+
+        # Then: 最終利用が古いセグメントが追い出される
+        self.assertNotIn("https://radiko.jp/segments/old.aac", reopened)
+        self.assertEqual(reopened.get("https://radiko.jp/segments/new.aac"), b"n" * 10)
+
+    def test_04_ファイル書き込み中も他のセグメントを取得(self):
+        """
+        TDD Test: ファイル書き込み中も他のセグメントを取得
+
+        ロックはファイルI/O中に保持されず、書き込みが停滞していても別のセグメントの
+        取得・保存が待たされないことを確認
+        """
+        # Given: 保存済みのセグメントと、書き込みが停滞するファイル
+        store = SegmentStore(self.store_dir, max_bytes=1024)
+        store.put("https://radiko.jp/segments/saved.aac", b"s" * 10)
+        writing = threading.Event()
+        release = threading.Event()
+        slow_key = SegmentStore.key_for("https://radiko.jp/segments/slow.aac")
+        real_open = open
+
+        def blocking_open(path, *args, **kwargs):
+            if slow_key in str(path):
+                writing.set()
+                release.wait(5)
+            return real_open(path, *args, **kwargs)
+
+        with patch('src.segment_store.open', blocking_open, create=True):
+            writer = threading.Thread(target=store.put, args=("https://radiko.jp/segments/slow.aac", b"w" * 10))
+            writer.start()
+            self.assertTrue(writing.wait(5))
+
+            # When: 書き込み停滞中に別のセグメントを取得・保存
+            started = time.monotonic()
+            data = store.get("https://radiko.jp/segments/saved.aac")
+            store.put("https://radiko.jp/segments/other.aac", b"o" * 10)
+            elapsed = time.monotonic() - started
+            release.set()
+            writer.join(5)
+
+        # Then: 停滞した書き込みを待たずに完了し、停滞した書き込みも最後に登録される
+        self.assertEqual(data, b"s" * 10)
+        self.assertLess(elapsed, 1.0)
+        self.assertIn("https://radiko.jp/segments/other.aac", store)
+        self.assertIn("https://radiko.jp/segments/slow.aac", store)
+        self.assertEqual(store.total_bytes, 30)
+        self.assertEqual(list(self.store_dir.glob("*/*.tmp")), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+OrderedSegmentWriter単体テスト（TDD手法）
+
+順不同で到着するセグメントの順序保証書き込み・先読みウィンドウ・保持バイト数上限による制御をテスト。
+"""
+
+import unittest
+import asyncio
+import io
+
+# テスト対象
+from src.segment_writer import OrderedSegmentWriter, SegmentWriterError
+
+
+class TestOrderedSegmentWriter(unittest.TestCase):
+    """OrderedSegmentWriter基本機能テスト"""
+
+    def test_01_順不同到着セグメントの順序保証書き込み(self):
+        """
+        TDD Test: 順不同到着セグメントの順序保証書き込み
+
+        後続セグメントが先に到着しても番号順に書き出されることを確認
+        """
+        async def run_test():
+            # Given: 書き込み先バッファ
+            output = io.BytesIO()
+            writer = OrderedSegmentWriter(output, window=4)
+
+            # When: 2 → 0 → 1 の順で到着
+            await writer.write(2, b"C")
+            self.assertEqual(output.getvalue(), b"")
+            self.assertEqual(writer.pending_count, 1)
+
+            await writer.write(0, b"A")
+            self.assertEqual(output.getvalue(), b"A")
+
+            await writer.write(1, b"B")
+
+            # Then: 番号順に書き出される
+            self.assertEqual(output.getvalue(), b"ABC")
+            self.assertEqual(writer.pending_count, 0)
+            self.assertEqual(writer.segments_written, 3)
+            self.assertEqual(writer.bytes_written, 3)
+
+        asyncio.run(run_test())
+
+    def test_02_先読みウィンドウによる待機(self):
+        """
+        TDD Test: 先読みウィンドウによる待機
+
+        ウィンドウ外のセグメントは先頭セグメントの書き込みまで待機することを確認
+        """
+        async def run_test():
+            # Given: ウィンドウ2のライター
+            output = io.BytesIO()
+            writer = OrderedSegmentWriter(output, window=2)
+
+            # When: ウィンドウ外（index=2）のスロット待機を開始
+            waiter = asyncio.create_task(writer.wait_for_slot(2))
+            await asyncio.sleep(0.01)
+
+            # Then: 先頭が書き込まれるまで待機し続ける
+            self.assertFalse(waiter.done())
+
+            await writer.write(0, b"A")
+            await asyncio.wait_for(waiter, timeout=1.0)
+            self.assertTrue(waiter.done())
+
+        asyncio.run(run_test())
+
+    def test_03_失敗セグメントのスキップ(self):
+        """
+        TDD Test: 失敗セグメントのスキップ
+
+        欠番として扱ったセグメントで後続の書き込みが停止しないことを確認
+        """
+        async def run_test():
+            # Given: 書き込み先バッファ
+            output = io.BytesIO()
+            writer = OrderedSegmentWriter(output, window=4)
+
+            # When: セグメント1が取得失敗
+            await writer.write(0, b"A")
+            await writer.write(2, b"C")
+            await writer.skip(1)
+
+            # Then: 欠番を除いて書き出される
+            self.assertEqual(output.getvalue(), b"AC")
+            self.assertEqual(writer.segments_written, 2)
+            self.assertEqual(writer.next_index, 3)
+
+        asyncio.run(run_test())
+
+
+    def test_04_保持バイト数上限による待機(self):
+        """
+        TDD Test: 保持バイト数上限による待機
+
+        未書き込みのバイト数が上限に達すると先頭以外のセグメントは待機し、先頭は常に開始できることを確認
+        """
+        async def run_test():
+            # Given: 上限20バイトのライターに後続セグメント2件（計20バイト）が到着済み
+            output = io.BytesIO()
+            writer = OrderedSegmentWriter(output, window=8, max_pending_bytes=20)
+            await writer.write(1, b"B" * 10)
+            await writer.write(2, b"C" * 10)
+            self.assertEqual(writer.pending_bytes, 20)
+
+            # When: ウィンドウ内の後続セグメントのスロット待機を開始
+            waiter = asyncio.create_task(writer.wait_for_slot(3))
+            await asyncio.sleep(0.01)
+
+            # Then: 上限到達中は待機し、先頭セグメントは待機しない
+            self.assertFalse(waiter.done())
+            await asyncio.wait_for(writer.wait_for_slot(0), timeout=1.0)
+
+            # And: 先頭の書き込みで保持分が書き出されると再開する
+            await writer.write(0, b"A" * 10)
+            await asyncio.wait_for(waiter, timeout=1.0)
+            self.assertEqual(writer.pending_bytes, 0)
+            self.assertEqual(writer.peak_pending_bytes, 20)
+
+        asyncio.run(run_test())
+
+    def test_05_中断時の待機解放(self):
+        """
+        TDD Test: 中断時の待機解放
+
+        abort後は待機中・以降のスロット待機と書き込みがエラーとなることを確認
+        """
+        async def run_test():
+            # Given: ウィンドウ外で待機中のセグメント
+            output = io.BytesIO()
+            writer = OrderedSegmentWriter(output, window=2)
+            waiter = asyncio.create_task(writer.wait_for_slot(5))
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiter.done())
+
+            # When: ライターを中断
+            await writer.abort(OSError("disk full"))
+
+            # Then: 待機中のセグメントは解放されてエラーとなる
+            with self.assertRaises(SegmentWriterError):
+                await asyncio.wait_for(waiter, timeout=1.0)
+
+            # And: 以降の書き込みもエラーとなり、最初の原因が保持される
+            with self.assertRaises(SegmentWriterError):
+                await writer.write(0, b"A")
+            await writer.abort(ValueError("second"))
+            self.assertIsInstance(writer.error, OSError)
+            self.assertEqual(output.getvalue(), b"")
+
+        asyncio.run(run_test())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,22 +7,66 @@ HLS/M3U8プレイリスト解析・セグメントダウンロード・暗号化
 
 import unittest
 import asyncio
+import contextlib
 import tempfile
 import shutil
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import patch, MagicMock, Mock, call
+from unittest.mock import patch, MagicMock, Mock, AsyncMock, call
+import aiohttp
 import requests
+from multidict import CIMultiDict
 
 # テスト対象
 from src.streaming import (
     StreamingManager, StreamSegment, StreamInfo, StreamingError
 )
+from src.segment_store import SegmentStore
+from src.bandwidth_limiter import load_bandwidth_limiter
+from src.segment_memory_cache import SegmentMemoryCache
 from src.auth import RadikoAuthenticator
+from src.utils.network_utils import AsyncSessionPool
+from tests.utils.mock_radiko_server import MockRadikoServer, MockServerConfig
 from tests.utils.test_environment import TemporaryTestEnvironment, RealEnvironmentTestBase
 
 
+async def iter_chunks(chunks):
+    """response.content.iter_chunked の代わりの非同期イテレーター"""
+    for chunk in chunks:
+        yield chunk
+
+
+def aiohttp_response(status=200, body=b"", headers=None, chunks=None):
+    """aiohttp の応答モック（本文は chunks 指定時はその単位、未指定時は1チャンクで受信）"""
+    response = MagicMock()
+    response.status = status
+    response.headers = CIMultiDict(headers or {})
+    response.content.iter_chunked = MagicMock(side_effect=lambda size: iter_chunks(chunks or [body]))
+    response.text = AsyncMock(return_value=body.decode() if isinstance(body, bytes) else body)
+    if status >= 400:
+        response.raise_for_status.side_effect = aiohttp.ClientResponseError(
+            MagicMock(), (), status=status, message=f"HTTP {status}"
+        )
+    return response
+
+
+@contextlib.contextmanager
+def fake_aiohttp_session(manager, responses):
+    """セッションプールのセッションを、リクエスト毎に responses を順に返すモックに置き換える
+    
+    responses の要素が例外の場合はリクエスト時に送出する。
+    """
+    session = MagicMock()
+    session.get.return_value.__aenter__ = AsyncMock(side_effect=responses)
+    session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch.object(manager.session_pool, 'get_session', AsyncMock(return_value=session)):
+        yield session
+
+
 class TestStreamingBasic(unittest.TestCase, RealEnvironmentTestBase):
     """Streaming基本機能テスト"""
     
@@ -60,7 +104,7 @@ class TestStreamingBasic(unittest.TestCase, RealEnvironmentTestBase):
         self.assertIsInstance(manager, StreamingManager)
         self.assertEqual(manager.max_workers, 8)
         self.assertEqual(manager.authenticator, authenticator)
-        self.assertIsInstance(manager.segment_cache, dict)
+        self.assertIsInstance(manager.segment_cache, SegmentMemoryCache)
     
     def test_02_StreamSegmentデータクラス機能(self):
         """
@@ -365,6 +409,7 @@ class TestStreamingPlaylist(unittest.TestCase, RealEnvironmentTestBase):
         
     def tearDown(self):
         """テストクリーンアップ"""
+        self.streaming_manager.close_sync()
         self.temp_env.__exit__(None, None, None)
         super().tearDown()
     
@@ -391,13 +436,7 @@ segment003.ts
 #EXT-X-ENDLIST"""
         
         # When: プレイリスト解析（モック）
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = m3u8_content
-            mock_response.raise_for_status.return_value = None  # 成功レスポンス
-            mock_get.return_value = mock_response
-            
+        with fake_aiohttp_session(self.streaming_manager, [aiohttp_response(body=m3u8_content)]):
             # プレイリスト解析実行
             stream_info = self.streaming_manager.parse_playlist(playlist_url)
         
@@ -423,12 +462,7 @@ segment003.ts
         playlist_url = "https://example.com/notfound.m3u8"
         
         # When: プレイリスト解析でHTTPエラー
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 404
-            mock_response.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
-            mock_get.return_value = mock_response
-            
+        with fake_aiohttp_session(self.streaming_manager, [aiohttp_response(404)]):
             # Then: StreamingErrorが発生
             with self.assertRaises(StreamingError) as context:
                 self.streaming_manager.parse_playlist(playlist_url)
@@ -463,21 +497,9 @@ segment001.ts
 #EXT-X-ENDLIST"""
         
         # When: マスタープレイリスト解析（再帰呼び出し）
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            # 1回目: マスタープレイリスト
-            master_response = Mock()
-            master_response.status_code = 200
-            master_response.text = master_content
-            master_response.raise_for_status.return_value = None
-            
-            # 2回目: 高品質プレイリスト
-            high_quality_response = Mock()
-            high_quality_response.status_code = 200
-            high_quality_response.text = high_quality_content
-            high_quality_response.raise_for_status.return_value = None
-            
-            mock_get.side_effect = [master_response, high_quality_response]
-            
+        # 1回目: マスタープレイリスト、2回目: 高品質プレイリスト
+        responses = [aiohttp_response(body=master_content), aiohttp_response(body=high_quality_content)]
+        with fake_aiohttp_session(self.streaming_manager, responses) as session:
             # プレイリスト解析実行
             stream_info = self.streaming_manager.parse_playlist(playlist_url)
         
@@ -486,7 +508,8 @@ segment001.ts
         self.assertEqual(len(stream_info.segments), 1)
         
         # 2回のHTTPリクエストが実行される（マスター + 高品質）
-        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(session.get.call_count, 2)
+        self.assertEqual(session.get.call_args.args[0], "https://example.com/high_quality.m3u8")
     
     def test_07_空セグメントエラーハンドリング(self):
         """
@@ -505,13 +528,7 @@ segment001.ts
 #EXT-X-ENDLIST"""
         
         # When: 空プレイリスト解析
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = empty_content
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-            
+        with fake_aiohttp_session(self.streaming_manager, [aiohttp_response(body=empty_content)]):
             # Then: StreamingErrorが発生
             with self.assertRaises(StreamingError) as context:
                 self.streaming_manager.parse_playlist(playlist_url)
@@ -565,6 +582,7 @@ class TestStreamingSegmentDownload(unittest.TestCase, RealEnvironmentTestBase):
         
     def tearDown(self):
         """テストクリーンアップ"""
+        self.streaming_manager.close_sync()
         self.temp_env.__exit__(None, None, None)
         super().tearDown()
     
@@ -704,14 +722,7 @@ class TestStreamingSegmentDownload(unittest.TestCase, RealEnvironmentTestBase):
         expected_data = b"test_segment_binary_data"
         
         # When: 単一セグメントダウンロード（モック）
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = expected_data
-            mock_response.iter_content.return_value = [expected_data]
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-            
+        with fake_aiohttp_session(self.streaming_manager, [aiohttp_response(body=expected_data)]) as session:
             # ダウンロード実行
             result_data = self.streaming_manager._download_single_segment(test_segment)
         
@@ -719,8 +730,8 @@ class TestStreamingSegmentDownload(unittest.TestCase, RealEnvironmentTestBase):
         self.assertEqual(result_data, expected_data)
         
         # HTTPリクエストが正しく実行される
-        mock_get.assert_called_once()
-        call_args = mock_get.call_args
+        session.get.assert_called_once()
+        call_args = session.get.call_args
         self.assertEqual(call_args[0][0], test_segment.url)
     
     def test_08_セグメントダウンロードリトライ機能(self):
@@ -740,26 +751,9 @@ class TestStreamingSegmentDownload(unittest.TestCase, RealEnvironmentTestBase):
         expected_data = b"retry_segment_data"
         
         # When: 最初2回失敗、3回目成功するダウンロード
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            # 1回目: 失敗
-            error_response1 = Mock()
-            error_response1.status_code = 500
-            error_response1.raise_for_status.side_effect = requests.HTTPError("Server Error")
-            
-            # 2回目: 失敗
-            error_response2 = Mock()
-            error_response2.status_code = 503
-            error_response2.raise_for_status.side_effect = requests.HTTPError("Service Unavailable")
-            
-            # 3回目: 成功
-            success_response = Mock()
-            success_response.status_code = 200
-            success_response.content = expected_data
-            success_response.iter_content.return_value = [expected_data]
-            success_response.raise_for_status.return_value = None
-            
-            mock_get.side_effect = [error_response1, error_response2, success_response]
-            
+        # 1回目: 500、2回目: 503、3回目: 成功
+        responses = [aiohttp_response(500), aiohttp_response(503), aiohttp_response(body=expected_data)]
+        with fake_aiohttp_session(self.streaming_manager, responses) as session:
             # ダウンロード実行（3回試行後成功）
             result_data = self.streaming_manager._download_single_segment(test_segment)
         
@@ -767,7 +761,7 @@ class TestStreamingSegmentDownload(unittest.TestCase, RealEnvironmentTestBase):
         self.assertEqual(result_data, expected_data)
         
         # 3回のHTTPリクエストが実行される
-        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(session.get.call_count, 3)
     
     def test_09_セグメントダウンロード完全失敗(self):
         """
@@ -784,14 +778,13 @@ class TestStreamingSegmentDownload(unittest.TestCase, RealEnvironmentTestBase):
         )
         
         # When: 全リトライで失敗するダウンロード
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            # 全ての試行で失敗
-            mock_get.side_effect = [
-                requests.HTTPError("Error 1"),
-                requests.HTTPError("Error 2"),
-                requests.HTTPError("Error 3")
-            ]
-            
+        # 全ての試行で失敗
+        errors = [
+            aiohttp.ClientConnectionError("Error 1"),
+            aiohttp.ClientConnectionError("Error 2"),
+            aiohttp.ClientConnectionError("Error 3")
+        ]
+        with fake_aiohttp_session(self.streaming_manager, errors) as session:
             # Then: StreamingErrorが発生
             with self.assertRaises(StreamingError) as context:
                 self.streaming_manager._download_single_segment(test_segment)
@@ -800,8 +793,108 @@ class TestStreamingSegmentDownload(unittest.TestCase, RealEnvironmentTestBase):
             self.assertIn("ダウンロードに失敗", str(context.exception))
             
             # リトライ回数分（3回）のHTTPリクエストが実行される
-            self.assertEqual(mock_get.call_count, 3)
+            self.assertEqual(session.get.call_count, 3)
+    
+    def test_09b_ステータス別リトライ判定とRetryAfter(self):
+        """
+        TDD Test: ステータス別リトライ判定とRetry-After
+        
+        404は再試行せず、503は Retry-After 秒数以上待機して再試行することを確認
+        """
+        test_segment = self.test_segments[0]
+        
+        # When: 404応答
+        with fake_aiohttp_session(self.streaming_manager, [aiohttp_response(404)]) as session:
+            # Then: 即時失敗
+            with self.assertRaises(StreamingError):
+                self.streaming_manager._download_single_segment(test_segment)
+            self.assertEqual(session.get.call_count, 1)
+        
+        # When: 503(Retry-After: 3) → 200
+        responses = [aiohttp_response(503, headers={'Retry-After': '3'}), aiohttp_response(body=b"segment_data")]
+        with fake_aiohttp_session(self.streaming_manager, responses) as session, \
+             patch('src.streaming.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            result_data = self.streaming_manager._download_single_segment(test_segment)
+        
+        # Then: Retry-After以上待機して再試行
+        self.assertEqual(result_data, b"segment_data")
+        self.assertEqual(session.get.call_count, 2)
+        self.assertGreaterEqual(mock_sleep.call_args.args[0], 3.0)
+    
+    def test_09c_永続セグメントストアの共有(self):
+        """
+        TDD Test: 永続セグメントストアの共有
+        
+        ストアに保存済みのセグメントは別インスタンスからも通信せずに取得できることを確認
+        """
+        test_segment = self.test_segments[0]
+        store_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, store_dir, ignore_errors=True)
+        store = SegmentStore(store_dir, max_bytes=1024 * 1024)
+        
+        # Given: ストア共有のマネージャーで1回ダウンロード
+        manager = StreamingManager(self.mock_auth, segment_store=store)
+        self.addCleanup(manager.close_sync)
+        with fake_aiohttp_session(manager, [aiohttp_response(body=b"segment_data")]):
+            manager._download_single_segment(test_segment)
+        
+        # When: 同じストアを共有する別のマネージャーでダウンロード
+        other_manager = StreamingManager(self.mock_auth, segment_store=store)
+        self.addCleanup(other_manager.close_sync)
+        with fake_aiohttp_session(other_manager, []) as session:
+            result_data = other_manager._download_single_segment(test_segment)
+        
+        # Then: 通信せずにストアから取得される
+        self.assertEqual(result_data, b"segment_data")
+        session.get.assert_not_called()
+        self.assertEqual(store.hits, 1)
 
+    
+    def test_09d_未出力バイト数上限による並列ダウンロードの一時停止(self):
+        """
+        TDD Test: 未出力バイト数上限による並列ダウンロードの一時停止
+        
+        先頭セグメントが停滞している間、未出力データが上限に達すると新たなダウンロードを開始しないことを確認
+        """
+        segments = [
+            StreamSegment(url=f"https://example.com/segment{i:03d}.ts", duration=5.0,
+                          sequence=i + 1, timestamp=datetime.now())
+            for i in range(20)
+        ]
+        stream_info = StreamInfo(
+            stream_url="https://example.com/test.m3u8", station_id="TBS", quality="high",
+            bitrate=48000, codec="aac", segments=segments, is_live=False
+        )
+        
+        # Given: 100バイトのセグメント3件分が上限、先頭セグメントのみ停滞
+        manager = StreamingManager(self.mock_auth, max_workers=4, max_inflight_bytes=300)
+        release_first = threading.Event()
+        started = []
+        
+        async def fake_download(segment, session, headers, retry_budget=None):
+            started.append(segment.sequence)
+            if segment.sequence == 1:
+                while not release_first.is_set():
+                    await asyncio.sleep(0.01)
+            return bytes([segment.sequence]) * 100
+        
+        with patch.object(manager, '_download_single_segment_async', side_effect=fake_download):
+            received = []
+            generator = manager.download_segments_parallel(stream_info, "dummy_output.ts")
+            consumer = threading.Thread(target=lambda: received.extend(generator))
+            consumer.start()
+            
+            # When: 停滞中に後続セグメントが完了
+            time.sleep(0.5)
+            started_while_stalled = len(started)
+            release_first.set()
+            consumer.join(timeout=10)
+        
+        # Then: 停滞中は上限分以上のダウンロードを開始せず、解放後は全て順番に出力される
+        self.assertEqual(started_while_stalled, 4)
+        self.assertEqual([data[0] for data in received], list(range(1, 21)))
+        # 保持量は上限＋実行中のダウンロード分を超えない
+        self.assertLessEqual(manager.peak_buffered_bytes, 300 + 4 * 100)
 
 class TestStreamingDecryption(unittest.TestCase, RealEnvironmentTestBase):
     """セグメント復号化テスト"""
@@ -919,6 +1012,7 @@ class TestStreamingCache(unittest.TestCase, RealEnvironmentTestBase):
         
     def tearDown(self):
         """テストクリーンアップ"""
+        self.streaming_manager.close_sync()
         self.temp_env.__exit__(None, None, None)
         super().tearDown()
     
@@ -975,14 +1069,7 @@ class TestStreamingCache(unittest.TestCase, RealEnvironmentTestBase):
         expected_data = b"cached_segment_data"
         
         # When: _download_single_segmentを2回実行（キャッシュ効果確認）
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = expected_data
-            mock_response.iter_content.return_value = [expected_data]
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-            
+        with fake_aiohttp_session(self.streaming_manager, [aiohttp_response(body=expected_data)]) as session:
             # 1回目のダウンロード
             data1 = self.streaming_manager._download_single_segment(test_segment)
             
@@ -994,7 +1081,7 @@ class TestStreamingCache(unittest.TestCase, RealEnvironmentTestBase):
         self.assertEqual(data2, expected_data)
         
         # 2回目はキャッシュから取得されるため、HTTP要求は1回のみ
-        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(session.get.call_count, 1)
     
     def test_13_キャッシュ制限機能(self):
         """
@@ -1014,14 +1101,8 @@ class TestStreamingCache(unittest.TestCase, RealEnvironmentTestBase):
             segments.append(segment)
         
         # When: 制限を超えてダウンロード実行
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = b"segment_data"
-            mock_response.iter_content.return_value = [b"segment_data"]
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-            
+        responses = [aiohttp_response(body=b"segment_data") for _ in segments]
+        with fake_aiohttp_session(self.streaming_manager, responses):
             # 制限を超える数のセグメントをダウンロード
             for segment in segments:
                 self.streaming_manager._download_single_segment(segment)
@@ -1050,17 +1131,8 @@ class TestStreamingCache(unittest.TestCase, RealEnvironmentTestBase):
         expected_decrypted_data = b"decrypted_data_here"
         
         # When: 暗号化セグメントダウンロード
-        with patch.object(self.streaming_manager.session, 'get') as mock_get, \
+        with fake_aiohttp_session(self.streaming_manager, [aiohttp_response(body=encrypted_data)]), \
              patch.object(self.streaming_manager, '_decrypt_segment') as mock_decrypt:
-            
-            # セグメントダウンロードレスポンス
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = encrypted_data
-            mock_response.iter_content.return_value = [encrypted_data]
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-            
             # 復号処理のモック
             mock_decrypt.return_value = expected_decrypted_data
             
@@ -1288,6 +1360,7 @@ class TestStreamingAdvanced(unittest.TestCase, RealEnvironmentTestBase):
         
     def tearDown(self):
         """テストクリーンアップ"""
+        self.streaming_manager.close_sync()
         self.temp_env.__exit__(None, None, None)
         super().tearDown()
     
@@ -1322,9 +1395,7 @@ class TestStreamingAdvanced(unittest.TestCase, RealEnvironmentTestBase):
         playlist_url = "https://example.com/exception.m3u8"
         
         # セッションで一般例外発生
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            mock_get.side_effect = Exception("一般的な解析エラー")
-            
+        with fake_aiohttp_session(self.streaming_manager, [Exception("一般的な解析エラー")]):
             # When & Then: 一般例外でStreamingErrorが発生
             with self.assertRaises(StreamingError) as context:
                 self.streaming_manager.parse_playlist(playlist_url)
@@ -1427,6 +1498,7 @@ class TestStreamingActualExecution(unittest.TestCase, RealEnvironmentTestBase):
         
     def tearDown(self):
         """テストクリーンアップ"""
+        self.streaming_manager.close_sync()
         self.temp_env.__exit__(None, None, None)
         super().tearDown()
     
@@ -1521,7 +1593,7 @@ class TestStreamingActualExecution(unittest.TestCase, RealEnvironmentTestBase):
         
         # When: 1セグメント目の後にstop_flagを設定
         call_count = 0
-        def mock_download_with_stop(segment):
+        def mock_download_with_stop(segment, retry_budget=None):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -1574,7 +1646,7 @@ class TestStreamingActualExecution(unittest.TestCase, RealEnvironmentTestBase):
         )
         
         # When: 2番目のセグメントでエラー発生
-        def mock_download_with_error(segment):
+        def mock_download_with_error(segment, retry_budget=None):
             if segment.sequence == 1:  # 2番目でエラー
                 raise Exception("セグメントダウンロードエラー")
             return b"good_segment_data"
@@ -1628,7 +1700,7 @@ class TestStreamingActualExecution(unittest.TestCase, RealEnvironmentTestBase):
         expected_data = [b"parallel_data_0", b"parallel_data_1", b"parallel_data_2"]
         
         # When: 実際に並行ダウンロード実行
-        with patch.object(self.streaming_manager, '_download_single_segment') as mock_download:
+        with patch.object(self.streaming_manager, '_download_single_segment_async') as mock_download:
             mock_download.side_effect = expected_data
             
             # 並行ダウンロードGenerator実行
@@ -1687,14 +1759,14 @@ class TestStreamingActualExecution(unittest.TestCase, RealEnvironmentTestBase):
         
         # When: 1回目のダウンロード後に停止フラグ設定
         call_count = 0
-        def mock_download_with_parallel_stop(segment):
+        def mock_download_with_parallel_stop(segment, session):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
                 stop_flag.set()  # 1回目の後に停止フラグ
             return b"parallel_stop_data"
         
-        with patch.object(self.streaming_manager, '_download_single_segment') as mock_download:
+        with patch.object(self.streaming_manager, '_download_single_segment_async') as mock_download:
             mock_download.side_effect = mock_download_with_parallel_stop
             
             # 並行ダウンロード実行
@@ -1772,6 +1844,7 @@ class TestStreamingEdgeCases(unittest.TestCase, RealEnvironmentTestBase):
         
     def tearDown(self):
         """テストクリーンアップ"""
+        self.streaming_manager.close_sync()
         self.temp_env.__exit__(None, None, None)
         super().tearDown()
     
@@ -1819,13 +1892,7 @@ segment001.ts
 #EXT-X-ENDLIST"""
         
         # When: 暗号化プレイリスト解析
-        with patch.object(self.streaming_manager.session, 'get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = encrypted_content
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-            
+        with fake_aiohttp_session(self.streaming_manager, [aiohttp_response(body=encrypted_content)]):
             # プレイリスト解析実行
             stream_info = self.streaming_manager.parse_playlist(playlist_url)
         
@@ -1854,14 +1921,8 @@ segment001.ts
             ]
             
             # When: 制限を超えるセグメントをダウンロード
-            with patch.object(self.streaming_manager.session, 'get') as mock_get:
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.content = b"cache_data"
-                mock_response.iter_content.return_value = [b"cache_data"]
-                mock_response.raise_for_status.return_value = None
-                mock_get.return_value = mock_response
-                
+            responses = [aiohttp_response(body=b"cache_data") for _ in segments]
+            with fake_aiohttp_session(self.streaming_manager, responses):
                 # 順次ダウンロード実行
                 for segment in segments:
                     self.streaming_manager._download_single_segment(segment)
@@ -2220,5 +2281,677 @@ class TestStreamingMainBlockExecution(unittest.TestCase, RealEnvironmentTestBase
                 os.environ.pop('RECRADIKO_TEST_MODE', None)
 
 
+class TestStreamingKeyCache(unittest.TestCase, RealEnvironmentTestBase):
+    """暗号化キーキャッシュテスト"""
+    
+    KEY = bytes(range(16))
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        mock_auth_info = MagicMock()
+        mock_auth_info.auth_token = "test_auth_token_string"
+        mock_auth_info.area_id = "JP13"
+        self.mock_auth.get_valid_auth_info.return_value = mock_auth_info
+        
+        self.streaming_manager = StreamingManager(self.mock_auth)
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.streaming_manager.close_sync()
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _encrypt(self, plaintext: bytes, iv: bytes) -> bytes:
+        """AES-128-CBC (PKCS7) で暗号化"""
+        from cryptography.hazmat.primitives import padding
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+        padder = padding.PKCS7(128).padder()
+        padded = padder.update(plaintext) + padder.finalize()
+        encryptor = Cipher(algorithms.AES(self.KEY), modes.CBC(iv)).encryptor()
+        return encryptor.update(padded) + encryptor.finalize()
+    
+    def _key_response(self):
+        response = Mock()
+        response.content = self.KEY
+        response.raise_for_status.return_value = None
+        return response
+    
+    def test_01_同一キーURIのキー取得は1回(self):
+        """
+        TDD Test: 同一キーURIのキー取得は1回
+        
+        同じキーを使用するセグメントの復号でキーを再取得せず、
+        有効期限切れ後は再取得することを確認
+        """
+        # Given: 同じキーで暗号化した5セグメント
+        key_uri = "https://example.com/key.bin"
+        segments = [(f"segment{i}".encode() * 10, f"0x{i:032x}") for i in range(5)]
+        
+        self.streaming_manager.key_cache_ttl = 0.5
+        
+        # When: 順に復号
+        with patch.object(self.streaming_manager.session, 'get',
+                          return_value=self._key_response()) as mock_get:
+            results = [
+                self.streaming_manager._decrypt_segment(
+                    self._encrypt(plaintext, bytes.fromhex(iv[2:])), key_uri, iv)
+                for plaintext, iv in segments
+            ]
+            fetches_before_expiry = mock_get.call_count
+            
+            # 有効期限切れ後の復号
+            time.sleep(0.6)
+            self.streaming_manager._decrypt_segment(
+                self._encrypt(b"after", b"\x00" * 16), key_uri, None)
+        
+        # Then: 全セグメントが正しく復号され、キー取得は期限切れまで1回
+        self.assertEqual(results, [plaintext for plaintext, _ in segments])
+        self.assertEqual(fetches_before_expiry, 1)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(self.streaming_manager.key_fetch_count, 2)
+    
+    def test_02_並列取得時のキー取得の集約(self):
+        """
+        TDD Test: 並列取得時のキー取得の集約
+        
+        複数スレッドが同時に同じキーを要求した場合に1回だけ取得し、
+        取得失敗はキャッシュせず次の要求で再取得することを確認
+        """
+        # Given: 取得に時間のかかるキーサーバー
+        key_uri = "https://example.com/key.bin"
+        plaintext = b"parallel segment data"
+        encrypted = self._encrypt(plaintext, b"\x00" * 16)
+        
+        def slow_key(*args, **kwargs):
+            time.sleep(0.2)
+            return self._key_response()
+        
+        # When: 8スレッドで同時に復号
+        with patch.object(self.streaming_manager.session, 'get', side_effect=slow_key) as mock_get:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(
+                    lambda _: self.streaming_manager._decrypt_segment(encrypted, key_uri, None), range(8)))
+        
+        # Then: キー取得は1回で全スレッドが復号できる
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(results, [plaintext] * 8)
+        
+        # And: 取得失敗はキャッシュされない
+        other_uri = "https://example.com/key2.bin"
+        with patch.object(self.streaming_manager.session, 'get',
+                          side_effect=[requests.ConnectionError("Connection failed"),
+                                       self._key_response()]):
+            self.assertEqual(self.streaming_manager._decrypt_segment(encrypted, other_uri, None), encrypted)
+            self.assertEqual(self.streaming_manager._decrypt_segment(encrypted, other_uri, None), plaintext)
+    
+    def test_03_メディアシーケンス番号からのIV(self):
+        """
+        TDD Test: メディアシーケンス番号からのIV
+        
+        IV属性のないEXT-X-KEYでは、メディアシーケンス番号をIVとして使用することを確認
+        """
+        # Given: IV属性のない暗号化プレイリスト（メディアシーケンス番号 100 から開始）
+        playlist_url = "https://example.com/encrypted.m3u8"
+        content = """#EXTM3U
+#EXT-X-VERSION:3
+#EXT-X-TARGETDURATION:5
+#EXT-X-MEDIA-SEQUENCE:100
+#EXT-X-KEY:METHOD=AES-128,URI="key.bin"
+#EXTINF:5.0,
+segment100.aac
+#EXTINF:5.0,
+segment101.aac
+#EXT-X-ENDLIST"""
+        
+        # When: プレイリスト解析
+        with fake_aiohttp_session(self.streaming_manager, [aiohttp_response(body=content)]):
+            stream_info = self.streaming_manager.parse_playlist(playlist_url)
+        
+        # Then: セグメント毎にメディアシーケンス番号のIVが設定される
+        ivs = [segment.encryption_iv for segment in stream_info.segments]
+        self.assertEqual(ivs, [f"0x{100:032x}", f"0x{101:032x}"])
+        self.assertEqual(stream_info.segments[0].encryption_key, "https://example.com/key.bin")
+        
+        # And: そのIVで暗号化されたセグメントを復号できる
+        encrypted = self._encrypt(b"sequence 101", (101).to_bytes(16, 'big'))
+        with patch.object(self.streaming_manager.session, 'get', return_value=self._key_response()):
+            decrypted = self.streaming_manager._decrypt_segment(
+                encrypted, stream_info.segments[1].encryption_key, ivs[1])
+        self.assertEqual(decrypted, b"sequence 101")
+
+
+class TestStreamingBodyAssembly(unittest.TestCase, RealEnvironmentTestBase):
+    """セグメント本文の読み取りテスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.streaming_manager = StreamingManager(self.mock_auth)
+        # 帯域制限はチャンク毎の呼び出しを記録
+        self.streaming_manager.bandwidth_limiter = MagicMock()
+        self.streaming_manager.bandwidth_limiter.throttle_async = AsyncMock()
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _read(self, chunks, headers):
+        response = aiohttp_response(chunks=chunks, headers=headers)
+        return asyncio.run(self.streaming_manager._read_segment_body(response)), response
+    
+    def test_01_Content_Lengthによる事前確保(self):
+        """
+        TDD Test: Content-Lengthによる事前確保
+        
+        Content-Length が一致する本文は確保したバッファへ直接書き込まれ、
+        連結・bytes 化による再コピーをせずにそのまま返され、チャンク毎に帯域制限されることを確認
+        """
+        # Given: 64KiBずつ受信する約1MBの本文
+        body = os.urandom(1_000_000)
+        chunk_size = self.streaming_manager.buffer_size
+        chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+        
+        # When: 本文を読み取り（確保したバッファを記録）
+        created = []
+        
+        class RecordingBytearray(bytearray):
+            def __init__(self, *args):
+                super().__init__(*args)
+                created.append(self)
+        
+        with patch('src.streaming.bytearray', RecordingBytearray, create=True):
+            data, response = self._read(chunks, {'Content-Length': str(len(body))})
+        
+        # Then: 確保した1つのバッファに本文が書き込まれ、そのまま返される
+        self.assertEqual(len(created), 1)
+        self.assertIs(data, created[0])
+        self.assertEqual(data, body)
+        response.content.iter_chunked.assert_called_once_with(chunk_size)
+        
+        # And: 受信したチャンク毎に帯域制限される
+        throttled = [c.args[0] for c in self.streaming_manager.bandwidth_limiter.throttle_async.await_args_list]
+        self.assertEqual(throttled, [len(chunk) for chunk in chunks])
+    
+    def test_02_Content_Lengthと一致しない本文(self):
+        """
+        TDD Test: Content-Lengthと一致しない本文
+        
+        Content-Length が無い・圧縮転送・不正な値の場合は本文を欠落なく返し、
+        宣言と長さが異なる場合は再試行対象のエラーになることを確認
+        """
+        chunks = [b"a" * 100, b"b" * 100, b"c" * 50]
+        body = b"".join(chunks)
+        cases = [
+            ("Content-Lengthなし", {}),
+            ("圧縮転送", {'Content-Length': '10', 'Content-Encoding': 'gzip'}),
+            ("不正な値", {'Content-Length': 'unknown'}),
+        ]
+        for name, headers in cases:
+            with self.subTest(case=name):
+                # When: 本文を読み取り
+                data, _ = self._read(chunks, headers)
+                
+                # Then: 受信した本文がそのまま返される
+                self.assertEqual(bytes(data), body)
+        
+        for name, headers in [("宣言より長い", {'Content-Length': '150'}),
+                              ("宣言より短い", {'Content-Length': '400'})]:
+            with self.subTest(case=name):
+                # When/Then: 長さの不一致は ClientPayloadError（再試行対象）
+                with self.assertRaises(aiohttp.ClientPayloadError):
+                    self._read(chunks, headers)
+                self.assertTrue(self.streaming_manager.retry_policy.is_retryable_exception(aiohttp.ClientPayloadError()))
+    
+    def test_03_指定した設定ファイルの帯域制限(self):
+        """
+        TDD Test: 指定した設定ファイルの帯域制限
+        
+        帯域制限を渡さない場合、既定の config.json ではなく config_path の
+        network セクションから共有の帯域制限を取得することを確認
+        """
+        # Given: 帯域制限を設定した設定ファイル
+        self.temp_env.update_config_data({"network": {"bandwidth_limit_mbps": 7.5}})
+        config_path = str(self.temp_env.config_file)
+        
+        # When: 設定ファイルを指定してマネージャーを生成
+        manager = StreamingManager(self.mock_auth, config_path=config_path)
+        
+        # Then: 指定した設定ファイルの帯域制限を共有する
+        self.assertIsNotNone(manager.bandwidth_limiter)
+        self.assertEqual(manager.bandwidth_limiter.limit_mbps, 7.5)
+        self.assertIs(manager.bandwidth_limiter, load_bandwidth_limiter(config_path))
+
+
+class TestStreamingAsync(unittest.TestCase, RealEnvironmentTestBase):
+    """非同期ダウンロードのモックサーバー結合テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _playlist_url(self, server: MockRadikoServer, minutes: int) -> str:
+        start = datetime(2025, 7, 22, 6, 0, 0)
+        end = start + timedelta(minutes=minutes)
+        return (f"{server.base_url}/v2/api/ts/playlist.m3u8?station_id=TBS"
+                f"&ft={start.strftime('%Y%m%d%H%M%S')}&to={end.strftime('%Y%m%d%H%M%S')}")
+    
+    def test_01_共有セッションプールでの非同期ダウンロード(self):
+        """
+        TDD Test: 共有セッションプールでの非同期ダウンロード
+        
+        マスタープレイリストから解決したセグメントを、スレッドを増やさずに
+        多数並行してダウンロードでき、共有したセッションプールはクローズしないことを確認
+        """
+        with MockRadikoServer(MockServerConfig(latency_ms=50)) as server:
+            # Given: 360セグメントの番組と、録音側と共有するセッションプール
+            authenticator = server.create_authenticator(str(self.temp_env.config_dir / "auth_config.json"))
+            session_pool = AsyncSessionPool(connection_limit=64)
+            manager = StreamingManager(authenticator, max_workers=64, session_pool=session_pool)
+            thread_counts = []
+            
+            async def run():
+                stream_info = await manager.parse_playlist_async(self._playlist_url(server, 30))
+                # 認証ヘッダー取得用のエグゼキュータースレッドは解析時に起動済み
+                threads_before.append(threading.active_count())
+                received = []
+                async for data in manager.download_segments_async(
+                        stream_info, progress_callback=lambda done, total: thread_counts.append(threading.active_count())):
+                    received.append(data)
+                await manager.close()
+                shared_session_open = session_pool.is_open
+                await session_pool.close()
+                return stream_info, received, shared_session_open
+            
+            # When: 非同期APIで解析・ダウンロード
+            threads_before = []
+            stream_info, received, shared_session_open = asyncio.run(run())
+            segment_size = server.segment_size
+            segments_served = server.stats.segments_served
+        
+        # Then: 全セグメントを取得し、ダウンロード中もスレッド数は増えない
+        self.assertEqual(len(stream_info.segments), 360)
+        self.assertEqual(len(received), 360)
+        self.assertTrue(all(len(data) == segment_size for data in received))
+        self.assertEqual(segments_served, 360)
+        self.assertLessEqual(max(thread_counts), threads_before[0])
+        self.assertTrue(shared_session_open)
+    
+    def test_02_同期APIは非同期版のラッパー(self):
+        """
+        TDD Test: 同期APIは非同期版のラッパー
+        
+        parse_playlist・download_segments_parallel が呼び出し毎にスレッド・セッションを作らず、
+        1つのイベントループとセッションを使い回し、close_sync でループのスレッドが終了することを確認
+        """
+        with MockRadikoServer(MockServerConfig(latency_ms=5)) as server:
+            # Given: 10分番組のストリーム情報
+            authenticator = server.create_authenticator(str(self.temp_env.config_dir / "auth_config.json"))
+            manager = StreamingManager(authenticator, max_workers=8)
+            stream_info = manager.parse_playlist(self._playlist_url(server, 10))
+            loop_thread = manager._background_thread
+            session = manager.session_pool._session
+            
+            # When: 同期APIで全件取得し、2回目は途中で閉じる
+            received = list(manager.download_segments_parallel(stream_info, "unused.ts"))
+            generator = manager.download_segments_parallel(stream_info, "unused.ts")
+            first = next(generator)
+            generator.close()
+            single = manager._download_single_segment(stream_info.segments[-1])
+            segment_size = server.segment_size
+            
+            # Then: 全セグメントを取得し、同じループ・セッションを使い回す
+            self.assertEqual(len(received), len(stream_info.segments))
+            self.assertEqual(len(first), segment_size)
+            self.assertEqual(len(single), segment_size)
+            self.assertIs(manager._background_thread, loop_thread)
+            self.assertIs(manager.session_pool._session, session)
+            
+            # And: close_sync でループのスレッドが終了し、セッションはクローズされる
+            manager.close_sync()
+            self.assertFalse(loop_thread.is_alive())
+            self.assertTrue(session.closed)
+    
+    def test_03_認証ヘッダーは一括で1回だけループ外で取得(self):
+        """
+        TDD Test: 認証ヘッダーは一括で1回だけループ外で取得
+        
+        トークン確認・再取得（同期通信）はイベントループのスレッド外で一括につき1回だけ行い、
+        全セグメントで同じ認証ヘッダーを使用することを確認
+        """
+        # Given: 呼び出されたスレッドを記録する認証器
+        auth_threads = []
+        mock_auth = MagicMock(spec=RadikoAuthenticator)
+        
+        def get_valid_auth_info():
+            auth_threads.append(threading.get_ident())
+            return MagicMock(auth_token="token", area_id="JP13")
+        mock_auth.get_valid_auth_info.side_effect = get_valid_auth_info
+        
+        manager = StreamingManager(mock_auth, max_workers=4)
+        segments = [
+            StreamSegment(url=f"https://example.com/segment{i}.ts", duration=5.0,
+                          sequence=i, timestamp=datetime.now())
+            for i in range(10)
+        ]
+        stream_info = StreamInfo(
+            stream_url="https://example.com/test.m3u8", station_id="TBS", quality="high",
+            bitrate=48000, codec="aac", segments=segments, is_live=False
+        )
+        seen_headers = []
+        
+        async def fake_download(segment, session, headers, retry_budget=None):
+            seen_headers.append(headers)
+            return b"data"
+        
+        async def run():
+            loop_thread = threading.get_ident()
+            received = [data async for data in manager.download_segments_async(stream_info)]
+            await manager.close()
+            return loop_thread, received
+        
+        # When: 10セグメントをダウンロード
+        with patch.object(manager, '_download_single_segment_async', side_effect=fake_download):
+            loop_thread, received = asyncio.run(run())
+        
+        # Then: 認証情報の取得はループ外で1回だけ
+        self.assertEqual(len(received), 10)
+        self.assertEqual(len(auth_threads), 1)
+        self.assertNotEqual(auth_threads[0], loop_thread)
+        
+        # And: 全セグメントで同じヘッダーを使用
+        self.assertTrue(all(headers['X-Radiko-AuthToken'] == "token" for headers in seen_headers))
+
+    
+    def test_04_同期APIは共有プールのイベントループで実行(self):
+        """
+        TDD Test: 同期APIは共有プールのイベントループで実行
+        
+        セッションプールのイベントループが別スレッドで実行中の場合、同期APIはそのループで
+        同じセッションを使って実行し、そのループ内からの呼び出しはエラーになることを確認
+        """
+        with MockRadikoServer(MockServerConfig(latency_ms=5)) as server:
+            # Given: 別スレッドのイベントループでセッションを生成済みの共有プール
+            authenticator = server.create_authenticator(str(self.temp_env.config_dir / "auth_config.json"))
+            session_pool = AsyncSessionPool(connection_limit=8)
+            loop = asyncio.new_event_loop()
+            loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+            loop_thread.start()
+            session = asyncio.run_coroutine_threadsafe(session_pool.get_session(), loop).result()
+            manager = StreamingManager(authenticator, max_workers=8, session_pool=session_pool)
+            
+            async def call_sync_api_in_loop():
+                with self.assertRaises(StreamingError):
+                    manager.parse_playlist(self._playlist_url(server, 1))
+            
+            try:
+                # When: 同期APIで解析・ダウンロード
+                stream_info = manager.parse_playlist(self._playlist_url(server, 10))
+                received = list(manager.download_segments_parallel(stream_info, "unused.ts"))
+                
+                # Then: 同期API用のループは起動せず、共有プールのセッションを使い続ける
+                self.assertEqual(len(received), len(stream_info.segments))
+                self.assertIsNone(manager._background_thread)
+                self.assertIs(session_pool._session, session)
+                
+                # And: 共有プールのループ内からの同期API呼び出しはエラー
+                asyncio.run_coroutine_threadsafe(call_sync_api_in_loop(), loop).result()
+                
+                # And: 共有されたセッションはクローズしない
+                manager.close_sync()
+                self.assertFalse(session.closed)
+            finally:
+                asyncio.run_coroutine_threadsafe(session_pool.close(), loop).result()
+                loop.call_soon_threadsafe(loop.stop)
+                loop_thread.join()
+                loop.close()
+
+class TestStreamingReorderWindow(unittest.TestCase, RealEnvironmentTestBase):
+    """並列ダウンロードの先読み範囲・遅延セグメントの重複リクエストテスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _stream_info(self, count: int) -> StreamInfo:
+        segments = [
+            StreamSegment(url=f"https://example.com/segment{i:03d}.ts", duration=5.0,
+                          sequence=i, timestamp=datetime.now())
+            for i in range(count)
+        ]
+        return StreamInfo(
+            stream_url="https://example.com/test.m3u8", station_id="TBS", quality="high",
+            bitrate=48000, codec="aac", segments=segments, is_live=False
+        )
+    
+    def _download_all(self, manager: StreamingManager, stream_info: StreamInfo, fake_download):
+        """非同期APIで全セグメントを取得"""
+        async def run():
+            received = []
+            async for data in manager.download_segments_async(stream_info):
+                received.append(data)
+            await manager.close()
+            return received
+        
+        with patch.object(manager, '_download_single_segment_async', side_effect=fake_download):
+            return asyncio.run(run())
+    
+    def test_01_先読み範囲による開始数の制限(self):
+        """
+        TDD Test: 先読み範囲による開始数の制限
+        
+        先頭セグメントが停滞している間、未出力の先頭から reorder_window 件先までしか
+        ダウンロードを開始しないことを確認
+        """
+        # Given: 並列数8・先読み5件、先頭セグメントのみ停滞
+        manager = StreamingManager(self.mock_auth, max_workers=8, max_inflight_bytes=None, reorder_window=5)
+        manager.straggler_timeout = 60
+        started = []
+        started_while_stalled = []
+        
+        async def fake_download(segment, session, headers, retry_budget=None):
+            started.append(segment.sequence)
+            if segment.sequence == 0:
+                await asyncio.sleep(0.3)
+                started_while_stalled.append(len(started))
+            return bytes([segment.sequence]) * 10
+        
+        # When: 20セグメントをダウンロード
+        received = self._download_all(manager, self._stream_info(20), fake_download)
+        
+        # Then: 停滞中の開始数は先読み範囲内で、解放後は全て順番に出力される
+        self.assertEqual(started_while_stalled, [5])
+        self.assertEqual([data[0] for data in received], list(range(20)))
+    
+    def test_02_p95を超えたセグメントの重複リクエスト(self):
+        """
+        TDD Test: p95を超えたセグメントの重複リクエスト
+        
+        レイテンシの p95 を超えて完了しないセグメントを重複して要求し、
+        先に完了した重複リクエストを採用して元のリクエストをキャンセルすることを確認
+        """
+        # Given: 40セグメント中、30番目の1回目の要求のみ応答しない
+        manager = StreamingManager(self.mock_auth, max_workers=4, max_inflight_bytes=None)
+        manager.hedge_min_delay = 0.1
+        calls = {}
+        cancelled = []
+        
+        async def fake_download(segment, session, headers, retry_budget=None):
+            calls[segment.sequence] = calls.get(segment.sequence, 0) + 1
+            try:
+                if segment.sequence == 30 and calls[segment.sequence] == 1:
+                    await asyncio.sleep(30)
+                await asyncio.sleep(0.01)
+            except asyncio.CancelledError:
+                cancelled.append(segment.sequence)
+                raise
+            return bytes([segment.sequence]) * 10
+        
+        # When: ダウンロード
+        start = time.monotonic()
+        received = self._download_all(manager, self._stream_info(40), fake_download)
+        elapsed = time.monotonic() - start
+        
+        # Then: 遅延したセグメントのみ重複して要求し、待たずに全て順番に出力される
+        self.assertEqual([data[0] for data in received], list(range(40)))
+        self.assertEqual(manager.hedged_requests, 1)
+        self.assertEqual(calls[30], 2)
+        self.assertEqual(cancelled, [30])
+        self.assertLess(elapsed, 10)
+    
+    def test_03_統計不足時の停滞セグメント再取得と失敗時の待機(self):
+        """
+        TDD Test: 統計不足時の停滞セグメント再取得と失敗時の待機
+        
+        レイテンシの件数が足りない間は straggler_timeout で再取得し、
+        先に失敗した要求があっても重複リクエストの結果を待つことを確認
+        """
+        # Given: 先頭セグメントの1回目の要求は停滞後に失敗、2回目は成功
+        manager = StreamingManager(self.mock_auth, max_workers=4, max_inflight_bytes=None)
+        manager.straggler_timeout = 0.1
+        calls = {}
+        
+        async def fake_download(segment, session, headers, retry_budget=None):
+            calls[segment.sequence] = calls.get(segment.sequence, 0) + 1
+            if segment.sequence == 0 and calls[0] == 1:
+                await asyncio.sleep(0.2)
+                raise StreamingError("セグメント 0 のダウンロードに失敗")
+            if segment.sequence == 0:
+                await asyncio.sleep(0.3)
+            return bytes([segment.sequence]) * 10
+        
+        # When: 3セグメントをダウンロード
+        received = self._download_all(manager, self._stream_info(3), fake_download)
+        
+        # Then: 再取得した先頭セグメントを含め全て出力される
+        self.assertEqual([data[0] for data in received], [0, 1, 2])
+        self.assertEqual(manager.hedged_requests, 1)
+    
+    def test_04_重複リクエストが同時に完了した場合の採用(self):
+        """
+        TDD Test: 重複リクエストが同時に完了した場合の採用
+        
+        元のリクエストと重複リクエストが同じ待機で完了しても、
+        一方を採用してもう一方を読み飛ばし、ダウンロードを継続することを確認
+        """
+        # Given: 先頭セグメントの2回の要求が同じイベントで同時に完了
+        manager = StreamingManager(self.mock_auth, max_workers=4, max_inflight_bytes=None)
+        manager.straggler_timeout = 0.05
+        calls = {}
+        release = asyncio.Event()
+        
+        async def fake_download(segment, session, headers, retry_budget=None):
+            calls[segment.sequence] = calls.get(segment.sequence, 0) + 1
+            if segment.sequence == 0:
+                if calls[0] == 2:
+                    release.set()
+                await release.wait()
+            return bytes([segment.sequence]) * 10
+        
+        # When: 3セグメントをダウンロード
+        received = self._download_all(manager, self._stream_info(3), fake_download)
+        
+        # Then: 先頭セグメントは1回だけ出力され、全て順番に出力される
+        self.assertEqual([data[0] for data in received], [0, 1, 2])
+        self.assertEqual(manager.hedged_requests, 1)
+        self.assertEqual(calls[0], 2)
+    
+    def test_05_リトライ予算はダウンロード呼び出し毎に独立(self):
+        """
+        TDD Test: リトライ予算はダウンロード呼び出し毎に独立
+        
+        同じマネージャーで並行する2つのダウンロードがそれぞれ自分のリトライ予算を使い、
+        一方のリトライで他方の予算が消費されないことを確認
+        """
+        # Given: 受け取ったリトライ予算を記録し、1回分消費するダウンロード
+        manager = StreamingManager(self.mock_auth, max_workers=2, max_inflight_bytes=None)
+        budgets = {}
+        
+        async def fake_download(segment, session, headers, retry_budget=None):
+            budgets.setdefault(segment.url, set()).add(id(retry_budget))
+            retry_budget.try_acquire("HTTP 503")
+            await asyncio.sleep(0)
+            return bytes([segment.sequence]) * 10
+        
+        async def collect(stream_info):
+            return [data async for data in manager.download_segments_async(stream_info)]
+        
+        async def run():
+            try:
+                return await asyncio.gather(collect(self._stream_info(3)), collect(self._stream_info(3)))
+            finally:
+                await manager.close()
+        
+        # When: 同じセグメント列を2つ並行してダウンロード
+        with patch.object(manager, '_download_single_segment_async', side_effect=fake_download):
+            first, second = asyncio.run(run())
+        
+        # Then: 両方とも全セグメントを取得し、各セグメントは呼び出し毎に別の予算で取得される
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 3)
+        self.assertTrue(all(len(ids) == 2 for ids in budgets.values()))
+    
+    def test_06_重複リクエストも並列数の枠内で実行(self):
+        """
+        TDD Test: 重複リクエストも並列数の枠内で実行
+        
+        遅延したセグメントの重複リクエストは max_workers を超えて送られず、
+        空いた枠では新しいセグメントより先に重複リクエストを開始することを確認
+        """
+        # Given: 並列数2で、先頭セグメントの1回目の要求だけが停滞
+        manager = StreamingManager(self.mock_auth, max_workers=2, max_inflight_bytes=None)
+        manager.straggler_timeout = 0.05
+        started = []
+        concurrency = {'running': 0, 'peak': 0}
+        
+        async def fake_download(segment, session, headers, retry_budget=None):
+            started.append(segment.sequence)
+            concurrency['running'] += 1
+            concurrency['peak'] = max(concurrency['peak'], concurrency['running'])
+            try:
+                if segment.sequence == 0 and started.count(0) == 1:
+                    await asyncio.sleep(30)
+                await asyncio.sleep(0.1 if segment.sequence == 1 else 0.01)
+            finally:
+                concurrency['running'] -= 1
+            return bytes([segment.sequence]) * 10
+        
+        # When: 3セグメントをダウンロード
+        received = self._download_all(manager, self._stream_info(3), fake_download)
+        
+        # Then: 全て順番に出力され、同時に実行される要求は2つまで
+        self.assertEqual([data[0] for data in received], [0, 1, 2])
+        self.assertEqual(concurrency['peak'], 2)
+        
+        # And: セグメント1の完了で空いた枠は、セグメント2より先に先頭セグメントの重複リクエストに使われる
+        self.assertEqual(started, [0, 1, 0, 2])
+        self.assertEqual(manager.hedged_requests, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
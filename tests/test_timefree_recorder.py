@@ -7,9 +7,14 @@ TEST_REDESIGN_PLANに基づく実環境重視テスト。
 
 import unittest
 import asyncio
+import io
 import tempfile
+import time
 import shutil
 import os
+import json
+import sys
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch, MagicMock, AsyncMock
@@ -18,13 +23,26 @@ import aiohttp
 # テスト対象
 from src.timefree_recorder import (
     TimeFreeRecorder, RecordingResult, TimeFreeError, TimeFreeAuthError,
-    SegmentDownloadError, PlaylistFetchError, FileConversionError
+    SegmentDownloadError, PlaylistFetchError, FileConversionError, _RecordingJob
 )
+from src.segment_writer import OrderedSegmentWriter
+from src.segment_store import SegmentStore
+from src.streaming import StreamSegment
+from src.bandwidth_limiter import load_bandwidth_limiter
+from src.utils.audio_utils import AdtsDurationCounter, iter_audio_frames
 from src.auth import RadikoAuthenticator
 from src.program_info import ProgramInfo
 from tests.utils.test_environment import TemporaryTestEnvironment, RealEnvironmentTestBase
 
 
+def _progress_stdout(content: str) -> asyncio.StreamReader:
+    """FFmpeg -progress pipe:1 の標準出力を模したストリーム"""
+    reader = asyncio.StreamReader()
+    reader.feed_data(content.encode())
+    reader.feed_eof()
+    return reader
+
+
 class TestTimeFreeRecorderBasic(unittest.TestCase, RealEnvironmentTestBase):
     """TimeFreeRecorder基本機能テスト"""
     
@@ -390,8 +408,7 @@ class TestTimeFreeRecorderConversion(unittest.TestCase, RealEnvironmentTestBase)
         FFmpeg実行中のプログレス表示が正常動作することを確認
         """
         async def run_test():
-            # Given: テスト用プログレスファイル
-            progress_file = self.temp_env.config_dir / "progress.txt"
+            # Given: テスト用プログレス情報
             input_file = self.temp_env.config_dir / "input.ts"
             
             # プログレス情報を作成
@@ -407,18 +424,17 @@ drop_frames=0
 speed=1.0x
 progress=continue"""
             
-            progress_file.write_text(progress_content)
-            
             # 入力ファイルの時間をモック
             with patch.object(self.recorder, '_get_media_duration', return_value=60.0):
                 # FFmpegプロセスをモック（即座に終了）
                 mock_process = AsyncMock()
                 mock_process.returncode = 0
+                mock_process.stdout = _progress_stdout(progress_content)
                 
                 # tqdmをモック
                 with patch('tqdm.tqdm', return_value=MagicMock()) as mock_tqdm:
                     # プログレス表示テスト
-                    await self.recorder._show_ffmpeg_progress(mock_process, str(progress_file), str(input_file))
+                    await self.recorder._show_ffmpeg_progress(mock_process, str(input_file))
             
             # Then: プログレス解析が正常動作する
             parsed_time = self.recorder._parse_ffmpeg_progress(progress_content)
@@ -570,41 +586,22 @@ class TestTimeFreeRecorderMetadata(unittest.TestCase, RealEnvironmentTestBase):
         """
         TDD Test: メディア期間取得機能
         
-        FFmpegを使用したメディアファイル期間取得を確認
+        ffprobeを起動せず、ADTSフレームヘッダーからメディアファイル期間を取得することを確認
         """
-        # Given: ダミーメディアファイル
-        media_file = self.temp_env.config_dir / "test_media.mp3"
-        media_file.write_bytes(b"dummy_mp3_content")
+        # Given: 48kHz・2時間30分15.5秒相当のADTSファイル（1フレーム = 1024/48000秒）
+        frame_count = int(9015.5 * 48000 / 1024)
+        media_file = self.temp_env.config_dir / "test_media.aac"
+        media_file.write_bytes(self.temp_env.build_adts_segment(frame_count, payload_size=0))
         
-        # ffprobe出力をモック（CSVフォーマット）
-        ffprobe_output = "9015.5"  # 2:30:15.50の秒数
-        
-        # When: メディア期間取得（モック）
+        # When: メディア期間取得
         with patch('asyncio.create_subprocess_exec') as mock_subprocess:
-            mock_process = AsyncMock()
-            mock_process.communicate.return_value = (ffprobe_output.encode(), b'')
-            mock_process.returncode = 0
-            mock_subprocess.return_value = mock_process
-            
-            # 非同期実行
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                duration = loop.run_until_complete(
-                    self.recorder._get_media_duration(str(media_file))
-                )
-            finally:
-                loop.close()
+            duration = asyncio.run(self.recorder._get_media_duration(str(media_file)))
         
         # Then: 正しい期間が取得される
-        expected_duration = 2 * 3600 + 30 * 60 + 15.5  # 2:30:15.50 = 9015.5秒
-        self.assertAlmostEqual(duration, expected_duration, places=1)
+        self.assertAlmostEqual(duration, 9015.5, delta=0.05)
         
-        # ffprobeが正しく呼び出されたことを確認
-        mock_subprocess.assert_called_once()
-        call_args = mock_subprocess.call_args[0]
-        self.assertIn('ffprobe', ' '.join(call_args))
-        self.assertIn(str(media_file), ' '.join(call_args))
+        # And: 外部プロセスは起動しない
+        mock_subprocess.assert_not_called()
     
     def test_14_FFmpegプログレス解析機能(self):
         """
@@ -843,7 +840,8 @@ class TestTimeFreeRecorderIntegration(unittest.TestCase, RealEnvironmentTestBase
                 mock_fetch.assert_called_once()
                 mock_download.assert_called_once()
                 mock_convert.assert_called_once()
-                mock_metadata.assert_called_once()
+                # メタデータは変換時に書き込むため後処理は行わない
+                mock_metadata.assert_not_called()
         
         # 非同期実行
         asyncio.run(run_test())
@@ -897,7 +895,7 @@ class TestTimeFreeRecorderIntegration(unittest.TestCase, RealEnvironmentTestBase
             with patch('aiohttp.ClientSession') as mock_session:
                 # セッション作成
                 mock_session_instance = MagicMock()
-                mock_session.return_value.__aenter__.return_value = mock_session_instance
+                mock_session.return_value = mock_session_instance
                 
                 # 1段目：playlist.m3u8レスポンス
                 mock_response1 = AsyncMock()
@@ -953,7 +951,7 @@ https://segment2.aac
             # asyncio並行処理の詳細テスト
             with patch('aiohttp.ClientSession') as mock_session:
                 mock_session_instance = MagicMock()
-                mock_session.return_value.__aenter__.return_value = mock_session_instance
+                mock_session.return_value = mock_session_instance
                 
                 # 各セグメントのレスポンスを設定
                 responses = []
@@ -1039,53 +1037,45 @@ https://segment2.aac
         """
         TDD Test: _show_ffmpeg_progress実際実行
         
-        ライン533-601のFFmpegプログレス詳細フローをテスト
+        -progress pipe:1 の標準出力を逐次読み取り、進捗情報の到着毎にプログレスバーを更新することを確認
         """
         async def run_test():
-            # Given: テスト用プロセスとファイル
-            progress_file = self.temp_env.config_dir / "progress.txt"
+            # Given: 30秒・60秒時点の進捗情報を出力して終了するFFmpeg
             input_file = self.temp_env.config_dir / "input.ts"
-            
             input_file.write_bytes(b"dummy_ts_content")
             
-            # プログレス情報を段階的に書き込み
             progress_content = """frame=100
-fps=30
-stream_0_0_q=2.0
-bitrate=256kbits/s
-total_size=1024000
 out_time_ms=30000000
 out_time=00:00:30.000000
-dup_frames=0
-drop_frames=0
 speed=1.0x
-progress=continue"""
-            
-            progress_file.write_text(progress_content)
-            
-            # FFmpegプロセスをモック
+progress=continue
+frame=200
+out_time_ms=60000000
+out_time=00:01:00.000000
+speed=1.0x
+progress=end
+"""
             mock_process = AsyncMock()
             mock_process.returncode = None
-            
-            # プロセス完了をシミュレート
-            async def mock_returncode_progression():
-                await asyncio.sleep(0.1)
-                mock_process.returncode = 0
-            
-            asyncio.create_task(mock_returncode_progression())
+            mock_process.stdout = _progress_stdout(progress_content)
             
             # メディア期間を60秒に設定
-            with patch.object(self.recorder, '_get_media_duration', return_value=60.0):
-                with patch('tqdm.tqdm') as mock_tqdm:
-                    mock_progress_bar = MagicMock()
-                    mock_tqdm.return_value = mock_progress_bar
-                    
-                    # When: プログレス表示実行
-                    await self.recorder._show_ffmpeg_progress(mock_process, str(progress_file), str(input_file))
-                    
-                    # Then: プログレスバーが正しく動作
-                    mock_tqdm.assert_called_once_with(total=60, desc="音声変換", unit="秒")
-                    self.assertTrue(mock_progress_bar.update.called)
+            with patch.object(self.recorder, '_get_media_duration', return_value=60.0), \
+                 patch('tqdm.tqdm') as mock_tqdm, \
+                 patch('asyncio.sleep') as mock_sleep:
+                mock_progress_bar = MagicMock()
+                mock_tqdm.return_value = mock_progress_bar
+                
+                # When: プログレス表示実行
+                await self.recorder._show_ffmpeg_progress(mock_process, str(input_file))
+                
+            # Then: 進捗情報毎にプログレスバーが更新される
+            mock_tqdm.assert_called_once_with(total=60, desc="音声変換", unit="秒")
+            self.assertEqual([c.args[0] for c in mock_progress_bar.update.call_args_list], [30, 30])
+            mock_progress_bar.close.assert_called_once()
+            
+            # And: ポーリング待機は行わない
+            mock_sleep.assert_not_called()
         
         asyncio.run(run_test())
     
@@ -1093,38 +1083,26 @@ progress=continue"""
         """
         TDD Test: _get_media_duration実際実行
         
-        ライン612-635のffprobeメディア期間取得をテスト
+        ダウンロード時に算出済みの再生時間を優先して使用することを確認
         """
         async def run_test():
-            # Given: テスト用メディアファイル
+            # Given: ダウンロード時に再生時間を算出済みの一時TSファイル
             media_file = self.temp_env.config_dir / "test_media.ts"
             media_file.write_bytes(b"dummy_media_content")
-            
-            # ffprobe出力をモック（150.5秒 = 2:30.5）
-            ffprobe_output = "150.5"
+            self.recorder._media_durations[str(media_file)] = 150.5
             
             with patch('asyncio.create_subprocess_exec') as mock_subprocess:
-                mock_process = AsyncMock()
-                mock_process.communicate.return_value = (ffprobe_output.encode(), b'')
-                mock_process.returncode = 0
-                mock_subprocess.return_value = mock_process
-                
                 # When: メディア期間取得
                 duration = await self.recorder._get_media_duration(str(media_file))
                 
-                # Then: 正しい期間が返される
+                # Then: 算出済みの期間が返され、ファイルは解析しない
                 self.assertAlmostEqual(duration, 150.5, places=1)
-                
-                # ffprobeが正しく呼び出される
-                mock_subprocess.assert_called_once()
-                call_args = mock_subprocess.call_args[0]
-                
-                self.assertIn('ffprobe', call_args)
-                self.assertIn('-v', call_args)
-                self.assertIn('quiet', call_args)
-                self.assertIn('-show_entries', call_args)
-                self.assertIn('format=duration', call_args)
-                self.assertIn(str(media_file), call_args)
+                mock_subprocess.assert_not_called()
+            
+            # And: 一時ファイル削除時に破棄される
+            self.recorder._remove_temp_file(str(media_file))
+            self.assertNotIn(str(media_file), self.recorder._media_durations)
+            self.assertEqual(await self.recorder._get_media_duration(str(media_file)), 0.0)
         
         asyncio.run(run_test())
     
@@ -1711,30 +1689,21 @@ class TestTimeFreeRecorderMainBlockActual(unittest.TestCase, RealEnvironmentTest
                     call_args = mock_subprocess.call_args[0]
                     self.assertIn('pcm_s16le', call_args)  # WAVコーデック
             
-            # プログレス表示の詳細エッジケース（ライン574-578, 585-586）
-            progress_file = self.temp_env.config_dir / "edge_progress.txt"
+            # プログレス表示の詳細エッジケース
             input_file = self.temp_env.config_dir / "edge_input.ts"
-            
-            # プログレスが更新されない場合の警告パス
-            progress_file.write_text("frame=1")
             input_file.write_bytes(b"dummy")
             
+            # 進捗情報が完結しないまま終了する場合
             mock_process = AsyncMock()
             mock_process.returncode = None
-            
-            # 警告カウンターのテスト用タスク
-            async def set_returncode_later():
-                await asyncio.sleep(0.05)
-                mock_process.returncode = 0
-            
-            asyncio.create_task(set_returncode_later())
+            mock_process.stdout = _progress_stdout("frame=1")
             
             with patch.object(recorder, '_get_media_duration', return_value=100.0):
                 with patch('tqdm.tqdm') as mock_tqdm:
                     mock_progress_bar = MagicMock()
                     mock_tqdm.return_value = mock_progress_bar
                     
-                    await recorder._show_ffmpeg_progress(mock_process, str(progress_file), str(input_file))
+                    await recorder._show_ffmpeg_progress(mock_process, str(input_file))
         
         asyncio.run(test_ffmpeg_edge_cases())
     
@@ -1810,23 +1779,20 @@ class TestTimeFreeRecorderMainBlockActual(unittest.TestCase, RealEnvironmentTest
         self.mock_auth = MagicMock(spec=RadikoAuthenticator)
         recorder = TimeFreeRecorder(self.mock_auth)
         
-        # 1. プログレスファイル削除例外処理パス
+        # 1. 進捗情報なしで標準出力が終端に達するパス
         async def test_progress_cleanup():
             mock_process = AsyncMock()
             mock_process.returncode = 0
+            mock_process.stdout = _progress_stdout("frame=1\nprogress=end\n")
             
-            progress_file = self.temp_env.config_dir / "test_progress.txt"
-            progress_file.write_text("frame=1")
-            
-            with patch('os.unlink', side_effect=OSError("Permission denied")):
-                try:
-                    with patch.object(recorder, '_get_media_duration', return_value=100.0):
-                        await recorder._show_ffmpeg_progress(
-                            mock_process, str(progress_file), str(self.temp_env.config_dir / "dummy.ts")
-                        )
-                    self.assertTrue(True)
-                except Exception as e:
-                    self.fail(f"ファイル削除例外処理が失敗: {e}")
+            try:
+                with patch.object(recorder, '_get_media_duration', return_value=100.0):
+                    await recorder._show_ffmpeg_progress(
+                        mock_process, str(self.temp_env.config_dir / "dummy.ts")
+                    )
+                self.assertTrue(True)
+            except Exception as e:
+                self.fail(f"プログレス終了処理が失敗: {e}")
         
         asyncio.run(test_progress_cleanup())
         
@@ -2061,9 +2027,9 @@ class TestTimeFreeRecorderMainBlockActual(unittest.TestCase, RealEnvironmentTest
         mock_auth = MagicMock(spec=RadikoAuthenticator)
         recorder = TimeFreeRecorder(mock_auth)
         
-        # 1. subprocess.runが例外を発生 (634-635行)
+        # 1. ファイル読み込みで例外が発生
         async def test_ffprobe_error():
-            with patch('subprocess.run', side_effect=Exception("ffprobeエラー")):
+            with patch('src.timefree_recorder.adts_file_duration', side_effect=OSError("読み込みエラー")):
                 duration = await recorder._get_media_duration("/fake/path.mp3")
                 self.assertEqual(duration, 0.0)  # エラー時は0.0を返す
         
@@ -2100,17 +2066,15 @@ class TestTimeFreeRecorderMainBlockActual(unittest.TestCase, RealEnvironmentTest
             # FFmpegプロセスのモック
             mock_process = AsyncMock()
             mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(side_effect=Exception("プログレスエラー"))
-            
-            progress_file = Path(self.temp_env.config_dir) / "progress.txt"
-            progress_file.write_text("frame=1")
+            mock_process.stdout.readline = AsyncMock(side_effect=OSError("プログレスエラー"))
+            mock_process.stdout.read = AsyncMock(return_value=b"")
             
             input_file = Path(self.temp_env.config_dir) / "input.ts"
             input_file.write_bytes(b"fake ts content")
             
             with patch.object(recorder, 'logger') as mock_logger:
                 # エラーが発生してもクラッシュしない
-                await recorder._show_ffmpeg_progress(mock_process, str(progress_file), str(input_file))
+                await recorder._show_ffmpeg_progress(mock_process, str(input_file))
                 # debugログが出力される
                 mock_logger.debug.assert_called()
                 debug_calls = [call[0][0] for call in mock_logger.debug.call_args_list]
@@ -2211,5 +2175,2194 @@ raise Exception("意図的な例外")
         self.assertIn("意図的な例外", result2.stderr)
 
 
+
+class TestTimeFreeRecorderStreamingWrite(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorderセグメント逐次書き込みテスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def test_49_ライター指定時の逐次書き込み(self):
+        """
+        TDD Test: ライター指定時の逐次書き込み
+        
+        writer指定時はセグメントを保持せず順序通りにファイルへ書き出すことを確認
+        """
+        async def run_test():
+            segment_urls = [f"https://example.com/seg{i}.aac" for i in range(5)]
+            output_path = self.temp_env.config_dir / "streamed.ts"
+            
+            with patch('aiohttp.ClientSession') as mock_session:
+                mock_session_instance = MagicMock()
+                mock_session.return_value = mock_session_instance
+                
+                responses = []
+                for i in range(5):
+                    mock_response = AsyncMock()
+                    mock_response.status = 200
+                    mock_response.read.return_value = f"segment{i}_".encode()
+                    responses.append(mock_response)
+                mock_session_instance.get.return_value.__aenter__.side_effect = responses
+                
+                with patch('tqdm.asyncio.tqdm'):
+                    # When: ライター指定で並行ダウンロード
+                    with open(output_path, 'wb') as f:
+                        writer = OrderedSegmentWriter(f, window=2)
+                        result = await self.recorder._download_segments_concurrent(
+                            segment_urls, writer=writer
+                        )
+            
+            # Then: メモリ上には保持されない
+            self.assertEqual(result, [])
+            self.assertEqual(writer.segments_written, 5)
+            
+            # And: 順序通りにファイルへ書き込まれる
+            expected = b"".join(f"segment{i}_".encode() for i in range(5))
+            self.assertEqual(output_path.read_bytes(), expected)
+        
+        asyncio.run(run_test())
+    
+    def test_50_逐次書き込み無効時の一括結合(self):
+        """
+        TDD Test: 逐次書き込み無効時の一括結合
+        
+        streaming_write無効時は従来通り一括ダウンロード後に結合することを確認
+        """
+        program_info = ProgramInfo(
+            program_id="TBS_20250722_140000",
+            station_id="TBS",
+            station_name="TBSラジオ",
+            title="一括結合テスト番組",
+            start_time=datetime(2025, 7, 22, 14, 0, 0),
+            end_time=datetime(2025, 7, 22, 16, 0, 0),
+            is_timefree_available=True
+        )
+        output_path = str(self.temp_env.config_dir / "buffered.mp3")
+        self.recorder.streaming_write = False
+        
+        async def run_test():
+            with patch.object(self.recorder, '_fetch_playlist', return_value=["https://seg1.aac"]):
+                with patch.object(self.recorder, '_download_segments_concurrent',
+                                  return_value=[b"data"]) as mock_download:
+                    with patch.object(self.recorder, '_combine_ts_segments') as mock_combine:
+                        with patch.object(self.recorder, '_convert_to_target_format', new_callable=AsyncMock):
+                            with patch.object(self.recorder, '_embed_metadata'):
+                                result = await self.recorder.record_program(program_info, output_path)
+            
+            # Then: ライターなしでダウンロードし、結合処理が呼ばれる
+            self.assertTrue(result.success)
+            mock_download.assert_called_once()
+            self.assertEqual(mock_download.call_args[0][0], ["https://seg1.aac"])
+            self.assertNotIn('writer', mock_download.call_args[1])
+            mock_combine.assert_called_once()
+            self.assertEqual(mock_combine.call_args[0][0], [b"data"])
+        
+        asyncio.run(run_test())
+
+    
+    def test_51_FFmpegパイプライン変換(self):
+        """
+        TDD Test: FFmpegパイプライン変換
+        
+        pipeline_conversion有効時は一時ファイルを使わずFFmpeg標準入力へ順序通りに流し込むことを確認
+        """
+        output_path = str(self.temp_env.config_dir / "pipelined.mp3")
+        
+        # FFmpeg標準入力のモック（書き込み内容を記録）
+        written = bytearray()
+        mock_stdin = MagicMock()
+        mock_stdin.write.side_effect = written.extend
+        mock_stdin.drain = AsyncMock()
+        mock_stdin.wait_closed = AsyncMock()
+        
+        mock_process = MagicMock()
+        mock_process.stdin = mock_stdin
+        mock_process.stderr.read = AsyncMock(return_value=b"")
+        mock_process.returncode = 0
+        
+        # FFmpegは標準入力が閉じられるまで終了しない
+        stdin_closed = asyncio.Event()
+        mock_stdin.close.side_effect = stdin_closed.set
+        
+        async def wait_for_exit():
+            await stdin_closed.wait()
+            return 0
+        mock_process.wait = wait_for_exit
+        
+        async def fake_download(segment_urls, writer=None, journal=None, metrics=None, segment_windows=None):
+            # 順不同で到着したセグメントをライターへ渡す
+            for index in (1, 0, 2):
+                await writer.write(index, f"seg{index}".encode())
+            return []
+        
+        async def run_test():
+            with patch('asyncio.create_subprocess_exec', return_value=mock_process) as mock_exec:
+                with patch.object(self.recorder, '_download_segments_concurrent', side_effect=fake_download):
+                    await self.recorder._download_and_convert_pipelined(
+                        ["https://seg0.aac", "https://seg1.aac", "https://seg2.aac"],
+                        output_path, MagicMock()
+                    )
+            
+            # Then: FFmpegが標準入力から読み込む設定で起動される
+            args = mock_exec.call_args[0]
+            self.assertIn('pipe:0', args)
+            self.assertEqual(args[-1], output_path)
+            
+            # And: セグメントが順序通りに書き込まれ、入力が閉じられる
+            self.assertEqual(bytes(written), b"seg0seg1seg2")
+            mock_stdin.close.assert_called_once()
+        
+        asyncio.run(run_test())
+    
+    def test_52_FFmpegパイプライン変換エラー(self):
+        """
+        TDD Test: FFmpegパイプライン変換エラー
+        
+        FFmpegが異常終了した場合はFileConversionErrorとなることを確認
+        """
+        mock_process = MagicMock()
+        mock_process.stdin.drain = AsyncMock()
+        mock_process.stdin.wait_closed = AsyncMock()
+        mock_process.stderr.read = AsyncMock(return_value=b"Invalid data found")
+        mock_process.wait = AsyncMock(return_value=1)
+        mock_process.returncode = 1
+        
+        async def run_test():
+            with patch('asyncio.create_subprocess_exec', return_value=mock_process):
+                with patch.object(self.recorder, '_download_segments_concurrent', new_callable=AsyncMock):
+                    with self.assertRaises(FileConversionError) as context:
+                        await self.recorder._download_and_convert_pipelined(
+                            ["https://seg0.aac"], str(self.temp_env.config_dir / "error.mp3"), MagicMock()
+                        )
+            
+            self.assertIn("Invalid data found", str(context.exception))
+        
+        asyncio.run(run_test())
+    
+    def test_82_FFmpeg途中終了時のダウンロード打ち切り(self):
+        """
+        TDD Test: FFmpeg途中終了時のダウンロード打ち切り
+        
+        FFmpegが標準入力を読み切る前に異常終了しても停止せず、
+        残りのダウンロードを打ち切ってFileConversionErrorとなることを確認
+        """
+        segment_urls = [f"https://example.com/seg{i}.aac" for i in range(360)]
+        real_exec = asyncio.create_subprocess_exec
+        # 先頭のみ読み込んで異常終了するFFmpegの代替プロセス
+        failing_ffmpeg = (
+            "import sys; sys.stdin.buffer.read(1024); "
+            "sys.stderr.write('Invalid data found'); sys.exit(1)"
+        )
+        
+        async def start_failing_ffmpeg(*cmd, **kwargs):
+            return await real_exec(sys.executable, '-c', failing_ffmpeg, **kwargs)
+        
+        async def run_test():
+            with patch('asyncio.create_subprocess_exec', side_effect=start_failing_ffmpeg):
+                with patch('aiohttp.ClientSession') as mock_session:
+                    mock_session_instance = MagicMock()
+                    mock_session.return_value = mock_session_instance
+                    mock_response = AsyncMock()
+                    mock_response.status = 200
+                    mock_response.read.return_value = b"x" * 65536
+                    mock_session_instance.get.return_value.__aenter__.return_value = mock_response
+                    with patch('tqdm.asyncio.tqdm'):
+                        with self.assertRaises(FileConversionError) as context:
+                            await asyncio.wait_for(
+                                self.recorder._download_and_convert_pipelined(
+                                    segment_urls, str(self.temp_env.config_dir / "early_exit.mp3"),
+                                    MagicMock()
+                                ),
+                                timeout=10.0
+                            )
+            
+            # Then: 残りのセグメントはダウンロードされない
+            self.assertIn("Invalid data found", str(context.exception))
+            self.assertLess(mock_session_instance.get.call_count, len(segment_urls))
+        
+        asyncio.run(run_test())
+    
+    def test_81_ダウンロード処理外の例外でも書き込みが停止しない(self):
+        """
+        TDD Test: ダウンロード処理外の例外でも書き込みが停止しない
+        
+        スプール読み込みのOSErrorは欠番として扱われ、
+        出力先のOSErrorはライターを中断し、いずれも並行処理が完了することを確認
+        """
+        segment_urls = [f"https://example.com/seg{i}.aac" for i in range(6)]
+        
+        # スプールに保存済みだが読み込みに失敗するセグメント0
+        journal = MagicMock()
+        journal.has_segment.side_effect = lambda index, url=None: index == 0
+        journal.load_segment.side_effect = OSError("spool read error")
+        
+        class FailingOutput:
+            """2回目の書き込みで容量不足となる出力先"""
+            def __init__(self):
+                self.writes = 0
+            
+            def write(self, data):
+                self.writes += 1
+                if self.writes >= 2:
+                    raise OSError("No space left on device")
+        
+        async def download(writer, journal=None):
+            with patch('aiohttp.ClientSession') as mock_session:
+                mock_session_instance = MagicMock()
+                mock_session.return_value = mock_session_instance
+                mock_response = AsyncMock()
+                mock_response.status = 200
+                mock_response.read.return_value = b"segment"
+                mock_session_instance.get.return_value.__aenter__.return_value = mock_response
+                with patch('tqdm.asyncio.tqdm'):
+                    return await asyncio.wait_for(
+                        self.recorder._download_segments_concurrent(
+                            segment_urls, writer=writer, journal=journal
+                        ),
+                        timeout=5.0
+                    )
+        
+        async def run_test():
+            # When: セグメント0のスプール読み込みが失敗
+            writer = OrderedSegmentWriter(io.BytesIO(), window=2)
+            with self.assertRaises(SegmentDownloadError) as context:
+                await download(writer, journal)
+            
+            # Then: 欠番として扱われ、残りは書き込まれる
+            self.assertEqual(context.exception.failed_segments, [0])
+            self.assertEqual(writer.segments_written, 5)
+            
+            # When: 出力先への書き込みが失敗
+            writer = OrderedSegmentWriter(FailingOutput(), window=2)
+            with self.assertRaises(SegmentDownloadError) as context:
+                await download(writer)
+            
+            # Then: ライターが中断され、待機中のセグメントも解放される
+            self.assertIn("No space left on device", str(context.exception))
+            self.assertIsInstance(writer.error, OSError)
+        
+        asyncio.run(run_test())
+
+    
+    def test_85_先読み範囲内のセグメントのみタスクを生成(self):
+        """
+        TDD Test: 先読み範囲内のセグメントのみタスクを生成
+        
+        先頭セグメントの停滞中も、全セグメント分のタスクを生成せず
+        write_window 件以下のダウンロードのみ開始することを確認
+        """
+        segment_urls = [f"https://example.com/seg{i}.aac" for i in range(200)]
+        self.recorder.write_window = 4
+        task_counts = []
+        
+        class SegmentResponse:
+            """URL毎の応答（先頭セグメントのみ停滞）"""
+            def __init__(self, url, **kwargs):
+                self.url = url
+                self.status = 200
+                self.headers = {}
+            
+            async def __aenter__(self):
+                if self.url.endswith("/seg0.aac"):
+                    await asyncio.sleep(0.1)
+                    task_counts.append(len(asyncio.all_tasks()))
+                return self
+            
+            async def __aexit__(self, *args):
+                return False
+            
+            async def read(self):
+                return b"segment"
+        
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session:
+                mock_session.return_value.get.side_effect = SegmentResponse
+                with patch('tqdm.asyncio.tqdm'):
+                    writer = OrderedSegmentWriter(io.BytesIO(), window=64)
+                    await self.recorder._download_segments_concurrent(segment_urls, writer=writer)
+            return writer
+        
+        # When: 200セグメントをダウンロード
+        writer = asyncio.run(run_test())
+        
+        # Then: 停滞中のタスク数は write_window（と実行中のテスト本体）以下で、全て書き込まれる
+        self.assertLessEqual(task_counts[0], self.recorder.write_window + 1)
+        self.assertEqual(writer.segments_written, 200)
+
+
+class TestTimeFreeRecorderResume(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorder録音再開（セグメントジャーナル）テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象（スプールは一時ディレクトリ）
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        self.recorder.spool_dir = str(self.temp_env.config_dir / "spool")
+        
+        self.program_info = ProgramInfo(
+            program_id="TBS_20250722_140000",
+            station_id="TBS",
+            station_name="TBSラジオ",
+            title="再開テスト番組",
+            start_time=datetime(2025, 7, 22, 14, 0, 0),
+            end_time=datetime(2025, 7, 22, 17, 0, 0),
+            is_timefree_available=True
+        )
+        self.segment_urls = [f"https://example.com/seg{i}.aac" for i in range(4)]
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _mock_session(self, mock_session, payloads):
+        """指定データを返すaiohttpセッションモックを設定"""
+        mock_session_instance = MagicMock()
+        mock_session.return_value = mock_session_instance
+        responses = []
+        for payload in payloads:
+            mock_response = AsyncMock()
+            mock_response.status = 200
+            mock_response.read.return_value = payload
+            responses.append(mock_response)
+        mock_session_instance.get.return_value.__aenter__.side_effect = responses
+        return mock_session_instance
+    
+    def test_53_取得済みセグメントのみ再利用して再開(self):
+        """
+        TDD Test: 取得済みセグメントのみ再利用して再開
+        
+        前回中断時に取得済みのセグメントはダウンロードせず、欠落分のみ取得することを確認
+        """
+        # Given: 前回の録音でセグメント0と2を取得済み
+        journal = self.recorder._open_journal(self.program_info, self.segment_urls)
+        journal.save_segment(0, b"seg0")
+        journal.save_segment(2, b"seg2")
+        
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session:
+                session = self._mock_session(mock_session, [b"seg1", b"seg3"])
+                with patch('tqdm.asyncio.tqdm'):
+                    # When: 同じ番組を再度ダウンロード
+                    resumed = self.recorder._open_journal(self.program_info, self.segment_urls)
+                    data = await self.recorder._download_segments_concurrent(
+                        self.segment_urls, journal=resumed
+                    )
+            
+            # Then: 欠落していた2セグメントのみダウンロードされる
+            self.assertEqual(session.get.call_count, 2)
+            requested = [call.args[0] for call in session.get.call_args_list]
+            self.assertEqual(sorted(requested), [self.segment_urls[1], self.segment_urls[3]])
+            
+            # And: 全セグメントが順序通りに揃う
+            self.assertEqual(data, [b"seg0", b"seg1", b"seg2", b"seg3"])
+            self.assertEqual(resumed.completed_count, 4)
+        
+        asyncio.run(run_test())
+    
+    def test_86_スプールの読み書きはイベントループ外で実行(self):
+        """
+        TDD Test: スプールの読み書きはイベントループ外で実行
+        
+        ジャーナルのセグメント読み込み・保存がイベントループのスレッドで実行されないことを確認
+        """
+        journal = self.recorder._open_journal(self.program_info, self.segment_urls)
+        journal.save_segment(0, b"seg0")
+        io_threads = []
+        load_segment = journal.load_segment
+        save_segment = journal.save_segment
+        
+        def record_load(index):
+            io_threads.append(threading.current_thread())
+            return load_segment(index)
+        
+        def record_save(index, data, url=None):
+            io_threads.append(threading.current_thread())
+            save_segment(index, data, url)
+        
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session:
+                self._mock_session(mock_session, [b"seg1", b"seg2", b"seg3"])
+                with patch('tqdm.asyncio.tqdm'), \
+                        patch.object(journal, 'load_segment', side_effect=record_load), \
+                        patch.object(journal, 'save_segment', side_effect=record_save):
+                    return await self.recorder._download_segments_concurrent(
+                        self.segment_urls, journal=journal
+                    )
+        
+        # When: 1セグメント取得済みのジャーナルでダウンロード
+        data = asyncio.run(run_test())
+        
+        # Then: 読み込み1回・保存3回とも別スレッドで実行される
+        self.assertEqual(len(data), 4)
+        self.assertEqual(len(io_threads), 4)
+        self.assertNotIn(threading.main_thread(), io_threads)
+    
+    def test_54_録音成功時のスプール削除(self):
+        """
+        TDD Test: 録音成功時のスプール削除
+        
+        録音が完了した場合はスプールディレクトリが削除されることを確認
+        """
+        output_path = str(self.temp_env.config_dir / "resume.mp3")
+        
+        async def run_test():
+            with patch.object(self.recorder, '_fetch_playlist', return_value=self.segment_urls):
+                with patch.object(self.recorder, '_download_and_convert_via_file', new_callable=AsyncMock) as mock_convert:
+                    with patch.object(self.recorder, '_embed_metadata'):
+                        result = await self.recorder.record_program(self.program_info, output_path)
+            
+            # Then: ジャーナル付きで変換処理が呼ばれ、完了後にスプールが削除される
+            self.assertTrue(result.success)
+            journal = mock_convert.call_args[0][3]
+            self.assertIsNotNone(journal)
+            self.assertFalse(journal.spool_dir.exists())
+        
+        asyncio.run(run_test())
+    
+    def test_55_プレイリスト変更時のジャーナル破棄(self):
+        """
+        TDD Test: プレイリスト変更時のジャーナル破棄
+        
+        セグメント構成が変わった場合は取得済み情報を破棄することを確認
+        """
+        # Given: 4セグメントのプレイリストで取得済み
+        journal = self.recorder._open_journal(self.program_info, self.segment_urls)
+        journal.save_segment(0, b"seg0")
+        
+        # When: 異なるプレイリストで再開
+        changed_urls = [f"https://example.com/other{i}.aac" for i in range(5)]
+        reopened = self.recorder._open_journal(self.program_info, changed_urls)
+        
+        # Then: 取得済みセグメントは引き継がれない
+        self.assertEqual(reopened.completed_count, 0)
+        self.assertFalse(reopened.has_segment(0))
+    
+    def test_88_プレイリスト取得前に開いたジャーナルのセグメント毎の照合(self):
+        """
+        TDD Test: プレイリスト取得前に開いたジャーナルのセグメント毎の照合
+        
+        セグメントURL一覧を渡さずに開いた場合も、URLパスが一致するセグメントのみ再利用することを確認
+        """
+        # Given: 時間窓毎に取得しながらセグメント0・1を保存
+        journal = self.recorder._open_journal(self.program_info)
+        journal.save_segment(0, b"seg0", self.segment_urls[0] + "?session=a")
+        journal.save_segment(1, b"seg1", self.segment_urls[1])
+        
+        # When: 再度開く
+        reopened = self.recorder._open_journal(self.program_info)
+        
+        # Then: クエリ部分が異なってもURLパスが一致すれば再利用される
+        self.assertTrue(reopened.has_segment(0, self.segment_urls[0] + "?session=b"))
+        self.assertTrue(reopened.has_segment(1, self.segment_urls[1]))
+        
+        # And: 同じ番号でもURLパスが異なるセグメントは再取得する
+        self.assertFalse(reopened.has_segment(1, "https://example.com/other1.aac"))
+        self.assertFalse(reopened.has_segment(2, self.segment_urls[2]))
+    
+    def test_83_古いスプールの削除(self):
+        """
+        TDD Test: 古いスプールの削除
+        
+        ジャーナルを開く際に保持期間を過ぎた他の録音のスプールのみ削除されることを確認
+        """
+        spool_root = Path(self.recorder.spool_dir)
+        
+        # Given: 8日前に中断した録音・昨日中断した録音・スプール以外のディレクトリ
+        stale = spool_root / "QRR_20250701100000_20250701110000"
+        recent = spool_root / "LFR_20250721100000_20250721110000"
+        unrelated = spool_root / "notes"
+        for spool_dir in (stale, recent):
+            spool_dir.mkdir(parents=True)
+            (spool_dir / "manifest.json").write_text("{}")
+            (spool_dir / "journal.log").write_text("0\n")
+        unrelated.mkdir()
+        old_time = time.time() - 8 * 24 * 3600
+        for path in (stale / "journal.log", stale, unrelated):
+            os.utime(path, (old_time, old_time))
+        
+        # When: 保持期間7日で番組のジャーナルを開く
+        self.recorder.spool_max_age_days = 7
+        journal = self.recorder._open_journal(self.program_info, self.segment_urls)
+        
+        # Then: 保持期間を過ぎたスプールのみ削除される
+        self.assertFalse(stale.exists())
+        self.assertTrue(recent.exists())
+        self.assertTrue(unrelated.exists())
+        self.assertTrue(journal.spool_dir.exists())
+
+
+class TestTimeFreeRecorderBatch(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorder一括録音テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        
+        self.programs = [
+            ProgramInfo(
+                program_id=f"TBS_20250722_{hour:02d}0000",
+                station_id="TBS",
+                station_name="TBSラジオ",
+                title="ニュース" if hour % 2 else f"番組{hour}",
+                start_time=datetime(2025, 7, 22, hour, 0, 0),
+                end_time=datetime(2025, 7, 22, hour + 1, 0, 0),
+                is_timefree_available=True
+            )
+            for hour in (5, 6, 7, 9)
+        ]
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def test_56_一括録音の共有セッションと同時録音数制限(self):
+        """
+        TDD Test: 一括録音の共有セッションと同時録音数制限
+        
+        全録音が共有セッション・共有並行数コントローラーを使用し、同時録音数が制限されることを確認
+        """
+        observed = {'sessions': set(), 'controllers': set(), 'active': 0, 'max_active': 0}
+        
+        async def fake_record(program_info, output_path):
+            observed['sessions'].add(id(await self.recorder.session_pool.get_session()))
+            observed['controllers'].add(id(self.recorder._segment_controller))
+            observed['active'] += 1
+            observed['max_active'] = max(observed['max_active'], observed['active'])
+            await asyncio.sleep(0.01)
+            observed['active'] -= 1
+            return RecordingResult(True, output_path, 100, 0.01, 1, 0, [])
+        
+        async def run_test():
+            self.recorder.overlap_transcode = False
+            with patch.object(self.recorder, 'record_program', side_effect=fake_record):
+                results = await self.recorder.record_programs(
+                    self.programs, str(self.temp_env.recordings_dir), max_concurrent_recordings=2
+                )
+            await self.recorder.close()
+            return results
+        
+        results = asyncio.run(run_test())
+        
+        # Then: 番組順に全結果が返される
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result.success for result in results))
+        
+        # And: 全録音で同じセッション・並行数コントローラーを共有し、終了後は解放される
+        self.assertEqual(len(observed['sessions']), 1)
+        self.assertEqual(len(observed['controllers']), 1)
+        self.assertFalse(self.recorder.session_pool.is_open)
+        self.assertIsNone(self.recorder._segment_controller)
+        
+        # And: 同時録音数が制限される
+        self.assertEqual(observed['max_active'], 2)
+    
+    def test_57_一括録音の出力パス重複回避(self):
+        """
+        TDD Test: 一括録音の出力パス重複回避
+        
+        同日同名の番組は開始時刻付きのファイル名になることを確認
+        """
+        # When: 出力パスを生成（5時・7時の「ニュース」が同名）
+        paths = self.recorder._generate_batch_output_paths(
+            self.programs, str(self.temp_env.recordings_dir)
+        )
+        
+        # Then: すべて異なるパスになる
+        self.assertEqual(len(set(paths)), 4)
+        self.assertTrue(paths[2].endswith("_0700.mp3"))
+        self.assertTrue(all(path.startswith(str(self.temp_env.recordings_dir)) for path in paths))
+    
+    def test_69_ダウンロードと変換のオーバーラップ(self):
+        """
+        TDD Test: ダウンロードと変換のオーバーラップ
+        
+        番組Nの変換中に番組N+1のダウンロードが進み、変換待ちが有界キューで制限されることを確認
+        """
+        events = []
+        pending = {'downloaded': 0, 'max_pending': 0}
+        temp_paths = []
+        
+        async def fake_windows(station_id, start_time, end_time):
+            yield [f"https://example.com/{start_time.hour}/segment.aac"]
+        
+        async def fake_download(segment_urls, journal=None, metrics=None, segment_windows=None):
+            hour = segment_urls[0].split('/')[3]
+            events.append(('download_start', hour))
+            await asyncio.sleep(0.02)
+            fd, temp_path = tempfile.mkstemp(suffix='.ts')
+            os.close(fd)
+            temp_paths.append(temp_path)
+            events.append(('download_end', hour))
+            pending['downloaded'] += 1
+            pending['max_pending'] = max(pending['max_pending'], pending['downloaded'])
+            return temp_path
+        
+        async def fake_convert(temp_ts_path, output_path, program_info):
+            pending['downloaded'] -= 1
+            events.append(('convert_start', str(program_info.start_time.hour)))
+            await asyncio.sleep(0.05)
+            Path(output_path).write_bytes(b"converted")
+            events.append(('convert_end', str(program_info.start_time.hour)))
+        
+        async def run_test():
+            self.recorder.transcode_workers = 1
+            self.recorder.transcode_queue_size = 1
+            with patch.object(self.recorder, '_iter_segment_windows', side_effect=fake_windows), \
+                 patch.object(self.recorder, '_download_to_temp_file', side_effect=fake_download), \
+                 patch.object(self.recorder, '_convert_to_target_format', side_effect=fake_convert), \
+                 patch.object(self.recorder, '_embed_metadata'):
+                results = await self.recorder.record_programs(
+                    self.programs, str(self.temp_env.recordings_dir), max_concurrent_recordings=1
+                )
+            await self.recorder.close()
+            return results
+        
+        results = asyncio.run(run_test())
+        
+        # Then: 番組順に全結果が返される
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual([result.output_path for result in results],
+                         self.recorder._generate_batch_output_paths(self.programs, str(self.temp_env.recordings_dir)))
+        
+        # And: 番組5時の変換完了前に番組6時のダウンロードが開始されている
+        self.assertLess(events.index(('download_start', '6')), events.index(('convert_end', '5')))
+        
+        # And: 変換待ちは変換待ちキュー＋ダウンロード枠の分までに制限される
+        self.assertLessEqual(pending['max_pending'], 2)
+        
+        # And: 一時TSファイルは全て削除される
+        self.assertFalse(any(os.path.exists(path) for path in temp_paths))
+
+class TestTimeFreeRecorderSessionPool(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorder共有HTTPセッションテスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.recorder.close_sync()
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def test_58_プレイリスト取得とセグメント取得で同一セッションを再利用(self):
+        """
+        TDD Test: プレイリスト取得とセグメント取得で同一セッションを再利用
+        
+        セッションは初回利用時に1度だけ生成され、後続のリクエストで使い回されることを確認
+        """
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session:
+                mock_session_instance = MagicMock()
+                mock_session_instance.closed = False
+                mock_session_instance.close = AsyncMock()
+                mock_session.return_value = mock_session_instance
+                
+                playlist_response = AsyncMock()
+                playlist_response.status = 200
+                playlist_response.text.return_value = "#EXTM3U\nhttps://example.com/chunklist.m3u8\n"
+                chunklist_response = AsyncMock()
+                chunklist_response.status = 200
+                chunklist_response.text.return_value = "#EXTM3U\nhttps://example.com/segment1.aac\n"
+                segment_response = AsyncMock()
+                segment_response.status = 200
+                segment_response.read.return_value = b"segment"
+                mock_session_instance.get.return_value.__aenter__.side_effect = [
+                    playlist_response, chunklist_response, segment_response
+                ]
+                
+                # When: プレイリスト取得→セグメント取得
+                segment_urls = await self.recorder._fetch_playlist("https://example.com/playlist.m3u8")
+                segments = await self.recorder._download_segments_concurrent(segment_urls)
+                
+                # Then: セッション生成は1回のみで、認証ヘッダーはリクエスト毎に付与される
+                self.assertEqual(segments, [b"segment"])
+                self.assertEqual(mock_session.call_count, 1)
+                for call in mock_session_instance.get.call_args_list:
+                    self.assertEqual(call.kwargs['headers']['X-Radiko-AuthToken'], "test_timefree_token")
+                
+                # And: close()でセッションがクローズされる
+                await self.recorder.close()
+                mock_session_instance.close.assert_awaited_once()
+                self.assertFalse(self.recorder.session_pool.is_open)
+        
+        asyncio.run(run_test())
+    
+    def test_59_イベントループ毎のセッション生成と同期クローズ(self):
+        """
+        TDD Test: イベントループ毎のセッション生成と同期クローズ
+        
+        別ループからの利用ではセッションを作り直し、close_sync()で確実にクローズされることを確認
+        """
+        async def get_session():
+            return await self.recorder.session_pool.get_session()
+        
+        # Given: 停止中のループで生成したセッション
+        loop = asyncio.new_event_loop()
+        try:
+            first = loop.run_until_complete(get_session())
+            second = loop.run_until_complete(get_session())
+            self.assertIs(first, second)
+            
+            # When: 同期コンテキストからクローズ
+            self.recorder.close_sync()
+            
+            # Then: セッションがクローズされる
+            self.assertTrue(first.closed)
+            self.assertFalse(self.recorder.session_pool.is_open)
+            
+            # And: 別のループでは新しいセッションが生成される
+            third = asyncio.run(self._get_and_close())
+            self.assertIsNot(third, first)
+        finally:
+            loop.close()
+    
+    def test_87_別ループでの再生成時に前のセッションをクローズ(self):
+        """
+        TDD Test: 別ループでの再生成時に前のセッションをクローズ
+        
+        停止中のループで生成したセッションは別ループでの再生成時にそのループでクローズされ、
+        終了済みのループのセッションは解放できない旨を警告して作り直すことを確認
+        """
+        async def get_session():
+            return await self.recorder.session_pool.get_session()
+        
+        # Given: 停止中のループで生成したセッション
+        loop = asyncio.new_event_loop()
+        try:
+            stopped = loop.run_until_complete(get_session())
+            
+            # When: 別のループでセッションを取得
+            closed_loop_session = asyncio.run(get_session())
+            
+            # Then: 停止中のループのセッションはクローズされる
+            self.assertTrue(stopped.closed)
+        finally:
+            loop.close()
+        
+        # When: 終了済みのループのセッションが残った状態で別のループから取得
+        with self.assertLogs(self.recorder.session_pool.logger, level='WARNING') as logs:
+            current = asyncio.run(self._get_and_close())
+        
+        # Then: 解放できない旨を警告し、新しいセッションを生成する
+        self.assertIn("イベントループが終了済み", logs.output[0])
+        self.assertIsNot(current, closed_loop_session)
+    
+    async def _get_and_close(self):
+        """新しいループでセッションを取得してクローズ"""
+        session = await self.recorder.session_pool.get_session()
+        await self.recorder.close()
+        return session
+
+
+class TestTimeFreeRecorderAdaptiveConcurrency(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorderセグメント並行数適応制御テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        self.recorder.resume_enabled = False
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def test_60_サーバーエラー応答で並行数を減少(self):
+        """
+        TDD Test: サーバーエラー応答で並行数を減少
+        
+        HTTP 503を受けたセグメントはリトライされ、並行数が乗算的に減少することを確認
+        """
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session, \
+                 patch('asyncio.sleep', new=AsyncMock()):
+                mock_session_instance = MagicMock()
+                mock_session_instance.closed = False
+                mock_session.return_value = mock_session_instance
+                
+                busy_response = AsyncMock()
+                busy_response.status = 503
+                ok_response = AsyncMock()
+                ok_response.status = 200
+                ok_response.read.return_value = b"segment"
+                mock_session_instance.get.return_value.__aenter__.side_effect = [busy_response, ok_response]
+                
+                # When: 503 → 200 の順で応答
+                async with self.recorder._shared_segment_budget() as controller:
+                    segments = await self.recorder._download_segments_concurrent(
+                        ["https://example.com/segment1.aac"]
+                    )
+                    
+                    # Then: リトライで取得でき、並行数が半減する
+                    self.assertEqual(segments, [b"segment"])
+                    self.assertEqual(controller.limit, self.recorder.max_workers // 2)
+                    self.assertEqual(controller.adjustments[0].reason, "HTTP 503")
+        
+        asyncio.run(run_test())
+    
+    def test_61_録音結果に並行数と変更理由を記録(self):
+        """
+        TDD Test: 録音結果に並行数と変更理由を記録
+        
+        録音中の並行数変更が RecordingResult に反映されることを確認
+        """
+        program_info = ProgramInfo(
+            program_id="TBS_20250722_060000",
+            station_id="TBS",
+            station_name="TBSラジオ",
+            title="森本毅郎・スタンバイ!",
+            start_time=datetime(2025, 7, 22, 6, 0, 0),
+            end_time=datetime(2025, 7, 22, 8, 30, 0),
+            is_timefree_available=True
+        )
+        
+        async def fake_download(segment_urls, output_path, program_info, journal, metrics=None,
+                                segment_windows=None):
+            controller = self.recorder._segment_controller
+            async with controller.slot() as slot:
+                controller.record_congestion(slot, "タイムアウト")
+        
+        async def run_test():
+            with patch.object(self.recorder, '_fetch_playlist', return_value=["https://example.com/s1.aac"]), \
+                 patch.object(self.recorder, '_download_and_convert_via_file', side_effect=fake_download), \
+                 patch.object(self.recorder, '_embed_metadata'):
+                return await self.recorder.record_program(
+                    program_info, str(self.temp_env.recordings_dir / "test.mp3")
+                )
+        
+        result = asyncio.run(run_test())
+        
+        # Then: 録音終了時点の並行数と変更理由が記録される
+        self.assertTrue(result.success)
+        self.assertEqual(result.segment_concurrency, self.recorder.max_workers // 2)
+        self.assertEqual(len(result.concurrency_adjustments), 1)
+        self.assertEqual(result.concurrency_adjustments[0].reason, "タイムアウト")
+        self.assertIsNone(self.recorder._segment_controller)
+
+
+class TestTimeFreeRecorderRetryPolicy(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorderセグメント再試行テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _response(self, status, headers=None, data=b""):
+        """モックレスポンス生成"""
+        response = AsyncMock()
+        response.status = status
+        response.headers = headers or {}
+        response.read.return_value = data
+        return response
+    
+    def _download(self, responses, segment_count=1):
+        """モックレスポンス列でセグメントダウンロードを実行"""
+        sleep_mock = AsyncMock()
+        
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session, \
+                 patch('asyncio.sleep', new=sleep_mock):
+                mock_session_instance = MagicMock()
+                mock_session_instance.closed = False
+                mock_session.return_value = mock_session_instance
+                mock_session_instance.get.return_value.__aenter__.side_effect = responses
+                self.get_mock = mock_session_instance.get
+                return await self.recorder._download_segments_concurrent(
+                    [f"https://example.com/segment{i}.aac" for i in range(segment_count)]
+                )
+        
+        return asyncio.run(run_test()), sleep_mock
+    
+    def test_62_RetryAfter指定の待機後に再試行(self):
+        """
+        TDD Test: Retry-After指定の待機後に再試行
+        
+        429応答の Retry-After 秒数以上待機してから再試行することを確認
+        """
+        # When: 429(Retry-After: 5) → 200
+        segments, sleep_mock = self._download([
+            self._response(429, {'Retry-After': '5'}),
+            self._response(200, data=b"segment")
+        ])
+        
+        # Then: 再試行で取得できる
+        self.assertEqual(segments, [b"segment"])
+        sleep_mock.assert_awaited_once()
+        self.assertGreaterEqual(sleep_mock.await_args.args[0], 5.0)
+    
+    def test_63_リトライ不可ステータスは即時失敗(self):
+        """
+        TDD Test: リトライ不可ステータスは即時失敗
+        
+        404応答は再試行せず、失敗セグメントとして報告されることを確認
+        """
+        # When/Then: 404 で SegmentDownloadError
+        with self.assertRaises(SegmentDownloadError) as context:
+            self._download([self._response(404)])
+        
+        self.assertIn("1個のセグメントダウンロードに失敗", str(context.exception))
+    
+    def test_64_リトライ予算超過で打ち切り(self):
+        """
+        TDD Test: リトライ予算超過で打ち切り
+        
+        録音全体のリトライ回数が予算を超えると再試行を打ち切ることを確認
+        """
+        # Given: 録音全体で1回のみリトライ可能
+        self.recorder.retry_policy.min_budget = 1
+        self.recorder.retry_policy.budget_ratio = 0
+        
+        # When: 2セグメントとも503が続く
+        with self.assertRaises(SegmentDownloadError) as context:
+            self._download(lambda: self._response(503), segment_count=2)
+        
+        # Then: リクエストは3回のみ（初回2回＋予算内の再試行1回）
+        self.assertEqual(self.get_mock.call_count, 3)
+        self.assertEqual(sorted(context.exception.failed_segments), [0, 1])
+
+
+class TestTimeFreeRecorderSlicedPlaylist(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorder長時間番組プレイリスト分割取得テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def test_65_長時間番組の時間窓分割(self):
+        """
+        TDD Test: 長時間番組の時間窓分割
+        
+        閾値を超える番組のみ設定した長さの時間窓に分割されることを確認
+        """
+        start = datetime(2025, 7, 22, 22, 0, 0)
+        
+        # 閾値（120分）以下は分割しない
+        self.assertEqual(
+            self.recorder._split_time_windows(start, start + timedelta(hours=2)),
+            [(start, start + timedelta(hours=2))]
+        )
+        
+        # 日付をまたぐ5時間番組は60分毎の5区間
+        windows = self.recorder._split_time_windows(start, datetime(2025, 7, 22, 3, 0, 0))
+        self.assertEqual(len(windows), 5)
+        self.assertEqual(windows[0], (start, start + timedelta(hours=1)))
+        self.assertEqual(windows[-1][1], datetime(2025, 7, 23, 3, 0, 0))
+        
+        # 端数は最終区間に含める
+        windows = self.recorder._split_time_windows(start, start + timedelta(minutes=150))
+        self.assertEqual([end - begin for begin, end in windows],
+                         [timedelta(hours=1), timedelta(hours=1), timedelta(minutes=30)])
+    
+    def test_66_時間窓の並行取得と境界重複除去(self):
+        """
+        TDD Test: 時間窓の並行取得と境界重複除去
+        
+        各時間窓のプレイリストを並行取得し、境界の重複セグメントを除いて時系列順に連結することを確認
+        """
+        start = datetime(2025, 7, 22, 13, 0, 0)
+        end = start + timedelta(hours=3)
+        
+        def segment(minute, query="a"):
+            return f"https://example.com/seg_{minute:03d}.aac?session={query}"
+        
+        window_segments = {
+            "ft=20250722130000": [segment(0), segment(30), segment(60)],
+            # 前区間の境界セグメント（別セッションのクエリ付き）が重複
+            "ft=20250722140000": [segment(60, "b"), segment(90), segment(120)],
+            "ft=20250722150000": [segment(120, "c"), segment(150)],
+        }
+        requested = []
+        
+        async def fake_fetch(playlist_url):
+            requested.append(playlist_url)
+            await asyncio.sleep(0)
+            for key, urls in window_segments.items():
+                if key in playlist_url:
+                    return urls
+            raise AssertionError(playlist_url)
+        
+        async def run_test():
+            with patch.object(self.recorder, '_fetch_playlist', side_effect=fake_fetch):
+                return await self.recorder._fetch_segment_urls("TBS", start, end)
+        
+        segment_urls = asyncio.run(run_test())
+        
+        # Then: 3区間のプレイリストを取得
+        self.assertEqual(len(requested), 3)
+        self.assertIn("ft=20250722140000&to=20250722150000", requested[1])
+        
+        # And: 重複を除いて時系列順に連結される
+        self.assertEqual(segment_urls, [
+            segment(0), segment(30), segment(60), segment(90), segment(120), segment(150)
+        ])
+    
+    def test_89_後続の時間窓の取得を待たずにダウンロード開始(self):
+        """
+        TDD Test: 後続の時間窓の取得を待たずにダウンロード開始
+        
+        先頭の時間窓のセグメントのダウンロードが、後続の時間窓のプレイリスト取得完了前に
+        開始され、取得できた時間窓のセグメントも順序通りにダウンロードされることを確認
+        """
+        start = datetime(2025, 7, 22, 13, 0, 0)
+        end = start + timedelta(hours=3)
+        first_window_downloading = asyncio.Event()
+        events = []
+        
+        def segment(minute):
+            return f"https://example.com/seg_{minute:03d}.aac"
+        
+        window_segments = {
+            "ft=20250722130000": [segment(0), segment(30)],
+            "ft=20250722140000": [segment(30), segment(60), segment(90)],
+            "ft=20250722150000": [segment(120), segment(150)],
+        }
+        
+        async def fake_fetch(playlist_url):
+            if "ft=20250722130000" not in playlist_url:
+                # 後続の時間窓は先頭の窓のダウンロード開始まで応答しない
+                await first_window_downloading.wait()
+                events.append(('playlist', playlist_url.split('ft=')[1][:14]))
+            for key, urls in window_segments.items():
+                if key in playlist_url:
+                    return urls
+            raise AssertionError(playlist_url)
+        
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session, \
+                    patch.object(self.recorder, '_fetch_playlist', side_effect=fake_fetch), \
+                    patch('tqdm.asyncio.tqdm'):
+                session = MagicMock()
+                session.closed = False
+                mock_session.return_value = session
+                
+                def enter_response(*args):
+                    url = session.get.call_args.args[0]
+                    events.append(('segment', url))
+                    first_window_downloading.set()
+                    response = AsyncMock()
+                    response.status = 200
+                    response.headers = {}
+                    response.read.return_value = url.encode()
+                    return response
+                
+                session.get.return_value.__aenter__.side_effect = enter_response
+                
+                # When: 先頭の時間窓のみ取得した状態でダウンロード開始
+                segment_windows = self.recorder._iter_segment_windows("TBS", start, end)
+                segment_urls = await segment_windows.__anext__()
+                data = await asyncio.wait_for(
+                    self.recorder._download_segments_concurrent(segment_urls, segment_windows=segment_windows),
+                    timeout=5
+                )
+            return segment_urls, data
+        
+        segment_urls, data = asyncio.run(run_test())
+        
+        # Then: 後続の時間窓の取得より先に先頭の窓のセグメントのダウンロードが始まる
+        self.assertEqual(events[0], ('segment', segment(0)))
+        
+        # And: 全時間窓のセグメントが重複なく順序通りにダウンロードされる
+        expected = [segment(minute) for minute in (0, 30, 60, 90, 120, 150)]
+        self.assertEqual(segment_urls, expected)
+        self.assertEqual(data, [url.encode() for url in expected])
+
+
+class TestTimeFreeRecorderStreamCopy(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorderストリームコピー出力テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _set_audio_format(self, audio_format):
+        """audio.format設定を差し替え"""
+        config = {'audio': {'format': audio_format, 'bitrate': 256, 'sample_rate': 44100}}
+        return patch.object(self.recorder.config_manager, 'load_config', return_value=config)
+    
+    def test_67_ストリームコピー形式のエンコード設定(self):
+        """
+        TDD Test: ストリームコピー形式のエンコード設定
+        
+        m4a/aac_copy 指定時は再エンコード・リサンプルせずコンテナのみ変換することを確認
+        """
+        # When: m4a形式
+        with self._set_audio_format('m4a'):
+            codec, extra_args, description = self.recorder._get_encoding_settings("out.m4a")
+            extension = self.recorder.get_output_extension()
+        
+        # Then: MP4コンテナへストリームコピー（faststart）
+        self.assertEqual(codec, 'copy')
+        self.assertEqual(extension, '.m4a')
+        self.assertIn('+faststart', extra_args)
+        self.assertEqual(extra_args[-2:], ['-f', 'mp4'])
+        self.assertNotIn('-ar', extra_args)
+        self.assertIn("ストリームコピー", description)
+        
+        # When: aac_copy形式
+        with self._set_audio_format('aac_copy'):
+            codec, extra_args, _ = self.recorder._get_encoding_settings("out.aac")
+            extension = self.recorder.get_output_extension()
+        
+        # Then: ADTSへストリームコピー
+        self.assertEqual((codec, extra_args, extension), ('copy', ['-f', 'adts'], '.aac'))
+        
+        # And: 従来のaac形式は再エンコード
+        with self._set_audio_format('aac'):
+            codec, _, _ = self.recorder._get_encoding_settings("out.aac")
+        self.assertEqual(codec, 'aac')
+    
+    def test_68_ストリームコピーのFFmpegコマンド(self):
+        """
+        TDD Test: ストリームコピーのFFmpegコマンド
+        
+        変換時のFFmpegコマンドが -c:a copy になることを確認
+        """
+        input_path = self.temp_env.config_dir / "input.ts"
+        input_path.write_bytes(b"ts")
+        output_path = str(self.temp_env.config_dir / "output.m4a")
+        program_info = ProgramInfo(
+            program_id="TBS_20250722_060000",
+            station_id="TBS",
+            station_name="TBSラジオ",
+            title="テスト番組",
+            start_time=datetime(2025, 7, 22, 6, 0, 0),
+            end_time=datetime(2025, 7, 22, 7, 0, 0)
+        )
+        
+        async def run_test():
+            with self._set_audio_format('m4a'), \
+                 patch('asyncio.create_subprocess_exec') as mock_exec, \
+                 patch.object(self.recorder, '_show_ffmpeg_progress', new=AsyncMock()):
+                mock_process = AsyncMock()
+                mock_process.stderr.read.return_value = b""
+                mock_process.returncode = 0
+                mock_exec.return_value = mock_process
+                
+                await self.recorder._convert_to_target_format(str(input_path), output_path, program_info)
+                return mock_exec.call_args.args
+        
+        ffmpeg_cmd = asyncio.run(run_test())
+        
+        # Then: 再エンコードなしのコマンド
+        codec_index = ffmpeg_cmd.index('-c:a')
+        self.assertEqual(ffmpeg_cmd[codec_index + 1], 'copy')
+        self.assertNotIn('libmp3lame', ffmpeg_cmd)
+        self.assertEqual(ffmpeg_cmd[-1], output_path)
+
+
+class TestTimeFreeRecorderSegmentStore(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorder永続セグメントキャッシュテスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象（再開用スプールは使用せず、永続キャッシュを有効化）
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        self.recorder.resume_enabled = False
+        self.recorder.segment_store = SegmentStore(
+            self.temp_env.config_dir / "segment_cache", max_bytes=1024 * 1024
+        )
+        
+        self.program = ProgramInfo(
+            program_id="TBS_20250722_060000",
+            station_id="TBS",
+            station_name="TBSラジオ",
+            title="テスト番組",
+            start_time=datetime(2025, 7, 22, 6, 0, 0),
+            end_time=datetime(2025, 7, 22, 7, 0, 0),
+            is_timefree_available=True
+        )
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.recorder.close_sync()
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def test_70_別フォーマットでの再録音は通信なし(self):
+        """
+        TDD Test: 別フォーマットでの再録音は通信なし
+        
+        録音済み番組を別の出力形式で再録音する際、セグメントをストアから読み込み通信しないことを確認
+        """
+        segment_urls = [f"https://example.com/segment{i}.aac" for i in range(3)]
+        converted = []
+        
+        async def fake_convert(temp_ts_path, output_path, program_info):
+            converted.append(Path(temp_ts_path).read_bytes())
+            Path(output_path).write_bytes(b"converted")
+        
+        def segment_response(index):
+            response = AsyncMock()
+            response.status = 200
+            response.headers = {}
+            response.read.return_value = f"segment{index}".encode()
+            return response
+        
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session, \
+                 patch.object(self.recorder, '_fetch_playlist', return_value=segment_urls), \
+                 patch.object(self.recorder, '_convert_to_target_format', side_effect=fake_convert), \
+                 patch.object(self.recorder, '_embed_metadata'):
+                mock_session_instance = MagicMock()
+                mock_session_instance.closed = False
+                mock_session.return_value = mock_session_instance
+                mock_session_instance.get.return_value.__aenter__.side_effect = [
+                    segment_response(i) for i in range(3)
+                ]
+                
+                # When: MP3で録音後、M4Aで再録音
+                first = await self.recorder.record_program(
+                    self.program, str(self.temp_env.recordings_dir / "program.mp3"))
+                request_count = mock_session_instance.get.call_count
+                second = await self.recorder.record_program(
+                    self.program, str(self.temp_env.recordings_dir / "program.m4a"))
+                
+                return first, second, request_count, mock_session_instance.get.call_count
+        
+        first, second, first_requests, total_requests = asyncio.run(run_test())
+        
+        # Then: 両方成功し、再録音ではセグメント取得リクエストが発生しない
+        self.assertTrue(first.success)
+        self.assertTrue(second.success)
+        self.assertEqual(first_requests, 3)
+        self.assertEqual(total_requests, 3)
+        
+        # And: 同じ内容のTSから変換される
+        self.assertEqual(converted[0], b"segment0segment1segment2")
+        self.assertEqual(converted[1], converted[0])
+        self.assertEqual(self.recorder.segment_store.hits, 3)
+    
+    def test_91_StreamingManagerとのセグメントストア共有(self):
+        """
+        TDD Test: StreamingManagerとのセグメントストア共有
+        
+        create_streaming_manager で生成したマネージャーは録音と同じストア・セッションプールを使い、
+        録音で保存済みのセグメントを通信せずに取得することを確認
+        """
+        # Given: 録音で保存済みのセグメント
+        url = "https://example.com/segment0.aac"
+        self.recorder.segment_store.put(url, b"recorded")
+        
+        # When: 録音と資源を共有するマネージャーで取得
+        manager = self.recorder.create_streaming_manager()
+        self.addCleanup(manager.close_sync)
+        segment = StreamSegment(url=url + "?token=other", duration=5.0, sequence=0, timestamp=datetime.now())
+        with patch('aiohttp.ClientSession.get') as mock_get:
+            data = manager._download_single_segment(segment)
+        
+        # Then: 同じストア・帯域制限・セッションプールを使い、通信せずにストアから取得される
+        self.assertIs(manager.segment_store, self.recorder.segment_store)
+        self.assertIs(manager.bandwidth_limiter, self.recorder.bandwidth_limiter)
+        self.assertIs(manager.session_pool, self.recorder.session_pool)
+        self.assertEqual(data, b"recorded")
+        mock_get.assert_not_called()
+        self.assertEqual(self.recorder.segment_store.hits, 1)
+
+
+class TestTimeFreeRecorderMediaDuration(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorderダウンロード時の再生時間算出テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.recorder.close_sync()
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _download_to_temp_file(self, segments):
+        """モックレスポンスで一時TSファイルへダウンロードし、再生時間を取得"""
+        def segment_response(data):
+            response = AsyncMock()
+            response.status = 200
+            response.headers = {}
+            response.read.return_value = data
+            return response
+        
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session, \
+                 patch('asyncio.create_subprocess_exec') as mock_subprocess:
+                mock_session_instance = MagicMock()
+                mock_session_instance.closed = False
+                mock_session.return_value = mock_session_instance
+                mock_session_instance.get.return_value.__aenter__.side_effect = [
+                    segment_response(data) for data in segments
+                ]
+                temp_ts_path = await self.recorder._download_to_temp_file(
+                    [f"https://example.com/segment{i}.aac" for i in range(len(segments))]
+                )
+                try:
+                    duration = await self.recorder._get_media_duration(temp_ts_path)
+                finally:
+                    self.recorder._remove_temp_file(temp_ts_path)
+                mock_subprocess.assert_not_called()
+                return duration
+        
+        return asyncio.run(run_test())
+    
+    def test_71_ダウンロード時にADTSフレームから再生時間を算出(self):
+        """
+        TDD Test: ダウンロード時にADTSフレームから再生時間を算出
+        
+        逐次書き込み・一括結合のどちらでも、ffprobeを起動せずに再生時間が得られることを確認
+        """
+        # Given: 5秒弱のセグメント3件（48kHz・234フレーム）
+        segments = [self.temp_env.build_adts_segment(234) for _ in range(3)]
+        expected = 3 * 234 * 1024 / 48000
+        
+        for streaming_write in (True, False):
+            with self.subTest(streaming_write=streaming_write):
+                # When: 一時TSファイルへダウンロード
+                self.recorder.streaming_write = streaming_write
+                duration = self._download_to_temp_file(segments)
+                
+                # Then: セグメントの合計再生時間が得られる
+                self.assertAlmostEqual(duration, expected, places=3)
+        
+        # And: 一時ファイル削除後に算出値は残らない
+        self.assertEqual(self.recorder._media_durations, {})
+
+
+class TestTimeFreeRecorderFFmpegProgress(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorder FFmpegプログレスパイプテスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        
+        self.program = ProgramInfo(
+            program_id="TBS_20250722_060000",
+            station_id="TBS",
+            station_name="TBSラジオ",
+            title="テスト番組",
+            start_time=datetime(2025, 7, 22, 6, 0, 0),
+            end_time=datetime(2025, 7, 22, 7, 0, 0),
+            is_timefree_available=True
+        )
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _convert_with_fake_ffmpeg(self, script):
+        """FFmpegの代わりにPythonスクリプトを実行して変換"""
+        input_file = self.temp_env.config_dir / "input.ts"
+        input_file.write_bytes(b"dummy")
+        output_file = self.temp_env.config_dir / "output.mp3"
+        launched = []
+        real_exec = asyncio.create_subprocess_exec
+        
+        async def fake_exec(*cmd, **kwargs):
+            launched.append(cmd)
+            return await real_exec(sys.executable, '-c', script, **kwargs)
+        
+        async def run_test():
+            with patch('asyncio.create_subprocess_exec', side_effect=fake_exec), \
+                 patch.object(self.recorder, '_get_media_duration', return_value=2.0):
+                await asyncio.wait_for(
+                    self.recorder._convert_to_target_format(str(input_file), str(output_file), self.program),
+                    timeout=30
+                )
+        
+        try:
+            asyncio.run(run_test())
+        finally:
+            self.assertTrue(launched)
+        return launched[0]
+    
+    def test_72_標準エラー大量出力時もプログレスを読み切る(self):
+        """
+        TDD Test: 標準エラー大量出力時もプログレスを読み切る
+        
+        標準エラーをパイプ容量以上に出力するFFmpegでも停止せず、プログレスがパイプ経由で渡されることを確認
+        """
+        # Given: 標準エラーへ1MB出力してから進捗情報を出力するFFmpeg
+        script = (
+            "import sys\n"
+            "sys.stderr.write('x' * 1024 * 1024)\n"
+            "sys.stderr.flush()\n"
+            "print('out_time_ms=1000000\\nprogress=continue')\n"
+            "print('out_time_ms=2000000\\nprogress=end')\n"
+        )
+        
+        # When: 変換実行
+        cmd = self._convert_with_fake_ffmpeg(script)
+        
+        # Then: 完了し、プログレスは標準出力へのパイプで受け取る
+        self.assertEqual(cmd[cmd.index('-progress') + 1], 'pipe:1')
+    
+    def test_73_変換失敗時は標準エラーをエラーメッセージに含める(self):
+        """
+        TDD Test: 変換失敗時は標準エラーをエラーメッセージに含める
+        
+        並行して読み取った標準エラーがFileConversionErrorに含まれることを確認
+        """
+        script = "import sys\nsys.stderr.write('Invalid data found')\nsys.exit(1)\n"
+        
+        with self.assertRaises(FileConversionError) as context:
+            self._convert_with_fake_ffmpeg(script)
+        
+        self.assertIn("Invalid data found", str(context.exception))
+    
+    def test_84_プログレス解析失敗後も標準出力を読み切る(self):
+        """
+        TDD Test: プログレス解析失敗後も標準出力を読み切る
+        
+        読み取り上限を超える行でプログレス表示を打ち切った後も標準出力を読み続け、
+        パイプ容量以上に進捗を出力するFFmpegが停止しないことを確認
+        """
+        # Given: 上限超過の行の後、標準出力へ1MB以上の進捗情報を出力するFFmpeg
+        script = (
+            "import sys\n"
+            "sys.stdout.write('x' * 256 * 1024 + '\\n')\n"
+            "for i in range(20000):\n"
+            "    sys.stdout.write('out_time_ms=%d\\nprogress=continue\\n' % (i * 1000))\n"
+            "sys.stdout.write('progress=end\\n')\n"
+        )
+        
+        # When/Then: タイムアウトせずに変換が完了する
+        self._convert_with_fake_ffmpeg(script)
+    
+    def test_93_プログレス表示の失敗時はFFmpegを停止(self):
+        """
+        TDD Test: プログレス表示の失敗時はFFmpegを停止
+        
+        プログレス表示が例外で中断した場合もFFmpegプロセスを停止して終了を待ち、
+        変換エラーとして扱うことを確認
+        """
+        # Given: 終了しないFFmpegと、失敗するプログレス表示
+        input_file = self.temp_env.config_dir / "input.ts"
+        input_file.write_bytes(b"dummy")
+        output_file = self.temp_env.config_dir / "output.mp3"
+        processes = []
+        real_exec = asyncio.create_subprocess_exec
+        
+        async def fake_exec(*cmd, **kwargs):
+            process = await real_exec(sys.executable, '-c', "import time\ntime.sleep(60)\n", **kwargs)
+            processes.append(process)
+            return process
+        
+        async def run_test():
+            with patch('asyncio.create_subprocess_exec', side_effect=fake_exec), \
+                 patch.object(self.recorder, '_show_ffmpeg_progress', side_effect=RuntimeError("進捗表示失敗")):
+                await asyncio.wait_for(
+                    self.recorder._convert_to_target_format(str(input_file), str(output_file), self.program),
+                    timeout=30
+                )
+        
+        # When: 変換実行
+        with self.assertRaises(FileConversionError) as context:
+            asyncio.run(run_test())
+        
+        # Then: 変換エラーとなり、FFmpegは停止・回収済み
+        self.assertIn("進捗表示失敗", str(context.exception))
+        self.assertEqual(len(processes), 1)
+        self.assertIsNotNone(processes[0].returncode)
+
+
+class TestTimeFreeRecorderMetadataArgs(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorder変換時メタデータ書き込みテスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        
+        self.program = ProgramInfo(
+            program_id="TBS_20250722_060000",
+            station_id="TBS",
+            station_name="TBSラジオ",
+            title="テスト番組",
+            start_time=datetime(2025, 7, 22, 6, 0, 0),
+            end_time=datetime(2025, 7, 22, 7, 0, 0),
+            performers=["出演者A"],
+            is_timefree_available=True
+        )
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _ffmpeg_command(self, output_name):
+        """変換時に起動されるFFmpegコマンドを取得"""
+        input_path = self.temp_env.config_dir / "input.ts"
+        input_path.write_bytes(b"ts")
+        output_path = str(self.temp_env.config_dir / output_name)
+        
+        async def run_test():
+            with patch('asyncio.create_subprocess_exec') as mock_exec, \
+                 patch.object(self.recorder, '_show_ffmpeg_progress', new=AsyncMock()):
+                mock_process = AsyncMock()
+                mock_process.stderr.read.return_value = b""
+                mock_process.returncode = 0
+                mock_exec.return_value = mock_process
+                
+                await self.recorder._convert_to_target_format(str(input_path), output_path, self.program)
+                return list(mock_exec.call_args.args)
+        
+        return asyncio.run(run_test())
+    
+    def test_74_変換時にメタデータ引数を付与(self):
+        """
+        TDD Test: 変換時にメタデータ引数を付与
+        
+        MP3はID3v2.4、AACはID3v2ヘッダー、M4AはMP4メタデータとして変換時に書き込まれることを確認
+        """
+        # When: MP3へ変換
+        cmd = self._ffmpeg_command("output.mp3")
+        
+        # Then: 番組情報のメタデータが渡される（空の値は除外）
+        self.assertIn('title=テスト番組', cmd)
+        self.assertIn('artist=出演者A', cmd)
+        self.assertIn('album=TBSラジオ', cmd)
+        self.assertIn('date=2025-07-22', cmd)
+        self.assertNotIn('comment=', cmd)
+        self.assertEqual(cmd[cmd.index('-id3v2_version') + 1], '4')
+        self.assertEqual(cmd[cmd.index('-map_metadata') + 1], '-1')
+        
+        # And: AAC・M4A
+        aac_cmd = self._ffmpeg_command("output.aac")
+        self.assertEqual(aac_cmd[aac_cmd.index('-write_id3v2') + 1], '1')
+        m4a_cmd = self._ffmpeg_command("output.m4a")
+        self.assertIn('title=テスト番組', m4a_cmd)
+        self.assertNotIn('-id3v2_version', m4a_cmd)
+    
+    def test_75_変換時書き込み無効時は後処理で埋め込み(self):
+        """
+        TDD Test: 変換時書き込み無効時は後処理で埋め込み
+        
+        tag_during_transcode無効時はメタデータ引数を付けず、変換後にmutagenで埋め込むことを確認
+        """
+        # Given: 変換時書き込み無効
+        self.recorder.tag_during_transcode = False
+        
+        # When: 変換・完了処理
+        cmd = self._ffmpeg_command("output.mp3")
+        job = _RecordingJob(self.program, str(self.temp_env.config_dir / "output.mp3"))
+        with patch.object(self.recorder, '_embed_metadata') as mock_metadata:
+            result = self.recorder._complete_recording(job)
+        
+        # Then: 変換後に埋め込まれる
+        self.assertNotIn('-metadata', cmd)
+        self.assertTrue(result.success)
+        mock_metadata.assert_called_once_with(job.output_path, self.program)
+
+
+class TestTimeFreeRecorderTokenRefresh(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorderダウンロード中のトークン再取得テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器（強制再取得で新しいトークンを発行）
+        self.current_token = "expired_token"
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.side_effect = self._authenticate_timefree
+        
+        # テスト対象
+        self.recorder = TimeFreeRecorder(self.mock_auth)
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def _authenticate_timefree(self, force_refresh=False):
+        if force_refresh:
+            self.current_token = "refreshed_token"
+        return self.current_token
+    
+    def _download(self, status_for_token, segment_count):
+        """トークン毎のステータスを返すモックサーバーでセグメントダウンロードを実行"""
+        self.sent_tokens = []
+        self.sent_urls = []
+        
+        def fake_get(url, headers=None):
+            token = headers['X-Radiko-AuthToken']
+            self.sent_tokens.append(token)
+            self.sent_urls.append(url)
+            response = AsyncMock()
+            response.status = status_for_token(token)
+            response.headers = {}
+            response.read.return_value = url.encode()
+            context = MagicMock()
+            context.__aenter__ = AsyncMock(return_value=response)
+            context.__aexit__ = AsyncMock(return_value=False)
+            return context
+        
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session, \
+                 patch('asyncio.sleep', new=AsyncMock()):
+                mock_session_instance = MagicMock()
+                mock_session_instance.closed = False
+                mock_session.return_value = mock_session_instance
+                mock_session_instance.get.side_effect = fake_get
+                return await self.recorder._download_segments_concurrent(
+                    [f"https://example.com/segment{i}.aac" for i in range(segment_count)]
+                )
+        
+        return asyncio.run(run_test())
+    
+    def _force_refresh_count(self):
+        return sum(1 for c in self.mock_auth.authenticate_timefree.call_args_list
+                   if c.kwargs.get('force_refresh'))
+    
+    def test_76_トークン失効時は1回だけ再取得して再試行(self):
+        """
+        TDD Test: トークン失効時は1回だけ再取得して再試行
+        
+        並行ダウンロード中の全ワーカーが401を受けても再認証は1回のみで、全セグメントが取得できることを確認
+        """
+        # Given: 失効したトークンでは401、新しいトークンでは200
+        def status_for_token(token):
+            return 200 if token == "refreshed_token" else 401
+        
+        # When: 8セグメントを並行ダウンロード
+        segments = self._download(status_for_token, segment_count=8)
+        
+        # Then: 全セグメントを取得し、強制再取得は1回のみ
+        self.assertEqual(segments, [f"https://example.com/segment{i}.aac".encode() for i in range(8)])
+        self.assertEqual(self._force_refresh_count(), 1)
+        self.assertEqual(self.sent_tokens.count("refreshed_token"), 8)
+    
+    def test_77_再取得後も認証エラーの場合は失敗(self):
+        """
+        TDD Test: 再取得後も認証エラーの場合は失敗
+        
+        再取得したトークンでも403の場合は再取得を繰り返さず失敗セグメントとして報告することを確認
+        """
+        # When/Then: 常に403
+        with self.assertRaises(SegmentDownloadError) as context:
+            self._download(lambda token: 403, segment_count=4)
+        
+        self.assertEqual(sorted(context.exception.failed_segments), [0, 1, 2, 3])
+        self.assertEqual(self._force_refresh_count(), 1)
+        self.assertEqual(len(self.sent_tokens), 8)
+    
+    def test_90_再試行中に再取得後のトークンも失効した場合は再度再取得(self):
+        """
+        TDD Test: 再試行中に再取得後のトークンも失効した場合は再度再取得
+        
+        再取得したトークンが他のセグメントで受け付けられた後に失効した場合は、
+        再取得済みのセグメントも再度トークンを再取得して取得できることを確認
+        """
+        issued = []
+        
+        def authenticate_timefree(force_refresh=False):
+            if force_refresh:
+                issued.append(f"token{len(issued) + 1}")
+            return issued[-1] if issued else self.current_token
+        
+        self.mock_auth.authenticate_timefree.side_effect = authenticate_timefree
+        
+        # Given: token1 はセグメント0で受け付けられた後に失効し、
+        #        セグメント1はそれまで503で再試行を続ける
+        token1_accepted = []
+        
+        def status_for_token(token):
+            if token == "token2":
+                return 200
+            if token != "token1":
+                return 401
+            if self.sent_urls[-1].endswith("segment0.aac"):
+                token1_accepted.append(True)
+                return 200
+            return 401 if token1_accepted else 503
+        
+        # When: 2セグメントを並行ダウンロード
+        segments = self._download(status_for_token, segment_count=2)
+        
+        # Then: 2回の再取得で全セグメントを取得
+        self.assertEqual(segments, [f"https://example.com/segment{i}.aac".encode() for i in range(2)])
+        self.assertEqual(self._force_refresh_count(), 2)
+        self.assertEqual(self.sent_tokens[-1], "token2")
+
+
+class TestTimeFreeRecorderBandwidthLimit(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorder帯域制限テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def test_78_設定した帯域制限をセグメント受信に適用(self):
+        """
+        TDD Test: 設定した帯域制限をセグメント受信に適用
+        
+        network セクションの帯域制限が他コンポーネントと共有され、受信チャンク毎に消費されることを確認
+        """
+        # Given: 帯域制限を設定した config.json
+        self.temp_env.update_config_data({"network": {"bandwidth_limit_mbps": 12.5}})
+        config_path = str(self.temp_env.config_file)
+        recorder = TimeFreeRecorder(self.mock_auth, config_path=config_path)
+        
+        # Then: 同じ設定を読み込んだ他コンポーネントと共有される
+        self.assertIsNotNone(recorder.bandwidth_limiter)
+        self.assertEqual(recorder.bandwidth_limiter.limit_mbps, 12.5)
+        self.assertIs(load_bandwidth_limiter(config_path), recorder.bandwidth_limiter)
+        
+        # When: 3セグメントをダウンロード
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session, \
+                 patch.object(recorder.bandwidth_limiter, 'throttle_async', new=AsyncMock()) as mock_throttle:
+                mock_session_instance = MagicMock()
+                mock_session_instance.closed = False
+                mock_session.return_value = mock_session_instance
+                response = AsyncMock()
+                response.status = 200
+                response.headers = {}
+                
+                async def iter_chunked(size):
+                    for _ in range(2):
+                        yield b"x" * 500
+                
+                response.content.iter_chunked = MagicMock(side_effect=iter_chunked)
+                mock_session_instance.get.return_value.__aenter__.return_value = response
+                segments = await recorder._download_segments_concurrent(
+                    [f"https://example.com/segment{i}.aac" for i in range(3)]
+                )
+                return mock_throttle, response, segments
+        
+        mock_throttle, response, segments = asyncio.run(run_test())
+        recorder.close_sync()
+        
+        # Then: 本文は受信チャンク毎に読み込み、チャンクのバイト数分の帯域を消費
+        self.assertEqual(segments, [b"x" * 1000] * 3)
+        response.read.assert_not_awaited()
+        response.content.iter_chunked.assert_called_with(recorder.chunk_size)
+        self.assertEqual(mock_throttle.await_count, 6)
+        mock_throttle.assert_awaited_with(500)
+
+
+class FakeChunkFFmpeg:
+    """分割変換テスト用のFFmpeg
+    
+    入力ADTSフレームのペイロードに書かれた番組全体でのフレーム番号から、
+    各出力MP3フレームが覆う位置（1152サンプル単位の格子番号）をペイロードに書き出す。
+    エンコーダー遅延分のフレームが先頭に付き、末尾は遅延・端数分まで出力される。
+    """
+    
+    ENCODER_DELAY = 1105
+    FRAME_SIZE = 1152
+    # MPEG-1 Layer III 128kbps 48kHz（384バイト）
+    FRAME_HEADER = bytes([0xFF, 0xFB, 0x94, 0xC4])
+    
+    def __init__(self):
+        self.commands = []
+        # 実行中のチャンク変換プロセス数とその最大値
+        self.running = 0
+        self.max_running = 0
+    
+    def __call__(self, *cmd, **kwargs):
+        self.commands.append(cmd)
+        if 'pipe:0' in cmd:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        return self._Process(self, cmd)
+    
+    def encode(self, cmd, received: bytes):
+        """受け取ったADTSの格子上の位置を出力フレームとして書き出す"""
+        id3_size = 10 + received[9]
+        first_frame = int.from_bytes(received[id3_size + 7:id3_size + 11], 'big')
+        counter = AdtsDurationCounter()
+        counter.feed(received)
+        
+        filters = cmd[cmd.index('-af') + 1]
+        trim = int(filters.split('start_sample=')[1].split(',')[0]) if 'start_sample=' in filters else 0
+        start = first_frame * 1024 + trim
+        decoded = counter.frames * 1024 - trim
+        frame_count = -(-(decoded + self.ENCODER_DELAY) // self.FRAME_SIZE)
+        with open(cmd[-1], 'wb') as f:
+            for j in range(frame_count):
+                # 格子からずれた場合は端数が残り、連結結果の検証で検出される
+                position = (start + j * self.FRAME_SIZE) / self.FRAME_SIZE
+                f.write(self.FRAME_HEADER + int(position * 1000).to_bytes(4, 'big') + b"\x00" * 376)
+    
+    class _Process:
+        def __init__(self, ffmpeg, cmd):
+            self.ffmpeg = ffmpeg
+            self.cmd = cmd
+            self.returncode = None
+            self.received = bytearray()
+            self.stdin = MagicMock()
+            self.stdin.write.side_effect = self.received.extend
+            self.stdin.drain = AsyncMock()
+            self.stdin.wait_closed = AsyncMock()
+            self.stderr = MagicMock()
+            self.stderr.read = AsyncMock(return_value=b"")
+        
+        async def wait(self):
+            if self.returncode is None:
+                self.ffmpeg.encode(self.cmd, bytes(self.received))
+                self.ffmpeg.running -= 1
+                self.returncode = 0
+            return self.returncode
+        
+        async def communicate(self):
+            # 連結後のストリームコピー
+            shutil.copyfile(self.cmd[self.cmd.index('-i') + 1], self.cmd[-1])
+            self.returncode = 0
+            return b"", b""
+
+
+class TestTimeFreeRecorderChunkedTranscode(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorder分割変換テスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        self.temp_env.update_config_data({"recording": {
+            "chunked_transcode": True,
+            "chunked_transcode_min_minutes": 0,
+            "chunked_transcode_workers": 3,
+        }})
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.recorder = TimeFreeRecorder(self.mock_auth, config_path=str(self.temp_env.config_file))
+        
+        self.program = ProgramInfo(
+            program_id="TBS_20250722_060000",
+            station_id="TBS",
+            station_name="TBSラジオ",
+            title="テスト番組",
+            start_time=datetime(2025, 7, 22, 6, 0, 0),
+            end_time=datetime(2025, 7, 22, 7, 0, 0),
+            is_timefree_available=True
+        )
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.recorder.close_sync()
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def test_80_分割変換のフレーム単位連結(self):
+        """
+        TDD Test: 分割変換のフレーム単位連結
+        
+        セグメント境界で分割した並列変換の出力が、1プロセスで変換した場合と同じフレーム格子で
+        隙間・重複なく連結され、ストリームコピーでメタデータが付与されることを確認
+        """
+        # Given: ペイロードにフレーム番号を書いた235フレーム×12セグメントの一時TSファイル
+        template = TemporaryTestEnvironment.build_adts_segment(1, payload_size=8)
+        id3_tag, header = template[:30], template[30:37]
+        frame_number = 0
+        segments = []
+        for _ in range(12):
+            frames = []
+            for _ in range(235):
+                frames.append(header + frame_number.to_bytes(4, 'big') + b"\x00" * 4)
+                frame_number += 1
+            segments.append(id3_tag + b"".join(frames))
+        ts_path = self.temp_env.config_dir / "program.ts"
+        ts_path.write_bytes(b"".join(segments))
+        output_path = self.temp_env.recordings_dir / "program.mp3"
+        ffmpeg = FakeChunkFFmpeg()
+        
+        # When: MP3へ変換
+        with patch('asyncio.create_subprocess_exec', side_effect=ffmpeg):
+            asyncio.run(self.recorder._convert_to_target_format(str(ts_path), str(output_path), self.program))
+        
+        # Then: 3分割で変換し、ストリームコピーで連結
+        encode_commands = [cmd for cmd in ffmpeg.commands if 'pipe:0' in cmd]
+        self.assertEqual(len(encode_commands), 3)
+        for cmd in encode_commands:
+            self.assertIn('-reservoir', cmd)
+            self.assertIn('256k', cmd)
+        remux = ffmpeg.commands[-1]
+        self.assertEqual(remux[remux.index('-c:a') + 1], 'copy')
+        self.assertIn('title=テスト番組', remux)
+        
+        # And: 1プロセスで変換した場合と同じフレームが順に1回ずつ並ぶ
+        data = output_path.read_bytes()
+        positions = [int.from_bytes(data[offset + 4:offset + 8], 'big') / 1000
+                     for offset, _ in iter_audio_frames(data, 'mp3')]
+        expected_frames = -(-(frame_number * 1024 + FakeChunkFFmpeg.ENCODER_DELAY) // FakeChunkFFmpeg.FRAME_SIZE)
+        self.assertEqual(positions, [float(i) for i in range(expected_frames)])
+    
+    def test_92_分割変換のFFmpeg同時実行数と入力読み込み(self):
+        """
+        TDD Test: 分割変換のFFmpeg同時実行数と入力読み込み
+        
+        チャンクのFFmpegは変換段と共有の上限（transcode_workers）を超えて同時実行されず、
+        入力ファイルの読み込みはイベントループのスレッド外で行われることを確認
+        """
+        # Given: 3分割で変換する一時TSファイルと、FFmpeg同時実行数の上限2
+        segment = TemporaryTestEnvironment.build_adts_segment(235, payload_size=8)
+        ts_path = self.temp_env.config_dir / "program.ts"
+        ts_path.write_bytes(segment * 12)
+        output_path = self.temp_env.recordings_dir / "program.mp3"
+        self.recorder.transcode_workers = 2
+        ffmpeg = FakeChunkFFmpeg()
+        open_threads = []
+        
+        def recording_open(*args, **kwargs):
+            open_threads.append(threading.current_thread())
+            return open(*args, **kwargs)
+        
+        # When: MP3へ変換
+        with patch('asyncio.create_subprocess_exec', side_effect=ffmpeg), \
+             patch('src.timefree_recorder.open', side_effect=recording_open, create=True):
+            asyncio.run(self.recorder._convert_to_target_format(str(ts_path), str(output_path), self.program))
+        
+        # Then: 3チャンクを変換し、同時に実行されるFFmpegは2つまで
+        self.assertEqual(len([cmd for cmd in ffmpeg.commands if 'pipe:0' in cmd]), 3)
+        self.assertEqual(ffmpeg.max_running, 2)
+        
+        # And: チャンク入力の読み込みはイベントループのスレッド外で行われる
+        self.assertGreaterEqual(len(open_threads), 3)
+        self.assertNotIn(threading.main_thread(), open_threads)
+
+
+class TestTimeFreeRecorderMetrics(unittest.TestCase, RealEnvironmentTestBase):
+    """TimeFreeRecorder録音メトリクステスト"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        super().setUp()
+        self.temp_env = TemporaryTestEnvironment()
+        self.temp_env.__enter__()
+        
+        # モック認証器
+        self.mock_auth = MagicMock(spec=RadikoAuthenticator)
+        self.mock_auth.authenticate_timefree.return_value = "test_timefree_token"
+        
+        self.program = ProgramInfo(
+            program_id="TBS_20250722_060000",
+            station_id="TBS",
+            station_name="TBSラジオ",
+            title="テスト番組",
+            start_time=datetime(2025, 7, 22, 6, 0, 0),
+            end_time=datetime(2025, 7, 22, 7, 0, 0),
+            is_timefree_available=True
+        )
+        
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_env.__exit__(None, None, None)
+        super().tearDown()
+    
+    def test_79_録音結果と出力先への計測値記録(self):
+        """
+        TDD Test: 録音結果と出力先への計測値記録
+        
+        録音結果に受信量・レイテンシ・リトライ回数が格納され、設定した出力先へ書き込まれることを確認
+        """
+        # Given: JSON Lines・Prometheus textfile の出力先を設定（セグメントストアは使用しない）
+        jsonl_path = self.temp_env.config_dir / "metrics.jsonl"
+        prom_path = self.temp_env.config_dir / "recradiko.prom"
+        self.temp_env.update_config_data({"recording": {
+            "metrics_jsonl_path": str(jsonl_path),
+            "metrics_prometheus_path": str(prom_path),
+            "segment_cache_enabled": False,
+            "resume_enabled": False,
+        }})
+        recorder = TimeFreeRecorder(self.mock_auth, config_path=str(self.temp_env.config_file))
+        recorder.retry_policy.base_delay = 0
+        segment_urls = [f"https://example.com/segment{i}.aac" for i in range(3)]
+        
+        def segment_response(status, body=b""):
+            response = AsyncMock()
+            response.status = status
+            response.headers = {}
+            response.read.return_value = body
+            return response
+        
+        async def fake_convert(temp_ts_path, output_path, program_info):
+            Path(output_path).write_bytes(b"converted")
+        
+        # When: 1回の503を挟んで3セグメントを録音
+        async def run_test():
+            with patch('aiohttp.ClientSession') as mock_session, \
+                 patch.object(recorder, '_fetch_playlist', return_value=segment_urls), \
+                 patch.object(recorder, '_convert_to_target_format', side_effect=fake_convert):
+                mock_session_instance = MagicMock()
+                mock_session_instance.closed = False
+                mock_session.return_value = mock_session_instance
+                mock_session_instance.get.return_value.__aenter__.side_effect = [
+                    segment_response(503),
+                    segment_response(200, b"x" * 100),
+                    segment_response(200, b"x" * 100),
+                    segment_response(200, b"x" * 100),
+                ]
+                return await recorder.record_program(
+                    self.program, str(self.temp_env.recordings_dir / "program.mp3"))
+        
+        result = asyncio.run(run_test())
+        recorder.close_sync()
+        
+        # Then: 録音結果に計測値が格納される
+        self.assertTrue(result.success)
+        metrics = result.metrics
+        self.assertTrue(metrics.success)
+        self.assertEqual(metrics.station_id, "TBS")
+        self.assertEqual(metrics.segments_downloaded, 3)
+        self.assertEqual(metrics.bytes_downloaded, 300)
+        self.assertEqual(metrics.retries_by_cause, {"HTTP 503": 1})
+        self.assertEqual(set(metrics.latency_percentiles()), {"p50", "p90", "p95", "p99", "max"})
+        self.assertIsNotNone(metrics.time_to_first_segment_seconds)
+        
+        # And: 両方の出力先へ書き込まれる
+        record = json.loads(jsonl_path.read_text(encoding='utf-8').splitlines()[-1])
+        self.assertEqual(record["program_id"], "TBS_20250722_060000")
+        self.assertEqual(record["bytes_downloaded"], 300)
+        self.assertIn(
+            'recradiko_recording_retries{station="TBS",program="TBS_20250722_060000",cause="HTTP 503"} 1',
+            prom_path.read_text(encoding='utf-8')
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,328 @@
+"""
+ローカルRadikoモックサーバー
+
+オフラインで録音処理全体を再現可能に計測するための aiohttp 製の Radiko 互換サーバーです。
+- auth1/auth2（部分キーの検証付き）
+- タイムフリー playlist.m3u8 → chunklist → .aac セグメント（ID3タグ＋ADTSフレーム）
+- 応答遅延・帯域・エラー注入・トークン失効を設定可能
+- 録音側の認証器・レコーダーの接続先をサーバーへ切り替える補助関数
+
+録音クライアント（RadikoAuthenticator）は同期HTTPを使用するため、
+サーバーは専用スレッドのイベントループで動作します。
+
+Usage:
+    async def record(server):
+        # 共有HTTPセッションはループ終了前にクローズ
+        async with TimeFreeRecorder(server.create_authenticator(), config_path) as recorder:
+            server.configure_recorder(recorder)
+            return await recorder.record_program(program_info, output_path)
+
+    with MockRadikoServer(MockServerConfig(latency_ms=50, bandwidth_mbps=100)) as server:
+        result = asyncio.run(record(server))
+"""
+
+import asyncio
+import base64
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from aiohttp import web
+
+from src.auth import RadikoAuthenticator, LocationInfo
+from src.bandwidth_limiter import BandwidthLimiter
+from tests.utils.test_environment import TemporaryTestEnvironment
+
+
+# ADTSフレーム（48kHz）1フレームの再生時間
+ADTS_FRAME_SECONDS = 1024 / 48000
+# ADTSヘッダー長
+ADTS_HEADER_SIZE = 7
+
+
+@dataclass
+class MockServerConfig:
+    """モックサーバーの動作設定"""
+    # 応答までの遅延（ミリ秒）とその揺らぎ（0〜指定値の一様乱数を加算）
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    # サーバー全体の送信帯域上限 (Mbit/s, 0 の場合は無制限)
+    bandwidth_mbps: float = 0.0
+    # セグメント要求のうちエラー応答を返す割合と、そのステータス
+    error_rate: float = 0.0
+    error_status: int = 503
+    # 発行したトークンを失効させるまでのセグメント要求数（None の場合は失効しない）
+    token_lifetime_requests: Optional[int] = None
+    # セグメント長（秒）と音声ビットレート（セグメントサイズの算出に使用）
+    segment_seconds: int = 5
+    bitrate_kbps: int = 48
+    # 本文送信時の書き込み単位
+    chunk_size: int = 16 * 1024
+    # エラー注入・遅延の揺らぎの乱数シード（同じ値なら同じ結果を再現）
+    seed: int = 0
+    area_id: str = "JP13"
+
+
+@dataclass
+class MockServerStats:
+    """モックサーバーの応答集計"""
+    requests: Dict[str, int] = field(default_factory=dict)
+    segments_served: int = 0
+    bytes_sent: int = 0
+    errors_injected: int = 0
+    tokens_issued: int = 0
+    tokens_expired: int = 0
+    # サーバースレッドが消費したCPU秒数（計測側のCPU時間から差し引くため）
+    cpu_seconds: float = 0.0
+
+    def count(self, endpoint: str):
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+
+class MockRadikoServer:
+    """ローカルRadikoモックサーバー
+
+    番組の長さはプレイリスト要求の ft/to から決まるため、任意の長さの番組や
+    時間窓に分割したプレイリスト取得をそのまま再現できる。
+    セグメントURLは放送時刻から一意に決まり、窓の境界では同じURLを返す。
+    """
+
+    TIME_FORMAT = '%Y%m%d%H%M%S'
+
+    def __init__(self, config: Optional[MockServerConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockServerConfig()
+        self.host = host
+        self.port = port
+        self.stats = MockServerStats()
+        self._random = random.Random(self.config.seed)
+        # auth1 で発行し auth2 で検証する部分キーの位置、認可済みトークン毎のセグメント要求数
+        self._key_offsets: Dict[str, int] = {}
+        self._tokens: Dict[str, int] = {}
+        self._limiter = (
+            BandwidthLimiter(limit_mbps=self.config.bandwidth_mbps)
+            if self.config.bandwidth_mbps > 0 else None
+        )
+        self._segment = self._build_segment()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._startup_error: Optional[BaseException] = None
+
+    # ------------------------------------------------------------------
+    # 起動・停止
+    # ------------------------------------------------------------------
+
+    def __enter__(self) -> 'MockRadikoServer':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """専用スレッドでサーバーを起動（待ち受け開始まで待機）"""
+        self._thread = threading.Thread(target=self._run, name="mock-radiko-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._startup_error:
+            raise self._startup_error
+
+    def stop(self):
+        """サーバーを停止"""
+        if self._loop and self._thread and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        cpu_start = time.thread_time()
+        try:
+            self._loop.run_until_complete(self._start_site())
+        except BaseException as e:
+            self._startup_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.run_until_complete(self._runner.cleanup())
+            self._loop.close()
+            self.stats.cpu_seconds = time.thread_time() - cpu_start
+
+    async def _start_site(self):
+        app = web.Application()
+        app.router.add_get('/v2/api/auth1', self._handle_auth1)
+        app.router.add_get('/v2/api/auth2', self._handle_auth2)
+        app.router.add_get('/v2/api/ts/playlist.m3u8', self._handle_playlist)
+        app.router.add_get(r'/v2/api/ts/chunklist/{station_id}_{ft:\d{14}}_{to:\d{14}}.m3u8',
+                           self._handle_chunklist)
+        app.router.add_get(r'/segments/{station_id}/{timestamp:\d{14}}.aac', self._handle_segment)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # ------------------------------------------------------------------
+    # 録音側の接続先切り替え
+    # ------------------------------------------------------------------
+
+    def create_authenticator(self, config_path: str = "auth_config.json") -> RadikoAuthenticator:
+        """サーバーへ接続する認証器を作成（位置情報の外部API取得は行わない）"""
+        authenticator = RadikoAuthenticator(config_path)
+        self.configure_authenticator(authenticator)
+        return authenticator
+
+    def configure_authenticator(self, authenticator: RadikoAuthenticator):
+        """認証器の接続先をサーバーへ切り替え"""
+        authenticator.AUTH1_URL = f"{self.base_url}/v2/api/auth1"
+        authenticator.AUTH2_URL = f"{self.base_url}/v2/api/auth2"
+        authenticator.TIMEFREE_AUTH_URL = authenticator.AUTH1_URL
+        authenticator.TIMEFREE_PLAYLIST_URL = f"{self.base_url}/v2/api/ts/playlist.m3u8"
+        authenticator.location_info = LocationInfo(
+            ip_address=self.host, area_id=self.config.area_id, region="mock", country="Japan"
+        )
+
+    def configure_recorder(self, recorder):
+        """レコーダーのプレイリスト取得先をサーバーへ切り替え（このレコーダーのみ http のURLを許可）"""
+        recorder.TIMEFREE_URL_API = f"{self.base_url}/v2/api/ts/playlist.m3u8"
+        recorder.PLAYLIST_URL_SCHEMES = ('https://', 'http://')
+
+    # ------------------------------------------------------------------
+    # 応答
+    # ------------------------------------------------------------------
+
+    def _build_segment(self) -> bytes:
+        """1セグメント分のID3タグ＋ADTSフレーム（ビットレートに応じたフレームサイズ）"""
+        frame_count = round(self.config.segment_seconds / ADTS_FRAME_SECONDS)
+        frame_bytes = self.config.bitrate_kbps * 1000 / 8 * ADTS_FRAME_SECONDS
+        payload_size = max(1, int(frame_bytes) - ADTS_HEADER_SIZE)
+        return TemporaryTestEnvironment.build_adts_segment(frame_count, payload_size=payload_size)
+
+    @property
+    def segment_size(self) -> int:
+        return len(self._segment)
+
+    async def _delay(self):
+        delay_ms = self.config.latency_ms
+        if self.config.latency_jitter_ms:
+            delay_ms += self._random.uniform(0, self.config.latency_jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+    def _authorized(self, request: web.Request) -> bool:
+        return request.headers.get('X-Radiko-AuthToken') in self._tokens
+
+    async def _handle_auth1(self, request: web.Request) -> web.Response:
+        self.stats.count('auth1')
+        await self._delay()
+        token = uuid.uuid4().hex
+        offset = self._random.randrange(0, len(RadikoAuthenticator.AUTH_KEY) - 16)
+        self._key_offsets[token] = offset
+        return web.Response(text="OK", headers={
+            'X-Radiko-AuthToken': token,
+            'X-Radiko-KeyLength': '16',
+            'X-Radiko-KeyOffset': str(offset),
+        })
+
+    async def _handle_auth2(self, request: web.Request) -> web.Response:
+        self.stats.count('auth2')
+        await self._delay()
+        offset = self._key_offsets.pop(request.headers.get('X-Radiko-AuthToken'), None)
+        if offset is None:
+            return web.Response(status=401, text="invalid token")
+        expected = base64.b64encode(RadikoAuthenticator.AUTH_KEY.encode('utf-8')[offset:offset + 16])
+        if request.headers.get('X-Radiko-Partialkey', '').encode('utf-8') != expected:
+            return web.Response(status=401, text="invalid partialkey")
+        self._tokens[request.headers['X-Radiko-AuthToken']] = 0
+        self.stats.tokens_issued += 1
+        return web.Response(text=f"{self.config.area_id},東京都,tokyo Japan")
+
+    async def _handle_playlist(self, request: web.Request) -> web.Response:
+        self.stats.count('playlist')
+        await self._delay()
+        if not self._authorized(request):
+            return web.Response(status=403, text="forbidden")
+        try:
+            station_id = request.query['station_id']
+            ft = request.query['ft']
+            to = request.query['to']
+            datetime.strptime(ft, self.TIME_FORMAT)
+            datetime.strptime(to, self.TIME_FORMAT)
+        except (KeyError, ValueError):
+            return web.Response(status=400, text="bad request")
+        return web.Response(text=(
+            "#EXTM3U\n"
+            "#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH=52973,CODECS=\"mp4a.40.5\"\n"
+            f"{self.base_url}/v2/api/ts/chunklist/{station_id}_{ft}_{to}.m3u8\n"
+        ), content_type='application/vnd.apple.mpegurl')
+
+    async def _handle_chunklist(self, request: web.Request) -> web.Response:
+        self.stats.count('chunklist')
+        await self._delay()
+        if not self._authorized(request):
+            return web.Response(status=403, text="forbidden")
+        station_id = request.match_info['station_id']
+        start = datetime.strptime(request.match_info['ft'], self.TIME_FORMAT)
+        end = datetime.strptime(request.match_info['to'], self.TIME_FORMAT)
+
+        # 放送時刻をセグメント長の境界に揃えて列挙（隣接する時間窓で同じURLになる）
+        step = timedelta(seconds=self.config.segment_seconds)
+        epoch = datetime(start.year, start.month, start.day)
+        moment = epoch + step * ((start - epoch) // step)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{self.config.segment_seconds}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+        ]
+        while moment < end:
+            lines.append(f"#EXTINF:{self.config.segment_seconds},")
+            lines.append(f"{self.base_url}/segments/{station_id}/{moment.strftime(self.TIME_FORMAT)}.aac")
+            moment += step
+        lines.append("#EXT-X-ENDLIST")
+        return web.Response(text='\n'.join(lines) + '\n', content_type='application/vnd.apple.mpegurl')
+
+    async def _handle_segment(self, request: web.Request) -> web.StreamResponse:
+        self.stats.count('segment')
+        await self._delay()
+        token = request.headers.get('X-Radiko-AuthToken')
+        if not self._authorized(request):
+            return web.Response(status=401, text="unauthorized")
+
+        lifetime = self.config.token_lifetime_requests
+        self._tokens[token] += 1
+        if lifetime is not None and self._tokens[token] > lifetime:
+            # 失効したトークンは以降も拒否（再認証で新しいトークンを取得させる）
+            del self._tokens[token]
+            self.stats.tokens_expired += 1
+            return web.Response(status=401, text="token expired")
+
+        if self.config.error_rate and self._random.random() < self.config.error_rate:
+            self.stats.errors_injected += 1
+            return web.Response(status=self.config.error_status, text="injected error")
+
+        response = web.StreamResponse(headers={'Content-Type': 'audio/aac'})
+        response.content_length = len(self._segment)
+        await response.prepare(request)
+        view = memoryview(self._segment)
+        for offset in range(0, len(view), self.config.chunk_size):
+            chunk = view[offset:offset + self.config.chunk_size]
+            if self._limiter is not None:
+                await self._limiter.throttle_async(len(chunk))
+            await response.write(chunk)
+            self.stats.bytes_sent += len(chunk)
+        await response.write_eof()
+        self.stats.segments_served += 1
+        return response
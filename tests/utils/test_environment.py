@@ -112,6 +112,27 @@ class TemporaryTestEnvironment:
         
         return file_path
     
+    @staticmethod
+    def build_adts_segment(frame_count: int, sample_rate_index: int = 3,
+                           payload_size: int = 32) -> bytes:
+        """Radikoセグメント形式（ID3タグ＋ADTSフレーム）のサンプルデータ生成
+        
+        既定の48kHzでは1フレーム = 1024/48000秒
+        """
+        id3_body = b"\x00" * 20
+        id3_tag = b"ID3\x04\x00\x00" + bytes([0, 0, 0, len(id3_body)]) + id3_body
+        
+        frame_length = 7 + payload_size
+        header = bytes([
+            0xFF, 0xF1,  # 同期ワード・MPEG-4・CRCなし
+            0x40 | (sample_rate_index << 2),  # AAC LC・サンプリング周波数
+            0x80 | ((frame_length >> 11) & 0x03),  # 2ch
+            (frame_length >> 3) & 0xFF,
+            ((frame_length & 0x07) << 5) | 0x1F,
+            0xFC,  # 1ブロック
+        ])
+        return id3_tag + (header + b"\x00" * payload_size) * frame_count
+    
     def create_sample_playlist(self, station_id: str, segments: int = 5,
                               segment_duration: int = 5) -> Path:
         """サンプルプレイリストファイル作成"""